@@ -67,6 +67,7 @@ TABLE_ORDER = [
     "tx_sol_balance_change",
     "tx_swap",
     "tx_token_balance_change",
+    "tx_token_day_activity",
     "tx_token_holder",
     "tx_token_market",
     "tx_token_participant",
@@ -12,7 +12,7 @@
 --   OR run via 02-create-schema.py
 
 -- =============================================================================
--- TABLES (23 total) - Order matters due to foreign key dependencies
+-- TABLES (24 total) - Order matters due to foreign key dependencies
 -- =============================================================================
 
 -- Base tables (no foreign keys)
@@ -40,6 +40,7 @@ SOURCE tables/tx_signer.sql;
 SOURCE tables/tx_sol_balance_change.sql;
 SOURCE tables/tx_swap.sql;
 SOURCE tables/tx_token_balance_change.sql;
+SOURCE tables/tx_token_day_activity.sql;
 SOURCE tables/tx_token_holder.sql;
 SOURCE tables/tx_token_market.sql;
 SOURCE tables/tx_token_participant.sql;
@@ -0,0 +1,19 @@
+-- Migration: Worker thread autoscaler
+-- With <worker>_wrk_autoscale = 1 the supervisor picks its thread count between
+-- <worker>_wrk_cnt_threads_min and _max from queue depth, message latency and
+-- the Solscan 429 rate (thresholds: AUTOSCALE_* in guide-config.json), logging
+-- every change. With 0 (default) <worker>_wrk_cnt_threads applies as before.
+
+INSERT IGNORE INTO config (config_type, config_key, config_value) VALUES
+('queue', 'decoder_wrk_autoscale',          '0'),
+('queue', 'decoder_wrk_cnt_threads_min',    '1'),
+('queue', 'decoder_wrk_cnt_threads_max',    '8'),
+('queue', 'detailer_wrk_autoscale',         '0'),
+('queue', 'detailer_wrk_cnt_threads_min',   '1'),
+('queue', 'detailer_wrk_cnt_threads_max',   '8'),
+('queue', 'funder_wrk_autoscale',           '0'),
+('queue', 'funder_wrk_cnt_threads_min',     '1'),
+('queue', 'funder_wrk_cnt_threads_max',     '8'),
+('queue', 'enricher_wrk_autoscale',         '0'),
+('queue', 'enricher_wrk_cnt_threads_min',   '1'),
+('queue', 'enricher_wrk_cnt_threads_max',   '8');
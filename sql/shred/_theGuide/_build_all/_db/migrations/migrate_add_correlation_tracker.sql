@@ -0,0 +1,27 @@
+-- Migration: Persistent gateway correlation tracker
+-- Created: 2026-10-17
+--
+-- Adds tx_correlation_tracker / tx_correlation_batch so the gateway's pipeline
+-- completion tracking survives restarts (enable with GATEWAY_TRACKER_PERSIST).
+--
+-- Run with: mysql -h 127.0.0.1 -P 3396 -u root -p t16o_db < migrate_add_correlation_tracker.sql
+
+SELECT 'Creating tx_correlation_tracker tables...' AS status;
+
+CREATE TABLE IF NOT EXISTS tx_correlation_tracker (
+    correlation_id   VARCHAR(36) NOT NULL PRIMARY KEY,
+    expected_batches INT UNSIGNED NOT NULL DEFAULT 0,
+    producer_done    TINYINT(1) NOT NULL DEFAULT 0,
+    started_utc      TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3),
+    updated_utc      TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3),
+    INDEX idx_updated_utc (updated_utc)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS tx_correlation_batch (
+    correlation_id VARCHAR(36) NOT NULL,
+    worker         VARCHAR(20) NOT NULL,
+    batch_num      INT UNSIGNED NOT NULL,
+    PRIMARY KEY (correlation_id, worker, batch_num)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+SELECT 'Done.' AS status;
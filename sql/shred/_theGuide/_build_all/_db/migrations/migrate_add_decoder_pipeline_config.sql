@@ -0,0 +1,8 @@
+-- Migration: Add decoder pipelined-mode config
+-- decoder_wrk_pipeline=1 overlaps Solscan /transaction/actions/multi fetches
+-- (decoder_wrk_cnt_api_inflight concurrent requests per worker thread) with
+-- sp_tx_parse_decode; 0 restores the sequential one-batch-at-a-time loop.
+
+INSERT IGNORE INTO config (config_type, config_key, config_value) VALUES
+('queue', 'decoder_wrk_pipeline',          '1'),
+('queue', 'decoder_wrk_cnt_api_inflight',  '4');
@@ -0,0 +1,7 @@
+-- Migration: Add detailer concurrent Solscan fetch config
+-- guide-detailer.py pulls up to detailer_wrk_cnt_prefetch messages at a time and
+-- fetches their details concurrently, at most detailer_wrk_cnt_api_inflight
+-- /transaction/detail/multi requests in flight per worker thread.
+
+INSERT IGNORE INTO config (config_type, config_key, config_value) VALUES
+('queue', 'detailer_wrk_cnt_api_inflight', '4');
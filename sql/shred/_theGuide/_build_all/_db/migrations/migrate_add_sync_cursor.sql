@@ -0,0 +1,33 @@
+-- Migration: Checkpointed, range-split RPC pagination for guide-synchronizer.py
+-- Created: 2026-10-17
+--
+-- One row per (sync_id, range_idx): the range pages getSignaturesForAddress from
+-- before_sig (resume point, NULL = chain head) down to until_sig. before_sig and
+-- fetched advance in the same transaction as the page's txs_sync rows, so a
+-- worker that dies mid-range resumes from its last stored page.
+--
+-- Run with: mysql -h 127.0.0.1 -P 3396 -u root -p t16o_db < migrate_add_sync_cursor.sql
+
+SELECT 'Creating t16o_db_staging.txs_sync_cursor...' AS status;
+
+CREATE TABLE IF NOT EXISTS t16o_db_staging.txs_sync_cursor (
+  `sync_id` char(36) NOT NULL,
+  `range_idx` smallint unsigned NOT NULL,
+  `mint_address_id` int unsigned NOT NULL,
+  `before_sig` varchar(88) DEFAULT NULL COMMENT 'Resume point; NULL = start at chain head',
+  `until_sig` varchar(88) DEFAULT NULL COMMENT 'Exclusive lower bound; NULL = full history',
+  `fetched` int unsigned NOT NULL DEFAULT '0',
+  `max_sigs` int unsigned NOT NULL,
+  `status` enum('active','done') NOT NULL DEFAULT 'active',
+  `created_utc` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_utc` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`sync_id`,`range_idx`),
+  KEY `idx_mint_status` (`mint_address_id`,`status`,`updated_utc`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+SELECT 'Adding synchronizer_wrk_cnt_pagers config...' AS status;
+
+INSERT IGNORE INTO config (config_type, config_key, config_value) VALUES
+('queue', 'synchronizer_wrk_cnt_pagers', '4');
+
+SELECT 'Done.' AS status;
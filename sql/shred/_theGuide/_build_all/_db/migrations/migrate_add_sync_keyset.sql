@@ -0,0 +1,63 @@
+-- Migration: txs_sync id column and keyset index for guide-synchronizer.py
+-- Created: 2026-10-17
+--
+-- The synchronizer walks a sync's rows by txs_sync.id (mark_existing_signatures
+-- id chunks) and streams gap signatures newest first with a keyset cursor on
+-- (block_time DESC, id DESC). Both need an auto-increment id and an index on
+-- (sync_id, status, block_time, id). Older staging schemas may lack either, so
+-- this guarantees the table, the column and the index.
+--
+-- Run with: mysql -h 127.0.0.1 -P 3396 -u root -p t16o_db < migrate_add_sync_keyset.sql
+
+SELECT 'Ensuring t16o_db_staging.txs_sync...' AS status;
+
+CREATE TABLE IF NOT EXISTS t16o_db_staging.txs_sync (
+  `id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `sync_id` char(36) NOT NULL,
+  `mint_address_id` int unsigned NOT NULL,
+  `signature` varchar(88) NOT NULL,
+  `block_time` bigint unsigned DEFAULT NULL,
+  `block_id` bigint unsigned DEFAULT NULL,
+  `status` enum('discovered','exists','queued') NOT NULL DEFAULT 'discovered',
+  `created_utc` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uk_sync_signature` (`sync_id`,`signature`),
+  KEY `idx_sync_status_time` (`sync_id`,`status`,`block_time`,`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+SELECT 'Ensuring txs_sync.id...' AS status;
+
+SET @col_exists = (SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = 't16o_db_staging' AND TABLE_NAME = 'txs_sync' AND COLUMN_NAME = 'id');
+
+SET @has_pk = (SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
+    WHERE TABLE_SCHEMA = 't16o_db_staging' AND TABLE_NAME = 'txs_sync'
+      AND CONSTRAINT_TYPE = 'PRIMARY KEY');
+
+-- An AUTO_INCREMENT column must be indexed: make it the primary key unless the
+-- table already has one
+SET @sql = IF(@col_exists = 0,
+    IF(@has_pk = 0,
+        'ALTER TABLE t16o_db_staging.txs_sync ADD COLUMN id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT FIRST, ADD PRIMARY KEY (id)',
+        'ALTER TABLE t16o_db_staging.txs_sync ADD COLUMN id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT FIRST, ADD UNIQUE KEY uk_id (id)'),
+    'SELECT ''column already exists'' AS result');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SELECT 'Ensuring txs_sync.idx_sync_status_time...' AS status;
+
+SET @idx_exists = (SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = 't16o_db_staging' AND TABLE_NAME = 'txs_sync'
+      AND INDEX_NAME = 'idx_sync_status_time');
+
+SET @sql = IF(@idx_exists = 0,
+    'ALTER TABLE t16o_db_staging.txs_sync ADD INDEX idx_sync_status_time (sync_id, status, block_time, id)',
+    'SELECT ''index already exists'' AS result');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SELECT 'Done.' AS status;
@@ -0,0 +1,21 @@
+-- Migration: Per-day token activity rollup
+-- Created: 2026-10-17
+--
+-- Adds tx_token_day_activity (token_id, day, edge_count). guide-aggregator.py
+-- fills it incrementally from tx_guide (operation 'days'); the first pass after
+-- this migration backfills from tx_guide.id 0. guide-price-loader.py reads it
+-- instead of scanning tx_guide.
+--
+-- Run with: mysql -h 127.0.0.1 -P 3396 -u root -p t16o_db < migrate_add_token_day_activity.sql
+
+SELECT 'Creating tx_token_day_activity...' AS status;
+
+CREATE TABLE IF NOT EXISTS tx_token_day_activity (
+    token_id   BIGINT NOT NULL,
+    day        DATE NOT NULL COMMENT 'DATE(FROM_UNIXTIME(block_time))',
+    edge_count INT UNSIGNED NOT NULL DEFAULT 0,
+    PRIMARY KEY (token_id, day),
+    KEY idx_day (day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+SELECT 'Done.' AS status;
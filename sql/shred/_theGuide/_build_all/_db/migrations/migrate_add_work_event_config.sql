@@ -0,0 +1,12 @@
+-- Migration: Event-driven db-poll dispatch
+-- The shredder (-> aggregator, enricher) and aggregator (-> funder, enricher)
+-- publish "new rows" work events after they commit; the consumers' supervisor
+-- db-poll timers drop to a slow fallback of max(db_poll_sec, db_poll_fallback_sec).
+-- Set *_event_dispatch to 0 and *_db_poll_fallback_sec to 0 to restore pure polling.
+
+INSERT IGNORE INTO config (config_type, config_key, config_value) VALUES
+('queue', 'shredder_wrk_event_dispatch',          '1'),
+('queue', 'aggregator_wrk_event_dispatch',        '1'),
+('queue', 'aggregator_wrk_db_poll_fallback_sec',  '300'),
+('queue', 'enricher_wrk_db_poll_fallback_sec',    '300'),
+('queue', 'funder_wrk_db_poll_fallback_sec',      '300');
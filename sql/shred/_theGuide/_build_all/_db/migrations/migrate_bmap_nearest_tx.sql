@@ -0,0 +1,74 @@
+-- Migration: Index-backed nearest-tx lookup and per-token edge count for sp_tx_bmap_get
+-- Created: 2026-10-17
+--
+-- sp_tx_bmap_get's p_block_time anchor used ORDER BY ABS(block_time - p_block_time),
+-- which reads every tx_guide row of the token. It now runs two range probes on
+-- idx_token_blocktime (last edge at or before the time, first edge after it).
+-- Symbol/name resolution ranked candidates by COUNT(*) over tx_guide per call;
+-- it now reads tx_token.guide_edge_count. guide-aggregator.py (operation 'days')
+-- maintains that count in the same transaction as the
+-- sync/token_day_activity_last_guide_id checkpoint, so the backfill below counts
+-- edges up to that checkpoint.
+--
+-- Stop guide-aggregator while this runs (the backfill must not race a 'days' batch).
+--
+-- Run with: mysql -h 127.0.0.1 -P 3396 -u root -p t16o_db < migrate_bmap_nearest_tx.sql
+
+SELECT 'Ensuring tx_guide.idx_token_blocktime...' AS status;
+
+SET @idx_exists = (SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'tx_guide' AND INDEX_NAME = 'idx_token_blocktime');
+
+SET @sql = IF(@idx_exists = 0,
+    'ALTER TABLE tx_guide ADD INDEX idx_token_blocktime (token_id, block_time)',
+    'SELECT ''index already exists'' AS result');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- idx_token (token_id) is a prefix of idx_token_blocktime; the tx_guide DDL no
+-- longer has it
+SELECT 'Dropping redundant tx_guide.idx_token...' AS status;
+
+SET @idx_exists = (SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'tx_guide' AND INDEX_NAME = 'idx_token');
+
+SET @sql = IF(@idx_exists > 0,
+    'ALTER TABLE tx_guide DROP INDEX idx_token',
+    'SELECT ''index already dropped'' AS result');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SELECT 'Adding tx_token.guide_edge_count...' AS status;
+
+SET @col_exists = (SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'tx_token' AND COLUMN_NAME = 'guide_edge_count');
+
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE tx_token ADD COLUMN guide_edge_count BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT ''tx_guide edges for this token (guide-aggregator days sync)'' AFTER token_type',
+    'SELECT ''column already exists'' AS result');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SELECT 'Backfilling guide_edge_count up to the days checkpoint...' AS status;
+
+SET @last_guide_id = COALESCE((SELECT CAST(config_value AS UNSIGNED) FROM config
+    WHERE config_type = 'sync' AND config_key = 'token_day_activity_last_guide_id'), 0);
+
+-- updated_utc kept as-is: the count is bookkeeping, not a metadata change
+UPDATE tx_token tk
+JOIN (
+    SELECT token_id, COUNT(*) AS cnt
+    FROM tx_guide
+    WHERE id <= @last_guide_id AND token_id IS NOT NULL
+    GROUP BY token_id
+) g ON g.token_id = tk.id
+SET tk.guide_edge_count = g.cnt,
+    tk.updated_utc = tk.updated_utc;
+
+SELECT 'Done.' AS status;
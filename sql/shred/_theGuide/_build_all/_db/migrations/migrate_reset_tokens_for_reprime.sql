@@ -3,6 +3,8 @@
 -- 1. Nulls out parsed fields so enricher re-claims them
 -- 2. Resets attempt_cnt so they pass the max_attempts filter
 -- 3. Deletes tx_guide records so auto-prime fires on re-enrichment
+-- 4. Drops the matching tx_token_day_activity rollup rows and zeroes
+--    tx_token.guide_edge_count (the aggregator only ever adds to them)
 --
 -- Safe: token_json is preserved — enricher will re-parse from API/cache
 
@@ -37,5 +39,16 @@ JOIN tmp_reprime_tokens t ON t.token_id = g.token_id;
 
 SELECT ROW_COUNT() AS guide_records_deleted;
 
+-- Step 4: Drop the per-day rollup for those tokens (all their edges are gone)
+DELETE a FROM tx_token_day_activity a
+JOIN tmp_reprime_tokens t ON t.token_id = a.token_id;
+
+SELECT ROW_COUNT() AS day_activity_rows_deleted;
+
+UPDATE tx_token
+SET guide_edge_count = 0,
+    updated_utc = updated_utc
+WHERE id IN (SELECT token_id FROM tmp_reprime_tokens);
+
 -- Cleanup
 DROP TEMPORARY TABLE IF EXISTS tmp_reprime_tokens;
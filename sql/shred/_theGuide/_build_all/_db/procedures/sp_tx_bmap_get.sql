@@ -13,13 +13,14 @@
 --
 -- Token Resolution:
 --   1. If p_mint_address provided, use it
---   2. Else if p_token_symbol provided, use it (ranked by activity)
---   3. Else if p_token_name provided, use it (ranked by activity)
+--   2. Else if p_token_symbol provided, use it (ranked by tx_token.guide_edge_count)
+--   3. Else if p_token_name provided, use it (ranked by tx_token.guide_edge_count)
 --   4. Else if p_signature provided (only), derive token from tx_guide activity
 --
 -- Transaction Resolution:
 --   1. If p_signature provided, use that tx (p_block_time ignored)
 --   2. Else if p_block_time provided, find nearest tx to that time
+--      (two idx_token_blocktime probes: last edge <= time, first edge > time)
 --   3. Else use most recent tx
 --
 -- Usage:
@@ -86,9 +87,8 @@ BEGIN
         INTO v_token_id, v_mint_address, v_token_symbol, v_token_type, v_decimals
         FROM tx_token tk
         JOIN tx_address mint ON mint.id = tk.mint_address_id
-        LEFT JOIN (SELECT token_id, COUNT(*) AS cnt FROM tx_guide GROUP BY token_id) g ON g.token_id = tk.id
         WHERE tk.token_symbol = p_token_symbol
-        ORDER BY COALESCE(g.cnt, 0) DESC, (mint.address_type = 'mint') DESC, tk.id
+        ORDER BY tk.guide_edge_count DESC, (mint.address_type = 'mint') DESC, tk.id
         LIMIT 1;
     ELSEIF p_token_name IS NOT NULL THEN
         
@@ -96,9 +96,8 @@ BEGIN
         INTO v_token_id, v_mint_address, v_token_symbol, v_token_type, v_decimals
         FROM tx_token tk
         JOIN tx_address mint ON mint.id = tk.mint_address_id
-        LEFT JOIN (SELECT token_id, COUNT(*) AS cnt FROM tx_guide GROUP BY token_id) g ON g.token_id = tk.id
         WHERE tk.token_name = p_token_name
-        ORDER BY COALESCE(g.cnt, 0) DESC, (mint.address_type = 'mint') DESC, tk.id
+        ORDER BY tk.guide_edge_count DESC, (mint.address_type = 'mint') DESC, tk.id
         LIMIT 1;
     ELSEIF p_signature IS NOT NULL THEN
         
@@ -174,14 +173,34 @@ BEGIN
         ELSEIF p_block_time IS NOT NULL THEN
             
             
-            SELECT t.id, t.signature, t.block_time
-            INTO v_tx_id, v_signature, v_block_time
-            FROM tx_guide g
-            JOIN tx t ON t.id = g.tx_id
-            WHERE g.token_id = v_token_id
-            ORDER BY ABS(CAST(g.block_time AS SIGNED) - CAST(p_block_time AS SIGNED))
+            -- Two range probes on idx_token_blocktime instead of ORDER BY ABS(...),
+            -- which sorted every edge of the token. Each probe breaks block_time ties
+            -- on g.id (the index's implicit PK suffix); equidistant candidates go to
+            -- the earlier tx.
+            SELECT sub.tx_id INTO v_tx_id
+            FROM (
+                (SELECT g.tx_id, g.block_time, p_block_time - g.block_time AS dist
+                 FROM tx_guide g
+                 WHERE g.token_id = v_token_id AND g.block_time <= p_block_time
+                 ORDER BY g.block_time DESC, g.id DESC
+                 LIMIT 1)
+                UNION ALL
+                (SELECT g.tx_id, g.block_time, g.block_time - p_block_time AS dist
+                 FROM tx_guide g
+                 WHERE g.token_id = v_token_id AND g.block_time > p_block_time
+                 ORDER BY g.block_time ASC, g.id ASC
+                 LIMIT 1)
+            ) sub
+            ORDER BY sub.dist, sub.block_time, sub.tx_id
             LIMIT 1;
 
+            IF v_tx_id IS NOT NULL THEN
+                SELECT t.signature, t.block_time
+                INTO v_signature, v_block_time
+                FROM tx t
+                WHERE t.id = v_tx_id;
+            END IF;
+
             IF v_tx_id IS NULL THEN
                 SELECT JSON_OBJECT('result', JSON_OBJECT(
                     'error', 'No transactions found for this token',
@@ -12,6 +12,7 @@ BEGIN
     TRUNCATE TABLE tx_request_log;
     TRUNCATE TABLE tx_token_participant;
     TRUNCATE TABLE tx_guide;
+    TRUNCATE TABLE tx_token_day_activity;
     TRUNCATE TABLE tx_activity;
     TRUNCATE TABLE tx_transfer;
     TRUNCATE TABLE tx_swap;
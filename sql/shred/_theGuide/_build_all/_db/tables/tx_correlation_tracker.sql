@@ -0,0 +1,29 @@
+-- tx_correlation_tracker: In-flight pipeline completion state for theGuide gateway
+-- Written through by CorrelationTracker (GATEWAY_TRACKER_PERSIST) so a restarted
+-- gateway can resume tracking correlations that were mid-cascade.
+--
+-- Rows are deleted when a correlation completes or goes idle past GATEWAY_TRACKER_TTL_SEC.
+--
+-- Usage:
+--   SELECT t.*, b.worker, COUNT(*) AS batches
+--   FROM tx_correlation_tracker t JOIN tx_correlation_batch b USING (correlation_id)
+--   GROUP BY t.correlation_id, b.worker;
+
+DROP TABLE IF EXISTS tx_correlation_batch;
+DROP TABLE IF EXISTS tx_correlation_tracker;
+
+CREATE TABLE tx_correlation_tracker (
+    correlation_id   VARCHAR(36) NOT NULL PRIMARY KEY,
+    expected_batches INT UNSIGNED NOT NULL DEFAULT 0,
+    producer_done    TINYINT(1) NOT NULL DEFAULT 0,
+    started_utc      TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3),
+    updated_utc      TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3),
+    INDEX idx_updated_utc (updated_utc)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE tx_correlation_batch (
+    correlation_id VARCHAR(36) NOT NULL,
+    worker         VARCHAR(20) NOT NULL,
+    batch_num      INT UNSIGNED NOT NULL,
+    PRIMARY KEY (correlation_id, worker, batch_num)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
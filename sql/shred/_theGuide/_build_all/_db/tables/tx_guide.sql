@@ -44,7 +44,7 @@ CREATE TABLE `tx_guide` (
   KEY `idx_to_ata` (`to_token_account_id`),
   KEY `idx_tx` (`tx_id`),
   KEY `idx_block_time` (`block_time`),
-  KEY `idx_token` (`token_id`),
+  KEY `idx_token_blocktime` (`token_id`,`block_time`),
   KEY `idx_edge_type` (`edge_type_id`),
   KEY `idx_source` (`source_id`,`source_row_id`),
   KEY `idx_swap_direction` (`swap_direction`),
@@ -12,6 +12,7 @@ CREATE TABLE `tx_token` (
   `decimals` tinyint unsigned DEFAULT NULL,
   `supply` bigint unsigned DEFAULT NULL COMMENT 'Total supply from Solscan API',
   `token_type` enum('fungible','semi_fungible','nft','unknown') DEFAULT NULL COMMENT 'Derived: fungible (dec>=1), semi_fungible (dec=0 supply>1), nft (dec=0 supply<=1 no mint auth)',
+  `guide_edge_count` bigint unsigned NOT NULL DEFAULT '0' COMMENT 'tx_guide edges for this token (guide-aggregator days sync)',
   `created_utc` datetime NOT NULL DEFAULT (UTC_TIMESTAMP()),
   `updated_utc` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
@@ -0,0 +1,13 @@
+-- tx_token_day_activity table
+-- Per-day tx_guide edge count per token, maintained incrementally by
+-- guide-aggregator.py (--sync days, checkpoint sync/token_day_activity_last_guide_id)
+
+DROP TABLE IF EXISTS `tx_token_day_activity`;
+
+CREATE TABLE `tx_token_day_activity` (
+  `token_id` bigint NOT NULL,
+  `day` date NOT NULL COMMENT 'DATE(FROM_UNIXTIME(block_time))',
+  `edge_count` int unsigned NOT NULL DEFAULT '0',
+  PRIMARY KEY (`token_id`,`day`),
+  KEY `idx_day` (`day`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -27,6 +27,7 @@ import time
 import base64
 import struct
 import os
+import sys
 import functools
 import random
 from pathlib import Path
@@ -37,6 +38,9 @@ from datetime import datetime
 import requests
 import mysql.connector
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from t16o_exchange.guide.common.solscan_client import get_solscan_client
+
 
 # =============================================================================
 # Config Loading
@@ -169,7 +173,6 @@ DB_CONFIG = {
 # Rate limiting
 RPC_BATCH_SIZE = _CONFIG.get('RPC_BATCH_SIZE', 100)    # Max accounts per getMultipleAccounts call
 RPC_DELAY = _CONFIG.get('RPC_DELAY', 0.2)              # Seconds between RPC calls
-SOLSCAN_DELAY = _CONFIG.get('SOLSCAN_DELAY', 0.25)     # Seconds between Solscan calls (4 req/sec)
 
 # Retry settings
 RETRY_MAX_ATTEMPTS = _CONFIG.get('RETRY_MAX_ATTEMPTS', 3)
@@ -340,6 +343,8 @@ def _solscan_request(session: requests.Session, url: str, params: dict = None) -
     if not SOLSCAN_TOKEN:
         raise ValueError("SOLSCAN_TOKEN not configured. Set in guide-config.json or SOLSCAN_API_TOKEN env var.")
 
+    # Paced by the host-wide Solscan limiter shared with the queue workers
+    get_solscan_client().limiter.acquire()
     headers = {"token": SOLSCAN_TOKEN}
     response = session.get(url, headers=headers, params=params, timeout=30)
     response.raise_for_status()
@@ -607,8 +612,6 @@ def run_classification(addresses: List[str], dry_run: bool = False, enrich_pools
             if (i + 1) % 50 == 0:
                 print(f"  Verified {i + 1}/{len(low_confidence)} addresses...")
 
-            time.sleep(SOLSCAN_DELAY)
-
         print(f"  Completed Solscan verification")
 
     # ==========================================================================
@@ -635,8 +638,6 @@ def run_classification(addresses: List[str], dry_run: bool = False, enrich_pools
             if (i + 1) % 50 == 0:
                 print(f"  Checked {i + 1}/{len(still_unknown)} addresses...")
 
-            time.sleep(SOLSCAN_DELAY)
-
         print(f"  Found {pools_found} pools via data-decoded")
 
     # ==========================================================================
@@ -660,7 +661,6 @@ def run_classification(addresses: List[str], dry_run: bool = False, enrich_pools
                 decoded = solscan_get_data_decoded(solscan_session, addr)
                 pool_info = extract_pool_data(decoded) if decoded else None
                 pool_data[addr] = {'pool_info': pool_info, 'metadata': metadata}
-                time.sleep(SOLSCAN_DELAY)
 
             if metadata and metadata.get('account_label'):
                 print(f"    [{i+1}] {addr[:16]}... -> {metadata['account_label'][:40]}")
@@ -668,8 +668,6 @@ def run_classification(addresses: List[str], dry_run: bool = False, enrich_pools
             if (i + 1) % 20 == 0:
                 print(f"  Enriched {i + 1}/{len(all_pools)} pools...")
 
-            time.sleep(SOLSCAN_DELAY)
-
         print(f"  Completed pool enrichment")
 
     # ==========================================================================
@@ -8,6 +8,8 @@ Worker threads each own their own DB + RabbitMQ connections.
 Operations:
 - guide:  Process tx_activity into tx_guide via sp_tx_guide_loader
 - tokens: Sync tx_token_participant from tx_guide (buys, sells, transfers)
+- days:   Roll tx_guide up into tx_token_day_activity (token_id, day, edge_count)
+          and tx_token.guide_edge_count
 
 Config keys (config_type='queue'):
     aggregator_wrk_cnt_threads           - desired worker thread count (0 = idle)
@@ -20,11 +22,23 @@ Config keys (config_type='queue'):
     aggregator_wrk_deadlock_max_retries  - max deadlock retry attempts
     aggregator_wrk_deadlock_base_delay   - initial deadlock backoff delay
     aggregator_wrk_db_poll_sec           - supervisor DB poll interval (0 = disabled)
+    aggregator_wrk_db_poll_fallback_sec  - floor on the poll interval while the shredder publishes
+                                           work events (0 = poll every db_poll_sec)
+    aggregator_wrk_event_dispatch        - publish "new rows" events to the funder and enricher
+                                           after a sync commits new edges (0 = off)
+
+DB polls are driven by work events (common.work_events): the shredder publishes
+db-poll-sync after it commits decoded rows, and the supervisor timer is only a
+slow fallback. Concurrent polls/events coalesce into one drain per process.
+New tx_guide edges are also announced to gateways (common.bmap_cache) so their
+/api/bmap/get response caches drop the affected windows; manual --sync runs
+that load guide edges announce them too.
 
 Manual modes (run directly, not as service):
     python guide-aggregator.py --sync guide             # Only sp_tx_guide_loader
     python guide-aggregator.py --sync tokens            # Only tx_token_participant
-    python guide-aggregator.py --sync all               # Both operations
+    python guide-aggregator.py --sync days              # Only tx_token_day_activity
+    python guide-aggregator.py --sync all               # All operations
     python guide-aggregator.py --status                 # Show sync status
 """
 
@@ -40,6 +54,7 @@ import pika
 import mysql.connector
 from mysql.connector import Error as MySQLError
 from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Optional, Dict, List, Any
 
 
@@ -52,10 +67,16 @@ from t16o_exchange.guide.common.config import (
     get_db_config, get_rabbitmq_config, get_queue_names, get_retry_config,
     nack_with_retry,
 )
+from t16o_exchange.guide.common.bmap_cache import publish_bmap_invalidation
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.request_log_writer import get_request_log_writer
+from t16o_exchange.guide.common.work_events import DrainGate, WorkNotifier
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
 _rmq                = get_rabbitmq_config()
 _queues             = get_queue_names('aggregator')
 _enricher_queues    = get_queue_names('enricher')
+_funder_queues      = get_queue_names('funder')
 _retry              = get_retry_config()
 
 RABBITMQ_HOST       = _rmq['host']
@@ -71,11 +92,19 @@ RESPONSE_QUEUE      = _queues['response']
 DLQ_QUEUE           = _queues['dlq']
 ENRICHER_REQUEST_QUEUE = _enricher_queues['request']
 ENRICHER_DLQ_QUEUE     = _enricher_queues['dlq']
+FUNDER_REQUEST_QUEUE   = _funder_queues['request']
+FUNDER_DLQ_QUEUE       = _funder_queues['dlq']
 DB_CONFIG           = get_db_config()
+METRICS             = get_worker_metrics('aggregator')
+REQUEST_LOG         = get_request_log_writer(log_fn=lambda msg: log('RLOG', msg))
 
 # Config table keys
 CONFIG_TYPE_SYNC = 'sync'
 TOKEN_PARTICIPANT_KEY = 'token_participant_last_guide_id'
+TOKEN_DAY_ACTIVITY_KEY = 'token_day_activity_last_guide_id'
+
+# One db-poll drain at a time per process, however many events/polls arrive
+DRAIN_GATE = DrainGate()
 
 
 # =============================================================================
@@ -87,39 +116,11 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
@@ -148,6 +149,10 @@ def rmq_connect():
                      arguments={'x-max-priority': 10,
                                 'x-dead-letter-exchange': '',
                                 'x-dead-letter-routing-key': ENRICHER_DLQ_QUEUE})
+    ch.queue_declare(queue=FUNDER_REQUEST_QUEUE, durable=True,
+                     arguments={'x-max-priority': 10,
+                                'x-dead-letter-exchange': '',
+                                'x-dead-letter-routing-key': FUNDER_DLQ_QUEUE})
     return conn, ch
 
 
@@ -155,53 +160,26 @@ def rmq_connect():
 # Request logging
 # =============================================================================
 
-def log_worker_request(cursor, conn, request_id, correlation_id,
-                       priority, api_key_id):
-    if api_key_id is not None:
-        cursor.execute(
-            "SELECT id FROM tx_request_log "
-            "WHERE request_id=%s AND target_worker='aggregator' AND api_key_id=%s",
-            (request_id, api_key_id))
-    else:
-        cursor.execute(
-            "SELECT id FROM tx_request_log "
-            "WHERE request_id=%s AND target_worker='aggregator' AND api_key_id IS NULL",
-            (request_id,))
-    row = cursor.fetchone()
-    if row:
-        return row['id']
+def log_worker_request(request_id, correlation_id, priority, api_key_id):
+    """Queue this worker's tx_request_log row; REQUEST_LOG writes it off the hot connection."""
+    return REQUEST_LOG.log_request(
+        request_id, 'aggregator', api_key_id,
+        correlation_id=correlation_id, source='queue', action='sync',
+        priority=priority, status='processing', payload_summary={'source': 'queue'})
 
-    cursor.execute(
-        "INSERT INTO tx_request_log "
-        "(request_id, correlation_id, api_key_id, source, target_worker, "
-        " action, priority, status, payload_summary) "
-        "VALUES (%s,%s,%s,'queue','aggregator','sync',%s,'processing',%s)",
-        (request_id, correlation_id, api_key_id, priority,
-         json.dumps({'source': 'queue'})))
-    conn.commit()
-    return cursor.lastrowid
 
+def update_worker_request(log_ref, status, result=None):
+    REQUEST_LOG.log_status(log_ref, status, result)
 
-def update_worker_request(cursor, conn, log_id, status, result=None):
-    cursor.execute(
-        "UPDATE tx_request_log SET status=%s, result_summary=%s, completed_at=NOW() WHERE id=%s",
-        (status, json.dumps(result) if result else None, log_id))
-    conn.commit()
 
-
-def log_daemon_request(cursor, conn, action, total_processed):
+def log_daemon_request(action, total_processed):
     request_id = f"daemon-aggregator-{uuid.uuid4().hex[:12]}"
-    cursor.execute(
-        "INSERT INTO tx_request_log "
-        "(request_id, correlation_id, api_key_id, source, target_worker, "
-        " action, priority, status, payload_summary) "
-        "VALUES (%s,%s,NULL,'daemon','aggregator',%s,5,'processing',%s)",
-        (request_id, request_id, action,
-         json.dumps({'total_processed': total_processed})))
-    conn.commit()
-    log_id = cursor.lastrowid
-    log('DAEMON', f"request_log id={log_id}")
-    return log_id
+    log('DAEMON', f"request_log request_id={request_id}")
+    return REQUEST_LOG.log_request(
+        request_id, 'aggregator', None,
+        correlation_id=request_id, source='daemon', action=action,
+        priority=5, status='processing',
+        payload_summary={'total_processed': total_processed})
 
 
 # =============================================================================
@@ -213,6 +191,7 @@ def run_guide_loader_batch(tag, cursor, conn, batch_size, max_retries, base_dela
     Returns (guide_count, last_tx_id)."""
     for attempt in range(max_retries):
         try:
+            t0 = time.perf_counter()
             cursor.execute("SET @rows = 0, @last = 0")
             cursor.execute("CALL sp_tx_guide_loader(%s, @rows, @last)", (batch_size,))
             try:
@@ -223,6 +202,7 @@ def run_guide_loader_batch(tag, cursor, conn, batch_size, max_retries, base_dela
             cursor.execute("SELECT @rows AS r, @last AS l")
             result = cursor.fetchone()
             conn.commit()
+            METRICS.record('sp', time.perf_counter() - t0)
             return (result['r'] or 0, result['l'] or 0)
         except mysql.connector.Error as err:
             if err.errno in (1213, 1205) and attempt < max_retries - 1:
@@ -289,7 +269,7 @@ def get_last_processed_id(cursor, config_key):
     return int(row['config_value']) if row else 0
 
 
-def set_last_processed_id(cursor, conn, config_key, last_id):
+def set_last_processed_id(cursor, conn, config_key, last_id, commit=True):
     cursor.execute("""
         INSERT INTO config (config_type, config_key, config_value, value_type, description)
         VALUES (%s, %s, %s, 'int', %s)
@@ -297,7 +277,8 @@ def set_last_processed_id(cursor, conn, config_key, last_id):
             config_value = VALUES(config_value),
             updated_utc = CURRENT_TIMESTAMP
     """, (CONFIG_TYPE_SYNC, config_key, str(last_id), f'Last processed tx_guide.id for {config_key}'))
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def get_max_guide_id(cursor):
@@ -306,115 +287,255 @@ def get_max_guide_id(cursor):
     return row['mx'] if row and row['mx'] else 0
 
 
+def invalidate_bmap_cache(tag, cursor, rmq_channel, from_id, to_id):
+    """Tell gateways which (token, block_time range) windows gained edges."""
+    try:
+        cursor.execute("""
+            SELECT token_id, MIN(block_time) AS min_bt, MAX(block_time) AS max_bt
+            FROM tx_guide
+            WHERE id > %s AND id <= %s
+              AND token_id IS NOT NULL AND block_time IS NOT NULL
+            GROUP BY token_id
+        """, (from_id, to_id))
+        ranges = [(r['token_id'], r['min_bt'], r['max_bt']) for r in cursor.fetchall()]
+        if ranges:
+            publish_bmap_invalidation(rmq_channel, ranges)
+            log(tag, f"[guide] bmap cache invalidation: {len(ranges):,} tokens")
+    except Exception as e:
+        # Gateways fall back to TTL expiry; never fail the sync over this
+        log(tag, f"[guide] bmap cache invalidation failed: {e}")
+
+
+# Edge types that feed tx_token_participant
+PARTICIPANT_TYPE_CODES = ('swap_in', 'swap_out', 'spl_transfer')
+PARTICIPANT_ADDRESS_TYPES = ('wallet', 'unknown')
+
+# tx_guide_type.id -> type_code (static lookup table, loaded once per process)
+_participant_edge_types: Dict[int, str] = {}
+
+
+def get_participant_edge_types(cursor) -> Dict[int, str]:
+    global _participant_edge_types
+    if not _participant_edge_types:
+        placeholders = ','.join(['%s'] * len(PARTICIPANT_TYPE_CODES))
+        cursor.execute(
+            f"SELECT id, type_code FROM tx_guide_type WHERE type_code IN ({placeholders})",
+            PARTICIPANT_TYPE_CODES)
+        _participant_edge_types = {row['id']: row['type_code'] for row in cursor.fetchall()}
+    return _participant_edge_types
+
+
+def _ui_amount(row) -> Decimal:
+    amount = row['amount']
+    if amount is None:
+        return Decimal(0)
+    decimals = row['decimals'] if row['decimals'] is not None else 9
+    return Decimal(amount).scaleb(-decimals)
+
+
+def aggregate_participant_deltas(rows, edge_types):
+    """
+    Fold one tx_guide id range into per-(token_id, address_id) deltas.
+
+    swap_in credits the receiver as a buy, swap_out debits the sender as a sell,
+    spl_transfer counts a transfer in for the receiver and out for the sender.
+    Only wallet/unknown addresses participate.
+
+    Returns {(token_id, address_id): [first_seen, last_seen, buy_count, buy_volume,
+                                      sell_count, sell_volume, xfer_in, xfer_out]}
+    """
+    deltas = {}
+
+    def bump(token_id, address_id, block_time):
+        d = deltas.get((token_id, address_id))
+        if d is None:
+            d = deltas[(token_id, address_id)] = [block_time, block_time, 0, Decimal(0), 0, Decimal(0), 0, 0]
+        elif block_time is not None:
+            if d[0] is None or block_time < d[0]:
+                d[0] = block_time
+            if d[1] is None or block_time > d[1]:
+                d[1] = block_time
+        return d
+
+    for row in rows:
+        type_code = edge_types.get(row['edge_type_id'])
+        token_id = row['token_id']
+        block_time = row['block_time']
+        to_ok = row['to_type'] in PARTICIPANT_ADDRESS_TYPES
+        from_ok = row['from_type'] in PARTICIPANT_ADDRESS_TYPES
+
+        if type_code == 'swap_in':
+            if to_ok:
+                d = bump(token_id, row['to_address_id'], block_time)
+                d[2] += 1
+                d[3] += _ui_amount(row)
+        elif type_code == 'swap_out':
+            if from_ok:
+                d = bump(token_id, row['from_address_id'], block_time)
+                d[4] += 1
+                d[5] += _ui_amount(row)
+        elif type_code == 'spl_transfer':
+            if to_ok:
+                bump(token_id, row['to_address_id'], block_time)[6] += 1
+            if from_ok:
+                bump(token_id, row['from_address_id'], block_time)[7] += 1
+
+    return deltas
+
+
 def sync_token_participants(tag, cursor, conn, last_id, max_id, batch_size,
                             max_retries, base_delay):
-    """Sync new records to tx_token_participant. Returns rows affected."""
+    """
+    Sync new tx_guide records to tx_token_participant. Returns rows affected.
+
+    Each id range is read once, folded into buy/sell/transfer deltas in memory
+    and upserted with a single statement. The upsert and the checkpoint commit
+    together, so an interrupted run resumes after the last applied range.
+    """
     if last_id >= max_id:
         return 0
 
-    total_rows = 0
-    current_id = last_id
+    edge_types = get_participant_edge_types(cursor)
+    if not edge_types:
+        log(tag, "[tokens] No participant edge types in tx_guide_type")
+        return 0
 
-    query_buys = """
-        INSERT INTO tx_token_participant (
-            token_id, address_id, first_seen, last_seen,
-            buy_count, buy_volume, net_position
-        )
-        SELECT g.token_id, g.to_address_id,
-               MIN(g.block_time), MAX(g.block_time),
-               COUNT(*),
-               SUM(g.amount / POW(10, COALESCE(g.decimals, 9))),
-               SUM(g.amount / POW(10, COALESCE(g.decimals, 9)))
+    type_placeholders = ','.join(['%s'] * len(edge_types))
+    query_range = f"""
+        SELECT g.token_id, g.from_address_id, g.to_address_id, g.edge_type_id,
+               g.amount, g.decimals, g.block_time,
+               fa.address_type AS from_type, ta.address_type AS to_type
         FROM tx_guide g
-        JOIN tx_address a ON a.id = g.to_address_id
-        JOIN tx_guide_type gt ON gt.id = g.edge_type_id
+        LEFT JOIN tx_address fa ON fa.id = g.from_address_id
+        LEFT JOIN tx_address ta ON ta.id = g.to_address_id
         WHERE g.id > %s AND g.id <= %s
-          AND gt.type_code = 'swap_in'
           AND g.token_id IS NOT NULL
-          AND a.address_type IN ('wallet', 'unknown')
-        GROUP BY g.token_id, g.to_address_id
-        ON DUPLICATE KEY UPDATE
-            first_seen = LEAST(first_seen, VALUES(first_seen)),
-            last_seen = GREATEST(last_seen, VALUES(last_seen)),
-            buy_count = buy_count + VALUES(buy_count),
-            buy_volume = buy_volume + VALUES(buy_volume),
-            net_position = net_position + VALUES(buy_volume)
+          AND g.edge_type_id IN ({type_placeholders})
     """
+    type_ids = tuple(edge_types)
 
-    query_sells = """
+    upsert_head = """
         INSERT INTO tx_token_participant (
             token_id, address_id, first_seen, last_seen,
-            sell_count, sell_volume, net_position
-        )
-        SELECT g.token_id, g.from_address_id,
-               MIN(g.block_time), MAX(g.block_time),
-               COUNT(*),
-               SUM(g.amount / POW(10, COALESCE(g.decimals, 9))),
-               -SUM(g.amount / POW(10, COALESCE(g.decimals, 9)))
-        FROM tx_guide g
-        JOIN tx_address a ON a.id = g.from_address_id
-        JOIN tx_guide_type gt ON gt.id = g.edge_type_id
-        WHERE g.id > %s AND g.id <= %s
-          AND gt.type_code = 'swap_out'
-          AND g.token_id IS NOT NULL
-          AND a.address_type IN ('wallet', 'unknown')
-        GROUP BY g.token_id, g.from_address_id
+            buy_count, buy_volume, sell_count, sell_volume,
+            transfer_in_count, transfer_out_count, net_position
+        ) VALUES
+    """
+    upsert_tail = """
         ON DUPLICATE KEY UPDATE
             first_seen = LEAST(first_seen, VALUES(first_seen)),
             last_seen = GREATEST(last_seen, VALUES(last_seen)),
+            buy_count = buy_count + VALUES(buy_count),
+            buy_volume = buy_volume + VALUES(buy_volume),
             sell_count = sell_count + VALUES(sell_count),
             sell_volume = sell_volume + VALUES(sell_volume),
-            net_position = net_position - VALUES(sell_volume)
+            transfer_in_count = transfer_in_count + VALUES(transfer_in_count),
+            transfer_out_count = transfer_out_count + VALUES(transfer_out_count),
+            net_position = net_position + VALUES(net_position)
     """
 
-    query_xfer_in = """
-        INSERT INTO tx_token_participant (
-            token_id, address_id, first_seen, last_seen, transfer_in_count
-        )
-        SELECT g.token_id, g.to_address_id,
-               MIN(g.block_time), MAX(g.block_time), COUNT(*)
-        FROM tx_guide g
-        JOIN tx_address a ON a.id = g.to_address_id
-        JOIN tx_guide_type gt ON gt.id = g.edge_type_id
-        WHERE g.id > %s AND g.id <= %s
-          AND gt.type_code = 'spl_transfer'
-          AND g.token_id IS NOT NULL
-          AND a.address_type IN ('wallet', 'unknown')
-        GROUP BY g.token_id, g.to_address_id
-        ON DUPLICATE KEY UPDATE
-            first_seen = LEAST(first_seen, VALUES(first_seen)),
-            last_seen = GREATEST(last_seen, VALUES(last_seen)),
-            transfer_in_count = transfer_in_count + VALUES(transfer_in_count)
+    total_rows = 0
+    current_id = last_id
+
+    while current_id < max_id:
+        batch_end = min(current_id + batch_size, max_id)
+
+        cursor.execute(query_range, (current_id, batch_end) + type_ids)
+        deltas = aggregate_participant_deltas(cursor.fetchall(), edge_types)
+
+        # Sorted keys keep row-lock order consistent across concurrent syncs
+        params = []
+        for (token_id, address_id) in sorted(deltas):
+            first, last, buys, buy_vol, sells, sell_vol, xin, xout = deltas[(token_id, address_id)]
+            params.extend((token_id, address_id, first, last,
+                           buys, buy_vol, sells, sell_vol, xin, xout, buy_vol - sell_vol))
+
+        for attempt in range(max_retries):
+            try:
+                affected = 0
+                if deltas:
+                    values = ','.join(['(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'] * len(deltas))
+                    cursor.execute(upsert_head + values + upsert_tail, params)
+                    affected = cursor.rowcount
+                set_last_processed_id(cursor, conn, TOKEN_PARTICIPANT_KEY, batch_end, commit=False)
+                conn.commit()
+                total_rows += affected
+                break
+            except mysql.connector.Error as e:
+                conn.rollback()
+                if e.errno in (1213, 1205) and attempt < max_retries - 1:
+                    delay = base_delay * (2 ** attempt) + random.uniform(0, 0.1)
+                    log(tag, f"Deadlock (attempt {attempt + 1}/{max_retries}), retrying in {delay:.2f}s...")
+                    time.sleep(delay)
+                else:
+                    raise
+
+        current_id = batch_end
+
+    return total_rows
+
+
+def sync_token_day_activity(tag, cursor, conn, last_id, max_id, batch_size,
+                            max_retries, base_delay):
     """
+    Roll new tx_guide records up into tx_token_day_activity and
+    tx_token.guide_edge_count (sp_tx_bmap_get symbol/name ranking). Returns
+    rows affected.
 
-    query_xfer_out = """
-        INSERT INTO tx_token_participant (
-            token_id, address_id, first_seen, last_seen, transfer_out_count
-        )
-        SELECT g.token_id, g.from_address_id,
-               MIN(g.block_time), MAX(g.block_time), COUNT(*)
+    One grouped upsert per id range; the range's checkpoint commits with it.
+    """
+    if last_id >= max_id:
+        return 0
+
+    query = """
+        INSERT INTO tx_token_day_activity (token_id, day, edge_count)
+        SELECT g.token_id, DATE(FROM_UNIXTIME(g.block_time)), COUNT(*)
         FROM tx_guide g
-        JOIN tx_address a ON a.id = g.from_address_id
-        JOIN tx_guide_type gt ON gt.id = g.edge_type_id
         WHERE g.id > %s AND g.id <= %s
-          AND gt.type_code = 'spl_transfer'
           AND g.token_id IS NOT NULL
-          AND a.address_type IN ('wallet', 'unknown')
-        GROUP BY g.token_id, g.from_address_id
+          AND g.block_time IS NOT NULL
+        GROUP BY g.token_id, DATE(FROM_UNIXTIME(g.block_time))
         ON DUPLICATE KEY UPDATE
-            first_seen = LEAST(first_seen, VALUES(first_seen)),
-            last_seen = GREATEST(last_seen, VALUES(last_seen)),
-            transfer_out_count = transfer_out_count + VALUES(transfer_out_count)
+            edge_count = edge_count + VALUES(edge_count)
     """
 
+    # updated_utc kept as-is: the count is bookkeeping, not a metadata change
+    count_query = """
+        UPDATE tx_token tk
+        JOIN (
+            SELECT g.token_id, COUNT(*) AS cnt
+            FROM tx_guide g
+            WHERE g.id > %s AND g.id <= %s
+              AND g.token_id IS NOT NULL
+            GROUP BY g.token_id
+        ) n ON n.token_id = tk.id
+        SET tk.guide_edge_count = tk.guide_edge_count + n.cnt,
+            tk.updated_utc = tk.updated_utc
+    """
+
+    total_rows = 0
+    current_id = last_id
+
     while current_id < max_id:
         batch_end = min(current_id + batch_size, max_id)
-        params = (current_id, batch_end)
 
-        total_rows += execute_with_deadlock_retry(tag, cursor, conn, query_buys, params, max_retries, base_delay)
-        total_rows += execute_with_deadlock_retry(tag, cursor, conn, query_sells, params, max_retries, base_delay)
-        total_rows += execute_with_deadlock_retry(tag, cursor, conn, query_xfer_in, params, max_retries, base_delay)
-        total_rows += execute_with_deadlock_retry(tag, cursor, conn, query_xfer_out, params, max_retries, base_delay)
+        for attempt in range(max_retries):
+            try:
+                cursor.execute(query, (current_id, batch_end))
+                affected = cursor.rowcount
+                cursor.execute(count_query, (current_id, batch_end))
+                set_last_processed_id(cursor, conn, TOKEN_DAY_ACTIVITY_KEY, batch_end, commit=False)
+                conn.commit()
+                total_rows += affected
+                break
+            except mysql.connector.Error as e:
+                conn.rollback()
+                if e.errno in (1213, 1205) and attempt < max_retries - 1:
+                    delay = base_delay * (2 ** attempt) + random.uniform(0, 0.1)
+                    log(tag, f"Deadlock (attempt {attempt + 1}/{max_retries}), retrying in {delay:.2f}s...")
+                    time.sleep(delay)
+                else:
+                    raise
 
         current_id = batch_end
 
@@ -471,9 +592,12 @@ def run_sync(tag, cursor, conn, operations, batch_size, max_retries, base_delay,
     stats = {
         'guide': {'batches': 0, 'edges': 0, 'pending': 0},
         'tokens': {'last_id': 0, 'new_id': 0, 'rows': 0},
+        'days': {'last_id': 0, 'new_id': 0, 'rows': 0},
         'pool_backfill': 0,
     }
 
+    guide_id_before = get_max_guide_id(cursor) if rmq_channel is not None else 0
+
     if 'guide' in operations:
         cursor.execute("SELECT COUNT(*) AS cnt FROM tx WHERE tx_state & 32 = 0 AND tx_state & 4 != 0 AND tx_state & 16 != 0")
         row = cursor.fetchone()
@@ -490,6 +614,9 @@ def run_sync(tag, cursor, conn, operations, batch_size, max_retries, base_delay,
 
     max_id = get_max_guide_id(cursor)
 
+    if rmq_channel is not None and max_id > guide_id_before:
+        invalidate_bmap_cache(tag, cursor, rmq_channel, guide_id_before, max_id)
+
     if 'tokens' in operations:
         last_id = get_last_processed_id(cursor, TOKEN_PARTICIPANT_KEY)
         stats['tokens']['last_id'] = last_id
@@ -505,6 +632,20 @@ def run_sync(tag, cursor, conn, operations, batch_size, max_retries, base_delay,
         else:
             log(tag, f"[tokens] Up to date (id={last_id:,})")
 
+    if 'days' in operations:
+        last_id = get_last_processed_id(cursor, TOKEN_DAY_ACTIVITY_KEY)
+        stats['days']['last_id'] = last_id
+
+        if last_id < max_id:
+            log(tag, f"[days] Rolling up {last_id:,} -> {max_id:,} ({max_id - last_id:,} records)")
+            rows = sync_token_day_activity(tag, cursor, conn, last_id, max_id,
+                                           batch_size, max_retries, base_delay)
+            stats['days']['new_id'] = max_id
+            stats['days']['rows'] = rows
+            log(tag, f"[days] {rows:,} rows affected")
+        else:
+            log(tag, f"[days] Up to date (id={last_id:,})")
+
     # Backfill pool labels that enricher has populated since guide_loader ran
     stats['pool_backfill'] = backfill_pool_labels(tag, cursor, conn)
 
@@ -520,6 +661,7 @@ def get_sync_status(cursor):
     cursor.execute("SELECT COUNT(*) AS cnt FROM tx WHERE tx_state & 32 = 0 AND tx_state & 4 != 0 AND tx_state & 16 != 0")
     pending = cursor.fetchone()['cnt']
     tokens_last = get_last_processed_id(cursor, TOKEN_PARTICIPANT_KEY)
+    days_last = get_last_processed_id(cursor, TOKEN_DAY_ACTIVITY_KEY)
 
     cursor.execute("""
         SELECT COUNT(*) AS cnt FROM tx_guide
@@ -535,6 +677,10 @@ def get_sync_status(cursor):
             'last_synced': tokens_last,
             'behind': max_id - tokens_last,
         },
+        'days': {
+            'last_synced': days_last,
+            'behind': max_id - days_last,
+        },
         'pool_labels_missing': pool_missing,
     }
 
@@ -546,7 +692,7 @@ def get_sync_status(cursor):
 class WorkerThread(threading.Thread):
     def __init__(self, worker_id, prefetch, stop_event,
                  poll_idle_sec, reconnect_sec, batch_size,
-                 deadlock_max_retries, deadlock_base_delay):
+                 deadlock_max_retries, deadlock_base_delay, event_dispatch=True):
         super().__init__(daemon=True)
         self.tag = f"W-{worker_id}"
         self.worker_id = worker_id
@@ -557,6 +703,8 @@ class WorkerThread(threading.Thread):
         self.batch_size = batch_size
         self.deadlock_max_retries = deadlock_max_retries
         self.deadlock_base_delay = deadlock_base_delay
+        self.event_dispatch = event_dispatch
+        self.notifier = None
 
     def run(self):
         log(self.tag, f"Starting (prefetch={self.prefetch})")
@@ -572,16 +720,21 @@ class WorkerThread(threading.Thread):
 
                 rmq_conn, ch = rmq_connect()
                 ch.basic_qos(prefetch_count=self.prefetch)
+                # Pending counts are per channel; a reconnect starts fresh
+                self.notifier = WorkNotifier('aggregator') if self.event_dispatch else None
                 log(self.tag, "RabbitMQ connected, consuming...")
 
                 while not self.stop_event.is_set():
                     method, properties, body = ch.basic_get(queue=REQUEST_QUEUE, auto_ack=False)
                     if method is None:
+                        if self.notifier:
+                            self.notifier.flush(ch)
                         time.sleep(self.poll_idle_sec)
                         rmq_conn.process_data_events(time_limit=0)
                         continue
 
-                    self._handle_message(ch, method, properties, body, cursor, db_conn)
+                    with METRICS.message(body, properties):
+                        self._handle_message(ch, method, properties, body, cursor, db_conn)
 
                 try:
                     rmq_conn.close()
@@ -618,35 +771,38 @@ class WorkerThread(threading.Thread):
             priority       = msg.get('priority', 5)
             batch          = msg.get('batch', {})
 
-            # ── DB poll: supervisor-scheduled sync pass ──
+            # ── DB poll: shredder work event or supervisor fallback timer ──
             if action == 'db-poll-sync':
-                self._handle_db_poll(ch, method, cursor, db_conn)
+                self._handle_db_poll(ch, method, cursor, db_conn, msg.get('ts'))
                 return
 
             # ── Normal queue message: gateway request ──
-            operations = batch.get('operations', ['guide', 'tokens'])
+            operations = batch.get('operations', ['guide', 'tokens', 'days'])
             if isinstance(operations, str):
                 operations = [op.strip() for op in operations.split(',')]
 
             log(self.tag, f"Request {request_id[:8]} (action={action}, ops={operations})")
 
             worker_log_id = log_worker_request(
-                cursor, db_conn, request_id, correlation_id, priority, api_key_id)
+                request_id, correlation_id, priority, api_key_id)
 
             stats = run_sync(self.tag, cursor, db_conn, operations,
                              self.batch_size, self.deadlock_max_retries,
                              self.deadlock_base_delay, self.stop_event,
                              rmq_channel=ch)
 
+            self._notify_downstream(ch, stats['guide']['edges'])
+
             total = stats['guide']['edges'] + stats['tokens']['rows']
             result = {
                 'processed': total,
                 'guide_edges': stats['guide']['edges'],
                 'token_rows': stats['tokens']['rows'],
+                'day_rows': stats['days']['rows'],
                 'pool_backfill': stats['pool_backfill'],
             }
 
-            update_worker_request(cursor, db_conn, worker_log_id, 'completed', result)
+            update_worker_request(worker_log_id, 'completed', result)
 
             self._publish_response(ch, request_id, correlation_id, 'completed', result)
             ch.basic_ack(delivery_tag=method.delivery_tag)
@@ -658,52 +814,63 @@ class WorkerThread(threading.Thread):
             raise
         except Exception as e:
             log(self.tag, f"ERROR processing message -> DLQ: {e}")
+            METRICS.incr('dlq')
             import traceback
             traceback.print_exc()
-            if worker_log_id:
-                try:
-                    update_worker_request(cursor, db_conn, worker_log_id, 'failed', {'error': str(e)})
-                except Exception:
-                    pass
+            update_worker_request(worker_log_id, 'failed', {'error': str(e)})
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
-    def _handle_db_poll(self, ch, method, cursor, db_conn):
-        """Handle supervisor-scheduled DB poll — loops until no more work."""
+    def _handle_db_poll(self, ch, method, cursor, db_conn, event_ts=None):
+        """Handle a work event / fallback DB poll — loops until no more work."""
+        if not DRAIN_GATE.begin(event_ts):
+            # Stale event, or another thread is draining and will go around again
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
         total_edges = 0
         total_token_rows = 0
         pass_num = 0
 
-        while not self.stop_event.is_set():
-            stats = run_sync(self.tag, cursor, db_conn, ['guide', 'tokens'],
-                             self.batch_size, self.deadlock_max_retries,
-                             self.deadlock_base_delay, self.stop_event,
-                             rmq_channel=ch)
-
-            edges = stats['guide']['edges']
-            token_rows = stats['tokens']['rows']
-            total_edges += edges
-            total_token_rows += token_rows
-            pass_num += 1
-
-            if edges == 0 and token_rows == 0:
-                break
-
-            log(self.tag, f"  pass {pass_num}: {edges} edges, {token_rows} token rows")
+        try:
+            while not self.stop_event.is_set():
+                stats = run_sync(self.tag, cursor, db_conn, ['guide', 'tokens', 'days'],
+                                 self.batch_size, self.deadlock_max_retries,
+                                 self.deadlock_base_delay, self.stop_event,
+                                 rmq_channel=ch)
+
+                edges = stats['guide']['edges']
+                token_rows = stats['tokens']['rows']
+                total_edges += edges
+                total_token_rows += token_rows
+                pass_num += 1
+                self._notify_downstream(ch, edges)
+
+                if edges == 0 and token_rows == 0:
+                    if not DRAIN_GATE.finish():
+                        break
+                    continue
+
+                log(self.tag, f"  pass {pass_num}: {edges} edges, {token_rows} token rows")
+        finally:
+            DRAIN_GATE.release()
 
         if total_edges > 0 or total_token_rows > 0:
             log(self.tag, f"DB poll complete: {total_edges} edges, {total_token_rows} token rows ({pass_num} passes)")
-            try:
-                dl_id = log_daemon_request(cursor, db_conn, 'db-poll-sync', total_edges + total_token_rows)
-                update_worker_request(cursor, db_conn, dl_id, 'completed', {
-                    'passes': pass_num,
-                    'guide_edges': total_edges,
-                    'token_rows': total_token_rows,
-                })
-            except Exception as e:
-                log(self.tag, f"Failed to log request: {e}")
+            dl_id = log_daemon_request('db-poll-sync', total_edges + total_token_rows)
+            update_worker_request(dl_id, 'completed', {
+                'passes': pass_num,
+                'guide_edges': total_edges,
+                'token_rows': total_token_rows,
+            })
 
         ch.basic_ack(delivery_tag=method.delivery_tag)
 
+    def _notify_downstream(self, ch, edges):
+        """New tx_guide edges bring new addresses (funder) and tokens/pools (enricher)."""
+        if self.notifier and edges > 0:
+            self.notifier.notify(ch, FUNDER_REQUEST_QUEUE, 'sync-db-missing', edges)
+            self.notifier.notify(ch, ENRICHER_REQUEST_QUEUE, 'db-poll-enrich', edges)
+
     def _publish_response(self, ch, request_id, correlation_id, status, result):
         body = json.dumps({
             'request_id':     request_id,
@@ -759,6 +926,8 @@ def read_config(cursor):
         'deadlock_max':     get_config_int(cursor, 'queue', 'aggregator_wrk_deadlock_max_retries', 5),
         'deadlock_delay':   get_config_float(cursor, 'queue', 'aggregator_wrk_deadlock_base_delay', 0.1),
         'db_poll':          get_config_float(cursor, 'queue', 'aggregator_wrk_db_poll_sec', 0),
+        'db_poll_fallback': get_config_float(cursor, 'queue', 'aggregator_wrk_db_poll_fallback_sec', 300.0),
+        'event_dispatch':   get_config_int(cursor, 'queue', 'aggregator_wrk_event_dispatch', 1) > 0,
     }
 
 
@@ -771,6 +940,9 @@ def run_supervisor():
 """, flush=True)
 
     workers = {}
+    start_exporter(METRICS)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
@@ -831,6 +1003,8 @@ def run_supervisor():
                 time.sleep(DB_FALLBACK_RETRY_SEC)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -849,7 +1023,7 @@ def run_supervisor():
                 w = WorkerThread(
                     next_id, cfg['prefetch'], stop_evt,
                     cfg['poll_idle'], cfg['reconnect'], cfg['batch_size'],
-                    cfg['deadlock_max'], cfg['deadlock_delay'])
+                    cfg['deadlock_max'], cfg['deadlock_delay'], cfg['event_dispatch'])
                 w.start()
                 workers[next_id] = (w, stop_evt)
                 next_id += 1
@@ -861,9 +1035,10 @@ def run_supervisor():
                 log('SVR', f'Stopping W-{wid}...')
                 stop_evt.set()
 
-            # DB poll scheduler
+            # DB poll fallback (shredder work events trigger the real-time drains)
             now = time.time()
-            if cfg['db_poll'] > 0 and active > 0 and (now - last_db_poll) >= cfg['db_poll']:
+            db_poll_sec = max(cfg['db_poll'], cfg['db_poll_fallback'])
+            if cfg['db_poll'] > 0 and active > 0 and (now - last_db_poll) >= db_poll_sec:
                 if ensure_svr_rmq():
                     try:
                         publish_db_poll()
@@ -886,6 +1061,9 @@ def run_supervisor():
         if w.is_alive():
             log('SVR', f'W-{wid} did not stop in time')
 
+    # Write buffered request-log rows before exiting
+    REQUEST_LOG.close()
+
     if svr_rmq_conn:
         try:
             svr_rmq_conn.close()
@@ -908,6 +1086,7 @@ def run_manual(args):
     """Run sync manually (single run)."""
     conn = db_connect()
     cursor = conn.cursor(dictionary=True)
+    rmq_conn = rmq_ch = None
 
     try:
         if args.status:
@@ -918,23 +1097,32 @@ def run_manual(args):
             print(f"  tx_guide max id:          {status['max_guide_id']:,}")
             print(f"  Pending activities:       {status['pending_activities']:,}")
             print(f"  Token participant synced: {status['tokens']['last_synced']:,} (behind: {status['tokens']['behind']:,})")
+            print(f"  Token day activity synced:{status['days']['last_synced']:,} (behind: {status['days']['behind']:,})")
             print(f"  Pool labels missing:      {status['pool_labels_missing']:,}")
             print(f"{'='*60}")
             return 0
 
         if args.sync.lower() == 'all':
-            operations = ['guide', 'tokens']
+            operations = ['guide', 'tokens', 'days']
         else:
             operations = [op.strip().lower() for op in args.sync.split(',')]
-            valid_ops = {'guide', 'tokens'}
+            valid_ops = {'guide', 'tokens', 'days'}
             invalid = set(operations) - valid_ops
             if invalid:
-                print(f"Error: Invalid operations: {invalid}. Valid: guide, tokens, all")
+                print(f"Error: Invalid operations: {invalid}. Valid: guide, tokens, days, all")
                 return 1
 
         log('MANUAL', f"Operations: {', '.join(operations)}, batch_size={args.batch_size}")
 
-        stats = run_sync('MANUAL', cursor, conn, operations, args.batch_size, 5, 0.1)
+        # New edges must reach running gateways' bmap caches here too
+        if 'guide' in operations:
+            try:
+                rmq_conn, rmq_ch = rmq_connect()
+            except Exception as e:
+                log('MANUAL', f"RabbitMQ unavailable, bmap cache invalidation skipped: {e}")
+
+        stats = run_sync('MANUAL', cursor, conn, operations, args.batch_size, 5, 0.1,
+                         rmq_channel=rmq_ch)
 
         total = stats['guide']['edges'] + stats['tokens']['rows']
         print(f"\n{'='*60}")
@@ -943,11 +1131,17 @@ def run_manual(args):
         print(f"  Pool backfill:     {stats['pool_backfill']:,}")
         print(f"  Guide edges:       {stats['guide']['edges']:,}")
         print(f"  Token participant: {stats['tokens']['rows']:,}")
+        print(f"  Token day rollup:  {stats['days']['rows']:,}")
         print(f"  Total:             {total:,}")
         print(f"{'='*60}")
 
     finally:
         conn.close()
+        if rmq_conn is not None:
+            try:
+                rmq_conn.close()
+            except Exception:
+                pass
 
     return 0
 
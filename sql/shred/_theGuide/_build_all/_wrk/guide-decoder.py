@@ -7,12 +7,23 @@ Worker threads each own their own DB + RabbitMQ connections.
 
 Config keys (config_type='queue'):
     decoder_wrk_cnt_threads        - desired worker thread count (0 = idle)
+    decoder_wrk_autoscale          - 1 = autoscale threads between min/max from queue
+                                     depth, message latency and Solscan 429 rate
+    decoder_wrk_cnt_threads_min    - autoscale lower bound
+    decoder_wrk_cnt_threads_max    - autoscale upper bound
     decoder_wrk_cnt_prefetch       - RabbitMQ prefetch per worker channel
     decoder_wrk_supervisor_poll_sec - supervisor config poll interval
     decoder_wrk_poll_idle_sec      - worker sleep when no message available
     decoder_wrk_reconnect_sec      - delay before reconnecting after errors
     decoder_wrk_shutdown_timeout_sec - max wait for worker thread on shutdown
     decoder_wrk_api_timeout_sec    - Solscan API request timeout
+    decoder_wrk_pipeline           - 1 = pipelined (fetch overlaps sp_tx_parse_decode),
+                                     0 = sequential, one batch at a time
+    decoder_wrk_cnt_api_inflight   - pipelined mode: concurrent Solscan requests per worker
+                                     (unacked messages are still capped by prefetch)
+
+Each worker logs per-stage latency histograms (filter/fetch/queue/sp/total)
+and decoded tx/s every STATS_LOG_INTERVAL_SEC.
 
 Usage:
     python guide-decoder.py
@@ -22,9 +33,11 @@ Usage:
 import argparse
 import json
 import os
+import queue
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import pika
 import mysql.connector
@@ -37,19 +50,22 @@ from datetime import datetime, timezone
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
-    get_db_config, get_rabbitmq_config, get_solscan_config,
+    get_db_config, get_rabbitmq_config,
     get_staging_config, get_queue_names, get_retry_config,
     nack_with_retry,
 )
+from t16o_exchange.guide.common.autoscaler import ThreadAutoscaler
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.request_log_writer import get_request_log_writer
+from t16o_exchange.guide.common.solscan_client import get_solscan_client
+from t16o_exchange.guide.common.stage_timings import StageTimings
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
-_solscan            = get_solscan_config()
 _rmq                = get_rabbitmq_config()
 _queues             = get_queue_names('decoder')
 _retry              = get_retry_config()
 _staging            = get_staging_config()
 
-SOLSCAN_API_BASE    = _solscan['api_base']
-SOLSCAN_API_TOKEN   = _solscan['token']
 RABBITMQ_HOST       = _rmq['host']
 RABBITMQ_PORT       = _rmq['port']
 RABBITMQ_USER       = _rmq['user']
@@ -62,6 +78,8 @@ REQUEST_QUEUE       = _queues['request']
 RESPONSE_QUEUE      = _queues['response']
 DLQ_QUEUE           = _queues['dlq']
 DB_CONFIG           = get_db_config()
+METRICS             = get_worker_metrics('decoder')
+REQUEST_LOG         = get_request_log_writer(log_fn=lambda msg: log('RLOG', msg))
 STAGING_SCHEMA      = _staging['schema']
 STAGING_TABLE       = _staging['table']
 
@@ -74,39 +92,11 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
@@ -138,54 +128,25 @@ def rmq_connect():
 # Request logging (billing)
 # =============================================================================
 
-def log_worker_request(cursor, conn, request_id, correlation_id,
-                       batch_num, batch_size, priority, api_key_id, features):
-    if api_key_id is not None:
-        cursor.execute(
-            "SELECT id FROM tx_request_log "
-            "WHERE request_id=%s AND target_worker='decoder' AND api_key_id=%s",
-            (request_id, api_key_id))
-    else:
-        cursor.execute(
-            "SELECT id FROM tx_request_log "
-            "WHERE request_id=%s AND target_worker='decoder' AND api_key_id IS NULL",
-            (request_id,))
-    row = cursor.fetchone()
-    if row:
-        return row[0]
+def log_worker_request(request_id, correlation_id, batch_num, batch_size,
+                       priority, api_key_id, features):
+    """Queue this worker's tx_request_log row; REQUEST_LOG writes it off the hot connection."""
+    return REQUEST_LOG.log_request(
+        request_id, 'decoder', api_key_id,
+        correlation_id=correlation_id, source='queue', action='decode',
+        priority=priority, features=features, status='processing',
+        payload_summary={'batch_num': batch_num, 'batch_size': batch_size, 'source': 'queue'})
 
-    cursor.execute(
-        "INSERT INTO tx_request_log "
-        "(request_id, correlation_id, api_key_id, source, target_worker, "
-        " action, priority, features, status, payload_summary) "
-        "VALUES (%s,%s,%s,'queue','decoder','decode',%s,%s,'processing',%s)",
-        (request_id, correlation_id, api_key_id, priority, features,
-         json.dumps({'batch_num': batch_num, 'batch_size': batch_size, 'source': 'queue'})))
-    conn.commit()
-    return cursor.lastrowid
 
-
-def update_worker_request(cursor, conn, log_id, status, result=None):
-    cursor.execute(
-        "UPDATE tx_request_log SET status=%s, result_summary=%s, completed_at=NOW() WHERE id=%s",
-        (status, json.dumps(result) if result else None, log_id))
-    conn.commit()
+def update_worker_request(log_ref, status, result=None):
+    REQUEST_LOG.log_status(log_ref, status, result)
 
 # =============================================================================
 # Solscan API
 # =============================================================================
 
-def solscan_session():
-    s = requests.Session()
-    s.headers['token'] = SOLSCAN_API_TOKEN
-    return s
-
-
-def fetch_decoded_batch(session, signatures, api_timeout):
-    params = '&'.join(f'tx[]={sig}' for sig in signatures)
-    r = session.get(f"{SOLSCAN_API_BASE}/transaction/actions/multi?{params}", timeout=api_timeout)
-    r.raise_for_status()
-    return r.json()
+def fetch_decoded_batch(client, signatures, api_timeout):
+    return client.transaction_actions_multi(signatures, timeout=api_timeout)
 
 # =============================================================================
 # Core processing
@@ -214,12 +175,11 @@ def get_tx_state_decoded(cursor):
     return row[0] if row else 8
 
 
-def process_signatures(tag, cursor, conn, session, signatures,
-                       priority, correlation_id, sig_hash, request_log_id,
-                       tx_origin, dry_run, api_timeout):
+def prepare_signatures(tag, cursor, signatures, dry_run):
+    """Filter stage: drop already-decoded signatures. Returns (result, new_sigs)."""
     result = {'processed': 0, 'skipped': 0, 'staging_id': None, 'tx_count': 0, 'error': None}
     if not signatures:
-        return result
+        return result, []
 
     new_sigs, existing_sigs = filter_existing_signatures(cursor, signatures)
     result['skipped'] = len(existing_sigs)
@@ -227,21 +187,16 @@ def process_signatures(tag, cursor, conn, session, signatures,
         log(tag, f"Skipped {result['skipped']}/{len(signatures)} already in tx table")
     if not new_sigs:
         log(tag, "No new signatures to decode")
-        return result
+        return result, []
     if dry_run:
         log(tag, f"[DRY] Would decode {len(new_sigs)} signatures")
         result['processed'] = len(new_sigs)
-        return result
+        return result, []
+    return result, new_sigs
 
-    # Fetch from Solscan
-    t0 = time.time()
-    try:
-        decoded = fetch_decoded_batch(session, new_sigs, api_timeout)
-    except requests.RequestException as e:
-        result['error'] = f'Solscan API error: {e}'
-        return result
-    fetch_time = time.time() - t0
 
+def apply_decoded(tag, cursor, conn, result, decoded, new_sigs, request_log_id, tx_origin):
+    """DB stage: run sp_tx_parse_decode on a fetched batch and fill in result."""
     if not decoded.get('success') or not decoded.get('data'):
         result['error'] = 'Solscan API returned no data'
         return result
@@ -260,7 +215,6 @@ def process_signatures(tag, cursor, conn, session, signatures,
 
     # Call SP directly — bypass staging table entirely
     txs_json = json.dumps(decoded)
-    t1 = time.time()
     cursor.execute("SET @tx=0, @xfer=0, @swap=0, @act=0, @skip=0")
     cursor.execute(
         "CALL sp_tx_parse_decode(%s, %s, %s, @tx, @xfer, @swap, @act, @skip)",
@@ -274,7 +228,6 @@ def process_signatures(tag, cursor, conn, session, signatures,
     cursor.execute("SELECT @tx, @xfer, @swap, @act, @skip")
     sp_row = cursor.fetchone()
     conn.commit()
-    sp_time = time.time() - t1
 
     sp_tx    = sp_row[0] or 0 if sp_row else 0
     sp_xfer  = sp_row[1] or 0 if sp_row else 0
@@ -285,16 +238,104 @@ def process_signatures(tag, cursor, conn, session, signatures,
     result['processed'] = len(actual_sigs)
     result['tx_count'] = sp_tx
     log(tag, f"Decoded {len(actual_sigs)} txs: tx={sp_tx} xfer={sp_xfer} swap={sp_swap} "
-            f"act={sp_act} skip={sp_skip} (fetch={fetch_time:.2f}s, sp={sp_time:.3f}s)")
+            f"act={sp_act} skip={sp_skip}")
     return result
 
+
+def process_signatures(tag, cursor, conn, client, signatures,
+                       priority, correlation_id, sig_hash, request_log_id,
+                       tx_origin, dry_run, api_timeout, timings):
+    """Sequential mode: filter -> fetch -> sp for one batch on the calling thread."""
+    t0 = time.perf_counter()
+    result, new_sigs = prepare_signatures(tag, cursor, signatures, dry_run)
+    timings.record('filter', time.perf_counter() - t0)
+    if not new_sigs:
+        return result
+
+    # Fetch from Solscan
+    t0 = time.perf_counter()
+    try:
+        decoded = fetch_decoded_batch(client, new_sigs, api_timeout)
+    except requests.RequestException as e:
+        result['error'] = f'Solscan API error: {e}'
+        return result
+    finally:
+        timings.record('fetch', time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    apply_decoded(tag, cursor, conn, result, decoded, new_sigs, request_log_id, tx_origin)
+    timings.record('sp', time.perf_counter() - t0)
+    return result
+
+
+class FetchPipeline:
+    """
+    Fetch stage for pipelined mode: up to `concurrency` Solscan requests run on
+    a small thread pool (sharing the process-wide SolscanClient) and finished
+    batches land in a bounded queue that the worker thread (DB stage) drains.
+    Fetchers block on a full queue, so a slow DB applies backpressure.
+    """
+
+    def __init__(self, tag, concurrency, api_timeout, timings, depth=None):
+        self.tag = tag
+        self.api_timeout = api_timeout
+        self.timings = timings
+        self.inflight = 0  # owned by the worker thread
+        self.client = get_solscan_client()
+        self._results = queue.Queue(maxsize=max(1, depth or concurrency))
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency),
+                                        thread_name_prefix=f"{tag}-fetch")
+
+    def _fetch(self, job):
+        t0 = time.perf_counter()
+        try:
+            job['decoded'] = fetch_decoded_batch(self.client, job['new_sigs'], self.api_timeout)
+        except Exception as e:
+            job['result']['error'] = f'Solscan API error: {e}'
+        self.timings.record('fetch', time.perf_counter() - t0)
+        job['queued_at'] = time.perf_counter()
+        self._results.put(job)
+
+    def submit(self, job):
+        self.inflight += 1
+        self._pool.submit(self._fetch, job)
+
+    def drain(self, timeout):
+        """Return finished jobs, waiting up to timeout for the first one."""
+        if not self.inflight:
+            return []
+        done = []
+        try:
+            done.append(self._results.get(timeout=timeout))
+            while True:
+                done.append(self._results.get_nowait())
+        except queue.Empty:
+            pass
+        self.inflight -= len(done)
+        now = time.perf_counter()
+        for job in done:
+            self.timings.record('queue', now - job['queued_at'])
+        return done
+
+    def close(self):
+        """Stop fetching and return the jobs still in flight (their deliveries are unacked)."""
+        pending = []
+        while self.inflight:
+            pending.extend(self.drain(timeout=0.5))
+        self._pool.shutdown(wait=True)
+        return pending
+
 # =============================================================================
 # Worker thread
 # =============================================================================
 
+# How often each worker logs (and resets) its stage histograms
+STATS_LOG_INTERVAL_SEC = 60
+
 class WorkerThread(threading.Thread):
     def __init__(self, worker_id, prefetch, dry_run, stop_event,
-                 poll_idle_sec, reconnect_sec, api_timeout_sec):
+                 poll_idle_sec, reconnect_sec, api_timeout_sec,
+                 pipeline, api_inflight):
         super().__init__(daemon=True)
         self.tag = f"W-{worker_id}"
         self.worker_id = worker_id
@@ -304,14 +345,23 @@ class WorkerThread(threading.Thread):
         self.poll_idle_sec = poll_idle_sec
         self.reconnect_sec = reconnect_sec
         self.api_timeout_sec = api_timeout_sec
+        self.pipeline = pipeline
+        self.api_inflight = max(1, api_inflight)
+        self.timings = StageTimings(['filter', 'fetch', 'queue', 'sp', 'total'],
+                                    parent=METRICS.timings)
+        self._stats_started = time.time()
+        self._stats_tx = 0
 
     def run(self):
-        log(self.tag, f"Starting (prefetch={self.prefetch})")
-        session = solscan_session()
+        mode = f"pipelined, api_inflight={self.api_inflight}" if self.pipeline else "sequential"
+        log(self.tag, f"Starting (prefetch={self.prefetch}, {mode})")
+        client = get_solscan_client()
         db_conn = None
         cursor = None
 
         while not self.stop_event.is_set():
+            fetcher = None
+            rmq_conn = ch = None
             try:
                 # Connect DB
                 if db_conn is None:
@@ -324,21 +374,23 @@ class WorkerThread(threading.Thread):
                 ch.basic_qos(prefetch_count=self.prefetch)
                 log(self.tag, "RabbitMQ connected, consuming...")
 
-                # Consume one message at a time so we can check stop_event between messages
-                while not self.stop_event.is_set():
-                    method, properties, body = ch.basic_get(queue=REQUEST_QUEUE, auto_ack=False)
-                    if method is None:
-                        time.sleep(self.poll_idle_sec)
-                        rmq_conn.process_data_events(time_limit=0)
-                        continue
-
-                    self._handle_message(ch, method, properties, body, cursor, db_conn, session)
-
-                # Clean exit
-                try:
-                    rmq_conn.close()
-                except Exception:
-                    pass
+                if self.pipeline:
+                    fetcher = FetchPipeline(self.tag, self.api_inflight,
+                                            self.api_timeout_sec, self.timings)
+                    self._consume_pipelined(rmq_conn, ch, cursor, db_conn, fetcher)
+                else:
+                    # Consume one message at a time so we can check stop_event between messages
+                    while not self.stop_event.is_set():
+                        method, properties, body = ch.basic_get(queue=REQUEST_QUEUE, auto_ack=False)
+                        if method is None:
+                            time.sleep(self.poll_idle_sec)
+                            rmq_conn.process_data_events(time_limit=0)
+                            self._maybe_log_stats()
+                            continue
+
+                        with METRICS.message(body, properties):
+                            self._handle_message(ch, method, properties, body, cursor, db_conn, client)
+                        self._maybe_log_stats()
 
             except MySQLError as e:
                 log(self.tag, f"MySQL error: {e}, reconnecting in {self.reconnect_sec}s...")
@@ -351,6 +403,20 @@ class WorkerThread(threading.Thread):
             except Exception as e:
                 log(self.tag, f"Unexpected error: {e}, retrying in {self.reconnect_sec}s...")
                 time.sleep(self.reconnect_sec)
+            finally:
+                # Hand unfinished batches straight back to the queue, then drop the
+                # connection so anything we couldn't nack is redelivered too
+                if fetcher is not None:
+                    for job in fetcher.close():
+                        try:
+                            ch.basic_nack(delivery_tag=job['method'].delivery_tag, requeue=True)
+                        except Exception:
+                            break
+                if rmq_conn is not None:
+                    try:
+                        rmq_conn.close()
+                    except Exception:
+                        pass
 
         # Cleanup
         if db_conn:
@@ -358,11 +424,177 @@ class WorkerThread(threading.Thread):
                 db_conn.close()
             except Exception:
                 pass
-        session.close()
         log(self.tag, "Stopped")
 
-    def _handle_message(self, ch, method, properties, body, cursor, db_conn, session):
+    def _maybe_log_stats(self, force=False):
+        elapsed = time.time() - self._stats_started
+        if not force and elapsed < STATS_LOG_INTERVAL_SEC:
+            return
+        if self._stats_tx or force:
+            rate = self._stats_tx / elapsed if elapsed > 0 else 0.0
+            log(self.tag, f"{self._stats_tx} txs in {elapsed:.0f}s ({rate:.1f} tx/s) | "
+                          f"{self.timings.summary()}")
+        self.timings.reset()
+        self._stats_started = time.time()
+        self._stats_tx = 0
+
+    def _consume_pipelined(self, rmq_conn, ch, cursor, db_conn, fetcher):
+        """
+        Pipelined mode: this thread runs the filter + DB stages and owns the
+        channel (acks); FetchPipeline overlaps up to api_inflight Solscan
+        requests with sp_tx_parse_decode. At most `prefetch` messages are
+        unacked at any time.
+        """
+        while not self.stop_event.is_set():
+            pulled = 0
+            while fetcher.inflight < self.prefetch:
+                method, properties, body = ch.basic_get(queue=REQUEST_QUEUE, auto_ack=False)
+                if method is None:
+                    break
+                pulled += 1
+                METRICS.received(body, properties)
+                job = self._start_job(ch, method, properties, body, cursor, db_conn)
+                if job is None:
+                    continue
+                if job['new_sigs']:
+                    fetcher.submit(job)
+                    continue
+                try:
+                    self._finish_job(ch, job, cursor, db_conn)
+                except MySQLError:
+                    self._requeue(ch, job)
+                    METRICS.handled(time.perf_counter() - job['started_at'], error=True)
+                    raise
+
+            done = fetcher.drain(timeout=self.poll_idle_sec)
+            for idx, job in enumerate(done):
+                try:
+                    self._finish_job(ch, job, cursor, db_conn)
+                except MySQLError:
+                    for j in done[idx:]:
+                        self._requeue(ch, j)
+                        METRICS.handled(time.perf_counter() - j['started_at'], error=True)
+                    raise
+
+            if not pulled and not done:
+                if not fetcher.inflight:
+                    time.sleep(self.poll_idle_sec)
+                rmq_conn.process_data_events(time_limit=0)
+            self._maybe_log_stats()
+
+    def _requeue(self, ch, job):
+        nack_with_retry(ch, job['method'].delivery_tag, job['properties'],
+                        log_fn=lambda msg: log(self.tag, f"[DB ERROR] {msg}"),
+                        queue_name=REQUEST_QUEUE, body=job['body'])
+
+    def _start_job(self, ch, method, properties, body, cursor, db_conn):
+        """Parse, billing-log and filter one delivery. Returns a job, or None if already settled."""
         worker_log_id = None
+        started_at = time.perf_counter()
+        try:
+            msg = json.loads(body.decode('utf-8'))
+            request_id     = msg.get('request_id', 'unknown')
+            correlation_id = msg.get('correlation_id', request_id)
+            sig_hash       = msg.get('sig_hash')
+            batch_data     = msg.get('batch', {})
+            signatures     = batch_data.get('signatures', [])
+            batch_num      = batch_data.get('batch_num', 0)
+
+            log(self.tag, f"Request {request_id[:8]} "
+                f"(corr={correlation_id[:8]}, sig_hash={sig_hash[:8] if sig_hash else 'N/A'}, "
+                f"sigs={len(signatures)}, batch={batch_num})")
+
+            # Billing log
+            worker_log_id = log_worker_request(
+                request_id, correlation_id,
+                batch_num, len(signatures), msg.get('priority', 5),
+                msg.get('api_key_id'), msg.get('features', 0))
+
+            job = {
+                'method': method, 'properties': properties, 'body': body,
+                'request_id': request_id, 'correlation_id': correlation_id,
+                'request_log_id': msg.get('request_log_id'),
+                'tx_origin': msg.get('tx_origin', 0),
+                'worker_log_id': worker_log_id, 'batch_num': batch_num,
+                'signatures': signatures, 'new_sigs': [], 'decoded': None,
+                'started_at': started_at,
+            }
+            if not signatures:
+                job['result'] = {'processed': 0, 'message': 'No signatures provided'}
+                return job
+
+            t0 = time.perf_counter()
+            job['result'], job['new_sigs'] = prepare_signatures(
+                self.tag, cursor, signatures, self.dry_run)
+            self.timings.record('filter', time.perf_counter() - t0)
+            return job
+
+        except MySQLError:
+            nack_with_retry(ch, method.delivery_tag, properties,
+                            log_fn=lambda msg: log(self.tag, f"[DB ERROR] {msg}"),
+                            queue_name=REQUEST_QUEUE, body=body)
+            METRICS.handled(time.perf_counter() - started_at, error=True)
+            raise
+        except Exception as e:
+            self._fail_to_dlq(ch, method, cursor, db_conn, worker_log_id, e)
+            METRICS.handled(time.perf_counter() - started_at, error=True)
+            return None
+
+    def _finish_job(self, ch, job, cursor, db_conn):
+        """
+        DB stage: parse fetched actions (if any), update billing log, respond, ack.
+        Records the message's 'handle' time (basic_get -> ack/nack) on METRICS,
+        as METRICS.message() does in sequential mode.
+        """
+        try:
+            result = job['result']
+            if 'message' in result:
+                status, resp = 'completed', result
+            else:
+                if job['decoded'] is not None and not result.get('error'):
+                    t0 = time.perf_counter()
+                    apply_decoded(self.tag, cursor, db_conn, result, job['decoded'],
+                                  job['new_sigs'], job['request_log_id'], job['tx_origin'])
+                    self.timings.record('sp', time.perf_counter() - t0)
+                status, resp = self._response_for(result)
+
+            update_worker_request(job['worker_log_id'], status, resp)
+            self._publish_response(ch, job['request_id'], job['correlation_id'],
+                                   status, resp, job['batch_num'])
+            ch.basic_ack(delivery_tag=job['method'].delivery_tag)
+            elapsed = time.perf_counter() - job['started_at']
+            self.timings.record('total', elapsed)
+            METRICS.handled(elapsed)
+            self._stats_tx += result.get('tx_count', 0) if status == 'completed' else 0
+
+        except MySQLError:
+            raise
+        except Exception as e:
+            self._fail_to_dlq(ch, job['method'], cursor, db_conn, job['worker_log_id'], e)
+            METRICS.handled(time.perf_counter() - job['started_at'], error=True)
+
+    @staticmethod
+    def _response_for(result):
+        if result.get('error'):
+            return 'failed', {'processed': 0, 'error': result['error']}
+        if result['processed'] == 0:
+            return 'completed', {'processed': 0, 'skipped': result['skipped'], 'already_exist': True}
+        return 'completed', {
+            'processed':  result['processed'],
+            'tx_count':   result['tx_count'],
+            'skipped':    result['skipped'],
+        }
+
+    def _fail_to_dlq(self, ch, method, cursor, db_conn, worker_log_id, e):
+        log(self.tag, f"ERROR processing message -> DLQ: {e}")
+        METRICS.incr('dlq')
+        update_worker_request(worker_log_id, 'failed', {'error': str(e)})
+        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+
+    def _handle_message(self, ch, method, properties, body, cursor, db_conn, client):
+        """Sequential mode: one delivery end-to-end."""
+        worker_log_id = None
+        started_at = time.perf_counter()
         try:
             msg = json.loads(body.decode('utf-8'))
             request_id     = msg.get('request_id', 'unknown')
@@ -383,38 +615,28 @@ class WorkerThread(threading.Thread):
 
             # Billing log
             worker_log_id = log_worker_request(
-                cursor, db_conn, request_id, correlation_id,
+                request_id, correlation_id,
                 batch_num, len(signatures), priority, api_key_id, features)
 
             if not signatures:
                 resp = {'processed': 0, 'message': 'No signatures provided'}
-                update_worker_request(cursor, db_conn, worker_log_id, 'completed', resp)
+                update_worker_request(worker_log_id, 'completed', resp)
                 self._publish_response(ch, request_id, correlation_id, 'completed', resp, batch_num)
                 ch.basic_ack(delivery_tag=method.delivery_tag)
                 return
 
             result = process_signatures(
-                self.tag, cursor, db_conn, session, signatures,
+                self.tag, cursor, db_conn, client, signatures,
                 priority, correlation_id, sig_hash, request_log_id,
-                tx_origin, self.dry_run, self.api_timeout_sec)
-
-            if result.get('error'):
-                status = 'failed'
-                resp = {'processed': 0, 'error': result['error']}
-            elif result['processed'] == 0:
-                status = 'completed'
-                resp = {'processed': 0, 'skipped': result['skipped'], 'already_exist': True}
-            else:
-                status = 'completed'
-                resp = {
-                    'processed':  result['processed'],
-                    'tx_count':   result['tx_count'],
-                    'skipped':    result['skipped'],
-                }
-
-            update_worker_request(cursor, db_conn, worker_log_id, status, resp)
+                tx_origin, self.dry_run, self.api_timeout_sec, self.timings)
+
+            status, resp = self._response_for(result)
+
+            update_worker_request(worker_log_id, status, resp)
             self._publish_response(ch, request_id, correlation_id, status, resp, batch_num)
             ch.basic_ack(delivery_tag=method.delivery_tag)
+            self.timings.record('total', time.perf_counter() - started_at)
+            self._stats_tx += result.get('tx_count', 0) if status == 'completed' else 0
 
         except MySQLError:
             nack_with_retry(ch, method.delivery_tag, properties,
@@ -422,13 +644,7 @@ class WorkerThread(threading.Thread):
                             queue_name=REQUEST_QUEUE, body=body)
             raise  # bubble up so outer loop reconnects DB
         except Exception as e:
-            log(self.tag, f"ERROR processing message -> DLQ: {e}")
-            if worker_log_id:
-                try:
-                    update_worker_request(cursor, db_conn, worker_log_id, 'failed', {'error': str(e)})
-                except Exception:
-                    pass
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            self._fail_to_dlq(ch, method, cursor, db_conn, worker_log_id, e)
 
     def _publish_response(self, ch, request_id, correlation_id, status, result, batch_num):
         result['batch_num'] = batch_num
@@ -452,12 +668,17 @@ class WorkerThread(threading.Thread):
 def read_config(cursor):
     return {
         'threads':          get_config_int(cursor, 'queue', 'decoder_wrk_cnt_threads', 0),
+        'autoscale':        get_config_int(cursor, 'queue', 'decoder_wrk_autoscale', 0),
+        'threads_min':      get_config_int(cursor, 'queue', 'decoder_wrk_cnt_threads_min', 1),
+        'threads_max':      get_config_int(cursor, 'queue', 'decoder_wrk_cnt_threads_max', 8),
         'prefetch':         get_config_int(cursor, 'queue', 'decoder_wrk_cnt_prefetch', 5),
         'supervisor_poll':  get_config_float(cursor, 'queue', 'decoder_wrk_supervisor_poll_sec', 5.0),
         'poll_idle':        get_config_float(cursor, 'queue', 'decoder_wrk_poll_idle_sec', 0.25),
         'reconnect':        get_config_float(cursor, 'queue', 'decoder_wrk_reconnect_sec', 5.0),
         'shutdown_timeout': get_config_float(cursor, 'queue', 'decoder_wrk_shutdown_timeout_sec', 10.0),
         'api_timeout':      get_config_float(cursor, 'queue', 'decoder_wrk_api_timeout_sec', 30.0),
+        'pipeline':         get_config_int(cursor, 'queue', 'decoder_wrk_pipeline', 1),
+        'api_inflight':     get_config_int(cursor, 'queue', 'decoder_wrk_cnt_api_inflight', 4),
     }
 
 
@@ -470,9 +691,17 @@ def run_supervisor(dry_run=False):
 """, flush=True)
 
     workers = {}       # worker_id -> (WorkerThread, stop_event)
+    start_exporter(METRICS)
+    get_solscan_client().set_observer(METRICS.record)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
+    autoscaler = ThreadAutoscaler('decoder', METRICS, get_solscan_client(),
+                                  log_fn=lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
+    svr_rmq_conn = None
+    svr_rmq_ch = None
 
     def ensure_svr_db():
         nonlocal svr_conn, svr_cursor
@@ -492,12 +721,41 @@ def run_supervisor(dry_run=False):
             log('SVR', f'DB connect failed: {e}')
             return False
 
+    def ensure_svr_rmq():
+        nonlocal svr_rmq_conn, svr_rmq_ch
+        try:
+            if svr_rmq_conn is not None and svr_rmq_conn.is_open:
+                return True
+        except Exception:
+            svr_rmq_conn = None
+        try:
+            svr_rmq_conn, svr_rmq_ch = rmq_connect()
+            log('SVR', 'RabbitMQ connected (queue depth)')
+            return True
+        except Exception as e:
+            log('SVR', f'RabbitMQ connect failed: {e}')
+            return False
+
+    def queue_depth():
+        """Request queue backlog for the autoscaler (None when RabbitMQ is down)."""
+        nonlocal svr_rmq_conn
+        if not ensure_svr_rmq():
+            return None
+        try:
+            return svr_rmq_ch.queue_declare(queue=REQUEST_QUEUE, passive=True).method.message_count
+        except Exception as e:
+            log('SVR', f'Queue depth check failed: {e}')
+            svr_rmq_conn = None
+            return None
+
     try:
         while True:
             if not ensure_svr_db():
                 time.sleep(DB_FALLBACK_RETRY_SEC)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -508,21 +766,28 @@ def run_supervisor(dry_run=False):
 
             active = len(workers)
 
-            if active != cfg['threads']:
-                log('SVR', f"Config: threads={cfg['threads']} prefetch={cfg['prefetch']} | active={active}")
+            target = cfg['threads']
+            if cfg['autoscale']:
+                target = autoscaler.decide(active, queue_depth(),
+                                           cfg['threads_min'], cfg['threads_max'])
+
+            if active != target:
+                log('SVR', f"Config: threads={target} prefetch={cfg['prefetch']} "
+                           f"pipeline={cfg['pipeline']} inflight={cfg['api_inflight']} | active={active}")
 
             # Scale up
-            while len(workers) < cfg['threads']:
+            while len(workers) < target:
                 stop_evt = threading.Event()
                 w = WorkerThread(
                     next_id, cfg['prefetch'], dry_run, stop_evt,
-                    cfg['poll_idle'], cfg['reconnect'], cfg['api_timeout'])
+                    cfg['poll_idle'], cfg['reconnect'], cfg['api_timeout'],
+                    bool(cfg['pipeline']), cfg['api_inflight'])
                 w.start()
                 workers[next_id] = (w, stop_evt)
                 next_id += 1
 
             # Scale down (stop newest first)
-            while len(workers) > cfg['threads']:
+            while len(workers) > target:
                 wid = max(workers.keys())
                 wthread, stop_evt = workers.pop(wid)
                 log('SVR', f'Stopping W-{wid}...')
@@ -546,6 +811,14 @@ def run_supervisor(dry_run=False):
         if w.is_alive():
             log('SVR', f'W-{wid} did not stop in time')
 
+    # Write buffered request-log rows before exiting
+    REQUEST_LOG.close()
+
+    if svr_rmq_conn:
+        try:
+            svr_rmq_conn.close()
+        except Exception:
+            pass
     if svr_conn:
         try:
             svr_conn.close()
@@ -7,7 +7,13 @@ Worker threads each own their own DB + RabbitMQ + aiohttp connections.
 
 Config keys (config_type='queue'):
     detailer_wrk_cnt_threads          - desired worker thread count (0 = idle)
-    detailer_wrk_cnt_prefetch         - RabbitMQ prefetch per worker channel
+    detailer_wrk_autoscale            - 1 = autoscale threads between min/max from queue
+                                        depth, message latency and Solscan 429 rate
+    detailer_wrk_cnt_threads_min      - autoscale lower bound
+    detailer_wrk_cnt_threads_max      - autoscale upper bound
+    detailer_wrk_cnt_prefetch         - RabbitMQ prefetch per worker channel (also max
+                                        messages pulled and fetched together)
+    detailer_wrk_cnt_api_inflight     - max concurrent Solscan requests per worker thread
     detailer_wrk_supervisor_poll_sec  - supervisor config poll interval
     detailer_wrk_poll_idle_sec        - worker sleep when no message available
     detailer_wrk_reconnect_sec        - delay before reconnecting after errors
@@ -39,19 +45,23 @@ from datetime import datetime, timezone
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
-    get_db_config, get_rabbitmq_config, get_solscan_config,
+    get_db_config, get_rabbitmq_config,
     get_staging_config, get_queue_names, get_retry_config,
     nack_with_retry,
 )
+from t16o_exchange.guide.common.autoscaler import ThreadAutoscaler
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.request_log_writer import get_request_log_writer
+from t16o_exchange.guide.common.solscan_client import (
+    RETRY_STATUSES, backoff_delay, get_solscan_client, retry_after_seconds,
+)
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
-_solscan            = get_solscan_config()
 _rmq                = get_rabbitmq_config()
 _queues             = get_queue_names('detailer')
 _retry              = get_retry_config()
 _staging            = get_staging_config()
 
-SOLSCAN_API_BASE    = _solscan['api_base']
-SOLSCAN_API_TOKEN   = _solscan['token']
 RABBITMQ_HOST       = _rmq['host']
 RABBITMQ_PORT       = _rmq['port']
 RABBITMQ_USER       = _rmq['user']
@@ -64,6 +74,8 @@ REQUEST_QUEUE       = _queues['request']
 RESPONSE_QUEUE      = _queues['response']
 DLQ_QUEUE           = _queues['dlq']
 DB_CONFIG           = get_db_config()
+METRICS             = get_worker_metrics('detailer')
+REQUEST_LOG         = get_request_log_writer(log_fn=lambda msg: log('RLOG', msg))
 STAGING_SCHEMA      = _staging['schema']
 STAGING_TABLE       = _staging['table']
 
@@ -76,39 +88,11 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
@@ -139,38 +123,18 @@ def rmq_connect():
 # Request logging (billing)
 # =============================================================================
 
-def log_worker_request(cursor, conn, request_id, correlation_id,
-                       batch_num, batch_size, priority, api_key_id, features):
-    if api_key_id is not None:
-        cursor.execute(
-            "SELECT id FROM tx_request_log "
-            "WHERE request_id=%s AND target_worker='detailer' AND api_key_id=%s",
-            (request_id, api_key_id))
-    else:
-        cursor.execute(
-            "SELECT id FROM tx_request_log "
-            "WHERE request_id=%s AND target_worker='detailer' AND api_key_id IS NULL",
-            (request_id,))
-    row = cursor.fetchone()
-    if row:
-        return row[0]
+def log_worker_request(request_id, correlation_id, batch_num, batch_size,
+                       priority, api_key_id, features):
+    """Queue this worker's tx_request_log row; REQUEST_LOG writes it off the hot connection."""
+    return REQUEST_LOG.log_request(
+        request_id, 'detailer', api_key_id,
+        correlation_id=correlation_id, source='queue', action='detail',
+        priority=priority, features=features, status='processing',
+        payload_summary={'batch_num': batch_num, 'batch_size': batch_size, 'source': 'queue'})
 
-    cursor.execute(
-        "INSERT INTO tx_request_log "
-        "(request_id, correlation_id, api_key_id, source, target_worker, "
-        " action, priority, features, status, payload_summary) "
-        "VALUES (%s,%s,%s,'queue','detailer','detail',%s,%s,'processing',%s)",
-        (request_id, correlation_id, api_key_id, priority, features,
-         json.dumps({'batch_num': batch_num, 'batch_size': batch_size, 'source': 'queue'})))
-    conn.commit()
-    return cursor.lastrowid
 
-
-def update_worker_request(cursor, conn, log_id, status, result=None):
-    cursor.execute(
-        "UPDATE tx_request_log SET status=%s, result_summary=%s, completed_at=NOW() WHERE id=%s",
-        (status, json.dumps(result) if result else None, log_id))
-    conn.commit()
+def update_worker_request(log_ref, status, result=None):
+    REQUEST_LOG.log_status(log_ref, status, result)
 
 # =============================================================================
 # Solscan API (async)
@@ -189,24 +153,27 @@ def sanitize_large_ints(obj):
 
 
 async def fetch_detail(session, signatures, api_timeout, max_retries):
+    # aiohttp path, but paced by the shared Solscan rate limiter
+    client = get_solscan_client()
     params = '&'.join(f'tx[]={sig}' for sig in signatures)
-    url = f"{SOLSCAN_API_BASE}/transaction/detail/multi?{params}"
+    url = f"{client.url('/transaction/detail/multi')}?{params}"
     timeout = aiohttp.ClientTimeout(total=api_timeout)
 
     for attempt in range(max_retries):
+        await client.limiter.acquire_async()
         try:
             async with session.get(url, timeout=timeout) as response:
-                if response.status in (502, 503, 504):
+                client.count_response(response.status)
+                if response.status in RETRY_STATUSES:
                     if attempt < max_retries - 1:
-                        wait = (attempt + 1) * 5
-                        await asyncio.sleep(wait)
+                        retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                        await asyncio.sleep(backoff_delay(attempt, retry_after, base=5))
                         continue
                 response.raise_for_status()
                 return await response.json()
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             if attempt < max_retries - 1:
-                wait = (attempt + 1) * 5
-                await asyncio.sleep(wait)
+                await asyncio.sleep(backoff_delay(attempt, base=5))
             else:
                 raise
     raise Exception(f"Failed after {max_retries} retries")
@@ -223,35 +190,27 @@ def get_tx_state_detailed(cursor):
     return row[0] if row else 16
 
 
-async def process_signatures(tag, cursor, conn, session, signatures,
-                             priority, correlation_id, sig_hash, request_log_id,
-                             dry_run, api_timeout, max_retries):
-    result = {'processed': 0, 'skipped': 0, 'staging_id': None, 'tx_count': 0, 'error': None}
-    if not signatures:
-        return result
-    if dry_run:
-        log(tag, f"[DRY] Would detail {len(signatures)} signatures")
-        result['processed'] = len(signatures)
-        return result
-
-    # Fetch from Solscan
+async def fetch_signatures(tag, session, signatures, api_timeout, max_retries):
+    """Fetch + trim one batch from Solscan. Returns {'error', 'txs_json', 'count', 'fetch_time'}."""
+    fetched = {'error': None, 'txs_json': None, 'count': 0, 'fetch_time': 0.0}
     t0 = time.time()
     try:
         detail_response = await fetch_detail(session, signatures, api_timeout, max_retries)
     except Exception as e:
-        result['error'] = f'Solscan API error: {e}'
-        return result
-    fetch_time = time.time() - t0
+        fetched['error'] = f'Solscan API error: {e}'
+        return fetched
+    fetched['fetch_time'] = time.time() - t0
+    METRICS.record('api', fetched['fetch_time'])
 
     if not detail_response.get('success'):
-        result['error'] = 'Detail API returned unsuccessful response'
-        return result
+        fetched['error'] = 'Detail API returned unsuccessful response'
+        return fetched
 
     tx_data = detail_response.get('data', [])
-    result['tx_count'] = len(tx_data)
+    fetched['count'] = len(tx_data)
     if not tx_data:
-        result['error'] = 'Detail API returned no data'
-        return result
+        fetched['error'] = 'Detail API returned no data'
+        return fetched
     if len(tx_data) < len(signatures):
         log(tag, f"Solscan returned {len(tx_data)}/{len(signatures)} transactions")
 
@@ -259,14 +218,34 @@ async def process_signatures(tag, cursor, conn, session, signatures,
     _DETAIL_KEEP_FIELDS = {'tx_hash', 'block_time', 'block_id', 'signer', 'sol_bal_change', 'token_bal_change'}
     sanitized = sanitize_large_ints(detail_response)
     sanitized['data'] = [{k: v for k, v in tx.items() if k in _DETAIL_KEEP_FIELDS} for tx in sanitized.get('data', [])]
+    fetched['txs_json'] = json.dumps(sanitized)
+    return fetched
+
+
+async def fetch_many(tag, session, batches, api_timeout, max_retries, inflight):
+    """Fetch several batches concurrently, at most `inflight` Solscan requests at once (order preserved)."""
+    sem = asyncio.Semaphore(max(1, inflight))
+
+    async def _one(signatures):
+        async with sem:
+            return await fetch_signatures(tag, session, signatures, api_timeout, max_retries)
+
+    return await asyncio.gather(*(_one(sigs) for sigs in batches))
+
+
+def apply_detail(tag, cursor, conn, fetched, request_log_id):
+    """Run sp_tx_parse_detail on a fetched batch (DB errors propagate)."""
+    result = {'processed': 0, 'skipped': 0, 'staging_id': None, 'tx_count': fetched['count'],
+              'error': fetched['error']}
+    if fetched['error']:
+        return result
 
     # Call SP directly — bypass staging table entirely
-    txs_json = json.dumps(sanitized)
     t1 = time.time()
     cursor.execute("SET @tx=0, @sol=0, @tok=0, @skip=0")
     cursor.execute(
         "CALL sp_tx_parse_detail(%s, %s, @tx, @sol, @tok, @skip)",
-        (txs_json, request_log_id))
+        (fetched['txs_json'], request_log_id))
     # Drain any result sets from the SP
     try:
         while cursor.nextset():
@@ -277,16 +256,17 @@ async def process_signatures(tag, cursor, conn, session, signatures,
     sp_row = cursor.fetchone()
     conn.commit()
     sp_time = time.time() - t1
+    METRICS.record('sp', sp_time)
 
     sp_tx   = sp_row[0] or 0 if sp_row else 0
     sp_sol  = sp_row[1] or 0 if sp_row else 0
     sp_tok  = sp_row[2] or 0 if sp_row else 0
     sp_skip = sp_row[3] or 0 if sp_row else 0
 
-    result['processed'] = len(tx_data)
+    result['processed'] = fetched['count']
     result['tx_count'] = sp_tx
-    log(tag, f"Detailed {len(tx_data)} txs: tx={sp_tx} sol={sp_sol} tok={sp_tok} "
-            f"skip={sp_skip} (fetch={fetch_time:.2f}s, sp={sp_time:.3f}s)")
+    log(tag, f"Detailed {fetched['count']} txs: tx={sp_tx} sol={sp_sol} tok={sp_tok} "
+            f"skip={sp_skip} (fetch={fetched['fetch_time']:.2f}s, sp={sp_time:.3f}s)")
     return result
 
 # =============================================================================
@@ -295,7 +275,8 @@ async def process_signatures(tag, cursor, conn, session, signatures,
 
 class WorkerThread(threading.Thread):
     def __init__(self, worker_id, prefetch, dry_run, stop_event,
-                 poll_idle_sec, reconnect_sec, api_timeout_sec, api_max_retries):
+                 poll_idle_sec, reconnect_sec, api_timeout_sec, api_max_retries,
+                 api_inflight):
         super().__init__(daemon=True)
         self.tag = f"W-{worker_id}"
         self.worker_id = worker_id
@@ -306,18 +287,20 @@ class WorkerThread(threading.Thread):
         self.reconnect_sec = reconnect_sec
         self.api_timeout_sec = api_timeout_sec
         self.api_max_retries = api_max_retries
+        self.api_inflight = max(1, api_inflight)
 
     def run(self):
-        log(self.tag, f"Starting (prefetch={self.prefetch})")
+        log(self.tag, f"Starting (prefetch={self.prefetch}, api_inflight={self.api_inflight})")
 
         # Each worker thread gets its own event loop + aiohttp session
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
         async def _create_session():
-            connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
+            per_host = max(5, self.api_inflight)
+            connector = aiohttp.TCPConnector(limit=max(10, per_host), limit_per_host=per_host)
             return aiohttp.ClientSession(
-                headers={'token': SOLSCAN_API_TOKEN},
+                headers=get_solscan_client().headers,
                 connector=connector)
 
         api_session = loop.run_until_complete(_create_session())
@@ -346,7 +329,20 @@ class WorkerThread(threading.Thread):
                             rmq_conn.process_data_events(time_limit=0)
                             continue
 
-                        self._handle_message(ch, method, properties, body, cursor, db_conn, api_session, loop)
+                        # Pull whatever else is already waiting (up to prefetch) so the
+                        # Solscan round-trips for these batches overlap
+                        deliveries = [(method, properties, body)]
+                        while len(deliveries) < self.prefetch:
+                            method, properties, body = ch.basic_get(queue=REQUEST_QUEUE, auto_ack=False)
+                            if method is None:
+                                break
+                            deliveries.append((method, properties, body))
+
+                        for _, d_properties, d_body in deliveries:
+                            METRICS.received(d_body, d_properties)
+                        # 'handle' covers the whole group (Solscan fetches overlap)
+                        with METRICS.timer('handle'):
+                            self._handle_messages(ch, deliveries, cursor, db_conn, api_session, loop)
 
                     try:
                         rmq_conn.close()
@@ -375,7 +371,48 @@ class WorkerThread(threading.Thread):
                     pass
             log(self.tag, "Stopped")
 
-    def _handle_message(self, ch, method, properties, body, cursor, db_conn, api_session, loop):
+    def _handle_messages(self, ch, deliveries, cursor, db_conn, api_session, loop):
+        """
+        Process a group of deliveries: log each request, fetch all their Solscan
+        details concurrently (bounded by api_inflight), then parse + ack in
+        delivery order.
+        """
+        jobs = []
+        pending = list(deliveries)
+        try:
+            while pending:
+                method, properties, body = pending[0]
+                job = self._start_job(ch, method, properties, body, cursor, db_conn)
+                pending.pop(0)
+                if job is not None:
+                    jobs.append(job)
+        except MySQLError:
+            self._requeue(ch, [(j['method'], j['properties'], j['body']) for j in jobs] + pending)
+            raise
+
+        to_fetch = [j for j in jobs if not self.dry_run]
+        if to_fetch:
+            fetched = loop.run_until_complete(fetch_many(
+                self.tag, api_session, [j['signatures'] for j in to_fetch],
+                self.api_timeout_sec, self.api_max_retries, self.api_inflight))
+            for job, f in zip(to_fetch, fetched):
+                job['fetched'] = f
+
+        for idx, job in enumerate(jobs):
+            try:
+                self._finish_job(ch, job, cursor, db_conn)
+            except MySQLError:
+                self._requeue(ch, [(j['method'], j['properties'], j['body']) for j in jobs[idx:]])
+                raise
+
+    def _requeue(self, ch, deliveries):
+        for method, properties, body in deliveries:
+            nack_with_retry(ch, method.delivery_tag, properties,
+                            log_fn=lambda msg: log(self.tag, f"[DB ERROR] {msg}"),
+                            queue_name=REQUEST_QUEUE, body=body)
+
+    def _start_job(self, ch, method, properties, body, cursor, db_conn):
+        """Parse + log one delivery. Returns a job dict, or None if it was already settled."""
         worker_log_id = None
         try:
             msg = json.loads(body.decode('utf-8'))
@@ -395,21 +432,39 @@ class WorkerThread(threading.Thread):
                 f"sigs={len(signatures)}, batch={batch_num})")
 
             worker_log_id = log_worker_request(
-                cursor, db_conn, request_id, correlation_id,
+                request_id, correlation_id,
                 batch_num, len(signatures), priority, api_key_id, features)
 
             if not signatures:
                 resp = {'processed': 0, 'message': 'No signatures provided'}
-                update_worker_request(cursor, db_conn, worker_log_id, 'completed', resp)
+                update_worker_request(worker_log_id, 'completed', resp)
                 self._publish_response(ch, request_id, correlation_id, 'completed', resp, batch_num)
                 ch.basic_ack(delivery_tag=method.delivery_tag)
-                return
+                return None
+
+            return {
+                'method': method, 'properties': properties, 'body': body,
+                'request_id': request_id, 'correlation_id': correlation_id,
+                'request_log_id': request_log_id, 'worker_log_id': worker_log_id,
+                'signatures': signatures, 'batch_num': batch_num, 'fetched': None,
+            }
+
+        except MySQLError:
+            raise
+        except Exception as e:
+            self._fail_to_dlq(ch, method, cursor, db_conn, worker_log_id, e)
+            return None
 
-            result = loop.run_until_complete(
-                process_signatures(
-                    self.tag, cursor, db_conn, api_session, signatures,
-                    priority, correlation_id, sig_hash, request_log_id,
-                    self.dry_run, self.api_timeout_sec, self.api_max_retries))
+    def _finish_job(self, ch, job, cursor, db_conn):
+        """Parse the fetched details into tx tables, log, respond and ack (in order)."""
+        method = job['method']
+        try:
+            if self.dry_run:
+                log(self.tag, f"[DRY] Would detail {len(job['signatures'])} signatures")
+                result = {'processed': len(job['signatures']), 'skipped': 0,
+                          'tx_count': 0, 'error': None}
+            else:
+                result = apply_detail(self.tag, cursor, db_conn, job['fetched'], job['request_log_id'])
 
             if result.get('error'):
                 status = 'failed'
@@ -424,23 +479,21 @@ class WorkerThread(threading.Thread):
                     'tx_count':   result['tx_count'],
                 }
 
-            update_worker_request(cursor, db_conn, worker_log_id, status, resp)
-            self._publish_response(ch, request_id, correlation_id, status, resp, batch_num)
+            update_worker_request(job['worker_log_id'], status, resp)
+            self._publish_response(ch, job['request_id'], job['correlation_id'],
+                                   status, resp, job['batch_num'])
             ch.basic_ack(delivery_tag=method.delivery_tag)
 
         except MySQLError:
-            nack_with_retry(ch, method.delivery_tag, properties,
-                            log_fn=lambda msg: log(self.tag, f"[DB ERROR] {msg}"),
-                            queue_name=REQUEST_QUEUE, body=body)
             raise
         except Exception as e:
-            log(self.tag, f"ERROR processing message -> DLQ: {e}")
-            if worker_log_id:
-                try:
-                    update_worker_request(cursor, db_conn, worker_log_id, 'failed', {'error': str(e)})
-                except Exception:
-                    pass
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            self._fail_to_dlq(ch, method, cursor, db_conn, job['worker_log_id'], e)
+
+    def _fail_to_dlq(self, ch, method, cursor, db_conn, worker_log_id, e):
+        log(self.tag, f"ERROR processing message -> DLQ: {e}")
+        METRICS.incr('dlq')
+        update_worker_request(worker_log_id, 'failed', {'error': str(e)})
+        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
     def _publish_response(self, ch, request_id, correlation_id, status, result, batch_num):
         result['batch_num'] = batch_num
@@ -464,6 +517,9 @@ class WorkerThread(threading.Thread):
 def read_config(cursor):
     return {
         'threads':          get_config_int(cursor, 'queue', 'detailer_wrk_cnt_threads', 0),
+        'autoscale':        get_config_int(cursor, 'queue', 'detailer_wrk_autoscale', 0),
+        'threads_min':      get_config_int(cursor, 'queue', 'detailer_wrk_cnt_threads_min', 1),
+        'threads_max':      get_config_int(cursor, 'queue', 'detailer_wrk_cnt_threads_max', 8),
         'prefetch':         get_config_int(cursor, 'queue', 'detailer_wrk_cnt_prefetch', 5),
         'supervisor_poll':  get_config_float(cursor, 'queue', 'detailer_wrk_supervisor_poll_sec', 5.0),
         'poll_idle':        get_config_float(cursor, 'queue', 'detailer_wrk_poll_idle_sec', 0.25),
@@ -471,6 +527,7 @@ def read_config(cursor):
         'shutdown_timeout': get_config_float(cursor, 'queue', 'detailer_wrk_shutdown_timeout_sec', 10.0),
         'api_timeout':      get_config_float(cursor, 'queue', 'detailer_wrk_api_timeout_sec', 60.0),
         'api_max_retries':  get_config_int(cursor, 'queue', 'detailer_wrk_api_max_retries', 3),
+        'api_inflight':     get_config_int(cursor, 'queue', 'detailer_wrk_cnt_api_inflight', 4),
     }
 
 
@@ -483,9 +540,16 @@ def run_supervisor(dry_run=False):
 """, flush=True)
 
     workers = {}
+    start_exporter(METRICS)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
+    autoscaler = ThreadAutoscaler('detailer', METRICS, get_solscan_client(),
+                                  log_fn=lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
+    svr_rmq_conn = None
+    svr_rmq_ch = None
     cfg = {}
 
     def ensure_svr_db():
@@ -506,12 +570,41 @@ def run_supervisor(dry_run=False):
             log('SVR', f'DB connect failed: {e}')
             return False
 
+    def ensure_svr_rmq():
+        nonlocal svr_rmq_conn, svr_rmq_ch
+        try:
+            if svr_rmq_conn is not None and svr_rmq_conn.is_open:
+                return True
+        except Exception:
+            svr_rmq_conn = None
+        try:
+            svr_rmq_conn, svr_rmq_ch = rmq_connect()
+            log('SVR', 'RabbitMQ connected (queue depth)')
+            return True
+        except Exception as e:
+            log('SVR', f'RabbitMQ connect failed: {e}')
+            return False
+
+    def queue_depth():
+        """Request queue backlog for the autoscaler (None when RabbitMQ is down)."""
+        nonlocal svr_rmq_conn
+        if not ensure_svr_rmq():
+            return None
+        try:
+            return svr_rmq_ch.queue_declare(queue=REQUEST_QUEUE, passive=True).method.message_count
+        except Exception as e:
+            log('SVR', f'Queue depth check failed: {e}')
+            svr_rmq_conn = None
+            return None
+
     try:
         while True:
             if not ensure_svr_db():
                 time.sleep(DB_FALLBACK_RETRY_SEC)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -522,21 +615,28 @@ def run_supervisor(dry_run=False):
 
             active = len(workers)
 
-            if active != cfg['threads']:
-                log('SVR', f"Config: threads={cfg['threads']} prefetch={cfg['prefetch']} | active={active}")
+            target = cfg['threads']
+            if cfg['autoscale']:
+                target = autoscaler.decide(active, queue_depth(),
+                                           cfg['threads_min'], cfg['threads_max'])
+
+            if active != target:
+                log('SVR', f"Config: threads={target} prefetch={cfg['prefetch']} "
+                         f"inflight={cfg['api_inflight']} | active={active}")
 
             # Scale up
-            while len(workers) < cfg['threads']:
+            while len(workers) < target:
                 stop_evt = threading.Event()
                 w = WorkerThread(
                     next_id, cfg['prefetch'], dry_run, stop_evt,
-                    cfg['poll_idle'], cfg['reconnect'], cfg['api_timeout'], cfg['api_max_retries'])
+                    cfg['poll_idle'], cfg['reconnect'], cfg['api_timeout'], cfg['api_max_retries'],
+                    cfg['api_inflight'])
                 w.start()
                 workers[next_id] = (w, stop_evt)
                 next_id += 1
 
             # Scale down (stop newest first)
-            while len(workers) > cfg['threads']:
+            while len(workers) > target:
                 wid = max(workers.keys())
                 wthread, stop_evt = workers.pop(wid)
                 log('SVR', f'Stopping W-{wid}...')
@@ -557,6 +657,14 @@ def run_supervisor(dry_run=False):
         if w.is_alive():
             log('SVR', f'W-{wid} did not stop in time')
 
+    # Write buffered request-log rows before exiting
+    REQUEST_LOG.close()
+
+    if svr_rmq_conn:
+        try:
+            svr_rmq_conn.close()
+        except Exception:
+            pass
     if svr_conn:
         try:
             svr_conn.close()
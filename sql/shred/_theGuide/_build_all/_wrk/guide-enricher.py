@@ -12,16 +12,27 @@ Enriches:
 
 Config keys (config_type='queue'):
     enricher_wrk_cnt_threads           - desired worker thread count (0 = idle)
+    enricher_wrk_autoscale             - 1 = autoscale threads between min/max from queue
+                                         depth, message latency and Solscan 429 rate
+    enricher_wrk_cnt_threads_min       - autoscale lower bound
+    enricher_wrk_cnt_threads_max       - autoscale upper bound
     enricher_wrk_cnt_prefetch          - RabbitMQ prefetch per worker channel
     enricher_wrk_supervisor_poll_sec   - supervisor config poll interval
     enricher_wrk_poll_idle_sec         - worker sleep when no message available
     enricher_wrk_reconnect_sec         - delay before reconnecting after errors
     enricher_wrk_shutdown_timeout_sec  - max wait for worker thread on shutdown
     enricher_wrk_api_timeout_sec       - Solscan API request timeout
-    enricher_wrk_api_delay_sec         - delay between API calls
+    enricher_wrk_api_delay_sec         - extra delay between API calls (0 = rely on the
+                                         shared Solscan rate limiter, SOLSCAN_RATE_PER_SEC)
     enricher_wrk_batch_limit           - max items per enrichment pass
     enricher_wrk_max_attempts          - skip items with more than N failed attempts
     enricher_wrk_db_poll_sec           - supervisor DB poll interval (0 = disabled)
+    enricher_wrk_db_poll_fallback_sec  - floor on the poll interval while the shredder and
+                                         aggregator publish work events (0 = poll every db_poll_sec)
+
+DB polls are driven by work events (common.work_events): the shredder and
+aggregator publish db-poll-enrich after committing new rows, and the supervisor
+timer is only a slow fallback. Concurrent polls/events coalesce into one pass.
 
 Manual modes (run directly, not as service):
     python guide-enricher.py --enrich tokens
@@ -41,7 +52,6 @@ import sys
 import time
 import threading
 import uuid
-import requests
 import pika
 import mysql.connector
 from mysql.connector import Error as MySQLError
@@ -55,11 +65,16 @@ from typing import Optional, Dict, List, Any
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
-    get_db_config, get_rabbitmq_config, get_solscan_config,
+    get_db_config, get_rabbitmq_config,
     get_queue_names, get_retry_config, nack_with_retry,
 )
+from t16o_exchange.guide.common.autoscaler import ThreadAutoscaler
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.address_cache import get_address_resolver
+from t16o_exchange.guide.common.solscan_client import get_solscan_client
+from t16o_exchange.guide.common.work_events import DrainGate
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
-_solscan            = get_solscan_config()
 _rmq                = get_rabbitmq_config()
 _queues             = get_queue_names('enricher')
 _producer_queues    = get_queue_names('producer')
@@ -67,8 +82,6 @@ _decoder_queues     = get_queue_names('decoder')
 _detailer_queues    = get_queue_names('detailer')
 _retry              = get_retry_config()
 
-SOLSCAN_API_BASE    = _solscan['api_base']
-SOLSCAN_API_TOKEN   = _solscan['token']
 RABBITMQ_HOST       = _rmq['host']
 RABBITMQ_PORT       = _rmq['port']
 RABBITMQ_USER       = _rmq['user']
@@ -81,13 +94,21 @@ REQUEST_QUEUE       = _queues['request']
 RESPONSE_QUEUE      = _queues['response']
 DLQ_QUEUE           = _queues['dlq']
 DB_CONFIG           = get_db_config()
+METRICS             = get_worker_metrics('enricher')
 PRODUCER_REQUEST_QUEUE = _producer_queues['request']
 DECODER_REQUEST_QUEUE  = _decoder_queues['request']
 DETAILER_REQUEST_QUEUE = _detailer_queues['request']
-PRIME_BATCH_SIZE       = 20
 
 MULTI_META_BATCH_SIZE = 50
 
+# Auto-prime: tokens per chunk (one token/meta/multi call) and signatures per
+# cascade message (the decoder/detailer batch size the producer uses)
+PRIME_BATCH_SIZE         = MULTI_META_BATCH_SIZE
+PRIME_CASCADE_BATCH_SIZE = 20
+
+# One db-poll enrichment pass at a time per process, however many events/polls arrive
+DRAIN_GATE = DrainGate()
+
 # Known token symbols → legitimate mint addresses. Any token claiming these
 # symbols from a different mint is flagged as a scam.
 KNOWN_TOKEN_MINTS = {
@@ -107,39 +128,11 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
@@ -224,19 +217,9 @@ def log_daemon_request(cursor, conn, action, batch_size):
 # Solscan API
 # =============================================================================
 
-def solscan_session():
-    s = requests.Session()
-    s.headers['token'] = SOLSCAN_API_TOKEN
-    return s
-
-
-def fetch_token_meta_multi(session, mint_addresses, api_timeout):
-    url = f"{SOLSCAN_API_BASE}/token/meta/multi"
-    params = [('address[]', addr) for addr in mint_addresses]
+def fetch_token_meta_multi(client, mint_addresses, api_timeout):
     try:
-        r = session.get(url, params=params, timeout=api_timeout)
-        r.raise_for_status()
-        data = r.json()
+        data = client.token_meta_multi(mint_addresses, timeout=api_timeout)
         if data.get('success') and data.get('data'):
             return {item['address']: item for item in data['data'] if 'address' in item}
         return {}
@@ -245,13 +228,9 @@ def fetch_token_meta_multi(session, mint_addresses, api_timeout):
         return {}
 
 
-def fetch_account_metadata_multi(session, addresses, api_timeout):
-    url = f"{SOLSCAN_API_BASE}/account/metadata/multi"
-    params = [('address[]', addr) for addr in addresses]
+def fetch_account_metadata_multi(client, addresses, api_timeout):
     try:
-        r = session.get(url, params=params, timeout=api_timeout)
-        r.raise_for_status()
-        data = r.json()
+        data = client.account_metadata_multi(addresses, timeout=api_timeout)
         if data.get('success') and data.get('data'):
             return {item['account_address']: item for item in data['data'] if 'account_address' in item}
         return {}
@@ -260,12 +239,9 @@ def fetch_account_metadata_multi(session, addresses, api_timeout):
         return {}
 
 
-def fetch_account_metadata(session, address, api_timeout):
-    url = f"{SOLSCAN_API_BASE}/account/metadata"
+def fetch_account_metadata(client, address, api_timeout):
     try:
-        r = session.get(url, params={'address': address}, timeout=api_timeout)
-        r.raise_for_status()
-        data = r.json()
+        data = client.account_metadata(address, timeout=api_timeout)
         if data.get('success') and data.get('data'):
             return data['data']
     except Exception as e:
@@ -273,12 +249,9 @@ def fetch_account_metadata(session, address, api_timeout):
     return None
 
 
-def fetch_pool_info(session, pool_address, api_timeout):
-    url = f"{SOLSCAN_API_BASE}/market/info"
+def fetch_pool_info(client, pool_address, api_timeout):
     try:
-        r = session.get(url, params={'address': pool_address}, timeout=api_timeout)
-        r.raise_for_status()
-        data = r.json()
+        data = client.get('/market/info', {'address': pool_address}, timeout=api_timeout)
         if data.get('success') and data.get('data'):
             return data['data']
     except Exception as e:
@@ -293,15 +266,7 @@ def fetch_pool_info(session, pool_address, api_timeout):
 def ensure_address(cursor, conn, address, addr_type='unknown'):
     if not address:
         return None
-    cursor.execute("SELECT id FROM tx_address WHERE address = %s", (address,))
-    row = cursor.fetchone()
-    if row:
-        return row['id']
-    cursor.execute(
-        "INSERT INTO tx_address (address, address_type) VALUES (%s, %s)",
-        (address, addr_type))
-    conn.commit()
-    return cursor.lastrowid
+    return get_address_resolver().resolve(conn, address, addr_type)
 
 
 def ensure_program(cursor, conn, program_address):
@@ -391,31 +356,15 @@ def publish_cascade_to_workers(ch, signatures, request_id=None, correlation_id=N
         return False
 
 
-def prime_unprimed_tokens(tag, session, cursor, conn, ch, api_timeout):
-    """Find unprimed tokens, fetch create_tx from Solscan, cascade to decoder+detailer.
-    Returns count of tokens primed. Never raises."""
-    try:
-        cursor.execute("""
-            SELECT t.id AS token_id, a.address AS mint_address, t.token_json
-            FROM tx_token t
-            JOIN tx_address a ON a.id = t.mint_address_id
-            WHERE t.primed = 0
-            ORDER BY t.id
-            LIMIT %s
-        """, (PRIME_BATCH_SIZE,))
-        rows = cursor.fetchall()
-    except Exception as e:
-        log(tag, f"[prime] Query error: {e}")
-        return 0
-
-    if not rows:
-        return 0
-
-    log(tag, f"[prime] {len(rows)} unprimed tokens")
+def split_prime_candidates(tag, client, rows, api_timeout):
+    """Resolve create_tx for a chunk of unprimed tokens.
 
-    # Split into tokens that already have token_json (with create_tx) vs need API call
-    need_api = []
+    Tokens with a cached token_json are resolved locally; the rest share one
+    token/meta/multi call. Returns (have_sig, fetched): [(token_id, mint, sig)]
+    and {token_id: (mint_address_id, token_json)} for metadata to cache.
+    """
     have_sig = []
+    need_api = []
     for row in rows:
         token_json = row.get('token_json')
         if token_json:
@@ -425,78 +374,129 @@ def prime_unprimed_tokens(tag, session, cursor, conn, ch, api_timeout):
                 if sig:
                     have_sig.append((row['token_id'], row['mint_address'], sig))
                     continue
-            except (json.JSONDecodeError, TypeError):
+            except (json.JSONDecodeError, TypeError, AttributeError):
                 pass
         need_api.append(row)
 
-    # Fetch metadata for tokens without cached create_tx
+    fetched = {}
     if need_api:
-        mint_addresses = [r['mint_address'] for r in need_api]
         mint_to_row = {r['mint_address']: r for r in need_api}
-        log(tag, f"[prime] Calling Solscan token/meta/multi for {len(mint_addresses)} tokens")
-
-        results = fetch_token_meta_multi(session, mint_addresses, api_timeout)
-
+        log(tag, f"[prime] Calling Solscan token/meta/multi for {len(need_api)} tokens")
+        results = fetch_token_meta_multi(client, list(mint_to_row), api_timeout)
         for mint, meta in results.items():
+            row = mint_to_row.get(mint)
+            if row is None:
+                continue
+            if not row.get('token_json'):
+                fetched[row['token_id']] = (row['mint_address_id'], json.dumps(meta))
             sig = meta.get('create_tx') or meta.get('first_mint_tx')
-            if sig and mint in mint_to_row:
-                have_sig.append((mint_to_row[mint]['token_id'], mint, sig))
+            if sig:
+                have_sig.append((row['token_id'], mint, sig))
+    return have_sig, fetched
+
+
+def save_prime_chunk(cursor, conn, fetched, primed_ids):
+    """Cache fetched token_json (multi-row upsert) and set primed, in one commit."""
+    if fetched:
+        placeholders = ','.join(['(%s, %s, %s)'] * len(fetched))
+        params = []
+        for token_id, (mint_address_id, token_json) in fetched.items():
+            params.extend((token_id, mint_address_id, token_json))
+        cursor.execute(f"""
+            INSERT INTO tx_token (id, mint_address_id, token_json)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE token_json = COALESCE(token_json, VALUES(token_json))
+        """, params)
+    if primed_ids:
+        placeholders = ','.join(['%s'] * len(primed_ids))
+        cursor.execute(f"UPDATE tx_token SET primed = 1 WHERE id IN ({placeholders})", primed_ids)
+    conn.commit()
 
-                # Cache the token_json for future use
-                try:
-                    cursor.execute(
-                        "UPDATE tx_token SET token_json = COALESCE(token_json, %s) WHERE id = %s",
-                        (json.dumps(meta), mint_to_row[mint]['token_id']))
-                    conn.commit()
-                except Exception:
-                    pass
 
-    if not have_sig:
-        # Mark all as primed even without sigs (no create_tx available)
-        token_ids = [r['token_id'] for r in rows]
-        placeholders = ','.join(['%s'] * len(token_ids))
+def prime_unprimed_tokens(tag, client, cursor, conn, ch, api_timeout, stop_event=None):
+    """Find unprimed tokens, fetch create_tx from Solscan, cascade to decoder+detailer.
+
+    Runs chunk after chunk (keyset on tx_token.id) until no unprimed tokens
+    remain, so launchpad bursts drain in one pass instead of PRIME_BATCH_SIZE
+    per poll. Each chunk costs one SELECT, at most one token/meta/multi call,
+    one tx existence lookup, cascades of PRIME_CASCADE_BATCH_SIZE signatures
+    and one commit for token_json + primed. Tokens whose cascade failed stay
+    unprimed for the next poll. Returns count of sigs cascaded. Never raises.
+    """
+    last_id = 0
+    chunks = 0
+    total_primed = 0
+    total_cascaded = 0
+    total_existing = 0
+
+    while stop_event is None or not stop_event.is_set():
         try:
-            cursor.execute(f"UPDATE tx_token SET primed = 1 WHERE id IN ({placeholders})", token_ids)
-            conn.commit()
-        except Exception:
-            pass
-        log(tag, f"[prime] No create_tx found for any of {len(rows)} tokens, marked primed")
-        return 0
+            cursor.execute("""
+                SELECT t.id AS token_id, t.mint_address_id, a.address AS mint_address, t.token_json
+                FROM tx_token t
+                JOIN tx_address a ON a.id = t.mint_address_id
+                WHERE t.primed = 0 AND t.id > %s
+                ORDER BY t.id
+                LIMIT %s
+            """, (last_id, PRIME_BATCH_SIZE))
+            rows = cursor.fetchall()
+        except Exception as e:
+            log(tag, f"[prime] Query error: {e}")
+            break
 
-    # Filter out signatures that already exist in tx table
-    sigs = [s for _, _, s in have_sig]
-    try:
-        placeholders = ','.join(['%s'] * len(sigs))
-        cursor.execute(f"SELECT signature FROM tx WHERE signature IN ({placeholders})", sigs)
-        existing = {r['signature'] for r in cursor.fetchall()}
-    except Exception:
-        existing = set()
+        if not rows:
+            break
+        last_id = rows[-1]['token_id']
+        chunks += 1
 
-    new_sigs = [(tid, mint, sig) for tid, mint, sig in have_sig if sig not in existing]
-    skipped = len(have_sig) - len(new_sigs)
-    if skipped:
-        log(tag, f"[prime] {skipped} signatures already in DB, skipping")
+        have_sig, fetched = split_prime_candidates(tag, client, rows, api_timeout)
 
-    # Cascade new signatures to decoder + detailer
-    if new_sigs:
-        sig_list = [sig for _, _, sig in new_sigs]
-        request_id = f"enricher-prime-{uuid.uuid4().hex[:12]}"
-        if publish_cascade_to_workers(ch, sig_list, request_id=request_id):
-            log(tag, f"[prime] Cascaded {len(sig_list)} create_tx sigs to decoder+detailer")
-        else:
-            log(tag, f"[prime] Failed to cascade signatures")
+        # Filter out signatures that already exist in tx table
+        existing = set()
+        if have_sig:
+            sigs = [sig for _, _, sig in have_sig]
+            try:
+                placeholders = ','.join(['%s'] * len(sigs))
+                cursor.execute(f"SELECT signature FROM tx WHERE signature IN ({placeholders})", sigs)
+                existing = {r['signature'] for r in cursor.fetchall()}
+            except Exception:
+                pass
+        new_sigs = [(tid, mint, sig) for tid, mint, sig in have_sig if sig not in existing]
+        total_existing += len(have_sig) - len(new_sigs)
+
+        # Cascade in decoder-sized messages; keep failed tokens unprimed
+        failed_ids = set()
+        for i in range(0, len(new_sigs), PRIME_CASCADE_BATCH_SIZE):
+            batch = new_sigs[i:i + PRIME_CASCADE_BATCH_SIZE]
+            if publish_cascade_to_workers(ch, [sig for _, _, sig in batch]):
+                total_cascaded += len(batch)
+            else:
+                failed_ids.update(tid for tid, _, _ in batch)
 
-    # Mark all processed tokens as primed
-    all_token_ids = [r['token_id'] for r in rows]
-    placeholders = ','.join(['%s'] * len(all_token_ids))
-    try:
-        cursor.execute(f"UPDATE tx_token SET primed = 1 WHERE id IN ({placeholders})", all_token_ids)
-        conn.commit()
-    except Exception as e:
-        log(tag, f"[prime] Failed to mark primed: {e}")
+        # Tokens without a create_tx are marked primed too (nothing to load)
+        primed_ids = [r['token_id'] for r in rows if r['token_id'] not in failed_ids]
+        try:
+            save_prime_chunk(cursor, conn, fetched, primed_ids)
+        except Exception as e:
+            log(tag, f"[prime] Failed to mark primed: {e}")
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            break
+        total_primed += len(primed_ids)
+
+        if failed_ids:
+            log(tag, f"[prime] Failed to cascade signatures for {len(failed_ids)} tokens, retrying next poll")
+            break
+        if len(rows) < PRIME_BATCH_SIZE:
+            break
 
-    log(tag, f"[prime] {len(all_token_ids)} tokens marked primed, {len(new_sigs)} new sigs cascaded")
-    return len(new_sigs)
+    if chunks:
+        skip_info = f", {total_existing} sigs already in DB" if total_existing else ""
+        log(tag, f"[prime] {chunks} chunks: {total_primed} tokens marked primed, "
+                 f"{total_cascaded} new sigs cascaded{skip_info}")
+    return total_cascaded
 
 
 # =============================================================================
@@ -564,8 +564,8 @@ def run_token_backfill(tag, cursor):
         return 0
 
 
-def enrich_tokens(tag, session, cursor, conn, limit, max_attempts, api_delay, api_timeout,
-                   rmq_channel=None, prime_enabled=False):
+def enrich_tokens(tag, client, cursor, conn, limit, max_attempts, api_delay, api_timeout,
+                   rmq_channel=None, prime_enabled=False, stop_event=None):
     stats = {'processed': 0, 'updated': 0, 'failed': 0, 'backfill_updated': 0, 'primed': 0}
 
     # Phase 1: Solscan API (claim batch with FOR UPDATE SKIP LOCKED)
@@ -593,7 +593,7 @@ def enrich_tokens(tag, session, cursor, conn, limit, max_attempts, api_delay, ap
         log(tag, f"  Batch {chunk_num}/{total_chunks}: {len(chunk)} tokens")
 
         try:
-            results = fetch_token_meta_multi(session, list(mint_to_token.keys()), api_timeout)
+            results = fetch_token_meta_multi(client, list(mint_to_token.keys()), api_timeout)
             log(tag, f"    Got {len(results)} results")
 
             for mint, token_info in mint_to_token.items():
@@ -686,7 +686,8 @@ def enrich_tokens(tag, session, cursor, conn, limit, max_attempts, api_delay, ap
     # Auto-prime: fetch create_tx for unprimed tokens and cascade to decoder+detailer
     if rmq_channel and prime_enabled:
         try:
-            primed = prime_unprimed_tokens(tag, session, cursor, conn, rmq_channel, api_timeout)
+            primed = prime_unprimed_tokens(tag, client, cursor, conn, rmq_channel, api_timeout,
+                                           stop_event=stop_event)
             stats['primed'] = primed
         except Exception as e:
             log(tag, f"[prime] Error (non-fatal): {e}")
@@ -756,7 +757,7 @@ def update_pool_from_api(cursor, conn, pool_address_id, pool_id, api_data, label
         return False
 
 
-def enrich_pools(tag, session, cursor, conn, limit, max_attempts, api_delay, api_timeout):
+def enrich_pools(tag, client, cursor, conn, limit, max_attempts, api_delay, api_timeout):
     stats = {'processed': 0, 'updated': 0, 'labels': 0, 'not_found': 0,
              'failed': 0, 'backfill_created': 0, 'backfill_updated': 0}
 
@@ -812,7 +813,7 @@ def enrich_pools(tag, session, cursor, conn, limit, max_attempts, api_delay, api
             addr_to_pool = {p['address']: p for p in chunk}
 
             try:
-                metadata_map = fetch_account_metadata_multi(session, list(addr_to_pool.keys()), api_timeout)
+                metadata_map = fetch_account_metadata_multi(client, list(addr_to_pool.keys()), api_timeout)
 
                 for address, pool_info in addr_to_pool.items():
                     pool_id = pool_info['pool_id']
@@ -860,7 +861,7 @@ def enrich_pools(tag, session, cursor, conn, limit, max_attempts, api_delay, api
             address = pool['address']
             pool_id = pool['pool_id']
 
-            api_data = fetch_pool_info(session, address, api_timeout)
+            api_data = fetch_pool_info(client, address, api_timeout)
 
             if not api_data:
                 stats['not_found'] += 1
@@ -927,7 +928,7 @@ def infer_program_type(label):
     return 'other'
 
 
-def enrich_programs(tag, session, cursor, conn, limit, max_attempts, api_delay, api_timeout):
+def enrich_programs(tag, client, cursor, conn, limit, max_attempts, api_delay, api_timeout):
     stats = {'processed': 0, 'updated': 0, 'known': 0, 'failed': 0}
 
     programs = claim_batch(
@@ -964,7 +965,7 @@ def enrich_programs(tag, session, cursor, conn, limit, max_attempts, api_delay,
 
         # Fetch from Solscan API
         try:
-            metadata = fetch_account_metadata(session, address, api_timeout)
+            metadata = fetch_account_metadata(client, address, api_timeout)
             if metadata:
                 label = metadata.get('account_label') or metadata.get('label')
                 if label:
@@ -1056,7 +1057,7 @@ class WorkerThread(threading.Thread):
 
     def run(self):
         log(self.tag, f"Starting (prefetch={self.prefetch})")
-        session = solscan_session()
+        client = get_solscan_client()
         db_conn = None
         cursor = None
 
@@ -1078,7 +1079,8 @@ class WorkerThread(threading.Thread):
                         rmq_conn.process_data_events(time_limit=0)
                         continue
 
-                    self._handle_message(ch, method, properties, body, cursor, db_conn, session)
+                    with METRICS.message(body, properties):
+                        self._handle_message(ch, method, properties, body, cursor, db_conn, client)
 
                 try:
                     rmq_conn.close()
@@ -1102,10 +1104,9 @@ class WorkerThread(threading.Thread):
                 db_conn.close()
             except Exception:
                 pass
-        session.close()
         log(self.tag, "Stopped")
 
-    def _handle_message(self, ch, method, properties, body, cursor, db_conn, session):
+    def _handle_message(self, ch, method, properties, body, cursor, db_conn, client):
         worker_log_id = None
         try:
             msg = json.loads(body.decode('utf-8'))
@@ -1116,9 +1117,9 @@ class WorkerThread(threading.Thread):
             priority       = msg.get('priority', 5)
             batch          = msg.get('batch', {})
 
-            # ── DB poll: supervisor-scheduled enrichment pass ──
+            # ── DB poll: shredder/aggregator work event or supervisor fallback timer ──
             if action == 'db-poll-enrich':
-                self._handle_db_poll(ch, method, cursor, db_conn, session)
+                self._handle_db_poll(ch, method, cursor, db_conn, client, msg.get('ts'))
                 return
 
             # ── Normal queue message: gateway request ──
@@ -1141,18 +1142,19 @@ class WorkerThread(threading.Thread):
 
             if 'tokens' in operations:
                 run_token_backfill(self.tag, cursor)
-                s = enrich_tokens(self.tag, session, cursor, db_conn, limit, max_attempts, delay, self.api_timeout_sec,
-                                  rmq_channel=ch, prime_enabled=prime_enabled)
+                s = enrich_tokens(self.tag, client, cursor, db_conn, limit, max_attempts, delay, self.api_timeout_sec,
+                                  rmq_channel=ch, prime_enabled=prime_enabled,
+                                  stop_event=self.stop_event)
                 total_updated += s.get('updated', 0)
                 all_stats['tokens'] = s
 
             if 'pools' in operations:
-                s = enrich_pools(self.tag, session, cursor, db_conn, limit, max_attempts, delay, self.api_timeout_sec)
+                s = enrich_pools(self.tag, client, cursor, db_conn, limit, max_attempts, delay, self.api_timeout_sec)
                 total_updated += s.get('updated', 0)
                 all_stats['pools'] = s
 
             if 'programs' in operations:
-                s = enrich_programs(self.tag, session, cursor, db_conn, limit, max_attempts, delay, self.api_timeout_sec)
+                s = enrich_programs(self.tag, client, cursor, db_conn, limit, max_attempts, delay, self.api_timeout_sec)
                 total_updated += s.get('updated', 0)
                 all_stats['programs'] = s
 
@@ -1168,6 +1170,7 @@ class WorkerThread(threading.Thread):
             raise
         except Exception as e:
             log(self.tag, f"ERROR processing message -> DLQ: {e}")
+            METRICS.incr('dlq')
             import traceback
             traceback.print_exc()
             if worker_log_id:
@@ -1177,37 +1180,54 @@ class WorkerThread(threading.Thread):
                     pass
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
-    def _handle_db_poll(self, ch, method, cursor, db_conn, session):
-        """Handle supervisor-scheduled enrichment pass — single batch per type per poll."""
+    def _handle_db_poll(self, ch, method, cursor, db_conn, client, event_ts=None):
+        """Handle a work event / fallback poll — single batch per type per pass."""
+        if not DRAIN_GATE.begin(event_ts):
+            # Stale event, or another thread is mid-pass and will go around again
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
         grand_total = 0
         all_stats = {}
+        pass_num = 0
         prime_enabled = get_config_int(cursor, 'batch', 'enricher_prime_enabled', 1) > 0
 
-        # Token backfill (once per poll)
-        bf = run_token_backfill(self.tag, cursor)
-        grand_total += bf
-
-        # Tokens — single batch
-        s = enrich_tokens(self.tag, session, cursor, db_conn,
-                          self.batch_limit, self.max_attempts,
-                          self.api_delay_sec, self.api_timeout_sec,
-                          rmq_channel=ch, prime_enabled=prime_enabled)
-        grand_total += s.get('updated', 0)
-        all_stats['tokens'] = s
-
-        # Pools — single batch
-        s = enrich_pools(self.tag, session, cursor, db_conn,
-                         self.batch_limit, self.max_attempts,
-                         self.api_delay_sec, self.api_timeout_sec)
-        grand_total += s.get('updated', 0) + s.get('backfill_created', 0) + s.get('backfill_updated', 0)
-        all_stats['pools'] = s
-
-        # Programs — single batch
-        s = enrich_programs(self.tag, session, cursor, db_conn,
-                            self.batch_limit, self.max_attempts,
-                            self.api_delay_sec, self.api_timeout_sec)
-        grand_total += s.get('updated', 0)
-        all_stats['programs'] = s
+        try:
+            while not self.stop_event.is_set():
+                pass_num += 1
+
+                # Token backfill (once per pass)
+                bf = run_token_backfill(self.tag, cursor)
+                grand_total += bf
+
+                # Tokens — single batch
+                s = enrich_tokens(self.tag, client, cursor, db_conn,
+                                  self.batch_limit, self.max_attempts,
+                                  self.api_delay_sec, self.api_timeout_sec,
+                                  rmq_channel=ch, prime_enabled=prime_enabled,
+                                  stop_event=self.stop_event)
+                grand_total += s.get('updated', 0)
+                all_stats['tokens'] = s
+
+                # Pools — single batch
+                s = enrich_pools(self.tag, client, cursor, db_conn,
+                                 self.batch_limit, self.max_attempts,
+                                 self.api_delay_sec, self.api_timeout_sec)
+                grand_total += s.get('updated', 0) + s.get('backfill_created', 0) + s.get('backfill_updated', 0)
+                all_stats['pools'] = s
+
+                # Programs — single batch
+                s = enrich_programs(self.tag, client, cursor, db_conn,
+                                    self.batch_limit, self.max_attempts,
+                                    self.api_delay_sec, self.api_timeout_sec)
+                grand_total += s.get('updated', 0)
+                all_stats['programs'] = s
+
+                # Another pass only if new-row events arrived during this one
+                if not DRAIN_GATE.finish():
+                    break
+        finally:
+            DRAIN_GATE.release()
 
         if grand_total > 0:
             log(self.tag, f"DB poll: {grand_total} enriched")
@@ -1243,16 +1263,20 @@ class WorkerThread(threading.Thread):
 def read_config(cursor):
     return {
         'threads':          get_config_int(cursor, 'queue', 'enricher_wrk_cnt_threads', 0),
+        'autoscale':        get_config_int(cursor, 'queue', 'enricher_wrk_autoscale', 0),
+        'threads_min':      get_config_int(cursor, 'queue', 'enricher_wrk_cnt_threads_min', 1),
+        'threads_max':      get_config_int(cursor, 'queue', 'enricher_wrk_cnt_threads_max', 8),
         'prefetch':         get_config_int(cursor, 'queue', 'enricher_wrk_cnt_prefetch', 5),
         'supervisor_poll':  get_config_float(cursor, 'queue', 'enricher_wrk_supervisor_poll_sec', 5.0),
         'poll_idle':        get_config_float(cursor, 'queue', 'enricher_wrk_poll_idle_sec', 0.25),
         'reconnect':        get_config_float(cursor, 'queue', 'enricher_wrk_reconnect_sec', 5.0),
         'shutdown_timeout': get_config_float(cursor, 'queue', 'enricher_wrk_shutdown_timeout_sec', 10.0),
         'api_timeout':      get_config_float(cursor, 'queue', 'enricher_wrk_api_timeout_sec', 60.0),
-        'api_delay':        get_config_float(cursor, 'queue', 'enricher_wrk_api_delay_sec', 0.30),
+        'api_delay':        get_config_float(cursor, 'queue', 'enricher_wrk_api_delay_sec', 0.0),
         'batch_limit':      get_config_int(cursor, 'queue', 'enricher_wrk_batch_limit', 100),
         'max_attempts':     get_config_int(cursor, 'queue', 'enricher_wrk_max_attempts', 3),
         'db_poll':          get_config_float(cursor, 'queue', 'enricher_wrk_db_poll_sec', 0),
+        'db_poll_fallback': get_config_float(cursor, 'queue', 'enricher_wrk_db_poll_fallback_sec', 300.0),
     }
 
 
@@ -1265,6 +1289,12 @@ def run_supervisor(dry_run=False):
 """, flush=True)
 
     workers = {}
+    start_exporter(METRICS)
+    get_solscan_client().set_observer(METRICS.record)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
+    autoscaler = ThreadAutoscaler('enricher', METRICS, get_solscan_client(),
+                                  log_fn=lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
@@ -1319,12 +1349,26 @@ def run_supervisor(dry_run=False):
             properties=pika.BasicProperties(delivery_mode=2, content_type='application/json'))
         log('SVR', 'Published db-poll-enrich to queue')
 
+    def queue_depth():
+        """Request queue backlog for the autoscaler (None when RabbitMQ is down)."""
+        nonlocal svr_rmq_conn
+        if not ensure_svr_rmq():
+            return None
+        try:
+            return svr_rmq_ch.queue_declare(queue=REQUEST_QUEUE, passive=True).method.message_count
+        except Exception as e:
+            log('SVR', f'Queue depth check failed: {e}')
+            svr_rmq_conn = None
+            return None
+
     try:
         while True:
             if not ensure_svr_db():
                 time.sleep(DB_FALLBACK_RETRY_SEC)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -1334,11 +1378,16 @@ def run_supervisor(dry_run=False):
                 del workers[wid]
 
             active = len(workers)
-            if active != cfg['threads']:
-                log('SVR', f"Config: threads={cfg['threads']} prefetch={cfg['prefetch']} | active={active}")
+            target = cfg['threads']
+            if cfg['autoscale']:
+                target = autoscaler.decide(active, queue_depth(),
+                                           cfg['threads_min'], cfg['threads_max'])
+
+            if active != target:
+                log('SVR', f"Config: threads={target} prefetch={cfg['prefetch']} | active={active}")
 
             # Scale up
-            while len(workers) < cfg['threads']:
+            while len(workers) < target:
                 stop_evt = threading.Event()
                 w = WorkerThread(
                     next_id, cfg['prefetch'], dry_run, stop_evt,
@@ -1349,15 +1398,16 @@ def run_supervisor(dry_run=False):
                 next_id += 1
 
             # Scale down (stop newest first)
-            while len(workers) > cfg['threads']:
+            while len(workers) > target:
                 wid = max(workers.keys())
                 wthread, stop_evt = workers.pop(wid)
                 log('SVR', f'Stopping W-{wid}...')
                 stop_evt.set()
 
-            # DB poll scheduler
+            # DB poll fallback (shredder/aggregator work events trigger the real-time passes)
             now = time.time()
-            if cfg['db_poll'] > 0 and active > 0 and (now - last_db_poll) >= cfg['db_poll']:
+            db_poll_sec = max(cfg['db_poll'], cfg['db_poll_fallback'])
+            if cfg['db_poll'] > 0 and active > 0 and (now - last_db_poll) >= db_poll_sec:
                 if ensure_svr_rmq():
                     try:
                         publish_db_poll()
@@ -1402,7 +1452,7 @@ def run_manual(args):
     """Run enrichment manually (single run or specific operations)."""
     conn = db_connect()
     cursor = conn.cursor(dictionary=True)
-    session = solscan_session()
+    client = get_solscan_client()
 
     try:
         # Status mode
@@ -1441,11 +1491,11 @@ def run_manual(args):
             else:
                 pool_id = row['id']
 
-            api_data = fetch_pool_info(session, address, 30)
+            api_data = fetch_pool_info(client, address, 30)
             if api_data:
                 log('MANUAL', f"  Program: {api_data.get('program_id', 'unknown')}")
             time.sleep(0.3)
-            metadata = fetch_account_metadata(session, address, 30)
+            metadata = fetch_account_metadata(client, address, 30)
             label = metadata.get('account_label') if metadata else None
             if label:
                 log('MANUAL', f"  Label: {label}")
@@ -1467,19 +1517,18 @@ def run_manual(args):
         log('MANUAL', f"Operations: {', '.join(operations)}, limit={limit}")
 
         if 'tokens' in operations:
-            s = enrich_tokens('MANUAL', session, cursor, conn, limit, max_attempts, delay, 30)
+            s = enrich_tokens('MANUAL', client, cursor, conn, limit, max_attempts, delay, 30)
             log('MANUAL', f"Tokens: {s.get('updated', 0)} updated, {s.get('failed', 0)} failed")
 
         if 'pools' in operations:
-            s = enrich_pools('MANUAL', session, cursor, conn, limit, max_attempts, delay, 30)
+            s = enrich_pools('MANUAL', client, cursor, conn, limit, max_attempts, delay, 30)
             log('MANUAL', f"Pools: {s.get('updated', 0)} updated, {s.get('not_found', 0)} not found")
 
         if 'programs' in operations:
-            s = enrich_programs('MANUAL', session, cursor, conn, limit, max_attempts, delay, 30)
+            s = enrich_programs('MANUAL', client, cursor, conn, limit, max_attempts, delay, 30)
             log('MANUAL', f"Programs: {s.get('updated', 0)} updated ({s.get('known', 0)} known)")
 
     finally:
-        session.close()
         conn.close()
 
     return 0
@@ -11,16 +11,28 @@ types, and writes results to tx_address.
 
 Config keys (config_type='queue'):
     funder_wrk_cnt_threads           - desired worker thread count (0 = idle)
+    funder_wrk_autoscale             - 1 = autoscale threads between min/max from queue
+                                       depth, message latency and Solscan 429 rate
+    funder_wrk_cnt_threads_min       - autoscale lower bound
+    funder_wrk_cnt_threads_max       - autoscale upper bound
     funder_wrk_cnt_prefetch          - RabbitMQ prefetch per worker channel
     funder_wrk_supervisor_poll_sec   - supervisor config poll interval
     funder_wrk_poll_idle_sec         - worker sleep when no message available
     funder_wrk_reconnect_sec         - delay before reconnecting after errors
     funder_wrk_shutdown_timeout_sec  - max wait for worker thread on shutdown
     funder_wrk_api_timeout_sec       - Solscan API request timeout
-    funder_wrk_api_delay_sec         - delay between individual API calls
+    funder_wrk_api_delay_sec         - extra delay between API batches (0 = rely on the
+                                       shared Solscan rate limiter, SOLSCAN_RATE_PER_SEC)
     funder_wrk_batch_delay_sec       - delay between processing batches
     funder_wrk_deadlock_max_retries  - max deadlock retry attempts
     funder_wrk_deadlock_base_delay   - initial deadlock retry delay (seconds)
+    funder_wrk_db_poll_sec           - supervisor DB poll interval (0 = disabled)
+    funder_wrk_db_poll_fallback_sec  - floor on the poll interval while the aggregator
+                                       publishes work events (0 = poll every db_poll_sec)
+
+DB polls (sync-db-missing) are driven by work events (common.work_events): the
+aggregator publishes one after committing new tx_guide edges, and the supervisor
+timer is only a slow fallback. Concurrent polls/events coalesce into one drain.
 
 Manual modes (run directly, not as service):
     python guide-funder.py --sync-db-missing
@@ -37,7 +49,6 @@ import re
 import sys
 import time
 import threading
-import requests
 import pika
 import mysql.connector
 from mysql.connector import Error as MySQLError
@@ -51,17 +62,21 @@ from typing import Optional, Dict, List, Set
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
-    get_db_config, get_rabbitmq_config, get_solscan_config,
+    get_db_config, get_rabbitmq_config,
     get_queue_names, get_retry_config, nack_with_retry,
 )
+from t16o_exchange.guide.common.autoscaler import ThreadAutoscaler
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.request_log_writer import get_request_log_writer
+from t16o_exchange.guide.common.address_cache import get_address_resolver
+from t16o_exchange.guide.common.solscan_client import get_solscan_client
+from t16o_exchange.guide.common.work_events import DrainGate
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
-_solscan            = get_solscan_config()
 _rmq                = get_rabbitmq_config()
 _queues             = get_queue_names('funder')
 _retry              = get_retry_config()
 
-SOLSCAN_API_BASE    = _solscan['api_base']
-SOLSCAN_API_TOKEN   = _solscan['token']
 RABBITMQ_HOST       = _rmq['host']
 RABBITMQ_PORT       = _rmq['port']
 RABBITMQ_USER       = _rmq['user']
@@ -74,6 +89,11 @@ REQUEST_QUEUE       = _queues['request']
 RESPONSE_QUEUE      = _queues['response']
 DLQ_QUEUE           = _queues['dlq']
 DB_CONFIG           = get_db_config()
+METRICS             = get_worker_metrics('funder')
+REQUEST_LOG         = get_request_log_writer(log_fn=lambda msg: log('RLOG', msg))
+
+# One sync-db-missing drain at a time per process, however many events/polls arrive
+DRAIN_GATE = DrainGate()
 
 # SOL token addresses for funding detection
 SOL_TOKEN   = 'So11111111111111111111111111111111111111111'
@@ -101,39 +121,11 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
@@ -196,6 +188,8 @@ def execute_with_deadlock_retry(cursor, conn, query, params=None,
 
 def log_worker_request(cursor, conn, request_id, correlation_id,
                        batch_size, priority, api_key_id):
+    # Synchronous, unlike the other workers: the row id is stamped on
+    # tx_address.request_log_id for billing. Status updates go through REQUEST_LOG.
     if api_key_id is not None:
         cursor.execute(
             "SELECT id FROM tx_request_log "
@@ -221,49 +215,30 @@ def log_worker_request(cursor, conn, request_id, correlation_id,
     return cursor.lastrowid
 
 
-def update_worker_request(cursor, conn, log_id, status, result=None):
-    cursor.execute(
-        "UPDATE tx_request_log SET status=%s, result_summary=%s, completed_at=NOW() WHERE id=%s",
-        (status, json.dumps(result) if result else None, log_id))
-    conn.commit()
+def update_worker_request(log_ref, status, result=None):
+    REQUEST_LOG.log_status(log_ref, status, result)
 
 
-def log_daemon_request(cursor, conn, action, batch_size):
+def log_daemon_request(action, batch_size):
     import uuid
     request_id = f"daemon-funder-{uuid.uuid4().hex[:12]}"
-    cursor.execute(
-        "INSERT INTO tx_request_log "
-        "(request_id, correlation_id, api_key_id, source, target_worker, "
-        " action, priority, status, payload_summary) "
-        "VALUES (%s,%s,NULL,'daemon','funder',%s,5,'processing',%s)",
-        (request_id, request_id, action,
-         json.dumps({'batch_size': batch_size})))
-    conn.commit()
-    log_id = cursor.lastrowid
-    log('DAEMON', f"request_log id={log_id}")
-    return log_id
+    log('DAEMON', f"request_log request_id={request_id}")
+    return REQUEST_LOG.log_request(
+        request_id, 'funder', None,
+        correlation_id=request_id, source='daemon', action=action,
+        priority=5, status='processing', payload_summary={'batch_size': batch_size})
 
 
 # =============================================================================
 # Solscan API
 # =============================================================================
 
-def solscan_session():
-    s = requests.Session()
-    s.headers['token'] = SOLSCAN_API_TOKEN
-    return s
-
-
-def fetch_account_metadata_multi(session, addresses, api_timeout, limit=50):
+def fetch_account_metadata_multi(client, addresses, api_timeout, limit=50):
     if not addresses:
         return {}
     addresses = addresses[:limit]
-    url = f"{SOLSCAN_API_BASE}/account/metadata/multi"
-    params = [('address[]', addr) for addr in addresses]
     try:
-        r = session.get(url, params=params, timeout=api_timeout)
-        r.raise_for_status()
-        result = r.json()
+        result = client.account_metadata_multi(addresses, timeout=api_timeout)
         metadata_map = {}
         if result.get('success') and result.get('data'):
             for item in result['data']:
@@ -276,12 +251,9 @@ def fetch_account_metadata_multi(session, addresses, api_timeout, limit=50):
         return {}
 
 
-def fetch_account_metadata(session, address, api_timeout):
-    url = f"{SOLSCAN_API_BASE}/account/metadata"
+def fetch_account_metadata(client, address, api_timeout):
     try:
-        r = session.get(url, params={'address': address}, timeout=api_timeout)
-        r.raise_for_status()
-        result = r.json()
+        result = client.account_metadata(address, timeout=api_timeout)
         if result.get('success') and result.get('data'):
             return result['data']
     except Exception as e:
@@ -289,10 +261,9 @@ def fetch_account_metadata(session, address, api_timeout):
     return None
 
 
-def fetch_account_transfers(session, address, page_size, api_timeout, token_filter=None):
+def fetch_account_transfers(client, address, page_size, api_timeout, token_filter=None):
     valid_sizes = [10, 20, 30, 40, 60, 100]
     actual_size = min([s for s in valid_sizes if s >= page_size], default=100)
-    url = f"{SOLSCAN_API_BASE}/account/transfer"
     params = {
         'address': address, 'page': 1, 'page_size': actual_size,
         'sort_by': 'block_time', 'sort_order': 'asc'
@@ -300,9 +271,7 @@ def fetch_account_transfers(session, address, page_size, api_timeout, token_filt
     if token_filter:
         params['token'] = token_filter
     try:
-        r = session.get(url, params=params, timeout=api_timeout)
-        r.raise_for_status()
-        return r.json()
+        return client.get('/account/transfer', params, timeout=api_timeout)
     except Exception as e:
         log('API', f"account/transfer error for {address[:12]}...: {e}")
     return None
@@ -437,21 +406,14 @@ def save_funding_info(tag, cursor, conn, target_address, funding_info,
 
     for attempt in range(max_retries):
         try:
-            # Upsert funder address
-            cursor.execute("SELECT id FROM tx_address WHERE address = %s", (funder,))
-            funder_row = cursor.fetchone()
-            if funder_row:
-                funder_id = funder_row['id']
-            else:
-                cursor.execute(
-                    "INSERT INTO tx_address (address, address_type, init_tx_fetched, request_log_id) "
-                    "VALUES (%s, 'wallet', 1, %s)", (funder, request_log_id))
-                funder_id = cursor.lastrowid
+            # Upsert funder address (inside this transaction — not cached until committed)
+            resolver = get_address_resolver()
+            funder_id = resolver.resolve(
+                conn, funder, 'wallet', commit=False,
+                extra={'init_tx_fetched': 1, 'request_log_id': request_log_id})
 
             # Get target address ID for pool record creation
-            cursor.execute("SELECT id FROM tx_address WHERE address = %s", (target_address,))
-            target_row = cursor.fetchone()
-            target_id = target_row['id'] if target_row else None
+            target_id = resolver.resolve(conn, target_address, create=False)
 
             # Build dynamic UPDATE
             update_fields = ["funded_by_address_id = %s"]
@@ -551,7 +513,7 @@ def save_funding_info(tag, cursor, conn, target_address, funding_info,
                 raise
 
 
-def process_addresses(tag, cursor, conn, session, addresses,
+def process_addresses(tag, cursor, conn, client, addresses,
                       api_timeout, api_delay, max_retries, base_delay,
                       force=False, request_log_id=None):
     """
@@ -620,7 +582,7 @@ def process_addresses(tag, cursor, conn, session, addresses,
         log(tag, f"Batch {batch_num}/{total_batches}: {len(batch)} addresses")
 
         # Batch metadata API
-        metadata_map = fetch_account_metadata_multi(session, batch, api_timeout)
+        metadata_map = fetch_account_metadata_multi(client, batch, api_timeout)
         log(tag, f"  Got metadata for {len(metadata_map)} addresses")
 
         for i, addr in enumerate(batch):
@@ -655,8 +617,8 @@ def process_addresses(tag, cursor, conn, session, addresses,
             initialized.append(addr)
             result['processed'] += 1
 
-        # Delay between API batch calls
-        if batch_start + batch_size < total:
+        # Pacing comes from the shared Solscan limiter; api_delay is optional extra spacing
+        if api_delay > 0 and batch_start + batch_size < total:
             time.sleep(api_delay)
 
     # Mark all processed
@@ -692,7 +654,7 @@ class WorkerThread(threading.Thread):
 
     def run(self):
         log(self.tag, f"Starting (prefetch={self.prefetch})")
-        session = solscan_session()
+        client = get_solscan_client()
         db_conn = None
         cursor = None
 
@@ -716,7 +678,8 @@ class WorkerThread(threading.Thread):
                         rmq_conn.process_data_events(time_limit=0)
                         continue
 
-                    self._handle_message(ch, method, properties, body, cursor, db_conn, session)
+                    with METRICS.message(body, properties):
+                        self._handle_message(ch, method, properties, body, cursor, db_conn, client)
 
                     if self.batch_delay_sec > 0:
                         time.sleep(self.batch_delay_sec)
@@ -743,10 +706,9 @@ class WorkerThread(threading.Thread):
                 db_conn.close()
             except Exception:
                 pass
-        session.close()
         log(self.tag, "Stopped")
 
-    def _handle_message(self, ch, method, properties, body, cursor, db_conn, session):
+    def _handle_message(self, ch, method, properties, body, cursor, db_conn, client):
         worker_log_id = None
         try:
             import uuid
@@ -758,9 +720,9 @@ class WorkerThread(threading.Thread):
             priority       = msg.get('priority', 5)
             batch          = msg.get('batch', {})
 
-            # ── sync-db-missing: supervisor-scheduled DB poll ──
+            # ── sync-db-missing: aggregator work event or supervisor fallback timer ──
             if action == 'sync-db-missing':
-                self._handle_db_poll(ch, method, cursor, db_conn, session)
+                self._handle_db_poll(ch, method, cursor, db_conn, client, msg.get('ts'))
                 return
 
             # ── Normal queue message: explicit addresses ──
@@ -781,7 +743,7 @@ class WorkerThread(threading.Thread):
 
             if not addresses:
                 resp = {'processed': 0, 'funders_found': 0, 'funders_not_found': 0}
-                update_worker_request(cursor, db_conn, worker_log_id, 'completed', resp)
+                update_worker_request(worker_log_id, 'completed', resp)
                 self._publish_response(ch, request_id, correlation_id, 'completed',
                                        resp, worker_log_id)
                 ch.basic_ack(delivery_tag=method.delivery_tag)
@@ -789,7 +751,7 @@ class WorkerThread(threading.Thread):
 
             force = (action == 'process')
             result = process_addresses(
-                self.tag, cursor, db_conn, session, addresses,
+                self.tag, cursor, db_conn, client, addresses,
                 self.api_timeout_sec, self.api_delay_sec,
                 self.deadlock_max_retries, self.deadlock_base_delay,
                 force=force, request_log_id=worker_log_id)
@@ -805,7 +767,7 @@ class WorkerThread(threading.Thread):
                     'funders_not_found': result['funders_not_found'],
                 }
 
-            update_worker_request(cursor, db_conn, worker_log_id, status, resp)
+            update_worker_request(worker_log_id, status, resp)
             self._publish_response(ch, request_id, correlation_id, status,
                                    resp, worker_log_id)
             ch.basic_ack(delivery_tag=method.delivery_tag)
@@ -817,77 +779,81 @@ class WorkerThread(threading.Thread):
             raise
         except Exception as e:
             log(self.tag, f"ERROR processing message -> DLQ: {e}")
+            METRICS.incr('dlq')
             import traceback
             traceback.print_exc()
-            if worker_log_id:
-                try:
-                    update_worker_request(cursor, db_conn, worker_log_id, 'failed', {'error': str(e)})
-                except Exception:
-                    pass
+            update_worker_request(worker_log_id, 'failed', {'error': str(e)})
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
-    def _handle_db_poll(self, ch, method, cursor, db_conn, session):
-        """Handle supervisor-scheduled DB poll — loops until no more unfunded addresses."""
+    def _handle_db_poll(self, ch, method, cursor, db_conn, client, event_ts=None):
+        """Handle a work event / fallback DB poll — loops until no more unfunded addresses."""
+        if not DRAIN_GATE.begin(event_ts):
+            # Stale event, or another thread is draining and will go around again
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
         total_processed = 0
         total_found = 0
         total_not_found = 0
         batch_num = 0
 
-        while not self.stop_event.is_set():
-            batch_size = get_config_int(cursor, 'batch', 'funder_batch_size', 10)
-
-            cursor.execute(
-                "SELECT address FROM tx_address "
-                "WHERE funded_by_address_id IS NULL "
-                "  AND (init_tx_fetched = 0 OR init_tx_fetched IS NULL) "
-                "ORDER BY id ASC LIMIT %s", (batch_size,))
-            candidates = [row['address'] for row in cursor.fetchall()]
-
-            if not candidates:
-                break
-
-            # Filter system addresses and mark them done
-            skip = [a for a in candidates if should_skip_address(a)]
-            if skip:
-                mark_addresses_initialized(cursor, db_conn, skip,
-                                           self.deadlock_max_retries, self.deadlock_base_delay)
-            candidates = [a for a in candidates if not should_skip_address(a)]
-
-            if not candidates:
-                continue
-
-            batch_num += 1
-            log(self.tag, f"DB poll batch {batch_num}: {len(candidates)} unfunded addresses")
-
-            result = process_addresses(
-                self.tag, cursor, db_conn, session, candidates,
-                self.api_timeout_sec, self.api_delay_sec,
-                self.deadlock_max_retries, self.deadlock_base_delay)
-
-            total_processed += result['processed']
-            total_found += result['funders_found']
-            total_not_found += result['funders_not_found']
-
-            log(self.tag, f"  batch {batch_num}: {result['processed']} processed, "
-                f"{result['funders_found']} found, {result['funders_not_found']} not found")
+        try:
+            while not self.stop_event.is_set():
+                batch_size = get_config_int(cursor, 'batch', 'funder_batch_size', 10)
 
-            if self.batch_delay_sec > 0:
-                time.sleep(self.batch_delay_sec)
+                cursor.execute(
+                    "SELECT address FROM tx_address "
+                    "WHERE funded_by_address_id IS NULL "
+                    "  AND (init_tx_fetched = 0 OR init_tx_fetched IS NULL) "
+                    "ORDER BY id ASC LIMIT %s", (batch_size,))
+                candidates = [row['address'] for row in cursor.fetchall()]
+
+                if not candidates:
+                    # Another sweep only if new-address events arrived during this one
+                    if not DRAIN_GATE.finish():
+                        break
+                    continue
+
+                # Filter system addresses and mark them done
+                skip = [a for a in candidates if should_skip_address(a)]
+                if skip:
+                    mark_addresses_initialized(cursor, db_conn, skip,
+                                               self.deadlock_max_retries, self.deadlock_base_delay)
+                candidates = [a for a in candidates if not should_skip_address(a)]
+
+                if not candidates:
+                    continue
+
+                batch_num += 1
+                log(self.tag, f"DB poll batch {batch_num}: {len(candidates)} unfunded addresses")
+
+                result = process_addresses(
+                    self.tag, cursor, db_conn, client, candidates,
+                    self.api_timeout_sec, self.api_delay_sec,
+                    self.deadlock_max_retries, self.deadlock_base_delay)
+
+                total_processed += result['processed']
+                total_found += result['funders_found']
+                total_not_found += result['funders_not_found']
+
+                log(self.tag, f"  batch {batch_num}: {result['processed']} processed, "
+                    f"{result['funders_found']} found, {result['funders_not_found']} not found")
+
+                if self.batch_delay_sec > 0:
+                    time.sleep(self.batch_delay_sec)
+        finally:
+            DRAIN_GATE.release()
 
         if total_processed > 0:
             log(self.tag, f"DB poll complete: {batch_num} batches, {total_processed} processed, "
                 f"{total_found} found, {total_not_found} not found")
-            try:
-                dl_id = log_daemon_request(cursor, db_conn,
-                                           'sync-db-missing', total_processed)
-                update_worker_request(cursor, db_conn, dl_id, 'completed', {
-                    'batches': batch_num,
-                    'processed': total_processed,
-                    'funders_found': total_found,
-                    'funders_not_found': total_not_found
-                })
-            except Exception as e:
-                log(self.tag, f"Failed to log request: {e}")
+            dl_id = log_daemon_request('sync-db-missing', total_processed)
+            update_worker_request(dl_id, 'completed', {
+                'batches': batch_num,
+                'processed': total_processed,
+                'funders_found': total_found,
+                'funders_not_found': total_not_found
+            })
 
         ch.basic_ack(delivery_tag=method.delivery_tag)
 
@@ -914,17 +880,21 @@ class WorkerThread(threading.Thread):
 def read_config(cursor):
     return {
         'threads':          get_config_int(cursor, 'queue', 'funder_wrk_cnt_threads', 0),
+        'autoscale':        get_config_int(cursor, 'queue', 'funder_wrk_autoscale', 0),
+        'threads_min':      get_config_int(cursor, 'queue', 'funder_wrk_cnt_threads_min', 1),
+        'threads_max':      get_config_int(cursor, 'queue', 'funder_wrk_cnt_threads_max', 8),
         'prefetch':         get_config_int(cursor, 'queue', 'funder_wrk_cnt_prefetch', 5),
         'supervisor_poll':  get_config_float(cursor, 'queue', 'funder_wrk_supervisor_poll_sec', 5.0),
         'poll_idle':        get_config_float(cursor, 'queue', 'funder_wrk_poll_idle_sec', 0.25),
         'reconnect':        get_config_float(cursor, 'queue', 'funder_wrk_reconnect_sec', 5.0),
         'shutdown_timeout': get_config_float(cursor, 'queue', 'funder_wrk_shutdown_timeout_sec', 10.0),
         'api_timeout':      get_config_float(cursor, 'queue', 'funder_wrk_api_timeout_sec', 60.0),
-        'api_delay':        get_config_float(cursor, 'queue', 'funder_wrk_api_delay_sec', 0.30),
+        'api_delay':        get_config_float(cursor, 'queue', 'funder_wrk_api_delay_sec', 0.0),
         'batch_delay':      get_config_float(cursor, 'queue', 'funder_wrk_batch_delay_sec', 1.0),
         'deadlock_max':     get_config_int(cursor, 'queue', 'funder_wrk_deadlock_max_retries', 5),
         'deadlock_delay':   get_config_float(cursor, 'queue', 'funder_wrk_deadlock_base_delay', 0.1),
         'db_poll':          get_config_float(cursor, 'queue', 'funder_wrk_db_poll_sec', 0),
+        'db_poll_fallback': get_config_float(cursor, 'queue', 'funder_wrk_db_poll_fallback_sec', 300.0),
     }
 
 
@@ -937,6 +907,12 @@ def run_supervisor(dry_run=False):
 """, flush=True)
 
     workers = {}
+    start_exporter(METRICS)
+    get_solscan_client().set_observer(METRICS.record)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
+    autoscaler = ThreadAutoscaler('funder', METRICS, get_solscan_client(),
+                                  log_fn=lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
@@ -993,12 +969,26 @@ def run_supervisor(dry_run=False):
             properties=pika.BasicProperties(delivery_mode=2, content_type='application/json'))
         log('SVR', 'Published sync-db-missing to queue')
 
+    def queue_depth():
+        """Request queue backlog for the autoscaler (None when RabbitMQ is down)."""
+        nonlocal svr_rmq_conn
+        if not ensure_svr_rmq():
+            return None
+        try:
+            return svr_rmq_ch.queue_declare(queue=REQUEST_QUEUE, passive=True).method.message_count
+        except Exception as e:
+            log('SVR', f'Queue depth check failed: {e}')
+            svr_rmq_conn = None
+            return None
+
     try:
         while True:
             if not ensure_svr_db():
                 time.sleep(DB_FALLBACK_RETRY_SEC)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -1008,11 +998,16 @@ def run_supervisor(dry_run=False):
                 del workers[wid]
 
             active = len(workers)
-            if active != cfg['threads']:
-                log('SVR', f"Config: threads={cfg['threads']} prefetch={cfg['prefetch']} | active={active}")
+            target = cfg['threads']
+            if cfg['autoscale']:
+                target = autoscaler.decide(active, queue_depth(),
+                                           cfg['threads_min'], cfg['threads_max'])
+
+            if active != target:
+                log('SVR', f"Config: threads={target} prefetch={cfg['prefetch']} | active={active}")
 
             # Scale up
-            while len(workers) < cfg['threads']:
+            while len(workers) < target:
                 stop_evt = threading.Event()
                 w = WorkerThread(
                     next_id, cfg['prefetch'], dry_run, stop_evt,
@@ -1024,15 +1019,16 @@ def run_supervisor(dry_run=False):
                 next_id += 1
 
             # Scale down (stop newest first)
-            while len(workers) > cfg['threads']:
+            while len(workers) > target:
                 wid = max(workers.keys())
                 wthread, stop_evt = workers.pop(wid)
                 log('SVR', f'Stopping W-{wid}...')
                 stop_evt.set()
 
-            # DB poll scheduler: publish sync-db-missing at configured interval
+            # DB poll fallback: aggregator work events trigger the real-time drains
             now = time.time()
-            if cfg['db_poll'] > 0 and active > 0 and (now - last_db_poll) >= cfg['db_poll']:
+            db_poll_sec = max(cfg['db_poll'], cfg['db_poll_fallback'])
+            if cfg['db_poll'] > 0 and active > 0 and (now - last_db_poll) >= db_poll_sec:
                 if ensure_svr_rmq():
                     try:
                         publish_db_poll()
@@ -1055,6 +1051,9 @@ def run_supervisor(dry_run=False):
         if w.is_alive():
             log('SVR', f'W-{wid} did not stop in time')
 
+    # Write buffered request-log rows before exiting
+    REQUEST_LOG.close()
+
     if svr_rmq_conn:
         try:
             svr_rmq_conn.close()
@@ -1079,7 +1078,7 @@ def run_sync_db_missing(args):
 
     conn = db_connect()
     cursor = conn.cursor(dictionary=True)
-    session = solscan_session()
+    client = get_solscan_client()
 
     total_limit = args.limit if args.limit > 0 else float('inf')
     processed = 0
@@ -1131,7 +1130,7 @@ def run_sync_db_missing(args):
                 continue
 
             # Batch API
-            metadata_map = fetch_account_metadata_multi(session, claimed, 60)
+            metadata_map = fetch_account_metadata_multi(client, claimed, 60)
             log('SYNC', f"  Got metadata for {len(metadata_map)} addresses")
 
             initialized = []
@@ -1170,8 +1169,8 @@ def run_sync_db_missing(args):
             mark_addresses_initialized(cursor, conn, initialized)
 
             if funders_found > 0:
-                dl_id = log_daemon_request(cursor, conn, 'discover', len(claimed))
-                update_worker_request(cursor, conn, dl_id, 'completed', {
+                dl_id = log_daemon_request('discover', len(claimed))
+                update_worker_request(dl_id, 'completed', {
                     'processed': len(initialized),
                     'funders_found': funders_found,
                     'funders_not_found': funders_not_found
@@ -1182,7 +1181,6 @@ def run_sync_db_missing(args):
     except KeyboardInterrupt:
         log('SYNC', 'Interrupted')
     finally:
-        session.close()
         conn.close()
 
     log('SYNC', f"Done: processed={processed}, found={funders_found}, not_found={funders_not_found}")
@@ -1194,7 +1192,7 @@ def run_sync_db_missing_metadata(args):
 
     conn = db_connect()
     cursor = conn.cursor(dictionary=True)
-    session = solscan_session()
+    client = get_solscan_client()
 
     total_limit = args.limit if args.limit > 0 else float('inf')
     processed = 0
@@ -1237,7 +1235,7 @@ def run_sync_db_missing_metadata(args):
                 processed += len(addresses)
                 continue
 
-            metadata_map = fetch_account_metadata_multi(session, addresses, 60)
+            metadata_map = fetch_account_metadata_multi(client, addresses, 60)
             log('META', f"Got metadata for {len(metadata_map)} addresses")
 
             for addr in addresses:
@@ -1292,7 +1290,6 @@ def run_sync_db_missing_metadata(args):
     except KeyboardInterrupt:
         log('META', 'Interrupted')
     finally:
-        session.close()
         conn.close()
 
     log('META', f"Done: processed={processed}, updated={updated}, not_found={not_found}")
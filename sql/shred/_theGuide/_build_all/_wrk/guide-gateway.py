@@ -35,11 +35,17 @@ Usage:
     # Debug mode
     python guide-gateway.py --debug
 
+    # Benchmark publish latency (per-call connection vs pooled publisher)
+    python guide-gateway.py --bench-publish 2000 --bench-threads 4
+
+    # Load-test the correlation tracker (10k concurrent pipelines, in-memory)
+    python guide-gateway.py --bench-tracker 10000 --bench-threads 8
+
 API Endpoints:
     POST /api/trigger/<worker>   - Trigger a worker with request payload
     GET  /api/status/<request_id> - Get status of a request
     GET  /api/workers             - List available workers
-    GET  /api/health              - Health check
+    GET  /api/health              - Health check (+ per-worker stage latency / bottleneck)
 """
 
 import argparse
@@ -69,7 +75,6 @@ except ImportError:
 
 # MySQL connector
 try:
-    import mysql.connector
     from mysql.connector import Error as MySQLError
     HAS_MYSQL = True
 except ImportError:
@@ -81,14 +86,20 @@ except ImportError:
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
-    get_db_config, get_rabbitmq_config, get_queue_names,
-    nack_with_retry,
+    get_db_config, get_db_pool_config, get_rabbitmq_config, get_queue_names,
+    get_tracker_config, nack_with_retry,
+)
+from t16o_exchange.guide.common.bmap_cache import (
+    BMAP_INVALIDATE_EXCHANGE, apply_bmap_invalidation, get_bmap_cache, window_bounds,
 )
+from t16o_exchange.guide.common.worker_metrics import aggregate_metrics, read_metrics
 
 _rmq = get_rabbitmq_config()
 _queues = get_queue_names('gateway')
 
 DB_CONFIG = get_db_config()
+DB_POOL_CONFIG = get_db_pool_config()
+TRACKER_CONFIG = get_tracker_config()
 RABBITMQ_CONFIG = {
     'host':     _rmq['host'],
     'port':     _rmq['port'],
@@ -96,6 +107,7 @@ RABBITMQ_CONFIG = {
     'password': _rmq['password'],
     'vhost':    _rmq['vhost'],
 }
+RABBITMQ_PUBLISHER_POOL_SIZE = _rmq['publisher_pool_size']
 
 # Gateway
 GATEWAY_PORT = 5100
@@ -106,17 +118,6 @@ GATEWAY_REQUEST_QUEUE = _queues['request']
 GATEWAY_RESPONSE_QUEUE = _queues['response']
 GATEWAY_DLQ = _queues['dlq']
 
-# Correlation tracking for pipeline completion detection
-# Structure: {correlation_id: {
-#     'expected_batches': int,        # Total batches from producer (0 until producer responds)
-#     'expected_workers': ['decoder', 'detailer'],  # Workers that should respond per batch
-#     'received': {'decoder': set(), 'detailer': set()},  # batch_nums received per worker
-#     'started_at': datetime,
-#     'producer_done': bool
-# }}
-_correlation_tracker: Dict[str, Dict] = {}
-_tracker_lock = threading.Lock()
-
 # Default downstream workers for producer (decoder + detailer fetch, then shredder processes)
 # Shredder is the final stage - pipeline is complete when shredder finishes
 DEFAULT_DOWNSTREAM_WORKERS = ['decoder', 'detailer', 'shredder']
@@ -141,115 +142,110 @@ FEATURE_FUNDER_DISCOVERY  = 0x0010  # Solscan API funder lookups
 # - Program details (collected in activities)
 
 
-def _get_or_create_tracker(correlation_id: str) -> Dict:
-    """Get existing tracker or create a new one (must be called with lock held)"""
-    if correlation_id not in _correlation_tracker:
-        _correlation_tracker[correlation_id] = {
-            'expected_batches': 0,  # Unknown until producer responds
-            'expected_workers': DEFAULT_DOWNSTREAM_WORKERS,
-            'received': {w: set() for w in DEFAULT_DOWNSTREAM_WORKERS},
-            'started_at': datetime.now(),
-            'producer_done': False
-        }
-    return _correlation_tracker[correlation_id]
+# =============================================================================
+# Correlation Tracking (pipeline completion detection)
+# =============================================================================
+# Striped, TTL-bounded tracker; optionally written through to
+# tx_correlation_tracker so in-flight correlations survive a gateway restart.
 
-def record_batch_response(correlation_id: str, worker: str, batch_num: int) -> Optional[Dict]:
-    """Record a batch response and return completion status if pipeline is done"""
-    with _tracker_lock:
-        tracker = _get_or_create_tracker(correlation_id)
+_tracker = None
+_tracker_lock = threading.Lock()
 
-        if worker in tracker['received']:
-            tracker['received'][worker].add(batch_num)
 
-        # Can only check completion if producer has reported expected batch count
-        if not tracker['producer_done'] or tracker['expected_batches'] == 0:
-            return None
+def get_tracker():
+    """Get (or lazily create) the process-wide CorrelationTracker"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                from t16o_exchange.guide.common.correlation_tracker import (
+                    CorrelationTracker, MySQLTrackerStore,
+                )
+                store = MySQLTrackerStore(get_db_connection) if TRACKER_CONFIG['persist'] else None
+                tracker = CorrelationTracker(
+                    DEFAULT_DOWNSTREAM_WORKERS,
+                    # Shredder sends ONE response when all staging rows are done
+                    single_response_workers={'shredder'},
+                    ttl_sec=TRACKER_CONFIG['ttl_sec'],
+                    stripes=TRACKER_CONFIG['stripes'],
+                    store=store,
+                    writer_threads=TRACKER_CONFIG['writers'],
+                    log_fn=lambda msg: print(f"[TRACK] {msg}", flush=True),
+                )
+                if store:
+                    try:
+                        resumed = tracker.resume()
+                        if resumed:
+                            print(f"[TRACK] Resumed {resumed} in-flight correlations", flush=True)
+                    except Exception as e:
+                        print(f"[WARN] Could not resume correlation tracker: {e}", flush=True)
+                tracker.start_reaper(TRACKER_CONFIG['sweep_sec'])
+                _tracker = tracker
+    return _tracker
 
-        # Check if all workers have completed
-        # - decoder/detailer: must have expected_batches responses (one per batch)
-        # - shredder: needs only 1 response (processes all staging as one unit)
-        expected = tracker['expected_batches']
-        all_complete = True
-        for w in tracker['expected_workers']:
-            received = len(tracker['received'].get(w, set()))
-            if w == 'shredder':
-                # Shredder sends ONE response when all staging rows are done
-                if received < 1:
-                    all_complete = False
-                    break
-            else:
-                # decoder/detailer send one response per batch
-                if received < expected:
-                    all_complete = False
-                    break
 
-        if all_complete:
-            # Pipeline complete - remove from tracker and return summary
-            elapsed = (datetime.now() - tracker['started_at']).total_seconds()
-            total_received = sum(len(tracker['received'].get(w, set())) for w in tracker['expected_workers'])
-            summary = {
-                'correlation_id': correlation_id,
-                'batches': expected,
-                'workers': tracker['expected_workers'],
-                'total_responses': total_received,
-                'elapsed_seconds': round(elapsed, 2)
-            }
-            del _correlation_tracker[correlation_id]
-            return summary
+def record_batch_response(correlation_id: str, worker: str, batch_num: int) -> Optional[Dict]:
+    """Record a batch response and return completion status if pipeline is done"""
+    return get_tracker().record_batch(correlation_id, worker, batch_num)
 
-        return None
 
 def mark_producer_done(correlation_id: str, total_batches: int) -> Optional[Dict]:
     """Mark producer as done and check if pipeline is already complete"""
-    with _tracker_lock:
-        tracker = _get_or_create_tracker(correlation_id)
-        tracker['producer_done'] = True
-        tracker['expected_batches'] = total_batches
-
-        # Check if downstream workers already finished before producer response arrived
-        if total_batches == 0:
-            # No batches sent, pipeline is complete
-            del _correlation_tracker[correlation_id]
-            return {
-                'correlation_id': correlation_id,
-                'batches': 0,
-                'workers': tracker['expected_workers'],
-                'total_responses': 0,
-                'elapsed_seconds': 0
-            }
+    return get_tracker().mark_producer_done(correlation_id, total_batches)
 
-        # Check if all workers have completed (same logic as record_batch_response)
-        expected = tracker['expected_batches']
-        all_complete = True
-        for w in tracker['expected_workers']:
-            received = len(tracker['received'].get(w, set()))
-            if w == 'shredder':
-                if received < 1:
-                    all_complete = False
-                    break
-            else:
-                if received < expected:
-                    all_complete = False
-                    break
 
-        if all_complete:
-            # Already complete! All workers finished before producer response
-            elapsed = (datetime.now() - tracker['started_at']).total_seconds()
-            total_received = sum(len(tracker['received'].get(w, set())) for w in tracker['expected_workers'])
-            summary = {
-                'correlation_id': correlation_id,
-                'batches': expected,
-                'workers': tracker['expected_workers'],
-                'total_responses': total_received,
-                'elapsed_seconds': round(elapsed, 2)
-            }
-            del _correlation_tracker[correlation_id]
-            return summary
-
-        # Not complete yet, log progress
-        received_counts = {w: len(tracker['received'].get(w, set())) for w in tracker['expected_workers']}
-        print(f"[TRACK] {correlation_id[:8]}: expecting {total_batches} batches, received so far: {received_counts}")
-        return None
+def run_tracker_benchmark(correlations: int, threads: int, batches: int = 4) -> Dict[str, Any]:
+    """
+    Load-test the in-memory tracker: `correlations` concurrent pipelines, each
+    with `batches` decoder/detailer responses (plus duplicates) and one shredder
+    response, delivered in shuffled order from `threads` threads.
+    """
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from t16o_exchange.guide.common.correlation_tracker import CorrelationTracker
+
+    tracker = CorrelationTracker(DEFAULT_DOWNSTREAM_WORKERS, single_response_workers={'shredder'},
+                                 ttl_sec=TRACKER_CONFIG['ttl_sec'], stripes=TRACKER_CONFIG['stripes'])
+    events = []
+    for _ in range(correlations):
+        cid = str(uuid.uuid4())
+        events.append(('done', cid, 'producer', batches))
+        for w in ('decoder', 'detailer'):
+            for b in range(1, batches + 1):
+                events.append(('batch', cid, w, b))
+            events.append(('batch', cid, w, 1))  # redelivered duplicate
+        events.append(('batch', cid, 'shredder', 1))
+    random.shuffle(events)
+
+    completed = []
+    done_lock = threading.Lock()
+
+    def apply(chunk):
+        for kind, cid, worker, n in chunk:
+            if kind == 'done':
+                summary = tracker.mark_producer_done(cid, n)
+            else:
+                summary = tracker.record_batch(cid, worker, n)
+            if summary:
+                with done_lock:
+                    completed.append(summary)
+
+    step = (len(events) + threads - 1) // threads
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(apply, [events[i:i + step] for i in range(0, len(events), step)]))
+    elapsed = time.perf_counter() - t0
+
+    return {
+        'correlations': correlations,
+        'events': len(events),
+        'threads': threads,
+        'completed': len(completed),
+        'completed_unique': len({s['correlation_id'] for s in completed}),
+        'left_active': len(tracker),
+        'elapsed_sec': round(elapsed, 3),
+        'events_per_sec': round(len(events) / elapsed) if elapsed else 0,
+    }
 
 # Worker registry with queue mappings (derived from common.config)
 def _build_worker_registry():
@@ -276,9 +272,31 @@ WORKER_REGISTRY = _build_worker_registry()
 # Database Functions
 # =============================================================================
 
+# Bounded pool shared by every REST handler and consumer (sized by DB_POOL_SIZE).
+# Connections are pinged on borrow; close() returns them to the pool.
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+
+def get_db_pool():
+    """Get (or lazily create) the process-wide MySQL connection pool"""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                from t16o_exchange.guide.common.db_pool import DbPool
+                _db_pool = DbPool(
+                    DB_CONFIG,
+                    name='gateway',
+                    log_fn=lambda msg: print(f"[DB] {msg}", flush=True),
+                    **DB_POOL_CONFIG
+                )
+    return _db_pool
+
+
 def get_db_connection():
-    """Create a database connection"""
-    return mysql.connector.connect(**DB_CONFIG)
+    """Borrow a database connection from the pool (use as a context manager or close())"""
+    return get_db_pool().get_connection()
 
 
 # =============================================================================
@@ -396,16 +414,15 @@ def validate_api_key(api_key: str) -> Optional[Dict]:
 
     # Query database
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT id, name, permissions, rate_limit, active, feature_mask
-            FROM tx_api_key
-            WHERE api_key = %s AND active = 1
-        """, (api_key,))
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT id, name, permissions, rate_limit, active, feature_mask
+                FROM tx_api_key
+                WHERE api_key = %s AND active = 1
+            """, (api_key,))
+            result = cursor.fetchone()
+            cursor.close()
 
         if result and result['permissions']:
             result['permissions'] = json.loads(result['permissions']) if isinstance(result['permissions'], str) else result['permissions']
@@ -467,6 +484,7 @@ def log_request(
     if not HAS_MYSQL:
         return 0  # Return 0 instead of None when MySQL not available
 
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -534,6 +552,9 @@ def log_request(
     except Exception as e:
         print(f"[ERROR] Failed to log request: {e}", flush=True)
         return None
+    finally:
+        if conn:
+            conn.close()
 
 
 def update_request_status(
@@ -546,6 +567,7 @@ def update_request_status(
     if not HAS_MYSQL:
         return
 
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -573,6 +595,9 @@ def update_request_status(
         conn.close()
     except Exception as e:
         print(f"[ERROR] Failed to update request status: {e}")
+    finally:
+        if conn:
+            conn.close()
 
 
 def get_request_status(request_id: str) -> Optional[Dict]:
@@ -584,6 +609,7 @@ def get_request_status(request_id: str) -> Optional[Dict]:
     if not HAS_MYSQL:
         return None
 
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
@@ -689,6 +715,9 @@ def get_request_status(request_id: str) -> Optional[Dict]:
     except Exception as e:
         print(f"[ERROR] Failed to get request status: {e}")
         return None
+    finally:
+        if conn:
+            conn.close()
 
 
 def get_correlation_status(correlation_id: str) -> Optional[Dict]:
@@ -696,6 +725,7 @@ def get_correlation_status(correlation_id: str) -> Optional[Dict]:
     if not HAS_MYSQL:
         return None
 
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
@@ -770,6 +800,9 @@ def get_correlation_status(correlation_id: str) -> Optional[Dict]:
     except Exception as e:
         print(f"[ERROR] Failed to get correlation status: {e}")
         return None
+    finally:
+        if conn:
+            conn.close()
 
 
 # =============================================================================
@@ -835,34 +868,50 @@ def ensure_queues_exist(channel):
         )
 
 
+# Long-lived publisher pool shared by REST handlers and consumers.
+# Queues are declared once when the first pooled connection opens.
+_publisher_pool = None
+_publisher_pool_lock = threading.Lock()
+
+
+def get_publisher_pool():
+    """Get (or lazily create) the process-wide RabbitMQ publisher pool"""
+    global _publisher_pool
+    if _publisher_pool is None:
+        with _publisher_pool_lock:
+            if _publisher_pool is None:
+                from t16o_exchange.guide.common.mq_publisher import PublisherPool
+                _publisher_pool = PublisherPool(
+                    get_rabbitmq_connection,
+                    declare_fn=ensure_queues_exist,
+                    size=RABBITMQ_PUBLISHER_POOL_SIZE,
+                    log_fn=lambda msg: print(f"[MQ] {msg}", flush=True),
+                )
+    return _publisher_pool
+
+
+def _message_properties(message: Dict, priority: int):
+    """Build persistent JSON properties with tracing IDs from the message"""
+    return pika.BasicProperties(
+        delivery_mode=2,  # persistent
+        content_type='application/json',
+        priority=priority,
+        correlation_id=message.get('correlation_id'),  # RabbitMQ standard property for tracing
+        message_id=message.get('request_id')  # RabbitMQ standard property for request tracking
+    )
+
+
 def publish_to_worker(worker: str, message: Dict, priority: int = 5) -> bool:
     """Publish a message to a worker's request queue"""
     if worker not in WORKER_REGISTRY:
         return False
 
     try:
-        conn = get_rabbitmq_connection()
-        channel = conn.channel()
-        ensure_queues_exist(channel)
-
-        queue_name = WORKER_REGISTRY[worker]['request_queue']
-        # Extract IDs from message for RabbitMQ headers
-        correlation_id = message.get('correlation_id')
-        request_id = message.get('request_id')
-
-        channel.basic_publish(
-            exchange='',
-            routing_key=queue_name,
-            body=json.dumps(message).encode('utf-8'),
-            properties=pika.BasicProperties(
-                delivery_mode=2,  # persistent
-                content_type='application/json',
-                priority=priority,
-                correlation_id=correlation_id,  # RabbitMQ standard property for tracing
-                message_id=request_id  # RabbitMQ standard property for request tracking
-            )
+        get_publisher_pool().publish(
+            WORKER_REGISTRY[worker]['request_queue'],
+            json.dumps(message).encode('utf-8'),
+            _message_properties(message, priority)
         )
-        conn.close()
         return True
     except Exception as e:
         print(f"[ERROR] Failed to publish to {worker}: {e}")
@@ -872,33 +921,91 @@ def publish_to_worker(worker: str, message: Dict, priority: int = 5) -> bool:
 def publish_to_gateway(message: Dict, priority: int = 5) -> bool:
     """Publish a cascade message to gateway request queue"""
     try:
-        conn = get_rabbitmq_connection()
-        channel = conn.channel()
-        ensure_queues_exist(channel)
-
-        # Extract IDs from message for RabbitMQ headers
-        correlation_id = message.get('correlation_id')
-        request_id = message.get('request_id')
-
-        channel.basic_publish(
-            exchange='',
-            routing_key=GATEWAY_REQUEST_QUEUE,
-            body=json.dumps(message).encode('utf-8'),
-            properties=pika.BasicProperties(
-                delivery_mode=2,
-                content_type='application/json',
-                priority=priority,
-                correlation_id=correlation_id,  # RabbitMQ standard property for tracing
-                message_id=request_id  # RabbitMQ standard property for request tracking
-            )
+        get_publisher_pool().publish(
+            GATEWAY_REQUEST_QUEUE,
+            json.dumps(message).encode('utf-8'),
+            _message_properties(message, priority)
         )
-        conn.close()
         return True
     except Exception as e:
         print(f"[ERROR] Failed to publish to gateway: {e}")
         return False
 
 
+def run_publish_benchmark(count: int, threads: int = 1) -> Dict:
+    """Compare per-call connections (legacy path) against the pooled publisher.
+
+    Publishes `count` messages each way to a scratch queue that is deleted afterwards.
+    Returns latency percentiles (ms) and throughput (msgs/sec) for both modes.
+    """
+    bench_queue = f'{GATEWAY_REQUEST_QUEUE}.bench'
+    body = json.dumps({'action': 'bench', 'pad': 'x' * 256}).encode('utf-8')
+    props = pika.BasicProperties(delivery_mode=2, content_type='application/json')
+
+    def summarize(latencies, elapsed):
+        latencies = sorted(latencies)
+        pct = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+        return {
+            'messages': len(latencies),
+            'elapsed_sec': round(elapsed, 3),
+            'msgs_per_sec': round(len(latencies) / elapsed, 1) if elapsed else None,
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99),
+        }
+
+    setup_conn = get_rabbitmq_connection()
+    setup_ch = setup_conn.channel()
+    setup_ch.queue_declare(queue=bench_queue, durable=False)
+
+    try:
+        # Legacy: connect + declare all queues + publish + close, per message
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(count):
+            t0 = time.perf_counter()
+            conn = get_rabbitmq_connection()
+            channel = conn.channel()
+            ensure_queues_exist(channel)
+            channel.basic_publish(exchange='', routing_key=bench_queue, body=body, properties=props)
+            conn.close()
+            latencies.append(time.perf_counter() - t0)
+        legacy = summarize(latencies, time.perf_counter() - start)
+
+        # Pooled: persistent confirmed channels, queues declared once
+        from t16o_exchange.guide.common.mq_publisher import PublisherPool
+        pool = PublisherPool(get_rabbitmq_connection, declare_fn=ensure_queues_exist,
+                             size=max(threads, 1))
+        pool.declare()
+        latencies = []
+        lat_lock = threading.Lock()
+
+        def publish_n(n):
+            local = []
+            for _ in range(n):
+                t0 = time.perf_counter()
+                pool.publish(bench_queue, body, props)
+                local.append(time.perf_counter() - t0)
+            with lat_lock:
+                latencies.extend(local)
+
+        per_thread = [count // threads + (1 if i < count % threads else 0) for i in range(threads)]
+        start = time.perf_counter()
+        workers = [threading.Thread(target=publish_n, args=(n,)) for n in per_thread]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        pooled = summarize(latencies, time.perf_counter() - start)
+        pooled['threads'] = threads
+        pool.close()
+    finally:
+        setup_ch.queue_delete(queue=bench_queue)
+        setup_conn.close()
+
+    return {'legacy': legacy, 'pooled': pooled}
+
+
 # =============================================================================
 # Request Processing
 # =============================================================================
@@ -1056,6 +1163,101 @@ def process_cascade(message: Dict) -> List[Dict]:
     return results
 
 
+# =============================================================================
+# bmap anchor resolution (cache key for /api/bmap/get)
+# =============================================================================
+
+BMAP_TX_LIMITS = (1, 10, 20, 50, 100)
+
+# Tokens skipped when a bare signature picks the token (sp_tx_bmap_get's list)
+BMAP_SIGNATURE_SKIP_SYMBOLS = (
+    'SOL', 'WSOL', 'USDC', 'USDT', 'PYUSD', 'USDH', 'UXD',
+    'MSOL', 'JITOSOL', 'BSOL', 'LSTSOL',
+)
+
+
+def resolve_bmap_anchor(cursor, token_name, token_symbol, mint_address,
+                        signature, block_time) -> Optional[Tuple[int, int, str, str]]:
+    """
+    Resolve /api/bmap/get params to (token_id, tx_id, mint, signature) with the
+    same precedence as sp_tx_bmap_get. Returns None wherever the SP would answer
+    with an error, so that path (and auto-fetch) stays with the SP.
+    """
+    token = tx = None
+    if mint_address is not None:
+        cursor.execute("""
+            SELECT tk.id, mint.address FROM tx_token tk
+            JOIN tx_address mint ON mint.id = tk.mint_address_id
+            WHERE mint.address = %s LIMIT 1
+        """, (mint_address,))
+        token = cursor.fetchone()
+    elif token_symbol is not None or token_name is not None:
+        column = 'token_symbol' if token_symbol is not None else 'token_name'
+        cursor.execute(f"""
+            SELECT tk.id, mint.address FROM tx_token tk
+            JOIN tx_address mint ON mint.id = tk.mint_address_id
+            WHERE tk.{column} = %s
+            ORDER BY tk.guide_edge_count DESC, (mint.address_type = 'mint') DESC, tk.id
+            LIMIT 1
+        """, (token_symbol if token_symbol is not None else token_name,))
+        token = cursor.fetchone()
+    elif signature is not None:
+        ph = ','.join(['%s'] * len(BMAP_SIGNATURE_SKIP_SYMBOLS))
+        for skip in (True, False):
+            cursor.execute(f"""
+                SELECT tk.id, mint.address, t.id, t.signature
+                FROM tx t
+                JOIN tx_guide g ON g.tx_id = t.id
+                JOIN tx_token tk ON tk.id = g.token_id
+                JOIN tx_address mint ON mint.id = tk.mint_address_id
+                WHERE t.signature = %s AND g.token_id IS NOT NULL
+                {f"AND UPPER(COALESCE(tk.token_symbol, '')) NOT IN ({ph})" if skip else ''}
+                LIMIT 1
+            """, (signature, *BMAP_SIGNATURE_SKIP_SYMBOLS) if skip else (signature,))
+            row = cursor.fetchone()
+            if row:
+                return row[0], row[2], row[1], row[3]
+        return None
+    if not token:
+        return None
+
+    if signature is not None:
+        cursor.execute("""
+            SELECT t.id, t.signature FROM tx_guide g
+            JOIN tx t ON t.id = g.tx_id
+            WHERE t.signature = %s AND g.token_id = %s LIMIT 1
+        """, (signature, token[0]))
+    elif block_time is not None:
+        # Nearest edge on either side of block_time (idx_token_blocktime probes);
+        # same tie-breaking as sp_tx_bmap_get so the cache key matches its anchor
+        cursor.execute("""
+            SELECT t.id, t.signature FROM (
+                (SELECT g.tx_id, g.block_time, %s - g.block_time AS dist FROM tx_guide g
+                 WHERE g.token_id = %s AND g.block_time <= %s
+                 ORDER BY g.block_time DESC, g.id DESC LIMIT 1)
+                UNION ALL
+                (SELECT g.tx_id, g.block_time, g.block_time - %s AS dist FROM tx_guide g
+                 WHERE g.token_id = %s AND g.block_time > %s
+                 ORDER BY g.block_time ASC, g.id ASC LIMIT 1)
+            ) sub
+            JOIN tx t ON t.id = sub.tx_id
+            ORDER BY sub.dist, sub.block_time, sub.tx_id
+            LIMIT 1
+        """, (block_time, token[0], block_time, block_time, token[0], block_time))
+    else:
+        cursor.execute("""
+            SELECT t.id, t.signature FROM tx_guide g
+            JOIN tx t ON t.id = g.tx_id
+            WHERE g.token_id = %s
+            ORDER BY g.block_time DESC
+            LIMIT 1
+        """, (token[0],))
+    tx = cursor.fetchone()
+    if not tx:
+        return None
+    return token[0], tx[0], token[1], tx[1]
+
+
 # =============================================================================
 # Flask Application
 # =============================================================================
@@ -1121,28 +1323,44 @@ def create_app():
             'pika': HAS_PIKA
         }
 
-        # Test DB connection
+        # Test DB connection (borrow + ping from the pool) and report pool pressure
+        db_pool = None
         if HAS_MYSQL:
             try:
-                conn = get_db_connection()
-                conn.close()
+                with get_db_connection():
+                    pass
                 checks['db_connection'] = True
             except:
                 checks['db_connection'] = False
+            if _db_pool is not None:
+                db_pool = _db_pool.stats()
 
-        # Test RabbitMQ connection
+        # Test RabbitMQ via the publisher pool (borrows a live channel, no new handshake)
+        publisher = None
         if HAS_PIKA:
             try:
-                conn = get_rabbitmq_connection()
-                conn.close()
+                pool = get_publisher_pool()
+                pool.declare()
                 checks['rabbitmq_connection'] = True
+                publisher = pool.stats()
             except:
                 checks['rabbitmq_connection'] = False
 
+        # Worker metrics: merged JSON dumps from every live worker process
+        try:
+            workers = aggregate_metrics(read_metrics())
+        except Exception:
+            workers = None
+
         healthy = all(checks.values())
         return jsonify({
             'status': 'healthy' if healthy else 'degraded',
             'checks': checks,
+            'db_pool': db_pool,
+            'publisher': publisher,
+            'tracker': _tracker.stats() if _tracker is not None else None,
+            'workers': workers,
+            'bmap_cache': get_bmap_cache().stats(),
             'timestamp': datetime.now().isoformat() + 'Z'
         }), 200 if healthy else 503
 
@@ -1178,15 +1396,46 @@ def create_app():
         block_time   = request.args.get('block_time', type=int)
         tx_limit     = request.args.get('limit', default=10, type=int)
 
+        if tx_limit not in BMAP_TX_LIMITS:
+            tx_limit = 10   # same fallback as the SP, so the cache key matches
+
+        # --- Cache: resolve to (token_id, tx_id) and serve the SP's last answer ---
+        cache = get_bmap_cache()
+        started = time.perf_counter()
+        params = (token_name, token_symbol, mint_address, signature, block_time)
+        cache_key = generation = None
+        sp_args = [token_name, token_symbol, mint_address, signature, block_time, tx_limit]
+
         # --- Call stored procedure ---
         conn = None
         try:
-            conn = get_db_connection()
+            anchor = cache.get_anchor(params)
+            if anchor is None:
+                conn = get_db_connection()
+                cursor = conn.cursor()
+                t0 = time.perf_counter()
+                anchor = resolve_bmap_anchor(cursor, *params)
+                cursor.close()
+                cache.timings.record('resolve', time.perf_counter() - t0)
+                if anchor is not None:
+                    cache.put_anchor(params, *anchor)
+            if anchor is not None:
+                cache_key = (anchor[0], anchor[1], tx_limit)
+                body = cache.get(cache_key)
+                if body is not None:
+                    cache.timings.record('hit', time.perf_counter() - started)
+                    resp = app.response_class(body, status=200, mimetype='application/json')
+                    resp.headers['X-Cache'] = 'HIT'
+                    return resp
+                # Already resolved: the SP takes its cheap mint + signature path
+                sp_args = [None, None, anchor[2], anchor[3], None, tx_limit]
+                # Taken before the SP runs: an invalidation in between voids the put
+                generation = cache.generation(anchor[0])
+
+            if conn is None:
+                conn = get_db_connection()
             cursor = conn.cursor()
-            cursor.callproc('sp_tx_bmap_get', [
-                token_name, token_symbol, mint_address,
-                signature, block_time, tx_limit
-            ])
+            cursor.callproc('sp_tx_bmap_get', sp_args)
             data = None
             for result_set in cursor.stored_results():
                 row = result_set.fetchone()
@@ -1205,7 +1454,16 @@ def create_app():
 
         # --- Success: data exists ---
         if 'error' not in data.get('result', {}):
-            return jsonify(data), 200
+            resp = jsonify(data)
+            if cache_key is not None:
+                cache.put(cache_key, resp.get_data(), window_bounds(data),
+                          generation=generation)
+                cache.timings.record('miss', time.perf_counter() - started)
+                resp.headers['X-Cache'] = 'MISS'
+            else:
+                cache.note_uncached()
+            return resp, 200
+        cache.note_uncached()
 
         # --- Auto-fetch: no data, trigger producer ---
         error_result = data.get('result', {})
@@ -1215,18 +1473,17 @@ def create_app():
         mint = error_result.get('mint') or mint_address
         if not mint and token_symbol:
             try:
-                resolve_conn = get_db_connection()
-                resolve_cursor = resolve_conn.cursor()
-                resolve_cursor.execute("""
-                    SELECT a.address FROM tx_token t
-                    JOIN tx_address a ON a.id = t.mint_address_id
-                    WHERE t.token_symbol = %s LIMIT 1
-                """, (token_symbol,))
-                row = resolve_cursor.fetchone()
-                if row:
-                    mint = row[0]
-                resolve_cursor.close()
-                resolve_conn.close()
+                with get_db_connection() as resolve_conn:
+                    resolve_cursor = resolve_conn.cursor()
+                    resolve_cursor.execute("""
+                        SELECT a.address FROM tx_token t
+                        JOIN tx_address a ON a.id = t.mint_address_id
+                        WHERE t.token_symbol = %s LIMIT 1
+                    """, (token_symbol,))
+                    row = resolve_cursor.fetchone()
+                    if row:
+                        mint = row[0]
+                    resolve_cursor.close()
             except Exception:
                 pass
 
@@ -1409,18 +1666,16 @@ def create_app():
         # Fetch configured thread counts from config table
         thread_config = {}
         try:
-            import mysql.connector
-            conn = mysql.connector.connect(**DB_CONFIG)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT config_key, config_value FROM config "
-                "WHERE config_key LIKE '%\\_wrk\\_cnt\\_threads' ESCAPE '\\\\'"
-            )
-            for key, val in cursor.fetchall():
-                worker_name = key.replace('_wrk_cnt_threads', '')
-                thread_config[worker_name] = int(val) if val else 0
-            cursor.close()
-            conn.close()
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT config_key, config_value FROM config "
+                    "WHERE config_key LIKE '%\\_wrk\\_cnt\\_threads' ESCAPE '\\\\'"
+                )
+                for key, val in cursor.fetchall():
+                    worker_name = key.replace('_wrk_cnt_threads', '')
+                    thread_config[worker_name] = int(val) if val else 0
+                cursor.close()
         except Exception:
             pass  # Fall back to no thread info
 
@@ -1791,6 +2046,40 @@ def run_queue_consumer(ready_event: threading.Event = None):
             time.sleep(5)
 
 
+# =============================================================================
+# bmap cache invalidation (aggregator -> gateway fanout)
+# =============================================================================
+
+def run_bmap_invalidation_consumer():
+    """Drop cached /api/bmap/get windows as the aggregator loads new tx_guide edges."""
+    cache = get_bmap_cache()
+
+    while True:
+        try:
+            conn = get_rabbitmq_connection()
+            channel = conn.channel()
+            channel.exchange_declare(exchange=BMAP_INVALIDATE_EXCHANGE,
+                                     exchange_type='fanout', durable=True)
+            queue = channel.queue_declare(queue='', exclusive=True).method.queue
+            channel.queue_bind(exchange=BMAP_INVALIDATE_EXCHANGE, queue=queue)
+
+            def callback(ch, method, properties, body):
+                try:
+                    apply_bmap_invalidation(cache, body)
+                except (ValueError, TypeError, KeyError) as e:
+                    print(f"[WARN] Bad bmap invalidation event: {e}")
+
+            channel.basic_consume(queue=queue, on_message_callback=callback, auto_ack=True)
+            print(f"[OK] bmap cache invalidation consumer bound to {BMAP_INVALIDATE_EXCHANGE}")
+            channel.start_consuming()
+
+        except Exception as e:
+            # Events published while disconnected are lost: start from empty
+            cache.clear()
+            print(f"[ERROR] bmap invalidation consumer error: {e}")
+            time.sleep(5)
+
+
 # =============================================================================
 # Response Queue Consumer (for worker responses and auto-cascade)
 # =============================================================================
@@ -1973,9 +2262,27 @@ def main():
                         help='Only run response consumer for auto-cascade')
     parser.add_argument('--init-queues', action='store_true',
                         help='Initialize all queues and exit')
+    parser.add_argument('--bench-publish', type=int, metavar='N',
+                        help='Benchmark N publishes (per-call connection vs pooled) and exit')
+    parser.add_argument('--bench-threads', type=int, default=4,
+                        help='Publisher threads for the pooled benchmark run (default: 4)')
+    parser.add_argument('--bench-tracker', type=int, metavar='N',
+                        help='Load-test the correlation tracker with N concurrent correlations and exit')
 
     args = parser.parse_args()
 
+    # Tracker load test is in-memory only (no Flask/pika/MySQL needed)
+    if args.bench_tracker:
+        print(f"[INFO] Load-testing tracker with {args.bench_tracker} correlations...")
+        r = run_tracker_benchmark(args.bench_tracker, max(args.bench_threads, 1))
+        print(f"[BENCH] {r['events']} events on {r['threads']} threads in {r['elapsed_sec']}s "
+              f"({r['events_per_sec']} events/s)")
+        print(f"[BENCH] completed={r['completed']} unique={r['completed_unique']} "
+              f"left_active={r['left_active']}")
+        ok = r['completed'] == r['completed_unique'] == r['correlations'] and r['left_active'] == 0
+        print("[OK] Every correlation completed exactly once" if ok else "[ERROR] Tracker mismatch")
+        return 0 if ok else 1
+
     # Check dependencies
     if not HAS_FLASK and not args.queue_consumer_only:
         print("[ERROR] Flask not installed. Run: pip install flask")
@@ -1999,6 +2306,18 @@ def main():
             print(f"[ERROR] Failed to initialize queues: {e}")
             return 1
 
+    if args.bench_publish:
+        print(f"[INFO] Benchmarking {args.bench_publish} publishes...")
+        results = run_publish_benchmark(args.bench_publish, max(args.bench_threads, 1))
+        for mode, r in results.items():
+            print(f"[BENCH] {mode:<7} {r['msgs_per_sec']:>9} msg/s  "
+                  f"p50={r['p50_ms']}ms p95={r['p95_ms']}ms p99={r['p99_ms']}ms "
+                  f"({r['messages']} msgs in {r['elapsed_sec']}s)")
+        if results['legacy']['msgs_per_sec'] and results['pooled']['msgs_per_sec']:
+            speedup = results['pooled']['msgs_per_sec'] / results['legacy']['msgs_per_sec']
+            print(f"[BENCH] pooled throughput {speedup:.1f}x legacy")
+        return 0
+
     # Queue consumer only mode
     if args.queue_consumer_only:
         run_queue_consumer()
@@ -2009,6 +2328,16 @@ def main():
         run_response_consumer()
         return 0
 
+    # Open the publisher pool up front so queue declaration happens once at startup
+    try:
+        get_publisher_pool().declare()
+        print(f"[OK] Publisher pool ready ({RABBITMQ_PUBLISHER_POOL_SIZE} channels)")
+    except Exception as e:
+        print(f"[WARN] Publisher pool not ready ({e}) - will connect on first publish")
+
+    # bmap response cache invalidation (aggregator publishes new-edge ranges)
+    threading.Thread(target=run_bmap_invalidation_consumer, daemon=True).start()
+
     # Track consumer ready events
     queue_consumer_ready = threading.Event()
     response_consumer_ready = threading.Event()
@@ -38,6 +38,10 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from t16o_exchange.guide.common.address_cache import get_address_resolver
+from t16o_exchange.guide.common.solscan_client import get_solscan_client
+
 
 # =============================================================================
 # Config Loading
@@ -85,7 +89,6 @@ _CONFIG = load_config()
 # Solscan API configuration
 SOLSCAN_API = _CONFIG.get('SOLSCAN_API', 'https://pro-api.solscan.io/v2.0')
 SOLSCAN_TOKEN = _CONFIG.get('SOLSCAN_TOKEN', '')
-SOLSCAN_DELAY = _CONFIG.get('SOLSCAN_DELAY', 0.25)
 
 
 # =============================================================================
@@ -1326,8 +1329,6 @@ class IntegrityChecker:
             elif updates:
                 stats['updated'] += 1  # Would update in dry run
 
-            time.sleep(SOLSCAN_DELAY)
-
         print(f"\n  Summary:")
         print(f"    API calls: {stats['fetched']:,}")
         print(f"    Updated: {stats['updated']:,}")
@@ -1341,6 +1342,7 @@ class IntegrityChecker:
         headers = {"token": SOLSCAN_TOKEN}
 
         try:
+            get_solscan_client().limiter.acquire()
             response = session.get(url, headers=headers, timeout=30)
             if response.status_code >= 400 and response.status_code < 500:
                 return None
@@ -1355,17 +1357,7 @@ class IntegrityChecker:
 
     def _ensure_address(self, address: str) -> Optional[int]:
         """Ensure address exists in tx_address and return its ID."""
-        self.cursor.execute("SELECT id FROM tx_address WHERE address = %s", (address,))
-        row = self.cursor.fetchone()
-        if row:
-            return row['id']
-
-        self.cursor.execute(
-            "INSERT INTO tx_address (address, address_type) VALUES (%s, 'unknown')",
-            (address,)
-        )
-        self.db_conn.commit()
-        return self.cursor.lastrowid
+        return get_address_resolver().resolve(self.db_conn, address, 'unknown')
 
     def fix_enrich_missing_swap_fields(self, limit: int = 1000, dry_run: bool = False) -> Dict[str, int]:
         """
@@ -18,6 +18,7 @@ import sys
 import requests
 import time
 import threading
+import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Generator, Dict, Any, Tuple
 from datetime import datetime, timezone
@@ -43,12 +44,11 @@ except ImportError:
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
     get_db_config, get_rabbitmq_config, get_rpc_config, get_queue_names,
-    get_solscan_config, nack_with_retry,
+    nack_with_retry,
 )
+from t16o_exchange.guide.common.solscan_client import get_solscan_client
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
-_solscan                = get_solscan_config()
-SOLSCAN_API_BASE        = _solscan['api_base']
-SOLSCAN_API_TOKEN       = _solscan['token']
 DEFAULT_PRIME_SIG_CNT   = 100
 
 _rmq                    = get_rabbitmq_config()
@@ -70,6 +70,7 @@ DLQ_QUEUE               = _queues['dlq']
 DECODER_REQUEST_QUEUE   = _decoder_queues['request']
 DETAILER_REQUEST_QUEUE  = _detailer_queues['request']
 DB_CONFIG               = get_db_config()
+METRICS                 = get_worker_metrics('producer')
 
 
 # =============================================================================
@@ -514,7 +515,7 @@ def resolve_boundary_to_signature(
     return (None, None, None)
 
 
-def fetch_all_signatures_with_filters(
+def fetch_signature_pages_with_filters(
     session: requests.Session,
     address: str,
     rpc_url: str,
@@ -525,13 +526,14 @@ def fetch_all_signatures_with_filters(
     until_block_id: Optional[int] = None,
     delay: float = 0.2,
     skip_failed: bool = True
-) -> Generator[dict, None, None]:
+) -> Generator[List[dict], None, None]:
     """
-    Generator that fetches signatures with support for time/slot-based until filtering.
+    Generator that yields one list of signature objects per getSignaturesForAddress page.
 
-    Extends fetch_all_signatures with inline filtering for until_block_time and until_block_id.
-    This allows stopping pagination when we reach a certain time or slot, even if we don't
-    have an exact signature for that boundary.
+    Supports time/slot-based until filtering: pagination stops when we reach
+    until_block_time or until_block_id, even if we don't have an exact signature
+    for that boundary. Failed transactions are dropped when skip_failed is set,
+    so a page may be shorter than the RPC page (or empty).
     """
     total_fetched = 0
 
@@ -557,6 +559,7 @@ def fetch_all_signatures_with_filters(
             break
 
         stop_pagination = False
+        page = []
 
         for sig in signatures:
             if skip_failed and sig.get('err') is not None:
@@ -576,7 +579,10 @@ def fetch_all_signatures_with_filters(
                     stop_pagination = True
                     break
 
-            yield sig
+            page.append(sig)
+
+        if page:
+            yield page
 
         if stop_pagination:
             break
@@ -591,6 +597,87 @@ def fetch_all_signatures_with_filters(
             time.sleep(delay)
 
 
+def fetch_all_signatures_with_filters(
+    session: requests.Session,
+    address: str,
+    rpc_url: str,
+    max_signatures: float = float('inf'),
+    before: Optional[str] = None,
+    until: Optional[str] = None,
+    until_block_time: Optional[int] = None,
+    until_block_id: Optional[int] = None,
+    delay: float = 0.2,
+    skip_failed: bool = True
+) -> Generator[dict, None, None]:
+    """
+    Generator that fetches signatures with support for time/slot-based until filtering.
+
+    Extends fetch_all_signatures with inline filtering for until_block_time and until_block_id.
+    Flattened view of fetch_signature_pages_with_filters.
+    """
+    for page in fetch_signature_pages_with_filters(
+        session, address, rpc_url,
+        max_signatures=max_signatures, before=before, until=until,
+        until_block_time=until_block_time, until_block_id=until_block_id,
+        delay=delay, skip_failed=skip_failed
+    ):
+        yield from page
+
+
+def prefetch_pages(pages: Generator[List[dict], None, None], depth: int = 2) -> Generator[List[dict], None, None]:
+    """
+    Run a page generator in a background thread, buffering up to `depth` pages.
+
+    The next getSignaturesForAddress call is in flight while the caller dedups and
+    publishes the current page. The RPC session is only touched by the background
+    thread while iterating; RabbitMQ and DB handles stay on the caller's thread.
+    If the caller stops early (error, limit reached), the prefetcher stops before
+    its next page and is joined, so the shared session is free again on return.
+    """
+    buf = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buf.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run():
+        try:
+            while not stop.is_set():
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    put(done)
+                    return
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            pages.close()
+
+    t = threading.Thread(target=run, name='sig-prefetch', daemon=True)
+    t.start()
+    try:
+        while True:
+            item = buf.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Stop between pages and wait out any in-flight RPC call
+        stop.set()
+        t.join()
+
+
 # =============================================================================
 # Gateway Integration
 # =============================================================================
@@ -728,6 +815,61 @@ def publish_cascade_to_workers(channel, request_id: str, correlation_id: str,
         return False
 
 
+def cascade_signature_pages(channel, pages, db_cursor, request_id: str, correlation_id: str,
+                            priority: int = 5, request_log_id: int = None,
+                            api_key_id: int = None, features: int = 0,
+                            tx_origin: int = 1, batch_size: int = 20,
+                            dry_run: bool = False, stats: dict = None) -> dict:
+    """
+    Stream RPC signature pages straight into decoder+detailer cascade batches.
+
+    Each page is deduped against tx with a single query, then every full batch is
+    published immediately; a short tail is carried into the next page so batches
+    stay full. The final batch count is not known until pagination ends, so cascade
+    messages carry total_batches=0 and the count is reported in the producer
+    response ('batches'), which the gateway feeds to mark_producer_done.
+
+    Counts are kept in `stats` ({'processed', 'batches', 'skipped'}) as they
+    happen, so a caller that catches an exception mid-stream still knows how
+    many batches were already published. Returns the same dict.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(processed=0, batches=0, skipped=0)
+    pending = []
+
+    def publish(chunk, skip_info):
+        stats['batches'] += 1
+        batch_num = stats['batches']
+        if dry_run:
+            print(f"    [DRY] Batch {batch_num}: {len(chunk)} sigs{skip_info}")
+        elif publish_cascade_to_workers(channel, request_id, correlation_id,
+                                        chunk, batch_num, 0, priority,
+                                        request_log_id, api_key_id, features,
+                                        tx_origin=tx_origin):
+            print(f"    [CASCADE] Batch {batch_num} -> decoder+detailer ({len(chunk)} sigs{skip_info})")
+
+    for page in pages:
+        sigs = [s.get('signature') if isinstance(s, dict) else s for s in page]
+        sigs = [s for s in sigs if s]
+        stats['processed'] += len(page)
+
+        new_sigs, skipped = filter_existing_signatures(db_cursor, sigs)
+        stats['skipped'] += skipped
+        skip_info = f", page skipped {skipped}" if skipped > 0 else ""
+
+        pending.extend(new_sigs)
+        while len(pending) >= batch_size:
+            publish(pending[:batch_size], skip_info)
+            pending = pending[batch_size:]
+            skip_info = ""
+
+    if pending:
+        publish(pending, "")
+
+    return stats
+
+
 def process_multiple_addresses(
     message: dict, addresses: list, rpc_session, gateway_channel, db_cursor,
     request_id: str, correlation_id: str, priority: int,
@@ -914,10 +1056,8 @@ def process_single_address(message: dict, rpc_session, gateway_channel, db_curso
     if not address:
         return {'processed': 0, 'batches': 0, 'errors': 1, 'error': 'No address'}
 
-    total_fetched = 0
-    total_batched = 0
+    streamed = {'processed': 0, 'batches': 0, 'skipped': 0}
     batch_size = 20
-    estimated_batches = (max_signatures + batch_size - 1) // batch_size
 
     try:
         # Parse boundary specifications (support both legacy string and new dict format)
@@ -1018,62 +1158,31 @@ def process_single_address(message: dict, rpc_session, gateway_channel, db_curso
                             until_sig = row[0]
                             print(f"    Smart sync ({addr_type}): fetching new sigs")
 
-        signatures = []
-        total_skipped = 0
-
-        for sig_obj in fetch_all_signatures_with_filters(
+        # Stream: each RPC page is deduped and cascaded while the next page is fetched
+        pages = prefetch_pages(fetch_signature_pages_with_filters(
             rpc_session, address, CHAINSTACK_RPC_URL,
             max_signatures=max_signatures, until=until_sig, before=before_sig,
             until_block_time=until_block_time, until_block_id=until_block_id
-        ):
-            sig_str = sig_obj.get('signature') if isinstance(sig_obj, dict) else sig_obj
-            if sig_str:
-                signatures.append(sig_str)
-            total_fetched += 1
-
-            while len(signatures) >= batch_size:
-                batch_to_send = signatures[:batch_size]
-                signatures = signatures[batch_size:]
-
-                new_sigs, skipped = filter_existing_signatures(db_cursor, batch_to_send)
-                total_skipped += skipped
-
-                if new_sigs:
-                    total_batched += 1
-                    if publish_cascade_to_workers(gateway_channel, request_id, correlation_id,
-                                                    new_sigs, total_batched, estimated_batches, priority,
-                                                    request_log_id, api_key_id, features):
-                        skip_info = f", skipped {skipped}" if skipped > 0 else ""
-                        print(f"    [CASCADE] Batch {total_batched} -> decoder+detailer ({len(new_sigs)} sigs{skip_info})")
-
-        # Handle remaining signatures
-        if signatures:
-            new_sigs, skipped = filter_existing_signatures(db_cursor, signatures)
-            total_skipped += skipped
-
-            if new_sigs:
-                total_batched += 1
-                if publish_cascade_to_workers(gateway_channel, request_id, correlation_id,
-                                                new_sigs, total_batched, total_batched, priority,
-                                                request_log_id, api_key_id, features):
-                    skip_info = f", skipped {skipped}" if skipped > 0 else ""
-                    print(f"    [CASCADE] Batch {total_batched} -> decoder+detailer ({len(new_sigs)} sigs{skip_info})")
+        ))
+        streamed = cascade_signature_pages(
+            gateway_channel, pages, db_cursor, request_id, correlation_id,
+            priority, request_log_id, api_key_id, features,
+            batch_size=batch_size, stats=streamed
+        )
 
-        return {'processed': total_fetched, 'batches': total_batched, 'skipped': total_skipped, 'errors': 0}
+        return {'processed': streamed['processed'], 'batches': streamed['batches'],
+                'skipped': streamed['skipped'], 'errors': 0}
 
     except Exception as e:
         print(f"    [ERROR] {e}")
-        return {'processed': total_fetched, 'batches': total_batched, 'errors': 1, 'error': str(e)}
+        return {'processed': streamed['processed'], 'batches': streamed['batches'],
+                'errors': 1, 'error': str(e)}
 
 
-def fetch_solscan_token_meta(session: requests.Session, mint_address: str) -> Optional[dict]:
+def fetch_solscan_token_meta(mint_address: str) -> Optional[dict]:
     """Fetch token metadata from Solscan /v2.0/token/meta for a single mint address."""
-    url = f"{SOLSCAN_API_BASE}/token/meta"
     try:
-        session.headers['token'] = SOLSCAN_API_TOKEN
-        r = session.get(url, params={'address': mint_address}, timeout=15)
-        r.raise_for_status()
-        data = r.json()
+        data = get_solscan_client().token_meta(mint_address, timeout=15)
         if data.get('success') and data.get('data'):
             return data['data']
     except Exception as e:
@@ -1260,7 +1369,7 @@ def _prime_single_mint(message, mint_address, rpc_session, gateway_channel,
     # Step 2b: If no anchor tx, call Solscan API
     if not anchor_tx:
         print(f"  [PRIME] No anchor tx in DB, calling Solscan token/meta...")
-        meta = fetch_solscan_token_meta(rpc_session, mint_address)
+        meta = fetch_solscan_token_meta(mint_address)
         if meta:
             # Priority: first_mint_tx → create_tx
             anchor_tx = meta.get('first_mint_tx') or meta.get('create_tx')
@@ -1670,6 +1779,8 @@ def run_queue_consumer(prefetch: int = 1):
 +-----------------------------------------------------------+
 """)
 
+    start_exporter(METRICS)
+    get_solscan_client().set_observer(METRICS.record)
     rpc_session = create_rpc_session()
     db_state = {'conn': None, 'cursor': None}
 
@@ -1706,7 +1817,7 @@ def run_queue_consumer(prefetch: int = 1):
             gateway_channel.basic_qos(prefetch_count=prefetch)
             print(f"[OK] Connected, waiting for requests...")
 
-            def callback(ch, method, properties, body):
+            def handle_message(ch, method, properties, body):
                 try:
                     message = json.loads(body.decode('utf-8'))
                     request_id = message.get('request_id', 'unknown')
@@ -1751,6 +1862,7 @@ def run_queue_consumer(prefetch: int = 1):
                         if not addresses and not has_signature:
                             print(f"\n[{datetime.now().strftime('%H:%M:%S')}] INVALID message -> DLQ (no address or signature in batch.filters)")
                             print(f"  Keys received: {list(message.keys())}, batch keys: {list(batch.keys())}")
+                            METRICS.incr('dlq')
                             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)  # -> DLQ
                             return
 
@@ -1772,6 +1884,7 @@ def run_queue_consumer(prefetch: int = 1):
 
                 except json.JSONDecodeError as e:
                     print(f"[ERROR] Invalid JSON -> DLQ: {e}")
+                    METRICS.incr('dlq')
                     ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)  # -> DLQ
                 except MySQLError as e:
                     print(f"[DB ERROR] {e}")
@@ -1780,8 +1893,13 @@ def run_queue_consumer(prefetch: int = 1):
                                     queue_name=REQUEST_QUEUE, body=body)
                 except Exception as e:
                     print(f"[ERROR] Failed to process message -> DLQ: {e}")
+                    METRICS.incr('dlq')
                     ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)  # -> DLQ
 
+            def callback(ch, method, properties, body):
+                with METRICS.message(body, properties):
+                    handle_message(ch, method, properties, body)
+
             gateway_channel.basic_consume(queue=REQUEST_QUEUE, on_message_callback=callback)
             gateway_channel.start_consuming()
 
@@ -1860,39 +1978,18 @@ def main():
         for addr_idx, address in enumerate(addresses, 1):
             print(f"\n--- [{addr_idx}/{len(addresses)}] {address[:20]}... ---")
 
-            sig_list = []
-            for sig_obj in fetch_all_signatures(rpc_session, address, CHAINSTACK_RPC_URL,
-                                                 max_signatures=max_sigs, before=args.before,
-                                                 until=args.until, skip_failed=True):
-                sig_str = sig_obj.get('signature')
-                if sig_str:
-                    sig_list.append(sig_str)
-
-                    if len(sig_list) >= args.batch_size:
-                        batch = sig_list[:args.batch_size]
-                        sig_list = sig_list[args.batch_size:]
-                        total_batches += 1
-
-                        if args.dry_run:
-                            print(f"  [DRY] Batch {total_batches}: {len(batch)} sigs")
-                        else:
-                            # CLI mode: no request_log_id, api_key_id, or features (defaults to core)
-                            publish_cascade_to_workers(gateway_channel, f"cli-{addr_idx}",
-                                                        f"cli-{addr_idx}", batch, total_batches, 0, args.priority,
-                                                        None, None, 0)
-                            print(f"  [>] Batch {total_batches} -> decoder+detailer")
-
-            if sig_list:
-                total_batches += 1
-                if args.dry_run:
-                    print(f"  [DRY] Batch {total_batches}: {len(sig_list)} sigs")
-                else:
-                    # CLI mode: no request_log_id, api_key_id, or features (defaults to core)
-                    publish_cascade_to_workers(gateway_channel, f"cli-{addr_idx}",
-                                                f"cli-{addr_idx}", sig_list, total_batches, 0, args.priority,
-                                                None, None, 0)
-
-            total_sigs += len(sig_list)
+            # CLI mode: no request_log_id, api_key_id, or features (defaults to core)
+            pages = prefetch_pages(fetch_signature_pages_with_filters(
+                rpc_session, address, CHAINSTACK_RPC_URL,
+                max_signatures=max_sigs, before=args.before, until=args.until
+            ))
+            streamed = cascade_signature_pages(
+                gateway_channel, pages, None, f"cli-{addr_idx}", f"cli-{addr_idx}",
+                args.priority, None, None, 0,
+                batch_size=args.batch_size, dry_run=args.dry_run
+            )
+            total_batches += streamed['batches']
+            total_sigs += streamed['processed']
             print(f"  Address complete")
 
     finally:
@@ -13,6 +13,9 @@ Config keys (config_type='queue'):
     shredder_wrk_poll_idle_sec        - worker sleep when no rows available
     shredder_wrk_reconnect_sec        - delay before reconnecting after errors
     shredder_wrk_shutdown_timeout_sec - max wait for worker thread on shutdown
+    shredder_wrk_event_dispatch       - publish "new rows" events to the aggregator and
+                                        enricher after each committed batch (0 = off;
+                                        they then rely on their db-poll timers)
 
 Consumes staged transactions from t16o_db_staging.txs by deleting rows and
 passing the JSON payload directly to stored procedures:
@@ -22,10 +25,14 @@ passing the JSON payload directly to stored procedures:
 On SP failure, the row is reinserted into staging with attempt_cnt incremented.
 No purge cycle needed — rows are deleted on consumption.
 
+After a batch commits, a debounced work event (common.work_events) tells the
+aggregator (db-poll-sync) and enricher (db-poll-enrich) there are new rows.
+
 Usage:
     python guide-shredder.py --daemon                 # Supervisor + worker threads
     python guide-shredder.py --once                   # Process once and exit
     python guide-shredder.py --daemon --dry-run      # Preview only
+    python guide-shredder.py --bench-participants 100 # Participant extraction benchmark
 """
 
 import argparse
@@ -57,12 +64,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from t16o_exchange.guide.common.config import (
     get_db_config, get_rabbitmq_config, get_staging_config, get_queue_names,
 )
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.address_cache import KNOWN_PROGRAMS, get_address_resolver
+from t16o_exchange.guide.common.work_events import WorkNotifier
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
 _rmq                = get_rabbitmq_config()
 _queues             = get_queue_names('shredder')
 _staging            = get_staging_config()
 
 DB_CONFIG           = get_db_config()
+METRICS             = get_worker_metrics('shredder')
 STAGING_SCHEMA      = _staging['schema']
 STAGING_TABLE       = _staging['table']
 RABBITMQ_HOST       = _rmq['host']
@@ -71,6 +83,8 @@ RABBITMQ_USER       = _rmq['user']
 RABBITMQ_PASS       = _rmq['password']
 RABBITMQ_VHOST      = _rmq['vhost']
 RABBITMQ_RESPONSE_QUEUE = _queues['response']
+AGGREGATOR_REQUEST_QUEUE = get_queue_names('aggregator')['request']
+ENRICHER_REQUEST_QUEUE   = get_queue_names('enricher')['request']
 
 # tx_state values
 TX_STATE_DECODED = 8
@@ -79,34 +93,9 @@ TX_STATE_DETAILED = 16
 # Max retry attempts before giving up
 MAX_ATTEMPTS = 3
 
-# Known Solana program addresses for participant classification
-KNOWN_PROGRAMS = {
-    '11111111111111111111111111111111',              # System Program
-    'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA',  # Token Program
-    'TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb',  # Token-2022 Program
-    'ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL', # Associated Token Program
-    'ComputeBudget111111111111111111111111111111',   # Compute Budget
-    'metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s',  # Metaplex Token Metadata
-    'BPFLoaderUpgradeab1e11111111111111111111111',   # BPF Upgradeable Loader
-    'BPFLoader2111111111111111111111111111111111',   # BPF Loader 2
-    'SysvarRent111111111111111111111111111111111',   # Sysvar Rent
-    'SysvarC1ock11111111111111111111111111111111',   # Sysvar Clock
-    'Sysvar1nstructions1111111111111111111111111',   # Sysvar Instructions
-    'Vote111111111111111111111111111111111111111',   # Vote Program
-    'Stake11111111111111111111111111111111111111',   # Stake Program
-    # DEX Programs
-    '675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8',  # Raydium AMM V4
-    'CAMMCzo5YL8w4VFF8KVHrK22GGUsp5VTaW7grrKgrWqK',  # Raydium CPMM
-    'CPMMoo8L3F4NbTegBCKVNunggL7H1ZpdTHKxQB5qKP1C',  # Raydium CLMM
-    '5quBtoiQqxF9Jv6KYKctB59NT3gtJD2Y65kdnB1Uev3h',  # Raydium Stable
-    'srmqPvymJeFKQ4zGQed1GFppgkRHL9kaELCbyksJtPX',  # Serum DEX V3
-    '9xQeWvG816bUx9EPjHmaT23yvVM2ZWbrrpZb9PusVFin',  # Serum DEX V2
-    'whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc',  # Orca Whirlpools
-    'JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4',  # Jupiter V6
-    'LBUZKhRxPF3XUpBCjp4YzTKgLccjZhTSDM9YuVaPwxo',  # Meteora DLMM
-    'Eo7WjKq67rjJQSZxS6z3YkapzY3eMj6Xy8X5EQVn5UaB', # Meteora Pools
-    '6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P',  # Pump.fun
-}
+# Max rows per IN (...) lookup / multi-row INSERT in participant extraction
+PARTICIPANT_CHUNK_SIZE = 1000
+
 
 
 # =============================================================================
@@ -118,45 +107,22 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
     return mysql.connector.connect(**DB_CONFIG)
 
 
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
 def rmq_connect():
     if not HAS_PIKA:
         return None, None
@@ -384,8 +350,103 @@ class ShredderProcessor:
     def extract_and_insert_participants(self, txs_data):
         """
         Extract participants from JSON data and insert into tx_participant.
+        Set-based: one IN (...) lookup per chunk for signatures, pubkeys resolved
+        through the shared address cache (bulk-inserting missing ones), and one
+        multi-row INSERT ... ON DUPLICATE KEY UPDATE per chunk of participants.
+        If a chunk fails, the batch is rolled back and redone row by row
+        (extract_and_insert_participants_rowwise), which skips only bad rows.
         Returns number of participants inserted.
         """
+        if isinstance(txs_data, str):
+            txs_data = json.loads(txs_data)
+
+        data_list = txs_data.get('data', [])
+        if not data_list:
+            return 0
+
+        # Collect (signature, [(idx, pubkey, signer, writable)]) in input order
+        tx_keys = []
+        for tx_item in data_list:
+            tx_hash = tx_item.get('tx_hash')
+            account_keys = tx_item.get('account_keys', [])
+            if not tx_hash or not account_keys:
+                continue
+            keys = [(idx, acct.get('pubkey'), acct.get('signer'), acct.get('writable'))
+                    for idx, acct in enumerate(account_keys) if acct.get('pubkey')]
+            if keys:
+                tx_keys.append((tx_hash, keys))
+        if not tx_keys:
+            return 0
+
+        fresh_cursor = self.db_conn.cursor()
+        try:
+            tx_ids = self._lookup_ids(
+                fresh_cursor, 'tx', 'signature', {sig for sig, _ in tx_keys})
+            tx_keys = [(tx_ids[sig], keys) for sig, keys in tx_keys if sig in tx_ids]
+            if not tx_keys:
+                return 0
+
+            # Cached + batched: misses resolved with IN (...), new addresses bulk-inserted
+            address_ids = get_address_resolver().resolve_many(
+                self.db_conn, [pk for _, keys in tx_keys for _, pk, _, _ in keys],
+                addr_type=lambda pk: 'program' if pk in KNOWN_PROGRAMS else 'unknown')
+
+            participants = []
+            for tx_id, keys in tx_keys:
+                for idx, pubkey, signer, writable in keys:
+                    address_id = address_ids.get(pubkey)
+                    if address_id is None:
+                        continue
+                    participants.append((
+                        tx_id, address_id,
+                        1 if signer else 0,
+                        1 if idx == 0 else 0,
+                        1 if writable else 0,
+                        1 if pubkey in KNOWN_PROGRAMS else 0,
+                        idx,
+                    ))
+
+            total_inserted = 0
+            try:
+                for chunk in _chunks(participants, PARTICIPANT_CHUNK_SIZE):
+                    fresh_cursor.execute("""
+                        INSERT INTO tx_participant
+                            (tx_id, address_id, is_signer, is_fee_payer, is_writable, is_program, account_index)
+                        VALUES """ + ','.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(chunk)) + """
+                        ON DUPLICATE KEY UPDATE
+                            is_signer = VALUES(is_signer),
+                            is_fee_payer = VALUES(is_fee_payer),
+                            is_writable = VALUES(is_writable),
+                            is_program = VALUES(is_program)
+                    """, [v for row in chunk for v in row])
+                    total_inserted += len(chunk)
+            except MySQLError as e:
+                # One bad row fails the whole multi-row INSERT: redo per row
+                log(self.tag, f"  participant batch insert failed ({e}), retrying row by row")
+                self.db_conn.rollback()
+                return self.extract_and_insert_participants_rowwise(txs_data)
+
+            self.db_conn.commit()
+            return total_inserted
+        finally:
+            fresh_cursor.close()
+
+    @staticmethod
+    def _lookup_ids(cursor, table, column, values):
+        """Resolve {value: id} for a set of unique column values, chunked IN (...) lookups."""
+        found = {}
+        for chunk in _chunks(list(values), PARTICIPANT_CHUNK_SIZE):
+            ph = ','.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({ph})", chunk)
+            found.update(cursor.fetchall())
+        return found
+
+    def extract_and_insert_participants_rowwise(self, txs_data):
+        """
+        Per-row implementation (one SELECT per tx, SELECT + INSERT per key) that
+        skips individual rows MySQL rejects. Fallback for a failed batch insert
+        in extract_and_insert_participants, and the --bench-participants baseline.
+        """
         fresh_cursor = self.db_conn.cursor(dictionary=True)
         try:
             if isinstance(txs_data, str):
@@ -498,7 +559,9 @@ class ShredderProcessor:
                 'detailed' if tx_state == TX_STATE_DETAILED else f'unknown({tx_state})'
             )
 
+            t0 = time.perf_counter()
             result = self.process_row(row)
+            METRICS.record('sp', time.perf_counter() - t0)
 
             if result['success']:
                 summary['processed'] += 1
@@ -520,6 +583,10 @@ class ShredderProcessor:
                 self.reinsert_row(row)
                 summary['reinserted'] += 1
 
+        METRICS.incr('processed', summary['processed'])
+        if summary['errors']:
+            METRICS.incr('errors', summary['errors'])
+
         # Check correlation completion
         for corr_id, count in correlation_counts.items():
             stats = check_correlation_complete(
@@ -537,7 +604,7 @@ class ShredderProcessor:
 
 class WorkerThread(threading.Thread):
     def __init__(self, worker_id, batch_size, dry_run, stop_event,
-                 poll_idle_sec, reconnect_sec):
+                 poll_idle_sec, reconnect_sec, event_dispatch=True):
         super().__init__(daemon=True)
         self.tag = f"W-{worker_id}"
         self.worker_id = worker_id
@@ -546,6 +613,7 @@ class WorkerThread(threading.Thread):
         self.stop_event = stop_event
         self.poll_idle_sec = poll_idle_sec
         self.reconnect_sec = reconnect_sec
+        self.notifier = WorkNotifier('shredder') if event_dispatch and not dry_run else None
 
     def run(self):
         log(self.tag, f"Starting (batch_size={self.batch_size})")
@@ -573,6 +641,9 @@ class WorkerThread(threading.Thread):
                 while not self.stop_event.is_set():
                     summary = processor.process_batch(self.batch_size, mq_channel)
 
+                    if self.notifier:
+                        self._notify_consumers(mq_channel, summary)
+
                     if summary['processed'] > 0:
                         corr_info = f", corr_done={len(summary['correlations_completed'])}" if summary['correlations_completed'] else ""
                         reinsert_info = f", reins={summary['reinserted']}" if summary['reinserted'] else ""
@@ -621,6 +692,16 @@ class WorkerThread(threading.Thread):
                 pass
         log(self.tag, "Stopped")
 
+    def _notify_consumers(self, mq_channel, summary):
+        """Tell the aggregator/enricher about committed rows (trailing events on idle batches)."""
+        if summary['decoded_count']:
+            self.notifier.notify(mq_channel, AGGREGATOR_REQUEST_QUEUE, 'db-poll-sync',
+                                 summary['decoded_count'])
+        if summary['processed']:
+            self.notifier.notify(mq_channel, ENRICHER_REQUEST_QUEUE, 'db-poll-enrich',
+                                 summary['processed'])
+        self.notifier.flush(mq_channel)
+
 
 # =============================================================================
 # Supervisor (config-driven daemon)
@@ -634,6 +715,7 @@ def read_config(cursor):
         'poll_idle':        get_config_float(cursor, 'queue', 'shredder_wrk_poll_idle_sec', 5.0),
         'reconnect':        get_config_float(cursor, 'queue', 'shredder_wrk_reconnect_sec', 5.0),
         'shutdown_timeout': get_config_float(cursor, 'queue', 'shredder_wrk_shutdown_timeout_sec', 10.0),
+        'event_dispatch':   get_config_int(cursor, 'queue', 'shredder_wrk_event_dispatch', 1) > 0,
     }
 
 
@@ -645,6 +727,9 @@ def run_supervisor(dry_run=False):
 """, flush=True)
 
     workers = {}       # worker_id -> (WorkerThread, stop_event)
+    start_exporter(METRICS)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
@@ -675,6 +760,8 @@ def run_supervisor(dry_run=False):
                 time.sleep(5.0)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -693,7 +780,7 @@ def run_supervisor(dry_run=False):
                 stop_evt = threading.Event()
                 w = WorkerThread(
                     next_id, cfg['batch_size'], dry_run, stop_evt,
-                    cfg['poll_idle'], cfg['reconnect'])
+                    cfg['poll_idle'], cfg['reconnect'], cfg['event_dispatch'])
                 w.start()
                 workers[next_id] = (w, stop_evt)
                 next_id += 1
@@ -778,6 +865,58 @@ def run_once(batch_size=100, dry_run=False):
     return 0
 
 
+# =============================================================================
+# Participant extraction benchmark
+# =============================================================================
+
+def load_bench_participants(cursor, tx_count):
+    """Rebuild Solscan-style account_keys JSON for recent txs from existing tx_participant
+    rows, so re-inserting them is an idempotent upsert (no data changes)."""
+    cursor.execute("""
+        SELECT t.signature, a.address, p.is_signer, p.is_writable, p.account_index
+        FROM (SELECT DISTINCT tx_id FROM tx_participant ORDER BY tx_id DESC LIMIT %s) recent
+        JOIN tx_participant p ON p.tx_id = recent.tx_id
+        JOIN tx t ON t.id = p.tx_id
+        JOIN tx_address a ON a.id = p.address_id
+        ORDER BY p.tx_id, p.account_index
+    """, (tx_count,))
+    by_sig = {}
+    for sig, address, is_signer, is_writable, _ in cursor.fetchall():
+        by_sig.setdefault(sig, []).append(
+            {'pubkey': address, 'signer': bool(is_signer), 'writable': bool(is_writable)})
+    return {'data': [{'tx_hash': sig, 'account_keys': keys} for sig, keys in by_sig.items()]}
+
+
+def run_participant_benchmark(tx_count=100, rounds=3):
+    """Compare row-by-row vs set-based participant extraction on the configured MySQL."""
+    conn = db_connect()
+    processor = ShredderProcessor(conn, tag='BENCH')
+    bench_cursor = conn.cursor()
+    payload = load_bench_participants(bench_cursor, tx_count)
+    bench_cursor.close()
+
+    n_tx = len(payload['data'])
+    n_keys = sum(len(tx['account_keys']) for tx in payload['data'])
+    if not n_tx:
+        log('BENCH', 'No tx_participant rows to replay - run the shredder on some data first')
+        conn.close()
+        return 1
+    log('BENCH', f"Replaying {n_tx} txs / {n_keys} account keys x {rounds} rounds")
+
+    for name, fn in (('rowwise', processor.extract_and_insert_participants_rowwise),
+                     ('batched', processor.extract_and_insert_participants)):
+        best = None
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            fn(payload)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        log('BENCH', f"{name:<8} best={best:.3f}s  {n_tx / best:,.0f} tx/s  {n_keys / best:,.0f} participants/s")
+
+    conn.close()
+    return 0
+
+
 # =============================================================================
 # Main
 # =============================================================================
@@ -794,6 +933,8 @@ def main():
                         help='Override batch size (--once mode only; daemon uses config table)')
     parser.add_argument('--dry-run', action='store_true',
                         help='Preview only, no DB changes')
+    parser.add_argument('--bench-participants', type=int, metavar='N', default=None,
+                        help='Benchmark participant extraction on the N most recent txs and exit')
 
     args = parser.parse_args()
 
@@ -801,6 +942,9 @@ def main():
         print("Error: mysql-connector-python not installed")
         return 1
 
+    if args.bench_participants:
+        return run_participant_benchmark(args.bench_participants)
+
     if args.once:
         return run_once(
             batch_size=args.batch_size or 100,
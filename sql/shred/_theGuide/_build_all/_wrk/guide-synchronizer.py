@@ -5,7 +5,9 @@ Guide Synchronizer - Gap-filling worker for mint transaction history
 
 Fills gaps in transaction coverage for a given mint. Different users request
 different time windows, creating holes in our data. The synchronizer:
-1. Fetches ALL on-chain signatures for a mint (newest → oldest known)
+1. Fetches ALL on-chain signatures for a mint (newest → oldest known), split
+   into time ranges paged concurrently; each range's RPC cursor is saved in
+   t16o_db_staging.txs_sync_cursor so an interrupted sync resumes
 2. Stores them in t16o_db_staging.txs_sync
 3. Diffs against our tx table to find missing signatures
 4. Cascades missing sigs through the decoder → detailer pipeline
@@ -20,6 +22,10 @@ Config keys (config_type='queue'):
     synchronizer_wrk_shutdown_timeout_sec - max wait for worker thread on shutdown
     synchronizer_wrk_rpc_delay_sec        - delay between Chainstack RPC calls
     synchronizer_wrk_cascade_batch_size   - sigs per batch sent to decoder/detailer
+    synchronizer_wrk_cnt_pagers           - concurrent RPC pagers (history ranges) per mint
+    synchronizer_wrk_max_sigs             - max signatures fetched per sync request (a
+                                            capped sync stays resumable; the next
+                                            request for the mint continues it)
 
 Usage:
     python guide-synchronizer.py              # Supervisor + worker threads
@@ -38,6 +44,7 @@ import requests
 import pika
 import mysql.connector
 from mysql.connector import Error as MySQLError
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
 # =============================================================================
@@ -49,6 +56,8 @@ from t16o_exchange.guide.common.config import (
     get_db_config, get_rabbitmq_config, get_rpc_config,
     get_queue_names, get_retry_config, nack_with_retry,
 )
+from t16o_exchange.guide.common.config_cache import get_config_cache
+from t16o_exchange.guide.common.worker_metrics import get_worker_metrics, start_exporter
 
 _rmq                = get_rabbitmq_config()
 _rpc                = get_rpc_config()
@@ -58,6 +67,7 @@ _decoder_queues     = get_queue_names('decoder')
 _detailer_queues    = get_queue_names('detailer')
 
 DB_CONFIG               = get_db_config()
+METRICS                 = get_worker_metrics('synchronizer')
 RABBITMQ_HOST           = _rmq['host']
 RABBITMQ_PORT           = _rmq['port']
 RABBITMQ_USER           = _rmq['user']
@@ -77,6 +87,10 @@ RPC_URL                 = _rpc['url']
 
 STAGING_SCHEMA          = 't16o_db_staging'
 SYNC_TABLE              = 'txs_sync'
+SYNC_CURSOR_TABLE       = 'txs_sync_cursor'
+SYNC_MIN_RANGE_SIGS     = 10000  # don't split a sync into ranges smaller than this
+SYNC_DIFF_CHUNK         = 10000  # txs_sync id span per 'exists' UPDATE
+SYNC_GAP_PAGE_BATCHES   = 50     # cascade batches per keyset page of gap signatures
 
 
 # =============================================================================
@@ -88,39 +102,11 @@ def log(tag, msg):
 
 
 def get_config_int(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return int(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_int(cursor, config_type, config_key, default)
 
 
 def get_config_float(cursor, config_type, config_key, default):
-    try:
-        cursor.execute("CALL sp_config_get(%s, %s)", (config_type, config_key))
-        row = cursor.fetchone()
-        try:
-            while cursor.nextset():
-                pass
-        except Exception:
-            pass
-        if row:
-            val = row[0] if isinstance(row, tuple) else row.get('config_value')
-            if val is not None:
-                return float(val)
-    except Exception:
-        pass
-    return default
+    return get_config_cache().get_float(cursor, config_type, config_key, default)
 
 
 def db_connect():
@@ -176,55 +162,91 @@ def fetch_signatures_rpc(session, address, limit=1000, before=None, until=None):
         "params": [address, params_obj]
     }
 
-    response = session.post(RPC_URL, json=payload)
+    with METRICS.timer('api'):
+        response = session.post(RPC_URL, json=payload)
     response.raise_for_status()
     return response.json()
 
 
-def fetch_all_signatures(session, tag, address, until_sig=None, rpc_delay=0.2):
+def page_sync_range(tag, sync_id, mint_address_id, address, rng, budget,
+                    rpc_delay=0.2, stop_event=None):
     """
-    Generator that fetches all signatures for an address from newest to oldest.
-    Stops when it hits until_sig (our oldest known signature) or runs out of history.
-    Skips failed transactions.
+    Page one checkpointed range of a mint's history, newest to oldest.
+
+    rng is a txs_sync_cursor row: pagination resumes from rng['before_sig'] and
+    runs until rng['until_sig'] (exclusive) or a short page, which mark the
+    range done, or until this call has paged `budget` signatures, which
+    leaves it active for the next request to resume.
+    Each page is stored and the cursor advanced in the same transaction, so a
+    worker that dies mid-range resumes from its last stored page. Runs on its
+    own DB connection and RPC session so several ranges can page concurrently.
+    Returns signatures fetched in this call (failed txs excluded).
     """
-    before = None
-    total_fetched = 0
+    range_tag = f"{tag}/r{rng['range_idx']}"
+    before = rng['before_sig']
+    fetched = rng['fetched']
+    fetched_now = 0
+    paged_now = 0
     page = 0
 
-    while True:
-        page += 1
-        try:
-            response = fetch_signatures_rpc(
-                session, address, limit=1000, before=before, until=until_sig
-            )
-        except requests.RequestException as e:
-            log(tag, f"RPC error on page {page}: {e}")
-            break
-
-        if 'error' in response:
-            log(tag, f"RPC returned error on page {page}: {response['error']}")
-            break
-
-        signatures = response.get('result', [])
-        if not signatures:
-            break
-
-        for sig in signatures:
-            if sig.get('err') is not None:
-                continue  # Skip failed txs
-            yield sig
-
-        total_fetched += len(signatures)
-        before = signatures[-1].get('signature') if signatures else None
-
-        if len(signatures) < 1000:
-            break  # Last page
+    session = requests.Session()
+    conn = db_connect()
+    cursor = conn.cursor()
+    try:
+        while paged_now < budget:
+            if stop_event is not None and stop_event.is_set():
+                log(range_tag, f"Stopping at {fetched} sigs (cursor saved)")
+                break
 
-        if rpc_delay > 0:
-            time.sleep(rpc_delay)
+            page += 1
+            limit = min(1000, budget - paged_now)
+            try:
+                response = fetch_signatures_rpc(
+                    session, address, limit=limit, before=before, until=rng['until_sig']
+                )
+            except requests.RequestException as e:
+                log(range_tag, f"RPC error on page {page}: {e} (cursor saved)")
+                break
+
+            if 'error' in response:
+                log(range_tag, f"RPC returned error on page {page}: {response['error']} (cursor saved)")
+                break
+
+            signatures = response.get('result', [])
+            # Only a short page ends the range; running out of budget keeps it active
+            done = len(signatures) < limit
+            ok_sigs = [sig for sig in signatures if sig.get('err') is None]  # Skip failed txs
+
+            if signatures:
+                before = signatures[-1].get('signature')
+                fetched += len(ok_sigs)
+                fetched_now += len(ok_sigs)
+                paged_now += len(signatures)
+
+            store_discovered_signatures(cursor, conn, range_tag, sync_id, mint_address_id,
+                                        ok_sigs, commit=False)
+            save_sync_cursor(cursor, sync_id, rng['range_idx'], before, fetched, done)
+            conn.commit()
+
+            if done:
+                break
+            if paged_now >= budget:
+                log(range_tag, f"Request budget reached at {fetched} sigs (range left active)")
+                break
+
+            if rpc_delay > 0:
+                time.sleep(rpc_delay)
+
+            if page % 10 == 0:
+                log(range_tag, f"  ... fetched {fetched} signatures so far (page {page})")
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        session.close()
 
-        if page % 10 == 0:
-            log(tag, f"  ... fetched {total_fetched} signatures so far (page {page})")
+    return fetched_now
 
 
 # =============================================================================
@@ -284,7 +306,7 @@ def find_oldest_signature(cursor, tag, mint_address_id):
     return None, None
 
 
-def store_discovered_signatures(cursor, conn, tag, sync_id, mint_address_id, sig_batch):
+def store_discovered_signatures(cursor, conn, tag, sync_id, mint_address_id, sig_batch, commit=True):
     """
     INSERT IGNORE a batch of discovered signatures into txs_sync.
     sig_batch is a list of RPC result dicts with 'signature', 'blockTime', 'slot'.
@@ -312,50 +334,218 @@ def store_discovered_signatures(cursor, conn, tag, sync_id, mint_address_id, sig
     """
     cursor.execute(sql, params)
     inserted = cursor.rowcount
-    conn.commit()
+    if commit:
+        conn.commit()
     return inserted
 
 
-def mark_existing_signatures(cursor, conn, tag, sync_id):
+def known_history_size(cursor, mint_address_id):
     """
-    Mark signatures that already exist in our tx table.
-    Returns count of existing signatures.
+    Rough size of the mint's history we already hold: tx_token.guide_edge_count
+    (maintained by guide-aggregator). Edges outnumber txs, so this errs towards
+    more ranges, which only costs a few extra pagers.
+    """
+    cursor.execute("""
+        SELECT COALESCE(MAX(guide_edge_count), 0)
+        FROM tx_token
+        WHERE mint_address_id = %s
+    """, (mint_address_id,))
+    row = cursor.fetchone()
+    return int(row[0]) if row and row[0] else 0
+
+
+def range_budget(max_sigs, n_ranges):
+    """Per-range share of a request's signature cap."""
+    return max(1, -(-max_sigs // max(1, n_ranges)))
+
+
+def plan_sync_ranges(cursor, tag, mint_address_id, oldest_sig, oldest_block_time, pagers):
+    """
+    Split [oldest known tx, now] into up to `pagers` time ranges for concurrent paging.
+
+    getSignaturesForAddress only accepts signature bounds, so each split point is
+    the first tx we already hold for this mint at or after an evenly spaced
+    block_time. Returns [(before_sig, until_sig), ...] newest range first; the
+    first range has no before (chain head), the last stops at oldest_sig.
+    """
+    if pagers <= 1 or not oldest_sig or not oldest_block_time:
+        return [(None, oldest_sig)]
+
+    now = int(time.time())
+    step = (now - oldest_block_time) / pagers
+    bounds = []
+    for k in range(1, pagers):
+        cursor.execute("""
+            SELECT t.signature
+            FROM tx_guide g
+            JOIN tx t ON t.id = g.tx_id
+            JOIN tx_token tk ON tk.id = g.token_id
+            WHERE tk.mint_address_id = %s AND t.block_time >= %s
+            ORDER BY t.block_time ASC
+            LIMIT 1
+        """, (mint_address_id, int(oldest_block_time + k * step)))
+        row = cursor.fetchone()
+        if row and row[0] != oldest_sig and row[0] not in bounds:
+            bounds.append(row[0])
+
+    # Newest first: head -> b[n-1] -> ... -> b[1] -> oldest_sig
+    edges = [None] + list(reversed(bounds)) + [oldest_sig]
+    ranges = [(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+    log(tag, f"Split history into {len(ranges)} ranges")
+    return ranges
+
+
+def create_sync_cursors(cursor, conn, sync_id, mint_address_id, ranges, max_sigs):
     """
+    Persist one txs_sync_cursor row per range (max_sigs records the per-request
+    share it was created with). Returns the rows as dicts.
+    """
+    per_range = range_budget(max_sigs, len(ranges))
+    rows = []
+    for idx, (before_sig, until_sig) in enumerate(ranges):
+        cursor.execute(f"""
+            INSERT INTO {STAGING_SCHEMA}.{SYNC_CURSOR_TABLE}
+                (sync_id, range_idx, mint_address_id, before_sig, until_sig, max_sigs)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (sync_id, idx, mint_address_id, before_sig, until_sig, per_range))
+        rows.append({'range_idx': idx, 'before_sig': before_sig, 'until_sig': until_sig,
+                     'fetched': 0, 'max_sigs': per_range})
+    conn.commit()
+    return rows
+
+
+def find_resumable_sync(cursor, mint_address_id):
+    """Most recent sync_id for this mint that still has unfinished ranges, or None."""
+    cursor.execute(f"""
+        SELECT sync_id
+        FROM {STAGING_SCHEMA}.{SYNC_CURSOR_TABLE}
+        WHERE mint_address_id = %s AND status = 'active'
+        ORDER BY updated_utc DESC
+        LIMIT 1
+    """, (mint_address_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def load_active_cursors(cursor, sync_id):
     cursor.execute(f"""
-        UPDATE {STAGING_SCHEMA}.{SYNC_TABLE} s
-        JOIN tx t ON t.signature = s.signature
-        SET s.status = 'exists'
-        WHERE s.sync_id = %s AND s.status = 'discovered'
+        SELECT range_idx, before_sig, until_sig, fetched, max_sigs
+        FROM {STAGING_SCHEMA}.{SYNC_CURSOR_TABLE}
+        WHERE sync_id = %s AND status = 'active'
+        ORDER BY range_idx
     """, (sync_id,))
-    existing = cursor.rowcount
-    conn.commit()
-    return existing
+    return [{'range_idx': r[0], 'before_sig': r[1], 'until_sig': r[2],
+             'fetched': r[3], 'max_sigs': r[4]} for r in cursor.fetchall()]
+
+
+def save_sync_cursor(cursor, sync_id, range_idx, before_sig, fetched, done):
+    """Advance a range's resume point (caller commits together with the page)."""
+    cursor.execute(f"""
+        UPDATE {STAGING_SCHEMA}.{SYNC_CURSOR_TABLE}
+        SET before_sig = %s, fetched = %s, status = %s
+        WHERE sync_id = %s AND range_idx = %s
+    """, (before_sig, fetched, 'done' if done else 'active', sync_id, range_idx))
 
 
-def fetch_gap_signatures(cursor, sync_id):
+def count_discovered_signatures(cursor, sync_id):
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM {STAGING_SCHEMA}.{SYNC_TABLE} WHERE sync_id = %s
+    """, (sync_id,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def sync_id_bounds(cursor, sync_id):
+    """(min_id, max_id) of a sync's txs_sync rows, or (None, None)."""
+    cursor.execute(f"""
+        SELECT MIN(id), MAX(id) FROM {STAGING_SCHEMA}.{SYNC_TABLE} WHERE sync_id = %s
+    """, (sync_id,))
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def mark_existing_signatures(cursor, conn, tag, sync_id):
     """
-    Fetch all discovered (gap) signatures that need processing.
-    Returns list of signature strings ordered by block_time DESC.
+    Mark signatures that already exist in our tx table.
+    Walks the sync in id chunks (one short transaction each) instead of one
+    UPDATE ... JOIN over the whole sync.
+    Returns count of existing signatures.
     """
+    lo, hi = sync_id_bounds(cursor, sync_id)
+    if lo is None:
+        return 0
+
+    existing = 0
+    start = lo - 1
+    while start < hi:
+        end = min(start + SYNC_DIFF_CHUNK, hi)
+        cursor.execute(f"""
+            UPDATE {STAGING_SCHEMA}.{SYNC_TABLE} s
+            JOIN tx t ON t.signature = s.signature
+            SET s.status = 'exists'
+            WHERE s.sync_id = %s AND s.status = 'discovered'
+              AND s.id > %s AND s.id <= %s
+        """, (sync_id, start, end))
+        existing += cursor.rowcount
+        conn.commit()
+        start = end
+    return existing
+
+
+def count_gap_signatures(cursor, sync_id):
     cursor.execute(f"""
-        SELECT signature
-        FROM {STAGING_SCHEMA}.{SYNC_TABLE}
+        SELECT COUNT(*) FROM {STAGING_SCHEMA}.{SYNC_TABLE}
         WHERE sync_id = %s AND status = 'discovered'
-        ORDER BY block_time DESC
     """, (sync_id,))
-    return [row[0] for row in cursor.fetchall()]
+    row = cursor.fetchone()
+    return row[0] if row else 0
 
 
-def mark_queued(cursor, conn, sync_id, signatures):
-    """Mark a batch of signatures as queued in txs_sync."""
-    if not signatures:
+def iter_gap_pages(cursor, sync_id, page_size):
+    """
+    Keyset-paginate the discovered (gap) signatures of a sync newest first,
+    on (block_time DESC, id DESC) via idx_sync_status_time; rows with no
+    block_time come last, as with the old ORDER BY block_time DESC.
+    Yields rows as [(id, signature, block_time), ...]; memory stays at one page
+    however large the gap set is. The caller marks each page before asking for
+    the next one.
+    """
+    base = f"""
+        SELECT id, signature, block_time
+        FROM {STAGING_SCHEMA}.{SYNC_TABLE}
+        WHERE sync_id = %s AND status = 'discovered'
+    """
+    order = "ORDER BY block_time DESC, id DESC LIMIT %s"
+    last = None
+    while True:
+        if last is None:
+            cursor.execute(f"{base} {order}", (sync_id, page_size))
+        elif last[1] is None:
+            cursor.execute(f"{base} AND block_time IS NULL AND id < %s {order}",
+                           (sync_id, last[0], page_size))
+        else:
+            cursor.execute(f"""{base}
+                  AND (block_time < %s OR (block_time = %s AND id < %s) OR block_time IS NULL)
+                {order}""", (sync_id, last[1], last[1], last[0], page_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        yield rows
+        last = (rows[-1][0], rows[-1][2])
+        if len(rows) < page_size:
+            return
+
+
+def mark_queued_ids(cursor, conn, sync_id, ids):
+    """Mark the given txs_sync rows of a sync as queued (one UPDATE per page)."""
+    if not ids:
         return
-    placeholders = ','.join(['%s'] * len(signatures))
+    placeholders = ','.join(['%s'] * len(ids))
     cursor.execute(f"""
         UPDATE {STAGING_SCHEMA}.{SYNC_TABLE}
         SET status = 'queued'
-        WHERE sync_id = %s AND signature IN ({placeholders})
-    """, (sync_id, *signatures))
+        WHERE sync_id = %s AND id IN ({placeholders})
+    """, (sync_id, *ids))
     conn.commit()
 
 
@@ -390,9 +580,16 @@ def cascade_to_pipeline(ch, tag, signatures, request_id, correlation_id,
     ch.basic_publish(exchange='', routing_key=DETAILER_REQUEST_QUEUE, body=body, properties=props)
 
 
-def process_sync_request(tag, cursor, conn, ch, session, msg, dry_run, rpc_delay, cascade_batch_size, max_sigs=1000):
+def process_sync_request(tag, cursor, conn, ch, msg, dry_run, rpc_delay, cascade_batch_size,
+                         max_sigs=1000, pagers=1, stop_event=None):
     """
     Main sync processing flow for a single mint.
+
+    RPC pagination is checkpointed per range in txs_sync_cursor: a request for a
+    mint with unfinished ranges (or an explicit sync.sync_id) resumes that sync
+    instead of starting over from the newest signature. max_sigs caps what one
+    request fetches, split evenly across the unfinished ranges; ranges that hit
+    their share stay active for the next request.
     Returns result dict.
     """
     request_id = msg.get('request_id', str(uuid.uuid4()))
@@ -404,7 +601,7 @@ def process_sync_request(tag, cursor, conn, ch, session, msg, dry_run, rpc_delay
 
     mint_address = sync_data.get('mint_address')
     mint_symbol = sync_data.get('mint_symbol')
-    sync_id = str(uuid.uuid4())
+    sync_id = sync_data.get('sync_id')
 
     result = {
         'mint_address': mint_address,
@@ -427,44 +624,64 @@ def process_sync_request(tag, cursor, conn, ch, session, msg, dry_run, rpc_delay
     result['mint_address'] = address_str
     log(tag, f"Resolved mint: {address_str} (id={address_id})")
 
-    # Step 2: Find our oldest known signature
-    oldest_sig, oldest_block_time = find_oldest_signature(cursor, tag, address_id)
-    if oldest_sig:
-        log(tag, f"Oldest known tx: {oldest_sig[:16]}... (block_time={oldest_block_time})")
+    # Step 2: Resume an interrupted sync, or plan ranges from our oldest known signature
+    if not sync_id:
+        sync_id = find_resumable_sync(cursor, address_id)
+    ranges = load_active_cursors(cursor, sync_id) if sync_id else []
+
+    if ranges:
+        log(tag, f"Resuming sync {sync_id[:8]}: {len(ranges)} unfinished range(s)")
     else:
-        log(tag, "No existing transactions found for this mint — fetching full history")
+        oldest_sig, oldest_block_time = find_oldest_signature(cursor, tag, address_id)
+        if oldest_sig:
+            log(tag, f"Oldest known tx: {oldest_sig[:16]}... (block_time={oldest_block_time})")
+        else:
+            log(tag, "No existing transactions found for this mint — fetching full history")
+
+        if dry_run:
+            log(tag, "[DRY] Would fetch signatures from Chainstack and process gaps")
+            return result
+
+        # Split by the history we already know of, not by the per-request cap:
+        # every range should cover at least SYNC_MIN_RANGE_SIGS known signatures
+        known = known_history_size(cursor, address_id) if oldest_sig else 0
+        n_ranges = max(1, min(pagers, known // SYNC_MIN_RANGE_SIGS))
+        sync_id = sync_id or str(uuid.uuid4())
+        ranges = create_sync_cursors(
+            cursor, conn, sync_id, address_id,
+            plan_sync_ranges(cursor, tag, address_id, oldest_sig, oldest_block_time, n_ranges),
+            max_sigs)
+
+    result['sync_id'] = sync_id
 
     if dry_run:
-        log(tag, "[DRY] Would fetch signatures from Chainstack and process gaps")
+        log(tag, "[DRY] Would resume RPC pagination and process gaps")
         return result
 
-    # Step 3: Fetch all signatures from Chainstack
-    log(tag, f"Fetching signatures from Chainstack (until={oldest_sig[:16] + '...' if oldest_sig else 'none'}, max={max_sigs})...")
-    sig_buffer = []
+    # Step 3: Page every unfinished range from Chainstack, concurrently
+    log(tag, f"Fetching signatures from Chainstack ({len(ranges)} range(s), max={max_sigs})...")
+    budget = range_budget(max_sigs, len(ranges))
     total_fetched = 0
-    total_stored = 0
-    buffer_size = 500  # INSERT batch size
-    capped = False
-
-    for sig in fetch_all_signatures(session, tag, address_str, until_sig=oldest_sig, rpc_delay=rpc_delay):
-        sig_buffer.append(sig)
-        total_fetched += 1
-
-        if len(sig_buffer) >= buffer_size:
-            total_stored += store_discovered_signatures(cursor, conn, tag, sync_id, address_id, sig_buffer)
-            sig_buffer = []
-
-        if total_fetched >= max_sigs:
-            log(tag, f"Reached max sig cap ({max_sigs}), stopping RPC pagination")
-            capped = True
-            break
-
-    # Flush remaining
-    if sig_buffer:
-        total_stored += store_discovered_signatures(cursor, conn, tag, sync_id, address_id, sig_buffer)
-
-    log(tag, f"Discovered {total_stored} signatures on-chain (fetched {total_fetched}{', CAPPED' if capped else ''})")
+    if len(ranges) == 1:
+        total_fetched = page_sync_range(tag, sync_id, address_id, address_str, ranges[0],
+                                        budget, rpc_delay, stop_event)
+    else:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(page_sync_range, tag, sync_id, address_id, address_str,
+                                   rng, budget, rpc_delay, stop_event)
+                       for rng in ranges]
+            for fut in as_completed(futures):
+                try:
+                    total_fetched += fut.result()
+                except Exception as e:
+                    log(tag, f"Range pager failed (cursor kept for resume): {e}")
+
+    unfinished = len(load_active_cursors(cursor, sync_id))
+    total_stored = count_discovered_signatures(cursor, sync_id)
+    log(tag, f"Discovered {total_stored} signatures on-chain (fetched {total_fetched} this run"
+             f"{f', {unfinished} range(s) left to resume' if unfinished else ''})")
     result['total_on_chain'] = total_stored
+    result['ranges_unfinished'] = unfinished
 
     if total_stored == 0:
         log(tag, "No signatures found on-chain")
@@ -475,32 +692,42 @@ def process_sync_request(tag, cursor, conn, ch, session, msg, dry_run, rpc_delay
     result['already_have'] = existing_count
     log(tag, f"Already have: {existing_count}, gaps: {total_stored - existing_count}")
 
-    # Step 5: Cascade missing signatures to pipeline
-    gap_sigs = fetch_gap_signatures(cursor, sync_id)
-    result['gaps_found'] = len(gap_sigs)
+    # Step 5: Stream missing signatures to the pipeline newest first, one keyset page at a time
+    gap_count = count_gap_signatures(cursor, sync_id)
+    result['gaps_found'] = gap_count
 
-    if not gap_sigs:
+    if not gap_count:
         log(tag, "No gaps found — mint is fully synced")
         return result
 
-    log(tag, f"Cascading {len(gap_sigs)} gap signatures in batches of {cascade_batch_size}...")
-    total_batches = (len(gap_sigs) + cascade_batch_size - 1) // cascade_batch_size
+    log(tag, f"Cascading {gap_count} gap signatures in batches of {cascade_batch_size}...")
+    total_batches = (gap_count + cascade_batch_size - 1) // cascade_batch_size
+    page_size = cascade_batch_size * SYNC_GAP_PAGE_BATCHES
     batches_queued = 0
+    failed = False
 
-    for i in range(0, len(gap_sigs), cascade_batch_size):
-        batch = gap_sigs[i:i + cascade_batch_size]
-        batch_num = (i // cascade_batch_size) + 1
-
-        try:
-            cascade_to_pipeline(
-                ch, tag, batch, request_id, correlation_id,
-                priority, request_log_id, api_key_id,
-                batch_num, total_batches
-            )
-            mark_queued(cursor, conn, sync_id, batch)
+    for rows in iter_gap_pages(cursor, sync_id, page_size):
+        published = 0
+        for i in range(0, len(rows), cascade_batch_size):
+            chunk = rows[i:i + cascade_batch_size]
+            batch_num = batches_queued + 1
+            try:
+                cascade_to_pipeline(
+                    ch, tag, [sig for _, sig, _ in chunk], request_id, correlation_id,
+                    priority, request_log_id, api_key_id,
+                    batch_num, total_batches
+                )
+            except Exception as e:
+                log(tag, f"Failed to cascade batch {batch_num}: {e} (rest left as discovered)")
+                failed = True
+                break
             batches_queued += 1
-        except Exception as e:
-            log(tag, f"Failed to cascade batch {batch_num}: {e}")
+            published += len(chunk)
+
+        # One UPDATE per page (only the part that was published)
+        mark_queued_ids(cursor, conn, sync_id, [row[0] for row in rows[:published]])
+        if failed:
+            break
 
     result['batches_queued'] = batches_queued
     log(tag, f"Sync complete: {batches_queued}/{total_batches} batches queued")
@@ -514,7 +741,7 @@ def process_sync_request(tag, cursor, conn, ch, session, msg, dry_run, rpc_delay
 
 class WorkerThread(threading.Thread):
     def __init__(self, worker_id, dry_run, stop_event,
-                 poll_idle_sec, reconnect_sec, rpc_delay_sec, cascade_batch_size):
+                 poll_idle_sec, reconnect_sec, rpc_delay_sec, cascade_batch_size, pagers=1):
         super().__init__(daemon=True)
         self.tag = f"W-{worker_id}"
         self.worker_id = worker_id
@@ -524,10 +751,10 @@ class WorkerThread(threading.Thread):
         self.reconnect_sec = reconnect_sec
         self.rpc_delay_sec = rpc_delay_sec
         self.cascade_batch_size = cascade_batch_size
+        self.pagers = pagers
 
     def run(self):
         log(self.tag, "Starting")
-        session = requests.Session()
         db_conn = None
         cursor = None
 
@@ -556,7 +783,8 @@ class WorkerThread(threading.Thread):
                         rmq_conn.process_data_events(time_limit=0)
                         continue
 
-                    self._handle_message(ch, method, properties, body, cursor, db_conn, session)
+                    with METRICS.message(body, properties):
+                        self._handle_message(ch, method, properties, body, cursor, db_conn)
 
                 # Clean exit
                 try:
@@ -584,10 +812,9 @@ class WorkerThread(threading.Thread):
                 db_conn.close()
             except Exception:
                 pass
-        session.close()
         log(self.tag, "Stopped")
 
-    def _handle_message(self, ch, method, properties, body, cursor, db_conn, session):
+    def _handle_message(self, ch, method, properties, body, cursor, db_conn):
         try:
             msg = json.loads(body.decode('utf-8'))
             request_id = msg.get('request_id', 'unknown')
@@ -597,9 +824,9 @@ class WorkerThread(threading.Thread):
 
             max_sigs = get_config_int(cursor, 'queue', 'synchronizer_wrk_max_sigs', 1000)
             result = process_sync_request(
-                self.tag, cursor, db_conn, ch, session, msg,
+                self.tag, cursor, db_conn, ch, msg,
                 self.dry_run, self.rpc_delay_sec, self.cascade_batch_size,
-                max_sigs=max_sigs
+                max_sigs=max_sigs, pagers=self.pagers, stop_event=self.stop_event
             )
 
             # Publish response
@@ -635,6 +862,7 @@ class WorkerThread(threading.Thread):
             raise  # Bubble up for DB reconnect
         except Exception as e:
             log(self.tag, f"ERROR processing sync request -> DLQ: {e}")
+            METRICS.incr('dlq')
             import traceback
             traceback.print_exc()
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
@@ -653,6 +881,7 @@ def read_config(cursor):
         'shutdown_timeout': get_config_float(cursor, 'queue', 'synchronizer_wrk_shutdown_timeout_sec', 30.0),
         'rpc_delay':        get_config_float(cursor, 'queue', 'synchronizer_wrk_rpc_delay_sec', 0.2),
         'cascade_batch':    get_config_int(cursor, 'queue', 'synchronizer_wrk_cascade_batch_size', 20),
+        'pagers':           get_config_int(cursor, 'queue', 'synchronizer_wrk_cnt_pagers', 4),
     }
 
 
@@ -665,6 +894,9 @@ def run_supervisor(dry_run=False):
 """, flush=True)
 
     workers = {}
+    start_exporter(METRICS)
+    config_cache = get_config_cache()
+    config_cache.log_changes(lambda msg: log('SVR', msg))
     next_id = 1
     svr_conn = None
     svr_cursor = None
@@ -695,6 +927,8 @@ def run_supervisor(dry_run=False):
                 time.sleep(DB_FALLBACK_RETRY_SEC)
                 continue
 
+            # One changed-rows query per poll; read_config is served from memory
+            config_cache.refresh(svr_cursor)
             cfg = read_config(svr_cursor)
 
             # Prune dead workers
@@ -714,7 +948,7 @@ def run_supervisor(dry_run=False):
                 w = WorkerThread(
                     next_id, dry_run, stop_evt,
                     cfg['poll_idle'], cfg['reconnect'],
-                    cfg['rpc_delay'], cfg['cascade_batch'])
+                    cfg['rpc_delay'], cfg['cascade_batch'], cfg['pagers'])
                 w.start()
                 workers[next_id] = (w, stop_evt)
                 next_id += 1
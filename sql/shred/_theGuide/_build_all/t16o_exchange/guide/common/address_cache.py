@@ -0,0 +1,249 @@
+"""
+Shared address -> tx_address.id resolver for T16O Exchange Guide Services
+
+Replaces the per-worker "SELECT id FROM tx_address WHERE address = %s, INSERT
+if missing" pattern with one process-wide resolver:
+    - bounded LRU cache in front of tx_address (ids never change once assigned)
+    - program/system addresses (KNOWN_PROGRAMS) are pinned and never evicted
+    - resolve_many() does one IN (...) lookup for cache misses and one
+      multi-row INSERT ... ON DUPLICATE KEY UPDATE for addresses that don't
+      exist yet
+    - thread-safe, so all WorkerThreads in a process share one cache
+
+Usage:
+    from t16o_exchange.guide.common.address_cache import get_address_resolver
+    resolver = get_address_resolver()
+    addr_id = resolver.resolve(conn, address, 'wallet')
+    ids = resolver.resolve_many(conn, addresses)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+# Known Solana program addresses (participant classification + pinned cache entries)
+KNOWN_PROGRAMS = {
+    '11111111111111111111111111111111',              # System Program
+    'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA',  # Token Program
+    'TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb',  # Token-2022 Program
+    'ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL', # Associated Token Program
+    'ComputeBudget111111111111111111111111111111',   # Compute Budget
+    'metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s',  # Metaplex Token Metadata
+    'BPFLoaderUpgradeab1e11111111111111111111111',   # BPF Upgradeable Loader
+    'BPFLoader2111111111111111111111111111111111',   # BPF Loader 2
+    'SysvarRent111111111111111111111111111111111',   # Sysvar Rent
+    'SysvarC1ock11111111111111111111111111111111',   # Sysvar Clock
+    'Sysvar1nstructions1111111111111111111111111',   # Sysvar Instructions
+    'Vote111111111111111111111111111111111111111',   # Vote Program
+    'Stake11111111111111111111111111111111111111',   # Stake Program
+    # DEX Programs
+    '675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8',  # Raydium AMM V4
+    'CAMMCzo5YL8w4VFF8KVHrK22GGUsp5VTaW7grrKgrWqK',  # Raydium CPMM
+    'CPMMoo8L3F4NbTegBCKVNunggL7H1ZpdTHKxQB5qKP1C',  # Raydium CLMM
+    '5quBtoiQqxF9Jv6KYKctB59NT3gtJD2Y65kdnB1Uev3h',  # Raydium Stable
+    'srmqPvymJeFKQ4zGQed1GFppgkRHL9kaELCbyksJtPX',  # Serum DEX V3
+    '9xQeWvG816bUx9EPjHmaT23yvVM2ZWbrrpZb9PusVFin',  # Serum DEX V2
+    'whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc',  # Orca Whirlpools
+    'JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4',  # Jupiter V6
+    'LBUZKhRxPF3XUpBCjp4YzTKgLccjZhTSDM9YuVaPwxo',  # Meteora DLMM
+    'Eo7WjKq67rjJQSZxS6z3YkapzY3eMj6Xy8X5EQVn5UaB', # Meteora Pools
+    '6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P',  # Pump.fun
+}
+
+# Well-known non-program mints that show up in most transactions
+PINNED_MINTS = {
+    'So11111111111111111111111111111111111111112',   # Wrapped SOL
+    'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',  # USDC
+    'Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB',  # USDT
+}
+
+DEFAULT_CACHE_SIZE = 200_000
+
+# Max rows per IN (...) lookup / multi-row INSERT
+CHUNK_SIZE = 1000
+
+AddrType = Union[str, Callable[[str], str]]
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class AddressResolver:
+    """
+    Thread-safe address -> id resolver with a bounded LRU and pinned entries.
+
+    Args:
+        max_size: max non-pinned entries kept in the LRU
+        pinned: addresses that are never evicted once resolved
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE,
+                 pinned: Optional[Iterable[str]] = None):
+        self.max_size = max(1, max_size)
+        self._pin_set = set(pinned if pinned is not None else KNOWN_PROGRAMS | PINNED_MINTS)
+        self._lru: 'OrderedDict[str, int]' = OrderedDict()
+        self._pinned: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'inserted': 0, 'evictions': 0}
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def _get_cached(self, addresses) -> Dict[str, int]:
+        found = {}
+        with self._lock:
+            for addr in addresses:
+                addr_id = self._pinned.get(addr)
+                if addr_id is None:
+                    addr_id = self._lru.get(addr)
+                    if addr_id is not None:
+                        self._lru.move_to_end(addr)
+                if addr_id is not None:
+                    found[addr] = addr_id
+            self._stats['hits'] += len(found)
+            self._stats['misses'] += len(addresses) - len(found)
+        return found
+
+    def _put(self, mapping: Dict[str, int]):
+        with self._lock:
+            for addr, addr_id in mapping.items():
+                if addr in self._pin_set:
+                    self._pinned[addr] = addr_id
+                    continue
+                self._lru[addr] = addr_id
+                self._lru.move_to_end(addr)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def pin(self, addresses: Iterable[str]):
+        """Mark addresses as never-evict (takes effect when they are next resolved)."""
+        with self._lock:
+            for addr in addresses:
+                self._pin_set.add(addr)
+                addr_id = self._lru.pop(addr, None)
+                if addr_id is not None:
+                    self._pinned[addr] = addr_id
+
+    def forget(self, addresses: Iterable[str]):
+        """Drop cached ids (e.g. after a rolled-back insert)."""
+        with self._lock:
+            for addr in addresses:
+                self._lru.pop(addr, None)
+                self._pinned.pop(addr, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            s['size'] = len(self._lru)
+            s['pinned'] = len(self._pinned)
+        lookups = s['hits'] + s['misses']
+        s['hit_rate'] = round(s['hits'] / lookups, 4) if lookups else 0.0
+        return s
+
+    # -------------------------------------------------------------------------
+    # Resolution
+    # -------------------------------------------------------------------------
+
+    def resolve(self, conn, address: str, addr_type: AddrType = 'unknown',
+                create: bool = True, commit: bool = True,
+                extra: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Resolve one address. Returns None if missing and create=False."""
+        if not address:
+            return None
+        return self.resolve_many(conn, [address], addr_type, create, commit, extra).get(address)
+
+    def resolve_many(self, conn, addresses: Iterable[str], addr_type: AddrType = 'unknown',
+                     create: bool = True, commit: bool = True,
+                     extra: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Resolve many addresses to ids.
+
+        Args:
+            conn: MySQL connection (a private cursor is used, so any cursor type is fine)
+            addresses: addresses to resolve (duplicates/empties ignored)
+            addr_type: address_type for new rows, or callable(address) -> type
+            create: insert addresses that don't exist yet
+            commit: commit after inserting. Pass False inside a caller-managed
+                    transaction; nothing read or inserted in that case is cached
+                    (the transaction may still roll back).
+            extra: additional column values for newly inserted rows
+
+        Returns:
+            {address: id} for every address that exists (or was created)
+        """
+        wanted = list(dict.fromkeys(a for a in addresses if a))
+        if not wanted:
+            return {}
+
+        found = self._get_cached(wanted)
+        missing = [a for a in wanted if a not in found]
+        if not missing:
+            return found
+
+        cursor = conn.cursor()
+        try:
+            from_db = self._select_ids(cursor, missing)
+            if commit:
+                self._put(from_db)
+            found.update(from_db)
+
+            to_insert = [a for a in missing if a not in from_db]
+            if to_insert and create:
+                self._insert(cursor, to_insert, addr_type, extra or {})
+                if commit:
+                    conn.commit()
+                inserted = self._select_ids(cursor, to_insert)
+                with self._lock:
+                    self._stats['inserted'] += len(inserted)
+                if commit:
+                    self._put(inserted)
+                found.update(inserted)
+        finally:
+            cursor.close()
+        return found
+
+    @staticmethod
+    def _select_ids(cursor, addresses) -> Dict[str, int]:
+        found = {}
+        for chunk in _chunks(addresses, CHUNK_SIZE):
+            ph = ','.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT address, id FROM tx_address WHERE address IN ({ph})", chunk)
+            found.update((row[0], row[1]) for row in cursor.fetchall())
+        return found
+
+    @staticmethod
+    def _insert(cursor, addresses, addr_type: AddrType, extra: Dict[str, Any]):
+        type_of = addr_type if callable(addr_type) else (lambda _a: addr_type)
+        extra_cols = list(extra.keys())
+        cols = ['address', 'address_type'] + extra_cols
+        row_ph = '(' + ','.join(['%s'] * len(cols)) + ')'
+        for chunk in _chunks(addresses, CHUNK_SIZE):
+            values = []
+            for addr in chunk:
+                values.extend([addr, type_of(addr)] + [extra[c] for c in extra_cols])
+            # Another worker may insert the same address concurrently; only the
+            # duplicate key is tolerated (data errors still raise)
+            cursor.execute(
+                f"INSERT INTO tx_address ({', '.join(cols)}) VALUES "
+                + ','.join([row_ph] * len(chunk))
+                + " ON DUPLICATE KEY UPDATE id = id",
+                values)
+
+
+# Process-wide resolver shared by all worker threads
+_resolver: Optional[AddressResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_address_resolver(max_size: int = DEFAULT_CACHE_SIZE) -> AddressResolver:
+    """Get (or lazily create) the process-wide AddressResolver."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = AddressResolver(max_size=max_size)
+    return _resolver
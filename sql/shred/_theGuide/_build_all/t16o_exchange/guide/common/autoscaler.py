@@ -0,0 +1,198 @@
+"""
+Worker thread autoscaler for T16O Exchange Guide supervisors
+
+Optional replacement for a fixed <worker>_wrk_cnt_threads: when
+<worker>_wrk_autoscale = 1 the supervisor asks ThreadAutoscaler.decide() for
+its thread target once per poll, bounded by <worker>_wrk_cnt_threads_min /
+_max (runtime `config` keys, so bounds and the switch itself change live).
+
+Signals, sampled per supervisor poll:
+    depth         - request queue backlog (passive queue_declare)
+    latency_ms    - mean 'handle' time of messages finished since the last
+                    poll (process WorkerMetrics)
+    throttle_rate - share of Solscan requests answered 429 since the last
+                    poll (process SolscanClient stats)
+
+Rules, with hysteresis (separate up/down thresholds, N consecutive polls,
+and a cooldown after every change):
+    429           - throttle_rate >= AUTOSCALE_MAX_THROTTLE_RATE for
+                    AUTOSCALE_THROTTLE_SAMPLES polls: -1 thread (more threads
+                    only earn more 429s)
+    backlog       - depth per thread >= AUTOSCALE_UP_BACKLOG for
+                    AUTOSCALE_UP_SAMPLES polls: + AUTOSCALE_UP_STEP_PCT of the
+                    current count (at least 1), unless latency has grown
+                    beyond AUTOSCALE_LATENCY_FACTOR x what it was at the
+                    previous change (threads contending, not helping); a
+                    slowdown held for AUTOSCALE_DOWN_SAMPLES polls becomes
+                    the new baseline
+    idle          - depth per thread <= AUTOSCALE_DOWN_BACKLOG for
+                    AUTOSCALE_DOWN_SAMPLES polls: -1 thread
+    bounds        - count outside [min, max]: clamp immediately
+
+Every change, and every change of hold reason, goes to log_fn for audit.
+
+Usage:
+    scaler = ThreadAutoscaler('decoder', METRICS, get_solscan_client(),
+                              log_fn=lambda m: log('SVR', m))
+    target = scaler.decide(len(workers), depth, cfg['threads_min'], cfg['threads_max'])
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_autoscale_config
+
+# Polls with new messages but no 'handle' samples before warning once
+NO_HANDLE_WARN_POLLS = 3
+
+
+class ThreadAutoscaler:
+    """Per-supervisor thread-count controller (supervisor thread only)."""
+
+    def __init__(self, service: str, metrics=None, client=None,
+                 log_fn: Optional[Callable[[str], None]] = None):
+        self.service = service
+        self.metrics = metrics
+        self.client = client
+        self.log_fn = log_fn or (lambda msg: None)
+        self.cfg = get_autoscale_config()
+
+        self._last_handle = self._handle_totals()
+        self._last_api = self._api_totals()
+        self._up_streak = 0
+        self._down_streak = 0
+        self._throttle_streak = 0
+        self._last_change = 0.0
+        self._baseline_ms: Optional[float] = None
+        self._latency_holds = 0
+        self._hold_reason: Optional[str] = None
+        self._last_messages = self._message_count()
+        self._warned_no_handle = False
+        self._no_handle_polls = 0
+        self.last_sample: Dict[str, Any] = {}
+
+    # -------------------------------------------------------------------------
+    # Signals
+    # -------------------------------------------------------------------------
+
+    def _handle_totals(self):
+        if self.metrics is None:
+            return (0, 0.0)
+        h = self.metrics.timings.snapshot().get('handle')
+        return (h['count'], h['sum_ms']) if h else (0, 0.0)
+
+    def _message_count(self) -> int:
+        if self.metrics is None:
+            return 0
+        return self.metrics.snapshot()['counters'].get('messages', 0)
+
+    def _api_totals(self):
+        if self.client is None:
+            return (0, 0)
+        s = self.client.stats()
+        return (s.get('requests', 0), s.get('throttled', 0))
+
+    def sample(self, threads: int, depth: Optional[int]) -> Dict[str, Any]:
+        """Window signals since the previous sample."""
+        handle = self._handle_totals()
+        api = self._api_totals()
+        n, ms = handle[0] - self._last_handle[0], handle[1] - self._last_handle[1]
+        requests, throttled = api[0] - self._last_api[0], api[1] - self._last_api[1]
+        self._last_handle, self._last_api = handle, api
+        messages = self._message_count()
+        if not self._warned_no_handle and handle[0] == 0 and messages > self._last_messages:
+            # Messages keep arriving but nothing records 'handle': the latency
+            # guard would silently never apply
+            self._no_handle_polls += 1
+            if self._no_handle_polls >= NO_HANDLE_WARN_POLLS:
+                self._warned_no_handle = True
+                self.log_fn(f"[autoscale] {self.service}: {messages} messages consumed but no "
+                            f"'handle' timings recorded, latency guard inactive")
+        self._last_messages = messages
+        self.last_sample = {
+            'depth':         depth,
+            'per_thread':    None if depth is None else round(depth / max(threads, 1), 1),
+            'latency_ms':    round(ms / n, 1) if n > 0 else None,
+            'throttle_rate': round(throttled / requests, 3) if requests > 0 else None,
+        }
+        return self.last_sample
+
+    # -------------------------------------------------------------------------
+    # Decision
+    # -------------------------------------------------------------------------
+
+    def decide(self, threads: int, depth: Optional[int],
+               min_threads: int, max_threads: int) -> int:
+        """Thread target for this poll (== threads when holding)."""
+        cfg = self.cfg
+        lo = max(0, int(min_threads))
+        hi = max(lo, int(max_threads))
+        s = self.sample(threads, depth)
+
+        if threads < lo or threads > hi:
+            return self._change(threads, min(max(threads, lo), hi), 'bounds', s)
+        if depth is None:
+            return self._hold(threads, 'no queue depth', s)
+
+        per_thread = s['per_thread']
+        throttled = (s['throttle_rate'] is not None
+                     and s['throttle_rate'] >= cfg['max_throttle_rate'])
+        self._throttle_streak = self._throttle_streak + 1 if throttled else 0
+        self._up_streak = (self._up_streak + 1
+                           if per_thread >= cfg['up_backlog'] and not throttled else 0)
+        self._down_streak = (self._down_streak + 1
+                             if per_thread <= cfg['down_backlog'] else 0)
+
+        if time.monotonic() - self._last_change < cfg['cooldown_sec']:
+            return threads
+
+        if self._throttle_streak >= cfg['throttle_samples'] and threads > lo:
+            return self._change(threads, threads - 1, '429', s)
+
+        if self._up_streak >= cfg['up_samples'] and threads < hi:
+            if (self._baseline_ms and s['latency_ms']
+                    and s['latency_ms'] > self._baseline_ms * cfg['latency_factor']):
+                reason = (f"latency {s['latency_ms']}ms > "
+                          f"{cfg['latency_factor']}x {self._baseline_ms}ms")
+                # A slowdown that outlasts the down window is the new normal
+                # (bigger batches, slower API), not thread contention
+                self._latency_holds += 1
+                if self._latency_holds >= cfg['down_samples']:
+                    self._baseline_ms = s['latency_ms']
+                    self._latency_holds = 0
+                return self._hold(threads, reason, s)
+            step = max(1, math.ceil(threads * cfg['up_step_pct'] / 100.0))
+            return self._change(threads, min(hi, threads + step), 'backlog', s)
+
+        if self._down_streak >= cfg['down_samples'] and threads > lo:
+            return self._change(threads, threads - 1, 'idle', s)
+
+        self._hold_reason = None
+        return threads
+
+    def _change(self, threads: int, target: int, reason: str, s: Dict[str, Any]) -> int:
+        self.log_fn(f"[autoscale] {self.service}: {threads} -> {target} threads ({reason}) "
+                    f"{self._fmt(s)}")
+        if self.metrics is not None:
+            self.metrics.incr('autoscale_up' if target > threads else 'autoscale_down')
+        self._last_change = time.monotonic()
+        self._up_streak = self._down_streak = self._throttle_streak = 0
+        self._latency_holds = 0
+        self._hold_reason = None
+        if s['latency_ms'] is not None:
+            self._baseline_ms = s['latency_ms']
+        return target
+
+    def _hold(self, threads: int, reason: str, s: Dict[str, Any]) -> int:
+        # Log only when the hold reason changes, not every poll
+        key = reason.split(' ', 1)[0]
+        if key != self._hold_reason:
+            self._hold_reason = key
+            self.log_fn(f"[autoscale] {self.service}: hold at {threads} threads ({reason}) "
+                        f"{self._fmt(s)}")
+        return threads
+
+    @staticmethod
+    def _fmt(s: Dict[str, Any]) -> str:
+        return ' '.join(f"{k}={'-' if v is None else v}" for k, v in s.items())
@@ -0,0 +1,388 @@
+"""
+Response cache for the gateway's /api/bmap/get (sp_tx_bmap_get)
+
+sp_tx_bmap_get builds ~10 temp tables and several JSON_ARRAYAGG blobs per
+call, while viewers scrub back and forth over the same windows. BmapCache
+keeps the SP's JSON result keyed by what the SP resolved to:
+
+    (token_id, anchor tx_id, limit)
+
+Request parameters (symbol/name/mint/signature/block_time) are first mapped
+to that key by the gateway's resolver; those mappings are memoized too
+(anchors), so a repeated request costs no DB round-trip at all.
+
+Freshness:
+    - every entry records the block_time span of its prev/next navigation.
+      A span that reaches the token's newest (or oldest) tx is open-ended
+    - the aggregator publishes (token_id, min_block_time, max_block_time) for
+      the tx_guide edges it just loaded to the BMAP_INVALIDATE_EXCHANGE fanout;
+      entries of that token whose span overlaps are dropped. Windows in the
+      past are therefore immutable unless history is backfilled into them
+    - every event bumps the token's generation. A miss takes the generation
+      before it runs the SP and passes it to put(); if an event arrived in
+      between (the SP may have read the pre-commit state), the result is not
+      cached
+    - open-ended ("live") entries also expire after live_ttl_sec, in case an
+      event is lost, and all entries after ttl_sec (labels, balances)
+    - anchors without a signature (latest tx / nearest to block_time) are
+      dropped on any event for their token; all anchors expire after
+      resolve_ttl_sec (symbol/name ranking drifts)
+
+Memory is bounded by max_bytes (LRU). With spill_dir set, evicted entries
+that are not live are written there (bounded by spill_max_bytes) and read
+back on a memory miss; the directory is emptied at startup.
+
+Usage:
+    cache = get_bmap_cache()
+    key = (token_id, tx_id, limit)
+    body = cache.get(key)
+    if body is None:
+        gen = cache.generation(token_id)
+        body = <run sp_tx_bmap_get>
+        cache.put(key, body, window_bounds(data), generation=gen)
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config import get_bmap_cache_config
+from .stage_timings import StageTimings
+
+# Fanout exchange the aggregator publishes invalidation events to
+BMAP_INVALIDATE_EXCHANGE = 'guide.bmap.invalidate'
+
+# sp_tx_bmap_get returns at most this many prev/next navigation entries
+NAV_SIZE = 5
+
+CacheKey = Tuple[int, int, int]
+AnchorKey = Tuple[Any, ...]
+
+
+class _Entry:
+    __slots__ = ('body', 'token_id', 'start_bt', 'end_bt', 'expires', 'size', 'path')
+
+    def __init__(self, body, token_id, start_bt, end_bt, expires):
+        self.body = body
+        self.token_id = token_id
+        self.start_bt = start_bt
+        self.end_bt = end_bt
+        self.expires = expires
+        self.size = len(body)
+        self.path = None
+
+    @property
+    def live(self) -> bool:
+        return self.start_bt is None or self.end_bt is None
+
+    def overlaps(self, min_bt: int, max_bt: int) -> bool:
+        return ((self.start_bt is None or self.start_bt <= max_bt)
+                and (self.end_bt is None or self.end_bt >= min_bt))
+
+
+def window_bounds(data: Dict) -> Tuple[Optional[int], Optional[int]]:
+    """(oldest, newest) block_time of a result's navigation; None = open end."""
+    txs = data['result']['txs']
+    prev, nxt = txs.get('prev') or [], txs.get('next') or []
+    start = prev[-1]['block_time'] if len(prev) >= NAV_SIZE else None
+    end = nxt[-1]['block_time'] if len(nxt) >= NAV_SIZE else None
+    return start, end
+
+
+class BmapCache:
+    """Thread-safe LRU of sp_tx_bmap_get results with token-range invalidation."""
+
+    def __init__(self, max_bytes: int, ttl_sec: float, live_ttl_sec: float,
+                 resolve_ttl_sec: float, spill_dir: Optional[str] = None,
+                 spill_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self.live_ttl_sec = live_ttl_sec
+        self.resolve_ttl_sec = resolve_ttl_sec
+        self.spill_dir = spill_dir or None
+        self.spill_max_bytes = spill_max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[CacheKey, _Entry]' = OrderedDict()
+        self._spilled: 'OrderedDict[CacheKey, _Entry]' = OrderedDict()
+        self._by_token: Dict[int, Set[CacheKey]] = {}
+        self._anchors: Dict[AnchorKey, Tuple[int, int, str, str, float]] = {}
+        self._generations: Dict[int, int] = {}
+        self._bytes = 0
+        self._spill_bytes = 0
+        self.timings = StageTimings(('hit', 'miss', 'resolve'))
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'uncached': 0,
+                       'anchor_hits': 0, 'events': 0, 'invalidated': 0,
+                       'expired': 0, 'evicted': 0, 'spilled': 0, 'raced': 0}
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            for path in glob.glob(os.path.join(self.spill_dir, 'bmap-*.json')):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # -------------------------------------------------------------------------
+    # Anchors (request params -> resolved key parts)
+    # -------------------------------------------------------------------------
+
+    def get_anchor(self, params: AnchorKey) -> Optional[Tuple[int, int, str, str]]:
+        with self._lock:
+            hit = self._anchors.get(params)
+            if hit is None:
+                return None
+            if hit[4] <= time.time():
+                del self._anchors[params]
+                return None
+            self._stats['anchor_hits'] += 1
+            return hit[:4]
+
+    def put_anchor(self, params: AnchorKey, token_id: int, tx_id: int,
+                   mint: str, signature: str):
+        with self._lock:
+            self._anchors[params] = (token_id, tx_id, mint, signature,
+                                     time.time() + self.resolve_ttl_sec)
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def generation(self, token_id: int) -> int:
+        """Invalidation generation of token_id; take it before running the SP."""
+        with self._lock:
+            return self._generations.get(token_id, 0)
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        """Cached JSON body for key, from memory or the spill directory."""
+        now = time.time()
+        with self._lock:
+            gen = self._generations.get(key[0], 0)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires <= now:
+                    self._drop(key)
+                    self._stats['expired'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry.body
+            spilled = self._spilled.get(key)
+            if spilled is None or spilled.path is None:
+                self._stats['misses'] += 1
+                return None
+            if spilled.expires <= now:
+                stale = self._drop(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+            else:
+                stale = None
+            path = spilled.path
+        if stale:
+            self._unlink([stale])
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            body = None
+        with self._lock:
+            if body is None or self._spilled.get(key) is not spilled:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+        self.put(key, body, (spilled.start_bt, spilled.end_bt), spilled.expires, gen)
+        return body
+
+    def put(self, key: CacheKey, body: bytes, bounds: Tuple[Optional[int], Optional[int]],
+            expires: Optional[float] = None, generation: Optional[int] = None):
+        """
+        Cache body for key. With generation (from generation() before the SP
+        ran), the put is skipped if the token was invalidated since.
+        """
+        if len(body) > self.max_bytes:
+            return
+        entry = _Entry(body, key[0], bounds[0], bounds[1], 0.0)
+        entry.expires = expires or time.time() + (
+            self.live_ttl_sec if entry.live else self.ttl_sec)
+        with self._lock:
+            if generation is not None and self._generations.get(key[0], 0) != generation:
+                self._stats['raced'] += 1
+                return
+            stale = self._drop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._by_token.setdefault(key[0], set()).add(key)
+            to_spill = self._evict()
+        self._unlink([stale])
+        self._spill(to_spill)
+
+    def note_uncached(self):
+        """Count a request answered by the SP without caching (errors, auto-fetch)."""
+        with self._lock:
+            self._stats['uncached'] += 1
+
+    def invalidate(self, token_id: int, min_bt: int, max_bt: int) -> int:
+        """Drop token_id's entries whose window overlaps [min_bt, max_bt]."""
+        removed = []
+        with self._lock:
+            self._stats['events'] += 1
+            self._generations[token_id] = self._generations.get(token_id, 0) + 1
+            for key in list(self._by_token.get(token_id, ())):
+                entry = self._entries.get(key) or self._spilled.get(key)
+                if entry is not None and entry.overlaps(min_bt, max_bt):
+                    removed.append(self._drop(key))
+            for params in [p for p, a in self._anchors.items()
+                           if a[0] == token_id and p[3] is None]:
+                del self._anchors[params]
+            self._stats['invalidated'] += len(removed)
+        self._unlink(removed)
+        return len(removed)
+
+    def clear(self):
+        with self._lock:
+            removed = [self._drop(key) for key in list(self._entries) + list(self._spilled)]
+            self._anchors.clear()
+        self._unlink(removed)
+
+    # -------------------------------------------------------------------------
+    # Internals (caller holds _lock unless noted)
+    # -------------------------------------------------------------------------
+
+    def _drop(self, key: CacheKey) -> Optional[str]:
+        """Forget key everywhere; returns a spill file to delete (outside the lock)."""
+        path = None
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        spilled = self._spilled.pop(key, None)
+        if spilled is not None:
+            self._spill_bytes -= spilled.size
+            path = spilled.path
+        keys = self._by_token.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_token[key[0]]
+        return path
+
+    def _evict(self) -> List[Tuple[CacheKey, _Entry]]:
+        to_spill = []
+        while self._bytes > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats['evicted'] += 1
+            if self.spill_dir and not entry.live:
+                # Claim the slot now so invalidate() sees it while the file is written
+                self._spilled[key] = entry
+                self._spill_bytes += entry.size
+                to_spill.append((key, entry))
+            else:
+                keys = self._by_token.get(key[0])
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_token[key[0]]
+        return to_spill
+
+    def _spill(self, to_spill: List[Tuple[CacheKey, _Entry]]):
+        """Write evicted entries to spill_dir (no lock held during I/O)."""
+        for key, entry in to_spill:
+            path = os.path.join(self.spill_dir, 'bmap-{}-{}-{}.json'.format(*key))
+            try:
+                with open(path, 'wb') as f:
+                    f.write(entry.body)
+            except OSError:
+                path = None
+            stale = []
+            with self._lock:
+                if self._spilled.get(key) is entry and path is not None:
+                    entry.path = path
+                    entry.body = None
+                    self._stats['spilled'] += 1
+                elif self._spilled.get(key) is entry:
+                    stale.append(self._drop(key))
+                elif path is not None:
+                    stale.append(path)        # invalidated while writing
+                while self._spill_bytes > self.spill_max_bytes and self._spilled:
+                    stale.append(self._drop(next(iter(self._spilled))))
+            self._unlink(stale)
+
+    @staticmethod
+    def _unlink(paths):
+        for path in paths:
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            s['entries'] = len(self._entries)
+            s['bytes'] = self._bytes
+            s['spill_entries'] = len(self._spilled)
+            s['spill_bytes'] = self._spill_bytes
+            s['anchors'] = len(self._anchors)
+        lookups = s['hits'] + s['disk_hits'] + s['misses']
+        s['hit_rate'] = round((s['hits'] + s['disk_hits']) / lookups, 3) if lookups else None
+        s['latency'] = {stage: {k: d[k] for k in ('count', 'avg_ms', 'p50_ms', 'p95_ms', 'max_ms')}
+                        for stage, d in self.timings.snapshot().items() if d['count']}
+        return s
+
+
+# =============================================================================
+# Invalidation events (aggregator -> gateway)
+# =============================================================================
+
+def publish_bmap_invalidation(channel, ranges: List[Tuple[int, int, int]]) -> bool:
+    """Publish [(token_id, min_block_time, max_block_time)] for newly loaded edges."""
+    if channel is None or not ranges:
+        return False
+    channel.exchange_declare(exchange=BMAP_INVALIDATE_EXCHANGE,
+                             exchange_type='fanout', durable=True)
+    body = json.dumps({'tokens': [list(r) for r in ranges], 'ts': time.time()})
+    channel.basic_publish(exchange=BMAP_INVALIDATE_EXCHANGE, routing_key='',
+                          body=body.encode('utf-8'))
+    return True
+
+
+def apply_bmap_invalidation(cache: BmapCache, body) -> int:
+    """Apply one invalidation event to cache; returns entries dropped."""
+    msg = json.loads(body.decode('utf-8') if isinstance(body, bytes) else body)
+    return sum(cache.invalidate(int(t), int(lo), int(hi)) for t, lo, hi in msg.get('tokens', []))
+
+
+# =============================================================================
+# Process-wide singleton
+# =============================================================================
+
+_cache: Optional[BmapCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_bmap_cache() -> BmapCache:
+    """Get (or lazily create) the process-wide BmapCache from guide-config.json."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cfg = get_bmap_cache_config()
+                _cache = BmapCache(
+                    max_bytes=int(cfg['max_mb'] * 1024 * 1024),
+                    ttl_sec=cfg['ttl_sec'],
+                    live_ttl_sec=cfg['live_ttl_sec'],
+                    resolve_ttl_sec=cfg['resolve_ttl_sec'],
+                    spill_dir=cfg['spill_dir'],
+                    spill_max_bytes=int(cfg['spill_max_mb'] * 1024 * 1024))
+    return _cache
@@ -7,6 +7,7 @@ All workers should import config from here instead of loading guide-config.json
 
 import json
 import os
+import tempfile
 from typing import Dict, Any, Optional
 
 # Default paths
@@ -65,6 +66,80 @@ def get_db_config(autocommit: bool = True) -> Dict[str, Any]:
     }
 
 
+def get_db_pool_config() -> Dict[str, Any]:
+    """Get MySQL connection pool sizing (used by DbPool)."""
+    cfg = load_config()
+    return {
+        'size':           cfg.get('DB_POOL_SIZE', 8),
+        'borrow_timeout': cfg.get('DB_POOL_TIMEOUT_SEC', 5.0),
+    }
+
+
+def get_tracker_config() -> Dict[str, Any]:
+    """Get gateway correlation tracker settings (used by CorrelationTracker)."""
+    cfg = load_config()
+    return {
+        'ttl_sec':   cfg.get('GATEWAY_TRACKER_TTL_SEC', 86400),
+        'sweep_sec': cfg.get('GATEWAY_TRACKER_SWEEP_SEC', 60),
+        'stripes':   cfg.get('GATEWAY_TRACKER_STRIPES', 64),
+        'persist':   cfg.get('GATEWAY_TRACKER_PERSIST', False),
+        'writers':   cfg.get('GATEWAY_TRACKER_WRITERS', 4),
+    }
+
+
+def get_metrics_config() -> Dict[str, Any]:
+    """Get worker metrics export settings (used by common.worker_metrics)."""
+    cfg = load_config()
+    return {
+        'dir':       cfg.get('METRICS_DIR',
+                             os.path.join(tempfile.gettempdir(), 't16o-guide-metrics')),
+        'dump_sec':  cfg.get('METRICS_DUMP_SEC', 15),
+        'stale_sec': cfg.get('METRICS_STALE_SEC', 60),
+        # Optional per-service HTTP ports for /metrics, e.g. {"decoder": 9101}
+        'ports':     cfg.get('METRICS_PORTS', {}),
+    }
+
+
+def get_request_log_config() -> Dict[str, Any]:
+    """Get tx_request_log batching settings (used by common.request_log_writer)."""
+    cfg = load_config()
+    return {
+        'flush_ms':      cfg.get('REQUEST_LOG_FLUSH_MS', 250),
+        'flush_records': cfg.get('REQUEST_LOG_FLUSH_RECORDS', 200),
+        'max_buffer':    cfg.get('REQUEST_LOG_MAX_BUFFER', 20000),
+    }
+
+
+def get_autoscale_config() -> Dict[str, Any]:
+    """Get worker autoscaler thresholds (used by common.autoscaler)."""
+    cfg = load_config()
+    return {
+        'up_backlog':        cfg.get('AUTOSCALE_UP_BACKLOG', 20),
+        'down_backlog':      cfg.get('AUTOSCALE_DOWN_BACKLOG', 1),
+        'up_samples':        cfg.get('AUTOSCALE_UP_SAMPLES', 3),
+        'down_samples':      cfg.get('AUTOSCALE_DOWN_SAMPLES', 6),
+        'up_step_pct':       cfg.get('AUTOSCALE_UP_STEP_PCT', 25),
+        'cooldown_sec':      cfg.get('AUTOSCALE_COOLDOWN_SEC', 30),
+        'max_throttle_rate': cfg.get('AUTOSCALE_MAX_THROTTLE_RATE', 0.05),
+        'throttle_samples':  cfg.get('AUTOSCALE_THROTTLE_SAMPLES', 2),
+        'latency_factor':    cfg.get('AUTOSCALE_LATENCY_FACTOR', 1.5),
+    }
+
+
+def get_bmap_cache_config() -> Dict[str, Any]:
+    """Get gateway /api/bmap/get cache settings (used by common.bmap_cache)."""
+    cfg = load_config()
+    return {
+        'max_mb':          cfg.get('BMAP_CACHE_MAX_MB', 256),
+        'ttl_sec':         cfg.get('BMAP_CACHE_TTL_SEC', 3600),
+        'live_ttl_sec':    cfg.get('BMAP_CACHE_LIVE_TTL_SEC', 60),
+        'resolve_ttl_sec': cfg.get('BMAP_CACHE_RESOLVE_TTL_SEC', 300),
+        # Optional directory for evicted historical entries ('' disables)
+        'spill_dir':       cfg.get('BMAP_CACHE_SPILL_DIR', ''),
+        'spill_max_mb':    cfg.get('BMAP_CACHE_SPILL_MAX_MB', 2048),
+    }
+
+
 def get_rabbitmq_config() -> Dict[str, Any]:
     """Get RabbitMQ configuration including heartbeat/timeout settings."""
     cfg = load_config()
@@ -76,6 +151,7 @@ def get_rabbitmq_config() -> Dict[str, Any]:
         'vhost':            _require(cfg, 'RABBITMQ_VHOST'),
         'heartbeat':        cfg.get('RABBITMQ_HEARTBEAT', 600),
         'blocked_timeout':  cfg.get('RABBITMQ_BLOCKED_TIMEOUT', 300),
+        'publisher_pool_size': cfg.get('RABBITMQ_PUBLISHER_POOL_SIZE', 4),
     }
 
 
@@ -103,6 +179,18 @@ def get_solscan_config() -> Dict[str, Any]:
     return {
         'api_base': _require(cfg, 'SOLSCAN_API'),
         'token':    _require(cfg, 'SOLSCAN_TOKEN'),
+        # Shared client (common/solscan_client.py) limits/caching. The rate is
+        # the whole host's budget (every worker process draws from one bucket),
+        # so it should match the API plan: Pro API level 2 = 1000 req/60s.
+        'rate_per_sec':    cfg.get('SOLSCAN_RATE_PER_SEC', 16.0),
+        'burst':           cfg.get('SOLSCAN_BURST', 16),
+        'rate_state_file': cfg.get('SOLSCAN_RATE_STATE_FILE',
+                                   os.path.join(tempfile.gettempdir(), 't16o-solscan-bucket')),
+        'timeout':         cfg.get('SOLSCAN_TIMEOUT_SEC', 30.0),
+        'max_retries':     cfg.get('SOLSCAN_MAX_RETRIES', 5),
+        'pool_size':       cfg.get('SOLSCAN_POOL_SIZE', 16),
+        'cache_ttl_sec':   cfg.get('SOLSCAN_CACHE_TTL_SEC', 300),
+        'cache_size':      cfg.get('SOLSCAN_CACHE_SIZE', 10000),
     }
 
 
@@ -0,0 +1,200 @@
+"""
+Process-wide cache of the runtime `config` table for T16O Exchange Guide Services
+
+Replaces per-key "CALL sp_config_get" round-trips (8-10 per supervisor poll,
+plus some inside batch loops) with one in-memory copy of the table:
+    - the first refresh() loads every row in one SELECT
+    - later refresh() calls fetch only rows whose updated_utc moved (indexed by
+      idx_updated_utc); `version` decides whether a row really changed, the same
+      change marker sp_config_get_changes uses
+    - subscribers are called with the changed {(config_type, config_key): value}
+      after each refresh that found changes
+    - get_int()/get_float() never touch the database once the cache is loaded,
+      so hot loops can read config freely
+
+Supervisor loops call refresh() once per poll; everything else only reads.
+
+Usage:
+    from t16o_exchange.guide.common.config_cache import get_config_cache
+    cache = get_config_cache()
+    cache.log_changes(lambda msg: log('SVR', msg))         # skips 'sync' checkpoints
+    cache.refresh(cursor)                                  # supervisor poll
+    threads = cache.get_int(cursor, 'queue', 'decoder_wrk_cnt_threads', 0)
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ConfigKey = Tuple[str, str]
+
+_FULL_QUERY = """
+    SELECT config_type, config_key, config_value, version, updated_utc
+    FROM config
+"""
+
+_CHANGES_QUERY = """
+    SELECT config_type, config_key, config_value, version, updated_utc
+    FROM config
+    WHERE updated_utc >= %s
+"""
+
+_COLUMNS = ('config_type', 'config_key', 'config_value', 'version', 'updated_utc')
+
+
+def _as_tuple(row) -> tuple:
+    """Rows come from both tuple and dictionary cursors."""
+    if isinstance(row, dict):
+        return tuple(row[c] for c in _COLUMNS)
+    return tuple(row)
+
+
+class ConfigCache:
+    """Thread-safe in-memory copy of the config table with change polling."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._values: Dict[ConfigKey, str] = {}
+        self._versions: Dict[ConfigKey, int] = {}
+        self._watermark = None          # max updated_utc seen
+        self._loaded = False
+        self._subscribers: List[Callable[[Dict[ConfigKey, str]], None]] = []
+        self.stats = {'full_loads': 0, 'polls': 0, 'changes': 0, 'errors': 0}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def subscribe(self, callback: Callable[[Dict[ConfigKey, str]], None]):
+        """Register callback(changes) to run after a refresh that changed rows."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def log_changes(self, log_fn: Callable[[str], None],
+                    skip_types: Tuple[str, ...] = ('sync',)) -> Callable:
+        """
+        Subscribe a "Config changed: ..." logger. Rows of skip_types (the
+        per-cycle 'sync' checkpoints by default) are left out, and nothing is
+        logged when only those changed. Returns the callback (for unsubscribe).
+        """
+        def callback(changes: Dict[ConfigKey, str]):
+            keys = sorted(k for t, k in changes if t not in skip_types)
+            if keys:
+                log_fn('Config changed: ' + ', '.join(keys))
+
+        self.subscribe(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Dict[ConfigKey, str]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # -------------------------------------------------------------------------
+    # Refresh
+    # -------------------------------------------------------------------------
+
+    def refresh(self, cursor) -> Dict[ConfigKey, str]:
+        """
+        Load the table (first call) or pull rows changed since the last refresh.
+
+        Returns the changed entries (empty when nothing changed, or when another
+        thread is already refreshing). Errors keep the current cache.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return {}
+        try:
+            full = not self._loaded
+            try:
+                if full:
+                    cursor.execute(_FULL_QUERY)
+                else:
+                    cursor.execute(_CHANGES_QUERY, (self._watermark,))
+                rows = [_as_tuple(r) for r in cursor.fetchall()]
+            except Exception:
+                self.stats['errors'] += 1
+                return {}
+
+            changes: Dict[ConfigKey, str] = {}
+            with self._lock:
+                for config_type, config_key, value, version, updated in rows:
+                    key = (config_type, config_key)
+                    if full or self._versions.get(key) != version or self._values.get(key) != value:
+                        self._values[key] = value
+                        self._versions[key] = version
+                        changes[key] = value
+                    if updated is not None and (self._watermark is None or updated > self._watermark):
+                        self._watermark = updated
+                self._loaded = True
+                subscribers = list(self._subscribers)
+                self.stats['full_loads' if full else 'polls'] += 1
+                if not full:
+                    self.stats['changes'] += len(changes)
+
+            # The initial load is not a change notification
+            if changes and not full:
+                for callback in subscribers:
+                    try:
+                        callback(changes)
+                    except Exception:
+                        pass
+            return changes
+        finally:
+            self._refresh_lock.release()
+
+    def ensure_loaded(self, cursor):
+        """Load once if nothing has been loaded yet (manual/CLI runs without a supervisor)."""
+        if not self._loaded and cursor is not None:
+            self.refresh(cursor)
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def get(self, config_type: str, config_key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get((config_type, config_key), default)
+
+    def get_int(self, cursor, config_type: str, config_key: str, default: int) -> int:
+        self.ensure_loaded(cursor)
+        val = self.get(config_type, config_key)
+        if val is None:
+            return default
+        try:
+            return int(val)
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, cursor, config_type: str, config_key: str, default: float) -> float:
+        self.ensure_loaded(cursor)
+        val = self.get(config_type, config_key)
+        if val is None:
+            return default
+        try:
+            return float(val)
+        except (TypeError, ValueError):
+            return default
+
+    def snapshot(self, config_type: Optional[str] = None) -> Dict[ConfigKey, str]:
+        with self._lock:
+            if config_type is None:
+                return dict(self._values)
+            return {k: v for k, v in self._values.items() if k[0] == config_type}
+
+
+# =============================================================================
+# Process-wide singleton
+# =============================================================================
+
+_cache: Optional[ConfigCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_config_cache() -> ConfigCache:
+    """Get (or lazily create) the process-wide ConfigCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ConfigCache()
+    return _cache
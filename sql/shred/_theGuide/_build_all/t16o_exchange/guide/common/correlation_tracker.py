@@ -0,0 +1,418 @@
+"""
+Pipeline completion tracker for the Guide gateway
+
+Tracks, per correlation_id, how many batches the producer cascaded and which
+batch responses each downstream worker has sent back, and reports when the
+whole pipeline is done.
+
+    - O(1) per response: each worker's requirement is checked only when its
+      own count changes; a running "satisfied workers" counter decides completion
+    - lock striping: correlations hash onto N independent locks/dicts
+    - TTL eviction: correlations with no activity for ttl_sec are dropped
+    - recently completed ids are remembered (bounded) so late/redelivered
+      responses don't resurrect a finished correlation
+    - optional persistence (MySQLTrackerStore) so a restarted gateway resumes;
+      writes are queued under the stripe lock and applied by per-stripe FIFO
+      writer threads, so each correlation's rows land in order and the
+      response consumer never blocks on the database
+
+Usage:
+    tracker = CorrelationTracker(['decoder', 'detailer', 'shredder'],
+                                 single_response_workers={'shredder'})
+    tracker.record_batch(correlation_id, 'decoder', batch_num)
+    summary = tracker.mark_producer_done(correlation_id, total_batches)
+"""
+
+import queue
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class _Entry:
+    __slots__ = ('expected_batches', 'producer_done', 'received', 'satisfied',
+                 'started_at', 'updated_at')
+
+    def __init__(self, workers: Iterable[str], started_at: float):
+        self.expected_batches = 0
+        self.producer_done = False
+        self.received: Dict[str, set] = {w: set() for w in workers}
+        self.satisfied = 0
+        self.started_at = started_at
+        self.updated_at = started_at
+
+
+class CorrelationTracker:
+    """
+    Thread-safe, bounded-lifetime pipeline completion tracker.
+
+    Args:
+        workers: downstream workers that must respond
+        single_response_workers: workers that send one response for the whole
+                                 correlation (e.g. shredder) instead of one per batch
+        ttl_sec: drop correlations idle for longer than this
+        stripes: number of lock stripes
+        completed_memory: finished correlation ids remembered per stripe
+        store: optional persistence backend (see MySQLTrackerStore)
+        writer_threads: background persistence writers (stripes map onto them)
+        log_fn: optional callable(msg) for logging
+    """
+
+    def __init__(self, workers: Iterable[str],
+                 single_response_workers: Iterable[str] = (),
+                 ttl_sec: float = 86400, stripes: int = 64,
+                 completed_memory: int = 1024,
+                 store: Optional['MySQLTrackerStore'] = None,
+                 writer_threads: int = 4,
+                 log_fn: Optional[Callable[[str], None]] = None):
+        self.workers = list(workers)
+        self.single_response_workers = set(single_response_workers)
+        self.ttl_sec = ttl_sec
+        self.store = store
+        self._log = log_fn or (lambda msg: None)
+        self.completed_memory = max(0, completed_memory)
+        self._stripes = [(threading.Lock(), {}) for _ in range(max(1, stripes))]
+        self._done = [OrderedDict() for _ in self._stripes]
+        self._stats_lock = threading.Lock()
+        self._stats = {'completed': 0, 'evicted': 0, 'responses': 0, 'duplicates': 0, 'late': 0}
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        self._writes: List[queue.Queue] = []
+        if store:
+            for i in range(max(1, min(writer_threads, len(self._stripes)))):
+                q: queue.Queue = queue.Queue()
+                threading.Thread(target=self._writer_loop, args=(q,),
+                                 name=f'correlation-writer-{i}', daemon=True).start()
+                self._writes.append(q)
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _stripe_index(self, correlation_id: str) -> int:
+        return zlib.crc32(correlation_id.encode('utf-8')) % len(self._stripes)
+
+    def _stripe(self, correlation_id: str):
+        return self._stripes[self._stripe_index(correlation_id)]
+
+    def _finish(self, entries: Dict[str, _Entry], correlation_id: str):
+        """Remove a completed correlation (stripe lock held)."""
+        del entries[correlation_id]
+        if self.completed_memory:
+            done = self._done[self._stripe_index(correlation_id)]
+            done[correlation_id] = None
+            if len(done) > self.completed_memory:
+                done.popitem(last=False)
+
+    def _need(self, worker: str, entry: _Entry) -> int:
+        return 1 if worker in self.single_response_workers else entry.expected_batches
+
+    def _get_or_create(self, entries: Dict[str, _Entry], correlation_id: str, now: float):
+        entry = entries.get(correlation_id)
+        created = entry is None
+        if created:
+            entry = _Entry(self.workers, now)
+            entries[correlation_id] = entry
+        entry.updated_at = now
+        return entry, created
+
+    def _summary(self, correlation_id: str, entry: _Entry, now: float) -> Dict[str, Any]:
+        return {
+            'correlation_id': correlation_id,
+            'batches': entry.expected_batches,
+            'workers': self.workers,
+            'total_responses': sum(len(s) for s in entry.received.values()),
+            'elapsed_seconds': round(now - entry.started_at, 2),
+        }
+
+    def _bump(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _persist(self, idx: int, fn_name: str, *args):
+        """Queue a store write for stripe idx (call with the stripe lock held to keep order)."""
+        if self._writes:
+            self._writes[idx % len(self._writes)].put((fn_name, args))
+
+    def _writer_loop(self, q: queue.Queue):
+        while True:
+            fn_name, args = q.get()
+            try:
+                getattr(self.store, fn_name)(*args)
+            except Exception as e:
+                self._log(f"Tracker persistence ({fn_name}) failed: {e}")
+            finally:
+                q.task_done()
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def record_batch(self, correlation_id: str, worker: str, batch_num: int) -> Optional[Dict]:
+        """Record a batch response; returns a summary if this completed the pipeline."""
+        now = time.time()
+        idx = self._stripe_index(correlation_id)
+        lock, entries = self._stripes[idx]
+        summary = None
+        is_new = created = False
+        with lock:
+            late = correlation_id in self._done[idx]
+            if not late:
+                entry, created = self._get_or_create(entries, correlation_id, now)
+                received = entry.received.get(worker)
+                if received is not None and batch_num not in received:
+                    received.add(batch_num)
+                    is_new = True
+                    if entry.producer_done and len(received) == self._need(worker, entry):
+                        entry.satisfied += 1
+                    if entry.producer_done and entry.satisfied == len(self.workers):
+                        summary = self._summary(correlation_id, entry, now)
+                        self._finish(entries, correlation_id)
+
+                if summary:
+                    self._persist(idx, 'delete', correlation_id)
+                elif is_new:
+                    if created:
+                        self._persist(idx, 'save_header', correlation_id, 0, False, now)
+                    self._persist(idx, 'add_batch', correlation_id, worker, batch_num)
+
+        self._bump('responses')
+        if late:
+            self._bump('late')
+            return None
+        if not is_new:
+            self._bump('duplicates')
+        if summary:
+            self._bump('completed')
+        return summary
+
+    def mark_producer_done(self, correlation_id: str, total_batches: int) -> Optional[Dict]:
+        """Set the expected batch count; returns a summary if downstream already finished."""
+        now = time.time()
+        idx = self._stripe_index(correlation_id)
+        lock, entries = self._stripes[idx]
+        with lock:
+            entry, _ = self._get_or_create(entries, correlation_id, now)
+            entry.producer_done = True
+            entry.expected_batches = total_batches
+
+            if total_batches == 0:
+                summary = self._summary(correlation_id, entry, now)
+                summary['elapsed_seconds'] = 0
+                self._finish(entries, correlation_id)
+            else:
+                # One-time O(workers) pass; record_batch keeps it current afterwards
+                entry.satisfied = sum(
+                    1 for w, got in entry.received.items() if len(got) >= self._need(w, entry))
+                if entry.satisfied == len(self.workers):
+                    summary = self._summary(correlation_id, entry, now)
+                    self._finish(entries, correlation_id)
+                else:
+                    summary = None
+                    progress = {w: len(got) for w, got in entry.received.items()}
+
+            if summary:
+                self._persist(idx, 'delete', correlation_id)
+            else:
+                self._persist(idx, 'save_header', correlation_id, total_batches, True,
+                              entry.started_at)
+
+        if summary:
+            self._bump('completed')
+        else:
+            self._log(f"{correlation_id[:8]}: expecting {total_batches} batches, "
+                      f"received so far: {progress}")
+        return summary
+
+    def progress(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Current in-memory progress for a correlation (None if unknown/finished)."""
+        lock, entries = self._stripe(correlation_id)
+        with lock:
+            entry = entries.get(correlation_id)
+            if entry is None:
+                return None
+            return {
+                'expected_batches': entry.expected_batches,
+                'producer_done': entry.producer_done,
+                'received': {w: len(got) for w, got in entry.received.items()},
+                'age_seconds': round(time.time() - entry.started_at, 1),
+            }
+
+    def evict_stale(self, now: Optional[float] = None) -> int:
+        """Drop correlations idle longer than ttl_sec. Returns number evicted."""
+        now = now or time.time()
+        cutoff = now - self.ttl_sec
+        evicted: List[str] = []
+        for lock, entries in self._stripes:
+            with lock:
+                stale = [cid for cid, e in entries.items() if e.updated_at < cutoff]
+                for cid in stale:
+                    del entries[cid]
+            evicted.extend(stale)
+        if evicted:
+            self._bump('evicted', len(evicted))
+            self._log(f"Evicted {len(evicted)} stale correlations (idle > {self.ttl_sec}s)")
+        self._persist(0, 'delete_stale', cutoff)
+        return len(evicted)
+
+    def start_reaper(self, interval_sec: float = 60.0):
+        """Run evict_stale() every interval_sec on a daemon thread."""
+        if self._reaper and self._reaper.is_alive():
+            return
+
+        def loop():
+            while not self._reaper_stop.wait(interval_sec):
+                try:
+                    self.evict_stale()
+                except Exception as e:
+                    self._log(f"Reaper error: {e}")
+
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(target=loop, name='correlation-reaper', daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self):
+        self._reaper_stop.set()
+
+    def flush(self):
+        """Block until every queued store write has been applied."""
+        for q in self._writes:
+            q.join()
+
+    def resume(self) -> int:
+        """Reload in-flight correlations from the store (call once at startup)."""
+        if not self.store:
+            return 0
+        cutoff = time.time() - self.ttl_sec
+        loaded = 0
+        for cid, expected, producer_done, started_at, received in self.store.load_active(cutoff):
+            lock, entries = self._stripe(cid)
+            with lock:
+                entry = _Entry(self.workers, started_at)
+                entry.updated_at = time.time()
+                entry.expected_batches = expected
+                entry.producer_done = producer_done
+                for w, batches in received.items():
+                    if w in entry.received:
+                        entry.received[w].update(batches)
+                if producer_done:
+                    entry.satisfied = sum(
+                        1 for w, got in entry.received.items() if len(got) >= self._need(w, entry))
+                entries[cid] = entry
+            loaded += 1
+        return loaded
+
+    def __len__(self):
+        return sum(len(entries) for _, entries in self._stripes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            s = dict(self._stats)
+        s['active'] = len(self)
+        s['stripes'] = len(self._stripes)
+        s['ttl_sec'] = self.ttl_sec
+        s['persistent'] = self.store is not None
+        s['pending_writes'] = sum(q.qsize() for q in self._writes)
+        return s
+
+
+class MySQLTrackerStore:
+    """
+    Write-through persistence for CorrelationTracker
+    (tables: tx_correlation_tracker, tx_correlation_batch).
+
+    Header upserts are monotonic: producer_done is never cleared and
+    expected_batches never lowered, so a replayed early header can't undo
+    the producer's final count.
+
+    Args:
+        connect_fn: callable() -> MySQL connection (autocommit; closed after each call)
+    """
+
+    def __init__(self, connect_fn: Callable[[], Any]):
+        self._connect = connect_fn
+
+    @staticmethod
+    def _utc(epoch: float) -> datetime:
+        return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None)
+
+    def _run(self, statements):
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            for sql, params in statements:
+                cursor.execute(sql, params)
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+
+    def save_header(self, correlation_id: str, expected_batches: int,
+                    producer_done: bool, started_at: float):
+        self._run([("""
+            INSERT INTO tx_correlation_tracker
+                (correlation_id, expected_batches, producer_done, started_utc)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                expected_batches = GREATEST(expected_batches, VALUES(expected_batches)),
+                producer_done = GREATEST(producer_done, VALUES(producer_done))
+        """, (correlation_id, expected_batches, int(producer_done), self._utc(started_at)))])
+
+    def add_batch(self, correlation_id: str, worker: str, batch_num: int):
+        self._run([
+            ("INSERT IGNORE INTO tx_correlation_batch (correlation_id, worker, batch_num) "
+             "VALUES (%s, %s, %s)", (correlation_id, worker, batch_num)),
+            ("UPDATE tx_correlation_tracker SET updated_utc = CURRENT_TIMESTAMP(3) "
+             "WHERE correlation_id = %s", (correlation_id,)),
+        ])
+
+    def delete(self, correlation_id: str):
+        self._run([
+            ("DELETE FROM tx_correlation_batch WHERE correlation_id = %s", (correlation_id,)),
+            ("DELETE FROM tx_correlation_tracker WHERE correlation_id = %s", (correlation_id,)),
+        ])
+
+    def delete_stale(self, cutoff: float):
+        cutoff_utc = self._utc(cutoff)
+        self._run([
+            ("DELETE b FROM tx_correlation_batch b "
+             "JOIN tx_correlation_tracker t ON t.correlation_id = b.correlation_id "
+             "WHERE t.updated_utc < %s", (cutoff_utc,)),
+            ("DELETE FROM tx_correlation_tracker WHERE updated_utc < %s", (cutoff_utc,)),
+            # Batch rows whose header is gone (e.g. written after a delete)
+            ("DELETE b FROM tx_correlation_batch b "
+             "LEFT JOIN tx_correlation_tracker t ON t.correlation_id = b.correlation_id "
+             "WHERE t.correlation_id IS NULL", ()),
+        ])
+
+    def load_active(self, cutoff: float):
+        """Yield (correlation_id, expected_batches, producer_done, started_epoch, {worker: set})."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT correlation_id, expected_batches, producer_done, started_utc
+                FROM tx_correlation_tracker
+                WHERE updated_utc >= %s
+            """, (self._utc(cutoff),))
+            headers = cursor.fetchall()
+
+            received: Dict[str, Dict[str, set]] = {}
+            cursor.execute("""
+                SELECT b.correlation_id, b.worker, b.batch_num
+                FROM tx_correlation_batch b
+                JOIN tx_correlation_tracker t ON t.correlation_id = b.correlation_id
+                WHERE t.updated_utc >= %s
+            """, (self._utc(cutoff),))
+            for cid, worker, batch_num in cursor.fetchall():
+                received.setdefault(cid, {}).setdefault(worker, set()).add(batch_num)
+            cursor.close()
+        finally:
+            conn.close()
+
+        for cid, expected, producer_done, started_utc in headers:
+            started = started_utc.replace(tzinfo=timezone.utc).timestamp() if started_utc else time.time()
+            yield cid, expected or 0, bool(producer_done), started, received.get(cid, {})
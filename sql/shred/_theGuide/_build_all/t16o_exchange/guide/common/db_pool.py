@@ -0,0 +1,172 @@
+"""
+Bounded MySQL connection pool for T16O Exchange Guide Services
+
+Wraps mysql.connector's MySQLConnectionPool with what the REST handlers need:
+callers wait (up to a timeout) for a free connection instead of failing the
+moment the pool is empty, every borrowed connection is pinged before use, and
+borrow/wait/exhaustion counters are kept for /api/health.
+
+Usage:
+    pool = DbPool(get_db_config(), **get_db_pool_config())
+    with pool.get_connection() as conn:
+        cursor = conn.cursor()
+        ...
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+# mysql.connector refuses pools larger than this
+MAX_POOL_SIZE = pooling.CNX_POOL_MAXSIZE
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled connection. close() (or leaving a `with` block)
+    returns it to the pool exactly once; everything else is delegated.
+    """
+
+    def __init__(self, pool: 'DbPool', conn):
+        self._pool = pool
+        self._conn = conn
+        self._borrowed_at = time.time()
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('_pool', '_conn', '_borrowed_at'):
+            raise AttributeError(name)
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        self._pool._release(conn, time.time() - self._borrowed_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        # Safety net for handlers that drop a connection without closing it
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class DbPool:
+    """
+    Thread-safe bounded pool of MySQL connections.
+
+    Args:
+        db_config: kwargs for mysql.connector.connect (see get_db_config)
+        size: number of pooled connections (capped at MAX_POOL_SIZE)
+        borrow_timeout: seconds to wait for a free connection before PoolError
+        name: pool name (must be unique per process)
+        log_fn: optional callable(msg) for logging
+    """
+
+    def __init__(self, db_config: Dict[str, Any], size: int = 8,
+                 borrow_timeout: float = 5.0, name: str = 'guide',
+                 log_fn: Optional[Callable[[str], None]] = None):
+        self.size = max(1, min(int(size), MAX_POOL_SIZE))
+        self.borrow_timeout = borrow_timeout
+        self._log = log_fn or (lambda msg: None)
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name=name,
+            pool_size=self.size,
+            pool_reset_session=True,
+            **db_config,
+        )
+        # mysql.connector raises immediately when empty; the semaphore makes callers queue
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'borrowed': 0,
+            'in_use': 0,
+            'max_in_use': 0,
+            'waited': 0,
+            'exhausted': 0,
+            'health_check_failures': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'hold_ms_max': 0.0,
+        }
+
+    def get_connection(self) -> PooledConnection:
+        """
+        Borrow a connection, waiting up to borrow_timeout for one to free up.
+        The connection is pinged (and reconnected if stale) before it is returned.
+
+        Raises PoolError when the pool stays exhausted for the whole timeout.
+        """
+        t0 = time.perf_counter()
+        waited = False
+        if not self._slots.acquire(blocking=False):
+            waited = True
+            if not self._slots.acquire(timeout=self.borrow_timeout):
+                with self._stats_lock:
+                    self._stats['exhausted'] += 1
+                raise PoolError(f"DB pool exhausted ({self.size} connections busy "
+                                f"for {self.borrow_timeout}s)")
+
+        try:
+            conn = self._pool.get_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        try:
+            conn.ping(reconnect=False)
+        except mysql.connector.Error:
+            with self._stats_lock:
+                self._stats['health_check_failures'] += 1
+            self._log("Pooled connection failed health check, reconnecting")
+            try:
+                conn.reconnect(attempts=2, delay=0)
+            except Exception:
+                self._release(conn, 0.0, counted=False)
+                raise
+
+        wait_ms = (time.perf_counter() - t0) * 1000
+        with self._stats_lock:
+            s = self._stats
+            s['borrowed'] += 1
+            s['in_use'] += 1
+            s['max_in_use'] = max(s['max_in_use'], s['in_use'])
+            if waited:
+                s['waited'] += 1
+            s['wait_ms_total'] += wait_ms
+            s['wait_ms_max'] = max(s['wait_ms_max'], wait_ms)
+        return PooledConnection(self, conn)
+
+    def _release(self, conn, held_sec: float, counted: bool = True):
+        try:
+            conn.close()  # returns the underlying connection to mysql.connector's pool
+        except Exception:
+            pass
+        finally:
+            if counted:
+                with self._stats_lock:
+                    self._stats['in_use'] -= 1
+                    self._stats['hold_ms_max'] = max(self._stats['hold_ms_max'], held_sec * 1000)
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters for health/metrics endpoints."""
+        with self._stats_lock:
+            s = dict(self._stats)
+        s['size'] = self.size
+        s['available'] = self.size - s['in_use']
+        s['wait_ms_avg'] = round(s['wait_ms_total'] / s['borrowed'], 2) if s['borrowed'] else 0.0
+        s['wait_ms_total'] = round(s['wait_ms_total'], 1)
+        s['wait_ms_max'] = round(s['wait_ms_max'], 2)
+        s['hold_ms_max'] = round(s['hold_ms_max'], 1)
+        return s
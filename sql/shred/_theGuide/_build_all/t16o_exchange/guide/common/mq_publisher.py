@@ -0,0 +1,222 @@
+"""
+Pooled RabbitMQ publisher for T16O Exchange Guide Services
+
+Keeps a small set of long-lived BlockingConnections (one channel each) with
+publisher confirms enabled, so callers don't pay a TCP + AMQP handshake and a
+round of queue.declare calls per message. pika connections are not thread-safe,
+so each pooled slot is borrowed exclusively by one thread at a time.
+
+Usage:
+    pool = PublisherPool(connect_fn, declare_fn=ensure_queues_exist, size=4)
+    pool.publish('mq.guide.decoder.request', body, properties)
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import pika
+import pika.exceptions
+
+# Errors after which a slot's connection is discarded and re-opened
+_RECONNECT_ERRORS = (
+    pika.exceptions.AMQPConnectionError,
+    pika.exceptions.AMQPChannelError,
+    pika.exceptions.StreamLostError,
+    ConnectionError,
+    OSError,
+)
+
+
+class _Slot:
+    """One pooled connection/channel pair."""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.conn = None
+        self.channel = None
+        self.last_used = 0.0
+
+    def is_open(self) -> bool:
+        return (self.conn is not None and self.conn.is_open
+                and self.channel is not None and self.channel.is_open)
+
+    def close(self):
+        try:
+            if self.conn is not None and self.conn.is_open:
+                self.conn.close()
+        except Exception:
+            pass
+        self.conn = None
+        self.channel = None
+
+
+class PublisherPool:
+    """
+    Thread-safe pool of persistent publishing channels.
+
+    Args:
+        connect_fn: callable() -> pika.BlockingConnection
+        declare_fn: optional callable(channel) run once, on the first connection,
+                    to declare queues (e.g. gateway ensure_queues_exist)
+        size: number of pooled connections
+        confirm: enable publisher confirms (basic_publish blocks until broker ack)
+        borrow_timeout: seconds to wait for a free slot before failing
+        idle_ping_sec: service heartbeats on borrow if slot idle longer than this
+        log_fn: optional callable(msg) for logging
+    """
+
+    def __init__(self, connect_fn: Callable[[], Any],
+                 declare_fn: Optional[Callable[[Any], None]] = None,
+                 size: int = 4, confirm: bool = True,
+                 borrow_timeout: float = 10.0, idle_ping_sec: float = 30.0,
+                 log_fn: Optional[Callable[[str], None]] = None):
+        self._connect_fn = connect_fn
+        self._declare_fn = declare_fn
+        self._confirm = confirm
+        self._borrow_timeout = borrow_timeout
+        self._idle_ping_sec = idle_ping_sec
+        self._log = log_fn or (lambda msg: None)
+        self.size = max(1, size)
+
+        self._free: 'queue.LifoQueue[_Slot]' = queue.LifoQueue()
+        for i in range(self.size):
+            self._free.put(_Slot(i))
+
+        self._declared = False
+        self._declare_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'published': 0,
+            'failed': 0,
+            'connects': 0,
+            'borrow_timeouts': 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Slot management
+    # -------------------------------------------------------------------------
+
+    def _bump(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _open(self, slot: _Slot):
+        slot.close()
+        slot.conn = self._connect_fn()
+        slot.channel = slot.conn.channel()
+        if self._confirm:
+            slot.channel.confirm_delivery()
+
+        # Queues are durable server-side, so one declare pass per process is enough
+        if self._declare_fn and not self._declared:
+            with self._declare_lock:
+                if not self._declared:
+                    self._declare_fn(slot.channel)
+                    self._declared = True
+
+        self._bump('connects')
+        self._log(f"Publisher slot {slot.slot_id} connected")
+
+    def _borrow(self) -> _Slot:
+        try:
+            slot = self._free.get(timeout=self._borrow_timeout)
+        except queue.Empty:
+            self._bump('borrow_timeouts')
+            raise TimeoutError(f"No publisher slot free after {self._borrow_timeout}s")
+
+        try:
+            if not slot.is_open():
+                self._open(slot)
+            elif time.time() - slot.last_used > self._idle_ping_sec:
+                # Let pika answer heartbeats that arrived while we were idle
+                slot.conn.process_data_events(time_limit=0)
+        except _RECONNECT_ERRORS:
+            try:
+                self._open(slot)
+            except Exception:
+                self._free.put(slot)
+                raise
+        except Exception:
+            self._free.put(slot)
+            raise
+        return slot
+
+    def _release(self, slot: _Slot):
+        slot.last_used = time.time()
+        self._free.put(slot)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def declare(self):
+        """Open one slot eagerly so queue declaration happens at startup."""
+        slot = self._borrow()
+        self._release(slot)
+
+    def publish(self, routing_key: str, body: bytes, properties=None,
+                exchange: str = '', retries: int = 1) -> bool:
+        """
+        Publish one message. With confirms enabled, returns only after the broker
+        acked it. Connection/channel errors trigger a reconnect and retry.
+
+        Raises the last error if all attempts fail.
+        """
+        last_error = None
+        for attempt in range(retries + 1):
+            slot = self._borrow()
+            try:
+                slot.channel.basic_publish(
+                    exchange=exchange,
+                    routing_key=routing_key,
+                    body=body,
+                    properties=properties,
+                )
+                self._bump('published')
+                return True
+            except (pika.exceptions.UnroutableError, pika.exceptions.NackError):
+                # Broker refused the message; the channel is still usable
+                self._bump('failed')
+                raise
+            except _RECONNECT_ERRORS as e:
+                last_error = e
+                self._log(f"Publisher slot {slot.slot_id} lost ({e}), "
+                          f"reconnecting (attempt {attempt + 1}/{retries + 1})")
+                slot.close()
+            except Exception:
+                self._bump('failed')
+                raise
+            finally:
+                # Always hand the slot back, whatever basic_publish raised
+                self._release(slot)
+
+        self._bump('failed')
+        raise last_error
+
+    def stats(self) -> Dict[str, int]:
+        """Counters plus current slot usage."""
+        with self._stats_lock:
+            out = dict(self._stats)
+        out['size'] = self.size
+        out['in_use'] = self.size - self._free.qsize()
+        return out
+
+    def close(self):
+        """Close all idle connections. The pool reconnects lazily if used again."""
+        idle = []
+        while True:
+            try:
+                idle.append(self._free.get_nowait())
+            except queue.Empty:
+                break
+        for slot in idle:
+            slot.close()
+            self._free.put(slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,298 @@
+"""
+Async batched tx_request_log writer for T16O Exchange Guide workers
+
+Worker-side request logging used to be an INSERT + commit before the real
+work and an UPDATE + commit after it, both on the worker's hot connection
+(the one running sp_tx_parse_* and friends). RequestLogWriter buffers those
+rows in memory instead and a background thread writes them on its own
+connection:
+    - every REQUEST_LOG_FLUSH_MS, or as soon as REQUEST_LOG_FLUSH_RECORDS
+      records are buffered
+    - inserts as one multi-row INSERT per column set (rows already present
+      for the same (request_id, target_worker, api_key_id) are skipped, as the
+      old SELECT-then-INSERT did)
+    - status updates as one UPDATE ... JOIN over a UNION ALL of the buffered
+      rows, so a batch costs two statements and one commit
+    - on failure the batch goes back to the buffer (oldest records dropped
+      beyond REQUEST_LOG_MAX_BUFFER) and is retried on the next flush
+    - close() (supervisor shutdown, atexit) writes whatever is left
+
+Rows are addressed by their unique key (request_id, target_worker,
+api_key_id) rather than the auto-increment id, which is not known until the
+flush. Callers that need the id itself (the funder stamps it on
+tx_address.request_log_id) still insert synchronously and pass the int id
+to log_status(). Billing columns are untouched: the gateway's request_log_id
+carried in the message is what the stored procedures record.
+
+Usage:
+    request_log = get_request_log_writer(log_fn=lambda m: log('RLOG', m))
+    ref = request_log.log_request(request_id, 'decoder', api_key_id,
+                                  correlation_id=..., source='queue',
+                                  action='decode', priority=5,
+                                  status='processing', payload_summary={...})
+    ...work...
+    request_log.log_status(ref, 'completed', resp)
+    request_log.close()                                  # supervisor shutdown
+"""
+
+import atexit
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import mysql.connector
+
+from .config import get_db_config, get_request_log_config
+
+# (request_id, target_worker, api_key_id) - the tx_request_log unique key
+RequestLogKey = Tuple[str, str, Optional[int]]
+RequestLogRef = Union[RequestLogKey, int]
+
+# Columns that hold JSON; dict/list values are serialized on enqueue
+_JSON_COLUMNS = {'payload_summary', 'result_summary'}
+
+
+class RequestLogWriter:
+    """Buffers tx_request_log inserts/status updates and writes them in batches."""
+
+    def __init__(self, db_config: Optional[Dict[str, Any]] = None,
+                 flush_ms: Optional[float] = None,
+                 max_records: Optional[int] = None,
+                 max_buffer: Optional[int] = None,
+                 log_fn: Optional[Callable[[str], None]] = None):
+        cfg = get_request_log_config()
+        self.db_config = db_config or get_db_config(autocommit=False)
+        self.flush_sec = float(cfg['flush_ms'] if flush_ms is None else flush_ms) / 1000.0
+        self.max_records = max(1, int(cfg['flush_records'] if max_records is None else max_records))
+        self.max_buffer = max(self.max_records,
+                              int(cfg['max_buffer'] if max_buffer is None else max_buffer))
+        self.log_fn = log_fn or (lambda msg: None)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._inserts: List[Dict[str, Any]] = []
+        self._updates: List[Tuple[RequestLogRef, str, Optional[str]]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._conn = None
+        self.stats = {'inserted': 0, 'updated': 0, 'flushes': 0,
+                      'errors': 0, 'dropped': 0}
+
+    # -------------------------------------------------------------------------
+    # Producer side (worker threads)
+    # -------------------------------------------------------------------------
+
+    def log_request(self, request_id: str, target_worker: str,
+                    api_key_id: Optional[int] = None, **columns) -> RequestLogKey:
+        """Queue a tx_request_log row; returns the key to pass to log_status()."""
+        row = {'request_id': request_id, 'target_worker': target_worker,
+               'api_key_id': api_key_id}
+        for col, value in columns.items():
+            if col in _JSON_COLUMNS and value is not None and not isinstance(value, str):
+                value = json.dumps(value)
+            row[col] = value
+        with self._lock:
+            self._inserts.append(row)
+            pending = len(self._inserts) + len(self._updates)
+        self._started()
+        if pending >= self.max_records:
+            self._wake.set()
+        return (request_id, target_worker, api_key_id)
+
+    def log_status(self, ref: Optional[RequestLogRef], status: str, result=None):
+        """Queue the final status/result_summary (completed_at = flush time)."""
+        if ref is None:
+            return
+        summary = json.dumps(result) if result else None
+        with self._lock:
+            self._updates.append((ref, status, summary))
+            pending = len(self._inserts) + len(self._updates)
+        self._started()
+        if pending >= self.max_records:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inserts) + len(self._updates)
+
+    # -------------------------------------------------------------------------
+    # Background flush
+    # -------------------------------------------------------------------------
+
+    def _started(self):
+        if self._thread is not None or self._stop.is_set():
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='request-log-writer',
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_sec)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything buffered so far. Returns the number of records written."""
+        with self._flush_lock:
+            with self._lock:
+                inserts, self._inserts = self._inserts, []
+                updates, self._updates = self._updates, []
+            if not inserts and not updates:
+                return 0
+
+            try:
+                conn = self._connection()
+                cursor = conn.cursor()
+                try:
+                    for i in range(0, len(inserts), self.max_records):
+                        self._write_inserts(cursor, inserts[i:i + self.max_records])
+                    latest = _latest_updates(updates)
+                    for i in range(0, len(latest), self.max_records):
+                        self._write_updates(cursor, latest[i:i + self.max_records])
+                    conn.commit()
+                finally:
+                    cursor.close()
+            except Exception as e:
+                self._requeue(inserts, updates)
+                self.stats['errors'] += 1
+                self.log_fn(f"request log flush failed ({len(inserts)} inserts, "
+                            f"{len(updates)} updates buffered): {e}")
+                self._reset_connection()
+                return 0
+
+            self.stats['flushes'] += 1
+            self.stats['inserted'] += len(inserts)
+            self.stats['updated'] += len(updates)
+            return len(inserts) + len(updates)
+
+    def _write_inserts(self, cursor, rows: List[Dict[str, Any]]):
+        # Skip keys that already have a row (redelivered messages). The unique
+        # index does not catch api_key_id IS NULL duplicates, so check first.
+        ph = ','.join(['%s'] * len(rows))
+        cursor.execute(
+            "SELECT request_id, target_worker, api_key_id FROM tx_request_log "
+            f"WHERE request_id IN ({ph})",
+            list({r['request_id'] for r in rows}))
+        seen = {tuple(r) for r in cursor.fetchall()}
+
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            key = (row['request_id'], row['target_worker'], row['api_key_id'])
+            if key in seen:
+                continue
+            seen.add(key)
+            groups.setdefault(tuple(row), []).append(row)
+
+        for cols, group in groups.items():
+            row_ph = '(' + ','.join(['%s'] * len(cols)) + ')'
+            cursor.execute(
+                f"INSERT INTO tx_request_log ({', '.join(cols)}) "
+                f"VALUES {','.join([row_ph] * len(group))} "
+                "ON DUPLICATE KEY UPDATE id = id",
+                [row[c] for row in group for c in cols])
+
+    def _write_updates(self, cursor, updates: List[Tuple[RequestLogRef, str, Optional[str]]]):
+        by_id = [u for u in updates if isinstance(u[0], int)]
+        by_key = [u for u in updates if not isinstance(u[0], int)]
+
+        if by_id:
+            rows = ' UNION ALL '.join(
+                ['SELECT %s AS id, %s AS status, %s AS result_summary'] +
+                ['SELECT %s, %s, %s'] * (len(by_id) - 1))
+            cursor.execute(
+                f"UPDATE tx_request_log l JOIN ({rows}) u ON l.id = u.id "
+                "SET l.status = u.status, l.result_summary = u.result_summary, "
+                "    l.completed_at = NOW()",
+                [v for ref, status, summary in by_id for v in (ref, status, summary)])
+
+        if by_key:
+            rows = ' UNION ALL '.join(
+                ['SELECT %s AS request_id, %s AS target_worker, %s AS api_key_id, '
+                 '%s AS status, %s AS result_summary'] +
+                ['SELECT %s, %s, %s, %s, %s'] * (len(by_key) - 1))
+            cursor.execute(
+                f"UPDATE tx_request_log l JOIN ({rows}) u "
+                "  ON l.request_id = u.request_id AND l.target_worker = u.target_worker "
+                " AND l.api_key_id <=> u.api_key_id "
+                "SET l.status = u.status, l.result_summary = u.result_summary, "
+                "    l.completed_at = NOW()",
+                [v for ref, status, summary in by_key for v in (*ref, status, summary)])
+
+    def _requeue(self, inserts, updates):
+        with self._lock:
+            self._inserts = inserts + self._inserts
+            self._updates = updates + self._updates
+            overflow = len(self._inserts) + len(self._updates) - self.max_buffer
+            if overflow > 0:
+                # Drop oldest updates first: a stale 'processing' row beats a missing one
+                drop_updates = min(overflow, len(self._updates))
+                del self._updates[:drop_updates]
+                del self._inserts[:overflow - drop_updates]
+                self.stats['dropped'] += overflow
+
+    def _connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.ping(reconnect=False, attempts=1, delay=0)
+                return self._conn
+            except Exception:
+                self._reset_connection()
+        self._conn = mysql.connector.connect(**self.db_config)
+        return self._conn
+
+    def _reset_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    def close(self, timeout: float = 5.0):
+        """Stop the flush thread and write what is left. Safe to call twice."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        deadline = time.monotonic() + timeout
+        while self.pending() and time.monotonic() < deadline:
+            if not self.flush():
+                time.sleep(0.2)
+        if self.pending():
+            self.log_fn(f"request log: {self.pending()} records not written at shutdown")
+        self._reset_connection()
+
+
+def _latest_updates(updates):
+    """Keep only the last status per row (the UPDATE ... JOIN has no order)."""
+    latest: Dict[RequestLogRef, Tuple[RequestLogRef, str, Optional[str]]] = {}
+    for update in updates:
+        latest.pop(update[0], None)
+        latest[update[0]] = update
+    return list(latest.values())
+
+
+# =============================================================================
+# Process-wide singleton
+# =============================================================================
+
+_writer: Optional[RequestLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_request_log_writer(log_fn: Optional[Callable[[str], None]] = None) -> RequestLogWriter:
+    """Get (or lazily create) the process-wide RequestLogWriter; flushed at exit."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = RequestLogWriter(log_fn=log_fn)
+                atexit.register(_writer.close)
+    return _writer
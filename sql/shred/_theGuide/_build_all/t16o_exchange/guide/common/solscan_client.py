@@ -0,0 +1,414 @@
+"""
+Shared Solscan Pro API client for T16O Exchange Guide Services
+
+One client per process instead of a requests.Session + fixed api_delay sleep
+in every worker:
+    - token-bucket rate limit shared by every thread in the process and, via a
+      lock file, by every process on the host (SOLSCAN_RATE_PER_SEC / SOLSCAN_BURST).
+      The rate is the host's aggregate budget, so set it to the API plan's limit
+    - pooled keep-alive connections (SOLSCAN_POOL_SIZE)
+    - 429/5xx retries with exponential backoff that honour Retry-After
+    - optional TTL cache for idempotent lookups (account metadata, token meta);
+      hits are deep copies, so callers may mutate what they get back
+
+Usage:
+    from t16o_exchange.guide.common.solscan_client import get_solscan_client
+    client = get_solscan_client()
+    data = client.get('/account/metadata', {'address': addr})   # parsed JSON
+    meta = client.token_meta_multi(mints)
+
+Async callers (aiohttp) share the same limiter:
+    await client.limiter.acquire_async()
+
+Latency reporting (e.g. into WorkerMetrics):
+    client.set_observer(metrics.record)   # observer('api_wait'|'api', seconds)
+"""
+
+import asyncio
+import copy
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to msvcrt byte-range locks
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+from .config import get_solscan_config
+
+# Status codes worth retrying (rate limit + transient upstream errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Endpoints whose responses are safe to cache for SOLSCAN_CACHE_TTL_SEC
+CACHEABLE_PATHS = {
+    '/account/metadata',
+    '/account/metadata/multi',
+    '/token/meta',
+    '/token/meta/multi',
+}
+
+
+class SolscanError(requests.RequestException):
+    """Solscan request failed after all retries (or with a non-retryable status)."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+# =============================================================================
+# Rate limiting
+# =============================================================================
+
+class TokenBucket:
+    """
+    Token bucket (rate tokens/sec, capacity burst). With state_file set the
+    bucket state lives in that file under an exclusive lock, so every process
+    on the host draws from the same bucket; otherwise it is per-process.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, state_file: Optional[str] = None):
+        self.rate = max(float(rate), 0.001)
+        self.burst = max(float(burst), 1.0)
+        self.state_file = state_file if (state_file and (fcntl or msvcrt)) else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+        self.waited_sec = 0.0
+
+    def _take(self, tokens: float, now: float, updated: float) -> Tuple[float, float, float]:
+        """Refill then try to take. Returns (new_tokens, wait_sec, now)."""
+        available = min(self.burst, tokens + (now - updated) * self.rate)
+        if available >= 1.0:
+            return available - 1.0, 0.0, now
+        return available, (1.0 - available) / self.rate, now
+
+    def _try_local(self) -> float:
+        with self._lock:
+            self._tokens, wait, self._updated = self._take(self._tokens, time.time(), self._updated)
+            return wait
+
+    def _try_shared(self) -> float:
+        with self._lock:
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                try:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    raw = os.read(fd, 64).decode('ascii', 'ignore').split()
+                    now = time.time()
+                    try:
+                        tokens, updated = float(raw[0]), float(raw[1])
+                    except (IndexError, ValueError):
+                        tokens, updated = self.burst, now
+                    tokens, wait, now = self._take(tokens, now, min(updated, now))
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.ftruncate(fd, 0)
+                    os.write(fd, f"{tokens:.6f} {now:.6f}".encode('ascii'))
+                    return wait
+                finally:
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    else:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+
+    def try_acquire(self) -> float:
+        """Take one token if available. Returns 0.0 on success, else seconds to wait."""
+        if self.state_file:
+            try:
+                return self._try_shared()
+            except OSError:
+                pass  # unwritable state file: degrade to per-process limiting
+        return self._try_local()
+
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            self.waited_sec += wait
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Await a token without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.state_file:
+                # flock + file I/O on the shared bucket run off the event loop
+                wait = await loop.run_in_executor(None, self.try_acquire)
+            else:
+                wait = self.try_acquire()
+            if wait <= 0:
+                return
+            self.waited_sec += wait
+            await asyncio.sleep(wait)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        ts = email.utils.parsedate_to_datetime(value).timestamp()
+        return max(0.0, ts - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = 1.0, cap: float = 30.0) -> float:
+    """Retry-After if the server sent one, else capped exponential backoff with jitter."""
+    if retry_after is not None:
+        return min(retry_after, cap * 4)
+    return min(cap, base * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+class SolscanClient:
+    """
+    Thread-safe Solscan API client.
+
+    Args:
+        api_base: e.g. https://pro-api.solscan.io/v2.0
+        token: Solscan Pro API token
+        limiter: shared TokenBucket
+        timeout: default request timeout (seconds)
+        max_retries: retries on 429/5xx/connection errors
+        pool_size: keep-alive connections kept per host
+        cache_ttl: TTL (seconds) for CACHEABLE_PATHS responses (0 disables)
+        cache_size: max cached responses
+    """
+
+    def __init__(self, api_base: str, token: str, limiter: TokenBucket,
+                 timeout: float = 30.0, max_retries: int = 5, pool_size: int = 16,
+                 cache_ttl: float = 300.0, cache_size: int = 10000):
+        self.api_base = api_base.rstrip('/')
+        self.limiter = limiter
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+
+        self.session = requests.Session()
+        self.session.headers['token'] = token
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._cache: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'errors': 0,
+                       'cache_hits': 0, 'cache_misses': 0}
+        self._observer = None
+
+    def set_observer(self, callback):
+        """callback(stage, seconds) for rate-limit waits ('api_wait') and HTTP round-trips ('api')."""
+        self._observer = callback
+
+    def _observe(self, stage: str, t0: float):
+        if self._observer is not None:
+            try:
+                self._observer(stage, time.perf_counter() - t0)
+            except Exception:
+                pass
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Auth headers, for callers with their own HTTP stack (aiohttp)."""
+        return {'token': self.session.headers['token']}
+
+    def url(self, path: str) -> str:
+        return f"{self.api_base}{path}"
+
+    def _bump(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def count_response(self, status: int):
+        """Count a request made outside get() (aiohttp callers) in stats()."""
+        self._bump('requests')
+        if status == 429:
+            self._bump('throttled')
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_key(path: str, params) -> str:
+        items = params.items() if isinstance(params, dict) else (params or [])
+        return path + '?' + json.dumps(sorted((str(k), str(v)) for k, v in items))
+
+    def _cache_get(self, key: str):
+        now = time.time()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > now:
+                self._cache.move_to_end(key)
+                value = hit[1]
+            else:
+                if hit is not None:
+                    del self._cache[key]
+                return None
+        # Copy outside the lock; callers get their own dict to mutate
+        return copy.deepcopy(value)
+
+    def _cache_put(self, key: str, value, ttl: float):
+        value = copy.deepcopy(value)
+        with self._cache_lock:
+            self._cache[key] = (time.time() + ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+
+    def get(self, path: str, params=None, timeout: Optional[float] = None,
+            cache_ttl: Optional[float] = None) -> Any:
+        """
+        GET {api_base}{path} and return the parsed JSON body.
+
+        cache_ttl overrides the default TTL (0 = don't cache); by default only
+        CACHEABLE_PATHS are cached. Raises SolscanError when retries run out.
+        """
+        ttl = self.cache_ttl if cache_ttl is None and path in CACHEABLE_PATHS else (cache_ttl or 0)
+        key = None
+        if ttl > 0:
+            key = self._cache_key(path, params)
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._bump('cache_hits')
+                return cached
+            self._bump('cache_misses')
+
+        url = self.url(path)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            t0 = time.perf_counter()
+            self.limiter.acquire()
+            self._observe('api_wait', t0)
+            self._bump('requests')
+            retry_after = None
+            t0 = time.perf_counter()
+            try:
+                r = self.session.get(url, params=params, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._observe('api', t0)
+                last_error = SolscanError(f"{path}: {e}")
+            else:
+                self._observe('api', t0)
+                if r.status_code in RETRY_STATUSES:
+                    if r.status_code == 429:
+                        self._bump('throttled')
+                    retry_after = retry_after_seconds(r.headers.get('Retry-After'))
+                    last_error = SolscanError(f"{path}: HTTP {r.status_code}", r.status_code)
+                elif r.status_code >= 400:
+                    self._bump('errors')
+                    raise SolscanError(f"{path}: HTTP {r.status_code}", r.status_code)
+                else:
+                    data = r.json()
+                    if key is not None and isinstance(data, dict) and data.get('success'):
+                        self._cache_put(key, data, ttl)
+                    return data
+
+            if attempt < self.max_retries:
+                self._bump('retries')
+                time.sleep(backoff_delay(attempt, retry_after))
+
+        self._bump('errors')
+        raise last_error
+
+    # Convenience wrappers for the endpoints the workers use
+
+    def transaction_actions_multi(self, signatures: Iterable[str], timeout=None):
+        return self.get('/transaction/actions/multi',
+                        [('tx[]', s) for s in signatures], timeout)
+
+    def transaction_detail_multi(self, signatures: Iterable[str], timeout=None):
+        return self.get('/transaction/detail/multi',
+                        [('tx[]', s) for s in signatures], timeout)
+
+    def account_metadata(self, address: str, timeout=None):
+        return self.get('/account/metadata', {'address': address}, timeout)
+
+    def account_metadata_multi(self, addresses: Iterable[str], timeout=None):
+        return self.get('/account/metadata/multi',
+                        [('address[]', a) for a in addresses], timeout)
+
+    def token_meta(self, mint: str, timeout=None):
+        return self.get('/token/meta', {'address': mint}, timeout)
+
+    def token_meta_multi(self, mints: Iterable[str], timeout=None):
+        return self.get('/token/meta/multi', [('address[]', m) for m in mints], timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            s = dict(self._stats)
+        with self._cache_lock:
+            s['cache_size'] = len(self._cache)
+        s['rate_per_sec'] = self.limiter.rate
+        s['rate_waited_sec'] = round(self.limiter.waited_sec, 1)
+        s['shared_limiter'] = self.limiter.state_file is not None
+        return s
+
+    def close(self):
+        self.session.close()
+
+
+# Process-wide client shared by all worker threads
+_client: Optional[SolscanClient] = None
+_client_lock = threading.Lock()
+
+
+def get_solscan_client() -> SolscanClient:
+    """Get (or lazily create) the process-wide SolscanClient from guide-config.json."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                cfg = get_solscan_config()
+                limiter = TokenBucket(cfg['rate_per_sec'], cfg['burst'], cfg['rate_state_file'])
+                _client = SolscanClient(
+                    cfg['api_base'], cfg['token'], limiter,
+                    timeout=cfg['timeout'],
+                    max_retries=cfg['max_retries'],
+                    pool_size=cfg['pool_size'],
+                    cache_ttl=cfg['cache_ttl_sec'],
+                    cache_size=cfg['cache_size'],
+                )
+    return _client
@@ -0,0 +1,124 @@
+"""
+Per-stage latency histograms for T16O Exchange Guide workers
+
+Fixed log-spaced millisecond buckets (cheap to record, mergeable, bounded
+memory) with p50/p95/p99 estimated from bucket upper bounds. StageTimings
+keeps one histogram per named stage and renders a one-line summary, replacing
+ad-hoc "fetch=..s sp=..s" log fields.
+
+Usage:
+    timings = StageTimings(['fetch', 'sp'])
+    timings.record('fetch', elapsed_sec)
+    log(tag, timings.summary())      # fetch n=40 p50<=250ms p95<=1000ms max=812ms | sp ...
+    timings.reset()
+
+A StageTimings can forward every sample to a `parent` (e.g. the process-wide
+WorkerMetrics histograms), so per-thread log summaries and exported metrics
+share one record() call.
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class LatencyHistogram:
+    """Bucketed latency histogram (not thread-safe on its own; see StageTimings)."""
+
+    __slots__ = ('counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket containing the p-th percentile."""
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'count':   self.count,
+            'avg_ms':  round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'sum_ms':  round(self.total_ms, 2),
+            'p50_ms':  self.percentile(50),
+            'p95_ms':  self.percentile(95),
+            'p99_ms':  self.percentile(99),
+            'max_ms':  round(self.max_ms, 2),
+            'buckets': dict(zip([str(b) for b in BUCKETS_MS] + ['inf'], self.counts)),
+        }
+
+    def merge_dict(self, d: Dict):
+        """Add a to_dict() snapshot (e.g. from another process) into this histogram."""
+        buckets = d.get('buckets', {})
+        for i, key in enumerate([str(b) for b in BUCKETS_MS] + ['inf']):
+            self.counts[i] += int(buckets.get(key, 0))
+        self.count += int(d.get('count', 0))
+        self.total_ms += float(d.get('sum_ms', 0.0))
+        self.max_ms = max(self.max_ms, float(d.get('max_ms', 0.0)))
+
+
+def _fmt_ms(ms: Optional[float]) -> str:
+    if ms is None:
+        return '-'
+    return f"{ms / 1000:g}s" if ms >= 1000 else f"{ms:g}ms"
+
+
+class StageTimings:
+    """Thread-safe set of named LatencyHistograms."""
+
+    def __init__(self, stages: Iterable[str] = (), parent: Optional['StageTimings'] = None):
+        self._lock = threading.Lock()
+        self._parent = parent
+        self._order: List[str] = list(stages)
+        self._hists: Dict[str, LatencyHistogram] = {s: LatencyHistogram() for s in self._order}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            hist = self._hists.get(stage)
+            if hist is None:
+                hist = self._hists[stage] = LatencyHistogram()
+                self._order.append(stage)
+            hist.record(seconds)
+        if self._parent is not None:
+            self._parent.record(stage, seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {s: self._hists[s].to_dict() for s in self._order}
+
+    def summary(self) -> str:
+        """One-line summary: '<stage> n=.. p50<=.. p95<=.. max=.. | ...'."""
+        parts = []
+        with self._lock:
+            for s in self._order:
+                h = self._hists[s]
+                if not h.count:
+                    continue
+                parts.append(f"{s} n={h.count} p50<={_fmt_ms(h.percentile(50))} "
+                             f"p95<={_fmt_ms(h.percentile(95))} max={_fmt_ms(round(h.max_ms, 1))}")
+        return ' | '.join(parts) if parts else 'no samples'
+
+    def reset(self):
+        with self._lock:
+            self._hists = {s: LatencyHistogram() for s in self._order}
@@ -0,0 +1,185 @@
+"""
+"New rows for X" work events for T16O Exchange Guide workers
+
+Producers of DB work (shredder -> aggregator/enricher, aggregator -> funder/
+enricher) publish a small event to the consumer's request queue right after
+they commit, instead of the consumer's supervisor publishing db-poll messages
+on a timer. The event reuses the consumer's existing drain action
+('db-poll-sync', 'db-poll-enrich', 'sync-db-missing'), so the worker handles it
+exactly like a poll; supervisor timers stay on only as a slow fallback.
+
+Publisher side (WorkNotifier, one per channel/thread):
+    - at most one event per (queue, action) per min_interval_sec; rows
+      committed in between are folded into the next event, and flush() sends
+      that trailing event from the caller's idle loop
+    - events are transient and low priority - a lost event only delays work
+      until the fallback poll. They carry no per-message TTL: the request
+      queues dead-letter expired messages, and stale events are dropped by
+      the consumer's DrainGate anyway
+
+Consumer side (DrainGate, one per process):
+    - only one drain runs at a time; an event arriving during a drain is
+      acked and makes the running drain go around once more
+    - an event published before the last drain started is stale (that drain
+      already saw its rows) and is acked without touching the DB
+
+Usage:
+    notifier = WorkNotifier('shredder')
+    notifier.notify(ch, AGGREGATOR_REQUEST_QUEUE, 'db-poll-sync', rows)
+    notifier.flush(ch)                                   # idle loop
+
+    DRAIN_GATE = DrainGate()
+    if not DRAIN_GATE.begin(msg.get('ts')):
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+        return
+    try:
+        while True:
+            ... drain ...
+            if not DRAIN_GATE.finish():
+                break
+    finally:
+        DRAIN_GATE.release()
+"""
+
+import json
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+try:
+    import pika
+except ImportError:
+    pika = None
+
+# Events are hints: transient, below normal request priority (5)
+EVENT_PRIORITY = 1
+
+# Publisher: minimum spacing between events for the same (queue, action)
+DEFAULT_MIN_INTERVAL_SEC = 1.0
+
+# Consumer: tolerated clock skew between publisher and consumer hosts
+STALE_MARGIN_SEC = 2.0
+
+
+class WorkNotifier:
+    """Debounced publisher of work events (not shared across pika channels)."""
+
+    def __init__(self, source: str, min_interval_sec: float = DEFAULT_MIN_INTERVAL_SEC):
+        self.source = source
+        self.min_interval_sec = min_interval_sec
+        self._lock = threading.Lock()
+        self._last_sent: Dict[Tuple[str, str], float] = {}
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self.stats = {'published': 0, 'coalesced': 0, 'errors': 0}
+
+    def notify(self, channel, queue: str, action: str, rows: int = 1) -> bool:
+        """Record `rows` new rows for queue/action; publish now unless debounced."""
+        if rows <= 0:
+            return False
+        key = (queue, action)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + rows
+        return self._send(channel, key)
+
+    def flush(self, channel) -> int:
+        """Publish events that were held back by the debounce window."""
+        with self._lock:
+            keys = [k for k, n in self._pending.items() if n > 0]
+        return sum(1 for key in keys if self._send(channel, key))
+
+    def _send(self, channel, key: Tuple[str, str]) -> bool:
+        if channel is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            rows = self._pending.get(key, 0)
+            if rows <= 0:
+                return False
+            if now - self._last_sent.get(key, 0.0) < self.min_interval_sec:
+                self.stats['coalesced'] += 1
+                return False
+            self._last_sent[key] = now
+            self._pending[key] = 0
+
+        queue, action = key
+        body = json.dumps({
+            'request_id': f"event-{uuid.uuid4().hex[:12]}",
+            'action':     action,
+            'source':     self.source,
+            'rows':       rows,
+            'ts':         time.time(),
+        })
+        properties = None
+        if pika is not None:
+            properties = pika.BasicProperties(
+                content_type='application/json', priority=EVENT_PRIORITY)
+        try:
+            channel.basic_publish(exchange='', routing_key=queue,
+                                  body=body.encode('utf-8'), properties=properties)
+        except Exception:
+            # Keep the rows pending so the next notify()/flush() retries;
+            # the caller's own channel handling notices a dead connection
+            with self._lock:
+                self._pending[key] = self._pending.get(key, 0) + rows
+                self._last_sent[key] = 0.0
+                self.stats['errors'] += 1
+            return False
+        with self._lock:
+            self.stats['published'] += 1
+        return True
+
+
+class DrainGate:
+    """Process-wide coalescing of db-poll drains triggered by events and timers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+        self._owner = None
+        self._rerun = False
+        self._last_start = 0.0
+        self.stats = {'drains': 0, 'stale': 0, 'coalesced': 0}
+
+    def begin(self, event_ts: Optional[float] = None) -> bool:
+        """
+        Claim the drain. Returns False when the caller should just ack:
+        the event predates the last drain, or a drain is already running
+        (which is then asked to go around once more).
+        """
+        with self._lock:
+            if event_ts is not None:
+                try:
+                    if float(event_ts) < self._last_start - STALE_MARGIN_SEC:
+                        self.stats['stale'] += 1
+                        return False
+                except (TypeError, ValueError):
+                    pass
+            if self._running:
+                self._rerun = True
+                self.stats['coalesced'] += 1
+                return False
+            self._running = True
+            self._owner = threading.get_ident()
+            self._rerun = False
+            self._last_start = time.time()
+            self.stats['drains'] += 1
+            return True
+
+    def finish(self) -> bool:
+        """End one drain pass; True when work arrived meanwhile and the caller should drain again."""
+        with self._lock:
+            if self._rerun:
+                self._rerun = False
+                self._last_start = time.time()
+                return True
+            self._running = False
+            self._owner = None
+            return False
+
+    def release(self):
+        """Drop this thread's claim, if it still holds one (error paths)."""
+        with self._lock:
+            if self._owner == threading.get_ident():
+                self._running = False
+                self._owner = None
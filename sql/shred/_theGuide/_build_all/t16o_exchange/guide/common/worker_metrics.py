@@ -0,0 +1,341 @@
+"""
+Process-wide worker metrics for T16O Exchange Guide Services
+
+One WorkerMetrics per worker process: named counters plus per-stage latency
+histograms (StageTimings, never reset, so totals are monotonic). Worker
+threads record into it; per-thread StageTimings can forward to it via
+`parent=` so the periodic log summaries and the exported metrics share one
+record() call.
+
+Common stages (workers add their own, e.g. the decoder's fetch/sp/queue):
+    queue_wait  - message publish timestamp -> basic_get
+    handle      - basic_get -> ack/nack (whole message)
+    api         - Solscan / RPC calls
+    sp          - stored procedure / DB write phase
+
+Export (start_exporter):
+    - a JSON snapshot written every METRICS_DUMP_SEC to
+      METRICS_DIR/<service>-<pid>.json (atomic replace; removed on exit)
+    - optionally GET /metrics (Prometheus text) and /metrics.json on the
+      port configured for the service in METRICS_PORTS
+
+The gateway's /api/health calls read_metrics() + aggregate_metrics() to merge
+every live process per service and name each service's slowest stage.
+
+Usage:
+    metrics = get_worker_metrics('decoder')
+    start_exporter(metrics)
+    with metrics.message(body, properties):
+        ...handle...
+    metrics.handled(seconds)          # same, for callers that ack outside a with-block
+    metrics.record('api', elapsed_sec)
+    metrics.incr('processed', n)
+"""
+
+import atexit
+import glob
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .config import get_metrics_config
+from .stage_timings import BUCKETS_MS, LatencyHistogram, StageTimings
+
+COMMON_STAGES = ('queue_wait', 'handle', 'api', 'sp')
+
+# Stages that wrap other stages; excluded when naming the bottleneck
+UMBRELLA_STAGES = {'handle', 'total'}
+
+# Ignore queue-wait samples beyond this (clock skew, replayed DLQ messages)
+MAX_QUEUE_WAIT_SEC = 86400
+
+
+def message_age_sec(body, properties=None) -> Optional[float]:
+    """Seconds since a message was published, from its 'ts'/'timestamp' field."""
+    try:
+        msg = json.loads(body.decode('utf-8') if isinstance(body, bytes) else body)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        msg = {}
+    if not isinstance(msg, dict):
+        msg = {}
+    now = time.time()
+    published = None
+    if isinstance(msg.get('ts'), (int, float)):
+        published = float(msg['ts'])
+    elif properties is not None and getattr(properties, 'timestamp', None):
+        published = float(properties.timestamp)
+    elif isinstance(msg.get('timestamp'), str):
+        try:
+            dt = datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        # Naive stamps are local time on an unknown host
+        if dt.tzinfo is None:
+            return None
+        published = dt.timestamp()
+    if published is None:
+        return None
+    age = now - published
+    return age if 0 <= age <= MAX_QUEUE_WAIT_SEC else None
+
+
+class WorkerMetrics:
+    """Thread-safe counters + stage histograms for one worker process."""
+
+    def __init__(self, service: str):
+        self.service = service
+        self.pid = os.getpid()
+        self.host = socket.gethostname()
+        self.started = time.time()
+        self.timings = StageTimings(COMMON_STAGES)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def record(self, stage: str, seconds: float):
+        self.timings.record(stage, seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - t0)
+
+    def received(self, body, properties=None):
+        """Count a consumed message and record its queue wait."""
+        self.incr('messages')
+        age = message_age_sec(body, properties)
+        if age is not None:
+            self.record('queue_wait', age)
+
+    def handled(self, seconds: float, error: bool = False):
+        """Count a finished (acked/nacked) message and record its handling time."""
+        self.incr('handled')
+        if error:
+            self.incr('errors')
+        self.record('handle', seconds)
+
+    @contextmanager
+    def message(self, body, properties=None):
+        """received() plus the message's handling time (and errors that escape)."""
+        self.received(body, properties)
+        t0 = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.handled(time.perf_counter() - t0, error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        now = time.time()
+        return {
+            'service':    self.service,
+            'pid':        self.pid,
+            'host':       self.host,
+            'ts':         now,
+            'uptime_sec': round(now - self.started, 1),
+            'counters':   counters,
+            'stages':     self.timings.snapshot(),
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (histograms in seconds)."""
+        snap = self.snapshot()
+        svc = snap['service']
+        lines = [
+            '# TYPE guide_worker_uptime_seconds gauge',
+            f'guide_worker_uptime_seconds{{service="{svc}"}} {snap["uptime_sec"]}',
+            '# TYPE guide_worker_count_total counter',
+        ]
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f'guide_worker_count_total{{service="{svc}",name="{name}"}} {value}')
+        lines.append('# TYPE guide_worker_stage_seconds histogram')
+        for stage, h in snap['stages'].items():
+            labels = f'service="{svc}",stage="{stage}"'
+            cumulative = 0
+            for bound in BUCKETS_MS:
+                cumulative += h['buckets'].get(str(bound), 0)
+                lines.append(f'guide_worker_stage_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'guide_worker_stage_seconds_bucket{{{labels},le="+Inf"}} {h["count"]}')
+            lines.append(f'guide_worker_stage_seconds_sum{{{labels}}} {h["sum_ms"] / 1000:.6f}')
+            lines.append(f'guide_worker_stage_seconds_count{{{labels}}} {h["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+# =============================================================================
+# Export (JSON dump + optional HTTP endpoint)
+# =============================================================================
+
+def _dump_path(metrics: WorkerMetrics, metrics_dir: str) -> str:
+    return os.path.join(metrics_dir, f"{metrics.service}-{metrics.pid}.json")
+
+
+def dump_metrics(metrics: WorkerMetrics, metrics_dir: str):
+    """Atomically write the current snapshot to METRICS_DIR."""
+    os.makedirs(metrics_dir, exist_ok=True)
+    path = _dump_path(metrics, metrics_dir)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(metrics.snapshot(), f)
+    os.replace(tmp, path)
+
+
+def _make_handler(metrics: WorkerMetrics):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith('/metrics.json'):
+                body = json.dumps(metrics.snapshot()).encode('utf-8')
+                ctype = 'application/json'
+            elif self.path.startswith('/metrics'):
+                body = metrics.render_prometheus().encode('utf-8')
+                ctype = 'text/plain; version=0.0.4'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return MetricsHandler
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(metrics: WorkerMetrics) -> bool:
+    """Start the periodic JSON dump (and HTTP endpoint if a port is configured). Idempotent."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return False
+        _exporter_started = True
+
+    cfg = get_metrics_config()
+    metrics_dir = cfg['dir']
+    dump_sec = float(cfg['dump_sec'] or 0)
+
+    if dump_sec > 0:
+        def dump_loop():
+            while True:
+                try:
+                    dump_metrics(metrics, metrics_dir)
+                except OSError:
+                    pass
+                time.sleep(dump_sec)
+
+        def remove_dump():
+            try:
+                os.remove(_dump_path(metrics, metrics_dir))
+            except OSError:
+                pass
+
+        threading.Thread(target=dump_loop, name='metrics-dump', daemon=True).start()
+        atexit.register(remove_dump)
+
+    port = int((cfg['ports'] or {}).get(metrics.service, 0) or 0)
+    if port > 0:
+        try:
+            server = ThreadingHTTPServer(('0.0.0.0', port), _make_handler(metrics))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        except OSError:
+            # Port taken (second process of the same service): JSON dump still works
+            pass
+    return True
+
+
+# =============================================================================
+# Aggregation (gateway side)
+# =============================================================================
+
+def read_metrics(metrics_dir: Optional[str] = None, stale_sec: Optional[float] = None) -> List[Dict]:
+    """Load every fresh worker snapshot from METRICS_DIR."""
+    cfg = get_metrics_config()
+    metrics_dir = metrics_dir or cfg['dir']
+    stale_sec = cfg['stale_sec'] if stale_sec is None else stale_sec
+    now = time.time()
+    snaps = []
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        try:
+            with open(path) as f:
+                snap = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if now - snap.get('ts', 0) <= stale_sec:
+            snaps.append(snap)
+    return snaps
+
+
+def aggregate_metrics(snaps: List[Dict]) -> Dict[str, Dict]:
+    """
+    Merge snapshots per service: counters summed, histograms merged.
+    Each service also gets 'bottleneck', the non-umbrella stage with the most
+    cumulative time.
+    """
+    merged: Dict[str, Dict] = {}
+    for snap in snaps:
+        svc = merged.setdefault(snap.get('service', 'unknown'),
+                                {'processes': 0, 'counters': {}, 'hists': {}})
+        svc['processes'] += 1
+        for name, value in snap.get('counters', {}).items():
+            svc['counters'][name] = svc['counters'].get(name, 0) + value
+        for stage, d in snap.get('stages', {}).items():
+            svc['hists'].setdefault(stage, LatencyHistogram()).merge_dict(d)
+
+    result = {}
+    for service, svc in sorted(merged.items()):
+        stages = {}
+        for stage, h in svc['hists'].items():
+            if not h.count:
+                continue
+            d = h.to_dict()
+            d.pop('buckets')
+            stages[stage] = d
+        candidates = {s: d['sum_ms'] for s, d in stages.items() if s not in UMBRELLA_STAGES}
+        result[service] = {
+            'processes':  svc['processes'],
+            'counters':   svc['counters'],
+            'stages':     stages,
+            'bottleneck': max(candidates, key=candidates.get) if candidates else None,
+        }
+    return result
+
+
+# =============================================================================
+# Process-wide singleton
+# =============================================================================
+
+_metrics: Optional[WorkerMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_worker_metrics(service: Optional[str] = None) -> WorkerMetrics:
+    """Get (or lazily create) the process-wide WorkerMetrics."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = WorkerMetrics(service or 'worker')
+    return _metrics
@@ -20,6 +20,8 @@ from typing import Optional, Dict, List, Set, Tuple
 import mysql.connector
 import networkx as nx
 
+from guide_edge_loader import load_edges, utc
+
 
 def connect_db(host='localhost', port=3396, user='root', password='rootpassword', database='t16o_db'):
     """Connect to MySQL database"""
@@ -34,63 +36,51 @@ def build_graph(cursor, token_filter: Optional[List[str]] = None,
                 end_time: Optional[int] = None) -> nx.MultiDiGraph:
     """Build NetworkX graph from tx_guide"""
 
-    query = """
-        SELECT
-            g.id as edge_id,
-            fa.address as from_address,
-            ta.address as to_address,
-            t.signature as tx_signature,
-            g.block_time,
-            tk.token_symbol,
-            g.amount,
-            g.decimals,
-            gt.type_code as edge_type
-        FROM tx_guide g
-        JOIN tx_address fa ON g.from_address_id = fa.id
-        JOIN tx_address ta ON g.to_address_id = ta.id
-        JOIN tx t ON g.tx_id = t.id
-        JOIN tx_guide_type gt ON g.edge_type_id = gt.id
-        LEFT JOIN tx_token tk ON g.token_id = tk.id
-        WHERE 1=1
-    """
+    where = "1=1"
     params = []
 
     if token_filter:
         placeholders = ','.join(['%s'] * len(token_filter))
-        query += f" AND tk.token_symbol IN ({placeholders})"
+        where += f" AND tk.token_symbol IN ({placeholders})"
         params.extend(token_filter)
 
     if address_filter:
-        query += " AND (fa.address = %s OR ta.address = %s)"
+        where += (" AND (g.from_address_id = (SELECT id FROM tx_address WHERE address = %s)"
+                  " OR g.to_address_id = (SELECT id FROM tx_address WHERE address = %s))")
         params.extend([address_filter, address_filter])
 
     if start_time:
-        query += " AND g.block_time >= %s"
+        where += " AND g.block_time >= %s"
         params.append(start_time)
 
     if end_time:
-        query += " AND g.block_time <= %s"
+        where += " AND g.block_time <= %s"
         params.append(end_time)
 
-    cursor.execute(query, params)
-
-    G = nx.MultiDiGraph()
-
-    for row in cursor.fetchall():
-        (edge_id, from_addr, to_addr, tx_sig, block_time,
-         token_symbol, amount, decimals, edge_type) = row
+    frame = load_edges(cursor, where, params, order_by=None, signatures=True)
 
-        human_amount = amount / (10 ** decimals) if amount and decimals else 0
-        block_time_utc = datetime.fromtimestamp(block_time, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if block_time else ''
+    # Edge attributes straight from the columns; block_time_utc is derived
+    # from block_time at export (sanitize_for_gexf) instead of per edge here
+    addresses = frame.addresses
+    tokens = frame.tokens
+    signatures = frame.signatures
+    type_codes = frame.type_codes
 
-        G.add_edge(from_addr, to_addr,
-                   edge_id=edge_id,
-                   tx_signature=tx_sig,
-                   block_time=block_time,
-                   block_time_utc=block_time_utc,
-                   token_symbol=token_symbol or 'SOL',
-                   amount=human_amount,
-                   edge_type=edge_type)
+    G = nx.MultiDiGraph()
+    G.add_edges_from(
+        (addresses[f], addresses[t], {
+            'edge_id': edge_id,
+            'tx_signature': signatures[tx],
+            'block_time': block_time or None,
+            'token_symbol': (tokens[tok][0] if tok >= 0 else None) or 'SOL',
+            'amount': amount,
+            'edge_type': type_codes.get(type_id),
+        })
+        for f, t, edge_id, tx, block_time, tok, amount, type_id in zip(
+            frame.from_idx.tolist(), frame.to_idx.tolist(), frame.edge_id.tolist(),
+            frame.tx_idx.tolist(), frame.block_time.tolist(), frame.token_idx.tolist(),
+            frame.amount.tolist(), frame.edge_type.tolist())
+    )
 
     return G
 
@@ -671,6 +661,14 @@ def sanitize_for_gexf(G: nx.MultiDiGraph) -> nx.MultiDiGraph:
     # Copy edges with sanitized attributes
     for u, v, key, attrs in G.edges(keys=True, data=True):
         clean_attrs = {}
+        if 'block_time' in attrs and 'block_time_utc' not in attrs:
+            # Keep block_time_utc right after block_time, as in earlier exports
+            ordered = {}
+            for k, val in attrs.items():
+                ordered[k] = val
+                if k == 'block_time':
+                    ordered['block_time_utc'] = utc(val)
+            attrs = ordered
         for k, val in attrs.items():
             if val is None:
                 clean_attrs[k] = ''
@@ -11,15 +11,19 @@ Usage:
     python guide-clipper.py --token <mint_or_symbol>
     python guide-clipper.py --token SOLTIT --window 30
     python guide-clipper.py --token SOLTIT --window 60 --gexf clipper.gexf
+    python guide-clipper.py --token SOLTIT --window 60 --workers 8   # parallel clip search
 """
 
 import argparse
 import json
 from collections import defaultdict
-from datetime import datetime, timezone
 
 import mysql.connector
 import networkx as nx
+import numpy as np
+
+from guide_clip_events import find_clip_events
+from guide_edge_loader import load_edges, utc
 
 
 def connect_db(host='localhost', port=3396, user='root', password='rootpassword', database='t16o_db'):
@@ -29,144 +33,33 @@ def connect_db(host='localhost', port=3396, user='root', password='rootpassword'
 
 
 def get_token_trades(cursor, token_filter: str, min_amount: float = 0):
-    """Get all swap_in (buys) and swap_out (sells) for a token"""
-
-    query = """
-        SELECT
-            g.id as edge_id,
-            g.block_time,
-            gt.type_code as edge_type,
-            fa.address as from_address,
-            ta.address as to_address,
-            tk.token_symbol,
-            mint.address as token_mint,
-            g.amount,
-            g.decimals,
-            t.signature as tx_signature
-        FROM tx_guide g
-        JOIN tx_guide_type gt ON g.edge_type_id = gt.id
-        JOIN tx_address fa ON g.from_address_id = fa.id
-        JOIN tx_address ta ON g.to_address_id = ta.id
-        JOIN tx t ON g.tx_id = t.id
-        LEFT JOIN tx_token tk ON g.token_id = tk.id
-        LEFT JOIN tx_address mint ON tk.mint_address_id = mint.id
-        WHERE gt.type_code IN ('swap_in', 'swap_out')
-          AND (tk.token_symbol = %s OR mint.address = %s)
-        ORDER BY g.block_time ASC
-    """
-
-    cursor.execute(query, [token_filter, token_filter])
-    return cursor.fetchall()
-
-
-def classify_trades(rows) -> list:
-    """Convert rows to classified trade records"""
-    trades = []
-
-    for row in rows:
-        (edge_id, block_time, edge_type, from_addr, to_addr,
-         token_symbol, token_mint, amount, decimals, tx_sig) = row
-
-        human_amount = amount / (10 ** decimals) if amount and decimals else 0
-
-        # Convert block_time to UTC string
-        block_time_utc = datetime.fromtimestamp(block_time, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if block_time else ''
-
-        # swap_in: to_address is the BUYER (receiving token)
-        # swap_out: from_address is the SELLER (giving token)
-        if edge_type == 'swap_in':
-            trader = to_addr
-            trade_type = 'BUY'
-        elif edge_type == 'swap_out':
-            trader = from_addr
-            trade_type = 'SELL'
-        else:
-            continue
-
-        trades.append({
-            'edge_id': edge_id,
-            'block_time': block_time,
-            'block_time_utc': block_time_utc,
-            'trade_type': trade_type,
-            'trader': trader,
-            'amount': human_amount,
-            'token_symbol': token_symbol,
-            'token_mint': token_mint,
-            'tx_signature': tx_sig
-        })
+    """Get all swap_in (buys) and swap_out (sells) for a token, as an EdgeFrame"""
+    return load_edges(cursor, "tk.token_symbol = %s OR mint.address = %s",
+                      [token_filter, token_filter], order_by='g.block_time ASC',
+                      edge_types=('swap_in', 'swap_out'))
 
-    return trades
-
-
-def find_clip_events(trades: list, window_seconds: int, min_amount: float = 0) -> list:
-    """
-    Find clip events: buys followed by sells from OTHER wallets within the window
-    """
-    clip_events = []
-
-    buys = [t for t in trades if t['trade_type'] == 'BUY' and t['amount'] >= min_amount and t['trader']]
-    sells = [t for t in trades if t['trade_type'] == 'SELL' and t['amount'] >= min_amount and t['trader']]
-
-    # Dedupe by (trader, block_time) keeping highest amount
-    buy_map = {}
-    for buy in buys:
-        key = (buy['trader'], buy['block_time'])
-        if key not in buy_map or buy['amount'] > buy_map[key]['amount']:
-            buy_map[key] = buy
-    buys = list(buy_map.values())
-
-    sell_map = {}
-    for sell in sells:
-        key = (sell['trader'], sell['block_time'])
-        if key not in sell_map or sell['amount'] > sell_map[key]['amount']:
-            sell_map[key] = sell
-    sells = list(sell_map.values())
-
-    print(f"Found {len(buys)} unique BUYs and {len(sells)} unique SELLs")
-
-    for buy in buys:
-        buy_time = buy['block_time']
-        buy_wallet = buy['trader']
-
-        window_sells = []
-        seen_sellers = set()
-
-        for sell in sells:
-            if sell['trader'] == buy_wallet:
-                continue
-
-            time_diff = sell['block_time'] - buy_time
-
-            if 0 < time_diff <= window_seconds:
-                if sell['trader'] in seen_sellers:
-                    continue
-                seen_sellers.add(sell['trader'])
-
-                sell_copy = sell.copy()
-                sell_copy['time_diff'] = time_diff
-                window_sells.append(sell_copy)
-
-        if window_sells:
-            total_sell_amount = sum(s['amount'] for s in window_sells)
-            avg_time_diff = sum(s['time_diff'] for s in window_sells) / len(window_sells)
-
-            clip_score = (
-                len(window_sells) * 10 +
-                (total_sell_amount / buy['amount'] if buy['amount'] > 0 else 0) * 50 +
-                (window_seconds - avg_time_diff) / window_seconds * 40
-            )
-
-            clip_events.append({
-                'buy': buy,
-                'sells': window_sells,
-                'clip_score': clip_score,
-                'total_sell_amount': total_sell_amount,
-                'sell_count': len(window_sells),
-                'avg_time_diff': avg_time_diff
-            })
 
-    clip_events.sort(key=lambda x: x['clip_score'], reverse=True)
-    return clip_events
+def classify_trades(frame) -> list:
+    """Convert edges to classified trade records (block_time_utc formatted on export)"""
+    # swap_in: to_address is the BUYER (receiving token)
+    # swap_out: from_address is the SELLER (giving token)
+    is_buy = frame.type_mask('swap_in')
+    trader_idx = np.where(is_buy, frame.to_idx, frame.from_idx)
+
+    return [
+        {
+            'edge_id': edge_id,
+            'block_time': block_time,
+            'trade_type': 'BUY' if buy else 'SELL',
+            'trader': frame.addresses[trader],
+            'amount': amount,
+            'token_symbol': frame.tokens[tok][0] if tok >= 0 else None,
+            'token_mint': frame.tokens[tok][1] if tok >= 0 else None,
+        }
+        for edge_id, block_time, buy, trader, amount, tok in zip(
+            frame.edge_id.tolist(), frame.block_time.tolist(), is_buy.tolist(),
+            trader_idx.tolist(), frame.amount.tolist(), frame.token_idx.tolist())
+    ]
 
 
 def build_clipper_graph(clip_events: list) -> nx.DiGraph:
@@ -372,7 +265,7 @@ def export_json(G: nx.DiGraph, clip_events: list, token: str, window: int, filep
             'buy_amount': buy['amount'],
             'buy_token': buy.get('token_symbol'),
             'buy_block_time': buy.get('block_time'),
-            'buy_block_time_utc': buy.get('block_time_utc'),
+            'buy_block_time_utc': utc(buy.get('block_time')),
             'sell_count': event['sell_count'],
             'total_sell_amount': event['total_sell_amount'],
             'avg_time_diff_seconds': event['avg_time_diff'],
@@ -381,7 +274,7 @@ def export_json(G: nx.DiGraph, clip_events: list, token: str, window: int, filep
                     'wallet': s['trader'],
                     'amount': s['amount'],
                     'block_time': s.get('block_time'),
-                    'block_time_utc': s.get('block_time_utc'),
+                    'block_time_utc': utc(s.get('block_time')),
                     'time_diff_seconds': s['time_diff']
                 }
                 for s in event['sells']
@@ -414,6 +307,8 @@ def main():
     parser.add_argument('--min-amount', type=float, default=0, help='Minimum trade amount')
     parser.add_argument('--json', help='Export results to JSON file')
     parser.add_argument('--gexf', help='Export graph to GEXF file (for Gephi)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Score buys in parallel across N processes (default: 1)')
     parser.add_argument('--db-host', default='localhost')
     parser.add_argument('--db-port', type=int, default=3396)
     parser.add_argument('--db-user', default='root')
@@ -447,7 +342,7 @@ def main():
     trades = classify_trades(raw_trades)
 
     print(f"Searching for clip events (window={args.window}s)...")
-    clip_events = find_clip_events(trades, args.window, args.min_amount)
+    clip_events = find_clip_events(trades, args.window, args.min_amount, workers=args.workers)
     print(f"Found {len(clip_events)} clip events")
 
     if clip_events:
@@ -0,0 +1,736 @@
+#!/usr/bin/env python3
+"""
+Guide Forensic Bench - Benchmark and regression check for the vectorized detectors
+
+Generates a synthetic token (random traders plus planted bots, wash pairs and
+dump bursts), then times detect_bot_signatures, detect_wash_trading and
+detect_coordinated_dump from guide-token-forensic.py. With --check it also
+runs the previous pure-Python detectors (kept below, verbatim, as the
+reference) on the same swaps and fails if any finding differs.
+
+Usage:
+    python guide-forensic-bench.py                          # 5M swaps, timings only
+    python guide-forensic-bench.py --swaps 200000 --check   # compare with the reference
+    python guide-forensic-bench.py --swaps 1000000 --check --seed 7
+
+The reference coordinated-dump scan is O(n*w); keep --check runs to a few
+hundred thousand swaps. Memory is dominated by the swap dicts (~1 GB per
+2M swaps).
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+_spec = importlib.util.spec_from_file_location(
+    'guide_token_forensic', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'guide-token-forensic.py'))
+forensic = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(forensic)
+
+ForensicCommentator = forensic.ForensicCommentator
+WalletProfile = forensic.WalletProfile
+SwapColumns = forensic.SwapColumns
+BOT_SCORE_THRESHOLD = forensic.BOT_SCORE_THRESHOLD
+WASH_TRADE_MIN_ROUNDS = forensic.WASH_TRADE_MIN_ROUNDS
+RAPID_TRADE_THRESHOLD = forensic.RAPID_TRADE_THRESHOLD
+HIGH_FREQUENCY_THRESHOLD = forensic.HIGH_FREQUENCY_THRESHOLD
+
+DUMP_WINDOW = forensic.DUMP_WINDOW_DEFAULT
+START_TIME = 1735689600                   # 2025-01-01 00:00:00 UTC
+
+
+# =============================================================================
+# Synthetic token
+# =============================================================================
+
+def _address(rng: random.Random) -> str:
+    return ''.join(rng.choice('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz')
+                   for _ in range(44))
+
+
+def synthetic_swaps(n: int, seed: int = 42, wallets: int = 50000) -> List[Dict]:
+    """n swaps in block_time order, shaped like get_swap_activity() rows."""
+    rng = random.Random(seed)
+    traders = [_address(rng) for _ in range(wallets)]
+    pools = [_address(rng) for _ in range(8)]
+    bots = traders[:max(1, wallets // 500)]
+    wash = [(traders[i], traders[i + 1]) for i in range(len(bots), len(bots) + 2 * max(1, wallets // 2000), 2)]
+
+    events = []
+    t = START_TIME
+    while len(events) < n:
+        t += rng.choice((0, 0, 1, 1, 2, 3, 5, 8, 13))
+        roll = rng.random()
+        if roll < 0.10:
+            # Bot: fixed-size trades, flips side within a couple of seconds
+            bot = rng.choice(bots)
+            events.append((t, rng.random() < 0.5, bot, rng.choice(pools), 1000.0))
+            if rng.random() < 0.3:
+                events.append((t + rng.randint(0, 2), rng.random() < 0.5, bot, rng.choice(pools), 1000.0))
+        elif roll < 0.15:
+            # Wash pair: the two wallets sell to each other
+            a, b = rng.choice(wash)
+            if rng.random() < 0.5:
+                a, b = b, a
+            events.append((t, True, a, b, round(rng.uniform(100, 5000), 6)))
+        elif roll < 0.16:
+            # Dump burst: several wallets sell within seconds
+            for k in range(rng.randint(3, 9)):
+                events.append((t + rng.randint(0, 20), True, rng.choice(traders), rng.choice(pools),
+                               round(rng.uniform(1e4, 1e6), 6)))
+        else:
+            events.append((t, rng.random() < 0.45, rng.choice(traders), rng.choice(pools),
+                           round(rng.lognormvariate(6, 2), 6)))
+    events = sorted(events[:n], key=lambda e: e[0])
+
+    swaps = []
+    for i, (block_time, is_sell, trader, counterparty, amount) in enumerate(events):
+        swaps.append({
+            'id': i + 1,
+            'tx_id': i + 1,
+            'signature': f"sig{i:010d}",
+            'block_time': block_time,
+            'block_time_utc': datetime.fromtimestamp(block_time, timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'trade_type': 'SELL' if is_sell else 'BUY',
+            'trader': trader,
+            'counterparty': counterparty,
+            'amount': amount,
+            'amount_raw': int(amount * 1e6),
+            'token_symbol': 'BENCH'
+        })
+    return swaps
+
+
+def swap_profiles(swaps: List[Dict]) -> Dict[str, WalletProfile]:
+    """Trader profiles from swaps alone (build_wallet_profiles needs an EdgeFrame)."""
+    profiles: Dict[str, WalletProfile] = {}
+    for swap in swaps:
+        p = profiles.get(swap['trader'])
+        if p is None:
+            p = profiles[swap['trader']] = WalletProfile(address=swap['trader'])
+        if p.first_seen == 0 or swap['block_time'] < p.first_seen:
+            p.first_seen = swap['block_time']
+        p.last_seen = max(p.last_seen, swap['block_time'])
+        if swap['trade_type'] == 'SELL':
+            p.total_sells += 1
+            p.sell_volume += swap['amount']
+        else:
+            p.total_buys += 1
+            p.buy_volume += swap['amount']
+    return profiles
+
+
+# =============================================================================
+# Reference detectors (pre-vectorization guide-token-forensic.py)
+# =============================================================================
+
+def legacy_detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
+                          commentator: ForensicCommentator) -> List[Dict]:
+    """
+    Identify wallets exhibiting bot-like trading behavior.
+
+    Bots leave distinctive fingerprints in their trading patterns:
+    - Unnaturally consistent timing between trades
+    - Sub-second reaction times to market events
+    - Identical or highly similar trade sizes
+    - Extremely high trading frequency
+
+    Each wallet is scored on multiple dimensions, and those exceeding
+    the threshold are flagged for investigation.
+    """
+    commentator.section("BOT DETECTION ANALYSIS")
+    commentator.narrate("Analyzing trading patterns for machine-like behavior signatures...")
+
+    bot_suspects = []
+
+    # Group all swaps by trader wallet
+    wallet_txs = defaultdict(list)
+    for swap in swaps:
+        if swap['trader']:
+            wallet_txs[swap['trader']].append(swap)
+
+    wallets_analyzed = 0
+    for wallet, txs in wallet_txs.items():
+        wallets_analyzed += 1
+
+        # Need minimum activity to establish patterns
+        if len(txs) < 3:
+            continue
+
+        profile = profiles.get(wallet)
+        if not profile:
+            continue
+
+        bot_score = 0.0
+        evidence = {
+            'analysis_notes': [],
+            'timing_analysis': {},
+            'amount_analysis': {},
+            'frequency_analysis': {}
+        }
+
+        sorted_txs = sorted(txs, key=lambda x: x['block_time'])
+
+        # =====================================================================
+        # TEST 1: Timing Interval Consistency
+        # Bots often operate on fixed intervals (e.g., every 30 seconds)
+        # =====================================================================
+        if len(sorted_txs) >= 3:
+            intervals = []
+            for i in range(1, len(sorted_txs)):
+                interval = sorted_txs[i]['block_time'] - sorted_txs[i-1]['block_time']
+                intervals.append(interval)
+
+            if intervals:
+                avg_interval = sum(intervals) / len(intervals)
+                variance = sum((i - avg_interval) ** 2 for i in intervals) / len(intervals)
+                std_dev = variance ** 0.5
+
+                evidence['timing_analysis'] = {
+                    'avg_interval_seconds': round(avg_interval, 2),
+                    'std_deviation': round(std_dev, 2),
+                    'variance': round(variance, 2),
+                    'sample_size': len(intervals)
+                }
+
+                # Very low variance in timing = highly suspicious
+                if variance < 100 and avg_interval < 300:
+                    score_add = 30
+                    bot_score += score_add
+                    evidence['analysis_notes'].append(
+                        f"SUSPICIOUS: Timing variance of {variance:.1f} is unusually consistent "
+                        f"(avg interval: {avg_interval:.1f}s) - suggests automated execution"
+                    )
+                elif variance < 500 and avg_interval < 600:
+                    score_add = 15
+                    bot_score += score_add
+                    evidence['analysis_notes'].append(
+                        f"NOTABLE: Somewhat consistent timing patterns detected "
+                        f"(variance: {variance:.1f}, avg: {avg_interval:.1f}s)"
+                    )
+
+        # =====================================================================
+        # TEST 2: Rapid Reaction Analysis
+        # Look for suspiciously fast buy-then-sell or sell-then-buy sequences
+        # =====================================================================
+        rapid_reactions = []
+        for i in range(1, len(sorted_txs)):
+            prev_tx = sorted_txs[i-1]
+            curr_tx = sorted_txs[i]
+            reaction_time = curr_tx['block_time'] - prev_tx['block_time']
+
+            # Different trade types in rapid succession
+            if prev_tx['trade_type'] != curr_tx['trade_type'] and reaction_time <= RAPID_TRADE_THRESHOLD:
+                rapid_reactions.append({
+                    'from': prev_tx['trade_type'],
+                    'to': curr_tx['trade_type'],
+                    'reaction_seconds': reaction_time,
+                    'timestamp': curr_tx['block_time_utc']
+                })
+
+        if rapid_reactions:
+            score_add = min(len(rapid_reactions) * 15, 40)
+            bot_score += score_add
+            evidence['rapid_reactions'] = rapid_reactions
+            evidence['analysis_notes'].append(
+                f"CRITICAL: {len(rapid_reactions)} sub-{RAPID_TRADE_THRESHOLD}s reaction(s) detected - "
+                f"this speed is virtually impossible for human traders"
+            )
+
+        # =====================================================================
+        # TEST 3: Trade Size Consistency
+        # Bots often use identical or formula-based trade sizes
+        # =====================================================================
+        amounts = [tx['amount'] for tx in txs if tx['amount'] > 0]
+        if len(amounts) >= 3:
+            avg_amount = sum(amounts) / len(amounts)
+            if avg_amount > 0:
+                amount_variance = sum((a - avg_amount) ** 2 for a in amounts) / len(amounts)
+                normalized_variance = amount_variance / (avg_amount ** 2)
+
+                evidence['amount_analysis'] = {
+                    'avg_trade_size': round(avg_amount, 4),
+                    'normalized_variance': round(normalized_variance, 4),
+                    'sample_size': len(amounts),
+                    'min_amount': round(min(amounts), 4),
+                    'max_amount': round(max(amounts), 4)
+                }
+
+                if normalized_variance < 0.05:
+                    score_add = 25
+                    bot_score += score_add
+                    evidence['analysis_notes'].append(
+                        f"SUSPICIOUS: Trade sizes are nearly identical (normalized variance: {normalized_variance:.4f}) - "
+                        f"suggests pre-programmed amounts"
+                    )
+                elif normalized_variance < 0.15:
+                    score_add = 10
+                    bot_score += score_add
+                    evidence['analysis_notes'].append(
+                        f"NOTABLE: Trade sizes show unusual consistency (variance: {normalized_variance:.4f})"
+                    )
+
+        # =====================================================================
+        # TEST 4: Trading Frequency Analysis
+        # Sustained high-frequency trading suggests automation
+        # =====================================================================
+        tx_rate = profile.trades_per_hour()
+        evidence['frequency_analysis'] = {
+            'trades_per_hour': round(tx_rate, 2),
+            'total_trades': len(txs),
+            'activity_hours': round(profile.activity_duration_hours(), 2)
+        }
+
+        if tx_rate > HIGH_FREQUENCY_THRESHOLD:
+            score_add = 25
+            bot_score += score_add
+            evidence['analysis_notes'].append(
+                f"SUSPICIOUS: Trading at {tx_rate:.1f} trades/hour - this sustained rate suggests automation"
+            )
+        elif tx_rate > HIGH_FREQUENCY_THRESHOLD / 2:
+            score_add = 10
+            bot_score += score_add
+            evidence['analysis_notes'].append(
+                f"NOTABLE: Elevated trading frequency ({tx_rate:.1f} trades/hour)"
+            )
+
+        # =====================================================================
+        # TEST 5: Sell Bias Analysis
+        # Dump bots typically show heavy sell-side activity
+        # =====================================================================
+        if profile.total_sells > profile.total_buys * 2 and profile.total_sells >= 5:
+            score_add = 15
+            bot_score += score_add
+            sell_ratio = profile.total_sells / max(profile.total_buys, 1)
+            evidence['analysis_notes'].append(
+                f"NOTABLE: Heavy sell bias ({profile.total_sells} sells vs {profile.total_buys} buys, "
+                f"ratio: {sell_ratio:.1f}x) - consistent with dump bot behavior"
+            )
+
+        # =====================================================================
+        # Compile Results
+        # =====================================================================
+        if bot_score >= BOT_SCORE_THRESHOLD:
+            profile.is_bot_suspect = True
+            profile.bot_score = bot_score
+            profile.bot_evidence = evidence
+
+            # Determine severity
+            if bot_score >= 70:
+                severity = 'critical'
+            elif bot_score >= 50:
+                severity = 'high'
+            elif bot_score >= 40:
+                severity = 'medium'
+            else:
+                severity = 'low'
+
+            bot_suspects.append({
+                'wallet': wallet,
+                'bot_score': bot_score,
+                'severity': severity,
+                'total_trades': len(txs),
+                'buys': profile.total_buys,
+                'sells': profile.total_sells,
+                'buy_volume': round(profile.buy_volume, 4),
+                'sell_volume': round(profile.sell_volume, 4),
+                'net_position': round(profile.net_position(), 4),
+                'activity_hours': round(profile.activity_duration_hours(), 2),
+                'first_seen': datetime.fromtimestamp(profile.first_seen, timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if profile.first_seen else '',
+                'last_seen': datetime.fromtimestamp(profile.last_seen, timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if profile.last_seen else '',
+                'evidence': evidence
+            })
+
+    # Sort by bot score descending
+    bot_suspects.sort(key=lambda x: x['bot_score'], reverse=True)
+
+    # Commentary on findings
+    commentator.finding(f"Analyzed {wallets_analyzed:,} wallets with trading activity")
+
+    if bot_suspects:
+        critical_bots = [b for b in bot_suspects if b['severity'] == 'critical']
+        high_bots = [b for b in bot_suspects if b['severity'] == 'high']
+
+        commentator.alert(f"Identified {len(bot_suspects)} wallets with bot-like signatures")
+
+        if critical_bots:
+            commentator.critical(
+                f"{len(critical_bots)} wallet(s) show CRITICAL bot indicators",
+                {'top_suspect': critical_bots[0]['wallet'], 'score': critical_bots[0]['bot_score']}
+            )
+
+        if high_bots:
+            commentator.alert(f"{len(high_bots)} additional wallet(s) with HIGH bot probability")
+
+        # Highlight the worst offender
+        top_bot = bot_suspects[0]
+        commentator.narrate(
+            f"Primary suspect: {top_bot['wallet']} with score {top_bot['bot_score']:.1f}",
+            "critical" if top_bot['severity'] == 'critical' else "alert"
+        )
+    else:
+        commentator.finding("No definitive bot signatures detected in trading patterns")
+
+    return bot_suspects
+
+
+def legacy_detect_wash_trading(swaps: List[Dict], profiles: Dict[str, WalletProfile],
+                        commentator: ForensicCommentator) -> List[Dict]:
+    """
+    Identify wash trading - fake volume created by trading between related wallets.
+
+    Wash trading is a classic manipulation technique where the same entity
+    (or colluding entities) trade back and forth to create the illusion
+    of market activity and liquidity.
+
+    We detect this by looking for:
+    - Bidirectional trading between wallet pairs
+    - Circular trading patterns (A→B→C→A)
+    - Volume that doesn't result in position changes
+    """
+    commentator.section("WASH TRADING DETECTION")
+    commentator.narrate("Scanning for circular and bidirectional trading patterns...")
+
+    wash_pairs = []
+
+    # Build a matrix of trades between wallet pairs
+    pair_trades = defaultdict(lambda: {
+        'a_to_b_sells': 0,
+        'b_to_a_sells': 0,
+        'a_to_b_volume': 0.0,
+        'b_to_a_volume': 0.0,
+        'transactions': []
+    })
+
+    for swap in swaps:
+        trader = swap['trader']
+        counterparty = swap['counterparty']
+
+        if not trader or not counterparty or trader == counterparty:
+            continue
+
+        # Normalize pair key (alphabetically sorted)
+        pair_key = tuple(sorted([trader, counterparty]))
+        is_a_to_b = trader == pair_key[0]
+
+        if swap['trade_type'] == 'SELL':
+            if is_a_to_b:
+                pair_trades[pair_key]['a_to_b_sells'] += 1
+                pair_trades[pair_key]['a_to_b_volume'] += swap['amount']
+            else:
+                pair_trades[pair_key]['b_to_a_sells'] += 1
+                pair_trades[pair_key]['b_to_a_volume'] += swap['amount']
+
+            pair_trades[pair_key]['transactions'].append({
+                'direction': 'A→B' if is_a_to_b else 'B→A',
+                'amount': swap['amount'],
+                'time': swap['block_time_utc'],
+                'signature': swap['signature']
+            })
+
+    # Identify suspicious pairs
+    for (wallet_a, wallet_b), data in pair_trades.items():
+        # Both directions must have meaningful activity
+        if data['a_to_b_sells'] >= WASH_TRADE_MIN_ROUNDS and data['b_to_a_sells'] >= WASH_TRADE_MIN_ROUNDS:
+
+            total_trades = data['a_to_b_sells'] + data['b_to_a_sells']
+            total_volume = data['a_to_b_volume'] + data['b_to_a_volume']
+
+            # Calculate wash score based on symmetry and volume
+            symmetry = min(data['a_to_b_sells'], data['b_to_a_sells']) / max(data['a_to_b_sells'], data['b_to_a_sells'])
+            wash_score = (
+                min(data['a_to_b_sells'], data['b_to_a_sells']) * 15 +  # Reward bidirectionality
+                symmetry * 20 +  # Reward symmetry
+                min(total_volume / 1000, 20)  # Volume factor
+            )
+
+            # Determine severity
+            if wash_score >= 50:
+                severity = 'high'
+            elif wash_score >= 30:
+                severity = 'medium'
+            else:
+                severity = 'low'
+
+            wash_pairs.append({
+                'wallet_a': wallet_a,
+                'wallet_b': wallet_b,
+                'a_to_b_trades': data['a_to_b_sells'],
+                'b_to_a_trades': data['b_to_a_sells'],
+                'a_to_b_volume': round(data['a_to_b_volume'], 4),
+                'b_to_a_volume': round(data['b_to_a_volume'], 4),
+                'total_trades': total_trades,
+                'total_volume': round(total_volume, 4),
+                'symmetry_score': round(symmetry, 2),
+                'wash_score': round(wash_score, 1),
+                'severity': severity,
+                'sample_transactions': data['transactions'][:10],  # First 10 for evidence
+                'narrative': (
+                    f"Wallet `{wallet_a}` and `{wallet_b}` engaged in {total_trades} "
+                    f"bidirectional trades totaling {total_volume:,.2f} tokens. "
+                    f"The symmetry score of {symmetry:.2f} suggests coordinated wash trading."
+                )
+            })
+
+    wash_pairs.sort(key=lambda x: x['wash_score'], reverse=True)
+
+    # Commentary
+    if wash_pairs:
+        high_severity = [w for w in wash_pairs if w['severity'] == 'high']
+        total_wash_volume = sum(w['total_volume'] for w in wash_pairs)
+
+        commentator.alert(f"Detected {len(wash_pairs)} potential wash trading pair(s)")
+        commentator.narrate(f"Total suspected wash volume: {total_wash_volume:,.2f} tokens")
+
+        if high_severity:
+            commentator.critical(
+                f"{len(high_severity)} pair(s) show HIGH confidence wash trading",
+                {
+                    'top_pair': f"{high_severity[0]['wallet_a']} ↔ {high_severity[0]['wallet_b']}",
+                    'trades': high_severity[0]['total_trades'],
+                    'volume': high_severity[0]['total_volume']
+                }
+            )
+    else:
+        commentator.finding("No definitive wash trading patterns detected")
+
+    return wash_pairs
+
+
+def legacy_detect_coordinated_dump(swaps: List[Dict], window_seconds: int,
+                            commentator: ForensicCommentator) -> List[Dict]:
+    """
+    Detect coordinated sell events - multiple wallets dumping simultaneously.
+
+    This is the signature of a planned attack: when multiple wallets that
+    accumulated tokens suddenly sell in a tight time window, it creates
+    massive downward pressure that legitimate holders can't escape.
+
+    We look for:
+    - Multiple unique sellers within a time window
+    - High aggregate volume relative to normal trading
+    - Timing that suggests coordination (too precise for coincidence)
+    """
+    commentator.section("COORDINATED DUMP DETECTION")
+    commentator.narrate(f"Analyzing for synchronized sell events (window: {window_seconds}s)...")
+
+    dump_events = []
+
+    # Get all sells sorted chronologically
+    sells = [s for s in swaps if s['trade_type'] == 'SELL']
+    sells.sort(key=lambda x: x['block_time'])
+
+    if len(sells) < 3:
+        commentator.finding("Insufficient sell data for coordinated dump analysis")
+        return dump_events
+
+    commentator.narrate(f"Processing {len(sells):,} sell transactions...")
+
+    # Sliding window analysis
+    i = 0
+    event_id = 0
+    while i < len(sells):
+        window_start = sells[i]['block_time']
+        window_end = window_start + window_seconds
+
+        # Collect all sells within this window
+        window_sells = []
+        j = i
+        while j < len(sells) and sells[j]['block_time'] <= window_end:
+            window_sells.append(sells[j])
+            j += 1
+
+        # Count unique sellers
+        unique_sellers = list(set(s['trader'] for s in window_sells if s['trader']))
+
+        # Flag if multiple wallets selling in tight window
+        if len(unique_sellers) >= 3:
+            event_id += 1
+            total_volume = sum(s['amount'] for s in window_sells)
+            actual_duration = window_sells[-1]['block_time'] - window_start if len(window_sells) > 1 else 0
+
+            # Calculate coordination score
+            # Higher score = more suspicious
+            coordination_score = (
+                len(unique_sellers) * 20 +              # More sellers = more suspicious
+                len(window_sells) * 5 +                 # More transactions = more activity
+                min(total_volume / 1000, 50) +          # Volume factor (capped)
+                (1 - actual_duration / window_seconds) * 30 if actual_duration > 0 else 30  # Tighter = more suspicious
+            )
+
+            # Determine severity
+            if coordination_score >= 80 or len(unique_sellers) >= 7:
+                severity = 'critical'
+            elif coordination_score >= 50 or len(unique_sellers) >= 5:
+                severity = 'high'
+            elif coordination_score >= 30:
+                severity = 'medium'
+            else:
+                severity = 'low'
+
+            # Build narrative
+            narrative = (
+                f"At {datetime.fromtimestamp(window_start, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC, "
+                f"{len(unique_sellers)} different wallets executed {len(window_sells)} sell transactions "
+                f"within {actual_duration} seconds, dumping a total of {total_volume:,.2f} tokens. "
+            )
+
+            if severity in ['critical', 'high']:
+                narrative += (
+                    f"The tight coordination of {len(unique_sellers)} sellers suggests this was a planned attack "
+                    f"rather than organic market activity."
+                )
+            else:
+                narrative += "This clustering warrants investigation but may represent normal market dynamics."
+
+            dump_events.append({
+                'event_id': f"DUMP-{event_id:03d}",
+                'start_time': window_start,
+                'start_time_utc': datetime.fromtimestamp(window_start, timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': window_sells[-1]['block_time'],
+                'end_time_utc': datetime.fromtimestamp(window_sells[-1]['block_time'], timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_seconds': actual_duration,
+                'unique_sellers': len(unique_sellers),
+                'total_transactions': len(window_sells),
+                'total_volume': round(total_volume, 4),
+                'coordination_score': round(coordination_score, 1),
+                'severity': severity,
+                'participating_wallets': unique_sellers,
+                'transactions': [
+                    {
+                        'wallet': s['trader'],
+                        'amount': round(s['amount'], 4),
+                        'time': s['block_time_utc'],
+                        'signature': s['signature']
+                    }
+                    for s in window_sells
+                ],
+                'narrative': narrative
+            })
+
+            # Skip past this window to avoid overlapping events
+            i = j
+        else:
+            i += 1
+
+    dump_events.sort(key=lambda x: x['coordination_score'], reverse=True)
+
+    # Commentary
+    if dump_events:
+        critical_dumps = [d for d in dump_events if d['severity'] == 'critical']
+        high_dumps = [d for d in dump_events if d['severity'] == 'high']
+        total_dump_volume = sum(d['total_volume'] for d in dump_events)
+
+        commentator.alert(f"Identified {len(dump_events)} coordinated dump event(s)")
+        commentator.narrate(f"Total volume in coordinated dumps: {total_dump_volume:,.2f} tokens")
+
+        if critical_dumps:
+            worst = critical_dumps[0]
+            commentator.critical(
+                f"MAJOR DUMP EVENT: {worst['unique_sellers']} wallets dumped {worst['total_volume']:,.2f} tokens in {worst['duration_seconds']}s",
+                {
+                    'event_id': worst['event_id'],
+                    'time': worst['start_time_utc'],
+                    'coordination_score': worst['coordination_score']
+                }
+            )
+
+        if high_dumps:
+            commentator.alert(f"{len(high_dumps)} additional HIGH severity dump event(s) detected")
+    else:
+        commentator.finding("No coordinated dump events detected within the analysis window")
+
+    return dump_events
+
+
+# =============================================================================
+# Run
+# =============================================================================
+
+def _canonical(findings: List[Dict]) -> List[Dict]:
+    # participating_wallets comes from list(set(...)): order is hash-seeded
+    out = []
+    for f in findings:
+        f = dict(f)
+        if 'participating_wallets' in f:
+            f['participating_wallets'] = sorted(f['participating_wallets'])
+        out.append(f)
+    return out
+
+
+def _timed(label: str, fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    print(f"  {label:<34} {time.perf_counter() - t0:9.2f}s  ({len(result):,} findings)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark / regression check for forensic detectors')
+    parser.add_argument('--swaps', type=int, default=5_000_000, help='Synthetic swaps (default: 5,000,000)')
+    parser.add_argument('--wallets', type=int, default=50000, help='Distinct traders (default: 50,000)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dump-window', type=int, default=DUMP_WINDOW)
+    parser.add_argument('--check', action='store_true', help='Compare with the reference detectors')
+    args = parser.parse_args()
+
+    quiet = ForensicCommentator(verbose=False)
+
+    print(f"Generating {args.swaps:,} synthetic swaps ({args.wallets:,} wallets, seed {args.seed})...")
+    t0 = time.perf_counter()
+    swaps = synthetic_swaps(args.swaps, args.seed, args.wallets)
+    print(f"  generated in {time.perf_counter() - t0:.2f}s")
+
+    print("Vectorized detectors:")
+    profiles = swap_profiles(swaps)
+    t0 = time.perf_counter()
+    cols = SwapColumns.from_swaps(swaps)
+    print(f"  {'SwapColumns.from_swaps':<34} {time.perf_counter() - t0:9.2f}s")
+    new = {
+        'bot': _timed('detect_bot_signatures', forensic.detect_bot_signatures, profiles, swaps, quiet, cols),
+        'wash': _timed('detect_wash_trading', forensic.detect_wash_trading, swaps, profiles, quiet, cols),
+        'dump': _timed('detect_coordinated_dump', forensic.detect_coordinated_dump,
+                       swaps, args.dump_window, quiet, cols),
+    }
+
+    if not args.check:
+        return 0
+
+    print("Reference detectors:")
+    ref_profiles = swap_profiles(swaps)
+    ref = {
+        'bot': _timed('legacy_detect_bot_signatures', legacy_detect_bot_signatures, ref_profiles, swaps, quiet),
+        'wash': _timed('legacy_detect_wash_trading', legacy_detect_wash_trading, swaps, ref_profiles, quiet),
+        'dump': _timed('legacy_detect_coordinated_dump', legacy_detect_coordinated_dump,
+                       swaps, args.dump_window, quiet),
+    }
+
+    failed = False
+    for name in ('bot', 'wash', 'dump'):
+        if _canonical(new[name]) == _canonical(ref[name]):
+            print(f"  {name:<6} identical ({len(ref[name]):,} findings)")
+        else:
+            failed = True
+            print(f"  {name:<6} MISMATCH: {len(new[name]):,} vs {len(ref[name]):,} reference findings")
+            for i, (a, b) in enumerate(zip(_canonical(new[name]), _canonical(ref[name]))):
+                if a != b:
+                    print(f"    first difference at #{i}:")
+                    print(f"      new: {a}")
+                    print(f"      ref: {b}")
+                    break
+    if new['bot'] and any(p.bot_evidence != ref_profiles[w].bot_evidence
+                          for w, p in profiles.items() if p.is_bot_suspect):
+        failed = True
+        print("  bot    MISMATCH in WalletProfile.bot_evidence")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,7 @@ Detects patterns where:
 Usage:
     python guide-hound-clipper.py --token <mint> [--window 60] [--min-amount 100]
     python guide-hound-clipper.py --token Cfmo6asAsZFx6GGQvAt4Ajxn8hN6vgWGpaSrjQKRpump --window 30
+    python guide-hound-clipper.py --token <mint> --workers 8   # parallel clip search
 """
 
 import argparse
@@ -32,6 +33,8 @@ except ImportError:
     print("pip install networkx")
     exit(1)
 
+from guide_clip_events import find_clip_events
+
 
 def get_connection(args):
     return mysql.connector.connect(
@@ -225,95 +228,6 @@ def classify_trade_both_sides(row) -> list:
     return results
 
 
-def find_clip_events(trades: list, window_seconds: int, min_amount: float) -> list:
-    """
-    Find clip events: large buys followed by sells within the window
-
-    Args:
-        trades: List of classified trades
-        window_seconds: Time window after buy to look for sells
-        min_amount: Minimum trade amount
-
-    Returns list of clip events with scores
-    """
-
-    clip_events = []
-
-    # Filter to just buys and sells with minimum amount AND valid trader wallet
-    buys = [t for t in trades if t['trade_type'] == 'BUY' and t['amount'] >= min_amount and t['trader']]
-    sells = [t for t in trades if t['trade_type'] == 'SELL' and t['amount'] >= min_amount and t['trader']]
-
-    # Dedupe buys by (trader, block_time) - keep highest amount
-    buy_key_map = {}
-    for buy in buys:
-        key = (buy['trader'], buy['block_time'])
-        if key not in buy_key_map or buy['amount'] > buy_key_map[key]['amount']:
-            buy_key_map[key] = buy
-    buys = list(buy_key_map.values())
-
-    # Dedupe sells by (trader, block_time) - keep highest amount
-    sell_key_map = {}
-    for sell in sells:
-        key = (sell['trader'], sell['block_time'])
-        if key not in sell_key_map or sell['amount'] > sell_key_map[key]['amount']:
-            sell_key_map[key] = sell
-    sells = list(sell_key_map.values())
-
-    print(f"Found {len(buys)} unique BUYs and {len(sells)} unique SELLs")
-
-    for buy in buys:
-        buy_time = buy['block_time']
-        buy_wallet = buy['trader']
-
-        # Find sells within window (excluding same wallet)
-        window_sells = []
-        seen_sellers = set()  # Track unique sellers per event
-
-        for sell in sells:
-            if sell['trader'] == buy_wallet:
-                continue  # Skip same wallet
-
-            time_diff = sell['block_time'] - buy_time
-
-            # Must be AFTER the buy and within window
-            if 0 < time_diff <= window_seconds:
-                # Only count each seller once per clip event
-                if sell['trader'] in seen_sellers:
-                    continue
-                seen_sellers.add(sell['trader'])
-
-                # Create a copy to avoid mutating original
-                sell_copy = sell.copy()
-                sell_copy['time_diff'] = time_diff
-                window_sells.append(sell_copy)
-
-        if window_sells:
-            # Calculate clip score based on timing and amounts
-            total_sell_amount = sum(s['amount'] for s in window_sells)
-            avg_time_diff = sum(s['time_diff'] for s in window_sells) / len(window_sells)
-
-            # Score: higher for more unique sellers, faster timing, larger amounts
-            clip_score = (
-                len(window_sells) * 10 +  # Number of unique sellers
-                (total_sell_amount / buy['amount'] if buy['amount'] > 0 else 0) * 50 +  # Amount ratio
-                (window_seconds - avg_time_diff) / window_seconds * 40  # Speed bonus
-            )
-
-            clip_events.append({
-                'buy': buy,
-                'sells': window_sells,
-                'clip_score': clip_score,
-                'total_sell_amount': total_sell_amount,
-                'sell_count': len(window_sells),
-                'avg_time_diff': avg_time_diff
-            })
-
-    # Sort by clip score descending
-    clip_events.sort(key=lambda x: x['clip_score'], reverse=True)
-
-    return clip_events
-
-
 def build_clipper_graph(clip_events: list) -> nx.DiGraph:
     """
     Build a directed graph showing clip relationships
@@ -736,6 +650,8 @@ def main():
     parser.add_argument('--json', help='Export results to JSON file')
     parser.add_argument('--gexf', help='Export graph to GEXF file (for Gephi)')
     parser.add_argument('--graphml', help='Export graph to GraphML file')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Score buys in parallel across N processes (default: 1)')
     parser.add_argument('--db-host', default='localhost')
     parser.add_argument('--db-port', type=int, default=3396)
     parser.add_argument('--db-user', default='root')
@@ -770,7 +686,7 @@ def main():
 
     # Find clip events
     print(f"Searching for clip events (window={args.window}s)...")
-    clip_events = find_clip_events(trades, args.window, 0)
+    clip_events = find_clip_events(trades, args.window, 0, workers=args.workers)
     print(f"Found {len(clip_events)} clip events")
 
     if clip_events:
@@ -68,6 +68,15 @@ except ImportError:
     print("Install with: pip install networkx")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed")
+    print("Install with: pip install numpy")
+    sys.exit(1)
+
+from guide_edge_loader import EdgeFrame, load_edges, utc
+
 
 # =============================================================================
 # CONFIGURATION
@@ -245,6 +254,55 @@ class ManipulationEvent:
     recommendations: List[str]                    # Suggested actions
 
 
+@dataclass
+class SwapColumns:
+    """
+    Swaps (get_swap_activity rows) as parallel arrays for the vectorized detectors.
+
+    Wallets are interned once; trader/counterparty hold codes into `wallets`
+    (-1 where the address is empty). `rank` orders codes the way Python sorts
+    the address strings, so (min rank, max rank) is the old tuple(sorted(...))
+    pair key and packs into a single int64.
+    """
+    wallets: List[str]
+    rank: np.ndarray                              # wallet code -> lexicographic rank
+    trader: np.ndarray                            # int32 wallet code
+    counterparty: np.ndarray                      # int32 wallet code
+    block_time: np.ndarray                        # int64
+    is_sell: np.ndarray                           # bool
+    amount: np.ndarray                            # float64
+
+    @classmethod
+    def from_swaps(cls, swaps: List[Dict]) -> 'SwapColumns':
+        n = len(swaps)
+        index: Dict[str, int] = {}
+        trader = np.fromiter((index.setdefault(s['trader'], len(index)) if s['trader'] else -1
+                              for s in swaps), dtype=np.int32, count=n)
+        counterparty = np.fromiter((index.setdefault(s['counterparty'], len(index)) if s['counterparty'] else -1
+                                    for s in swaps), dtype=np.int32, count=n)
+        wallets = list(index)
+        rank = np.empty(len(wallets), dtype=np.int64)
+        rank[sorted(range(len(wallets)), key=wallets.__getitem__)] = np.arange(len(wallets))
+        return cls(
+            wallets=wallets,
+            rank=rank,
+            trader=trader,
+            counterparty=counterparty,
+            block_time=np.fromiter((s['block_time'] for s in swaps), dtype=np.int64, count=n),
+            is_sell=np.fromiter((s['trade_type'] == 'SELL' for s in swaps), dtype=bool, count=n),
+            amount=np.fromiter((s['amount'] for s in swaps), dtype=np.float64, count=n),
+        )
+
+
+def _segments(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(starts, ends) of runs of equal values in an already grouped array."""
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.append(starts[1:], len(keys))
+    return starts, ends
+
+
 # =============================================================================
 # DATABASE INTERFACE
 # =============================================================================
@@ -282,81 +340,35 @@ def get_token_info(cursor, token_mint: str, commentator: ForensicCommentator) ->
 
 
 def get_all_token_activity(cursor, token_mint: str, start_time: int = None,
-                           end_time: int = None, commentator: ForensicCommentator = None) -> List[Dict]:
+                           end_time: int = None, commentator: ForensicCommentator = None) -> EdgeFrame:
     """
     Fetch ALL transaction activity for the token from tx_guide.
 
     This is our raw evidence - every transfer, swap, and movement of the token.
     We cast a wide net here to ensure we don't miss any relevant activity.
+    Rows come back as an EdgeFrame (typed columns); frame.record(i) gives the
+    per-row dict for the few rows a report needs.
     """
     if commentator:
         commentator.narrate("Querying transaction database for all token activity...")
 
-    query = """
-        SELECT
-            g.id,
-            g.tx_id,
-            t.signature,
-            g.block_time,
-            gt.type_code as edge_type,
-            gt.category,
-            fa.address as from_address,
-            ta.address as to_address,
-            g.amount,
-            g.decimals,
-            tk.token_symbol,
-            mint.address as token_mint
-        FROM tx_guide g
-        JOIN tx t ON t.id = g.tx_id
-        JOIN tx_guide_type gt ON gt.id = g.edge_type_id
-        JOIN tx_address fa ON fa.id = g.from_address_id
-        JOIN tx_address ta ON ta.id = g.to_address_id
-        LEFT JOIN tx_token tk ON tk.id = g.token_id
-        LEFT JOIN tx_address mint ON mint.id = tk.mint_address_id
-        WHERE mint.address = %s
-    """
+    where = "mint.address = %s"
     params = [token_mint]
 
     if start_time:
-        query += " AND g.block_time >= %s"
+        where += " AND g.block_time >= %s"
         params.append(start_time)
 
     if end_time:
-        query += " AND g.block_time <= %s"
+        where += " AND g.block_time <= %s"
         params.append(end_time)
 
-    query += " ORDER BY g.block_time ASC, g.id ASC"
-
-    cursor.execute(query, params)
-
-    activities = []
-    for row in cursor.fetchall():
-        (edge_id, tx_id, signature, block_time, edge_type, category,
-         from_addr, to_addr, amount, decimals, token_symbol, token_mint_addr) = row
-
-        # Convert raw amount to human-readable using token decimals
-        human_amount = float(amount) / (10 ** decimals) if amount and decimals else 0
-
-        activities.append({
-            'id': edge_id,
-            'tx_id': tx_id,
-            'signature': signature,
-            'block_time': block_time,
-            'block_time_utc': datetime.fromtimestamp(block_time, timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if block_time else '',
-            'edge_type': edge_type,
-            'category': category,
-            'from_address': from_addr,
-            'to_address': to_addr,
-            'amount': human_amount,
-            'amount_raw': amount,
-            'token_symbol': token_symbol,
-            'token_mint': token_mint_addr
-        })
+    activities = load_edges(cursor, where, params, order_by='g.block_time ASC, g.id ASC')
 
     if commentator:
-        if activities:
-            first_time = activities[0]['block_time_utc']
-            last_time = activities[-1]['block_time_utc']
+        if len(activities):
+            first_time = utc(activities.block_time[0])
+            last_time = utc(activities.block_time[-1])
             commentator.finding(f"Retrieved {len(activities):,} transactions spanning {first_time} to {last_time}")
         else:
             commentator.alert("No transaction data found for this token")
@@ -1187,7 +1199,7 @@ def cross_reference_bad_actors(cursor, bad_actor_wallets: List[str],
 # ANALYSIS ENGINES
 # =============================================================================
 
-def build_wallet_profiles(activities: List[Dict], commentator: ForensicCommentator) -> Dict[str, WalletProfile]:
+def build_wallet_profiles(activities: EdgeFrame, commentator: ForensicCommentator) -> Dict[str, WalletProfile]:
     """
     Construct behavioral profiles for every wallet that touched this token.
 
@@ -1200,12 +1212,16 @@ def build_wallet_profiles(activities: List[Dict], commentator: ForensicCommentat
 
     profiles: Dict[str, WalletProfile] = {}
 
-    for act in activities:
-        from_addr = act['from_address']
-        to_addr = act['to_address']
-        block_time = act['block_time']
-        amount = act['amount']
-        edge_type = act['edge_type']
+    # Walk the columns as plain lists: no per-row dicts for the whole token
+    addresses = activities.addresses
+    type_codes = activities.type_codes
+    for from_idx, to_idx, block_time, amount, type_id in zip(
+            activities.from_idx.tolist(), activities.to_idx.tolist(),
+            activities.block_time.tolist(), activities.amount.tolist(),
+            activities.edge_type.tolist()):
+        from_addr = addresses[from_idx]
+        to_addr = addresses[to_idx]
+        edge_type = type_codes.get(type_id)
 
         # Initialize profiles for new wallets
         for addr in [from_addr, to_addr]:
@@ -1266,7 +1282,8 @@ def build_wallet_profiles(activities: List[Dict], commentator: ForensicCommentat
 
 
 def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
-                          commentator: ForensicCommentator) -> List[Dict]:
+                          commentator: ForensicCommentator,
+                          cols: Optional[SwapColumns] = None) -> List[Dict]:
     """
     Identify wallets exhibiting bot-like trading behavior.
 
@@ -1283,19 +1300,35 @@ def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
     commentator.narrate("Analyzing trading patterns for machine-like behavior signatures...")
 
     bot_suspects = []
-
-    # Group all swaps by trader wallet
-    wallet_txs = defaultdict(list)
-    for swap in swaps:
-        if swap['trader']:
-            wallet_txs[swap['trader']].append(swap)
+    cols = cols if cols is not None else SwapColumns.from_swaps(swaps)
+
+    # Group all swaps by trader wallet: a stable sort on the wallet keeps swap
+    # order inside each group, a lexsort adds block_time (same as sorted(txs))
+    rows = np.flatnonzero(cols.trader >= 0)
+    by_wallet = rows[np.argsort(cols.trader[rows], kind='stable')]
+    by_time = rows[np.lexsort((cols.block_time[rows], cols.trader[rows]))]
+    starts, ends = _segments(cols.trader[by_wallet])
+
+    # Consecutive-trade intervals and direction flips, all wallets at once
+    times = cols.block_time[by_time]
+    intervals_all = np.diff(times)
+    flips = np.flatnonzero(
+        (cols.trader[by_time][1:] == cols.trader[by_time][:-1])
+        & (cols.is_sell[by_time][1:] != cols.is_sell[by_time][:-1])
+        & (intervals_all <= RAPID_TRADE_THRESHOLD)
+    )
+    amounts_all = cols.amount[by_wallet]
 
     wallets_analyzed = 0
-    for wallet, txs in wallet_txs.items():
+    # Visit wallets in order of first swap (dict order of the old grouping)
+    for seg in np.argsort(by_wallet[starts], kind='stable'):
         wallets_analyzed += 1
+        start, end = int(starts[seg]), int(ends[seg])
+        n_txs = end - start
+        wallet = cols.wallets[cols.trader[by_wallet[start]]]
 
         # Need minimum activity to establish patterns
-        if len(txs) < 3:
+        if n_txs < 3:
             continue
 
         profile = profiles.get(wallet)
@@ -1310,64 +1343,54 @@ def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
             'frequency_analysis': {}
         }
 
-        sorted_txs = sorted(txs, key=lambda x: x['block_time'])
-
         # =====================================================================
         # TEST 1: Timing Interval Consistency
         # Bots often operate on fixed intervals (e.g., every 30 seconds)
         # =====================================================================
-        if len(sorted_txs) >= 3:
-            intervals = []
-            for i in range(1, len(sorted_txs)):
-                interval = sorted_txs[i]['block_time'] - sorted_txs[i-1]['block_time']
-                intervals.append(interval)
-
-            if intervals:
-                avg_interval = sum(intervals) / len(intervals)
-                variance = sum((i - avg_interval) ** 2 for i in intervals) / len(intervals)
-                std_dev = variance ** 0.5
-
-                evidence['timing_analysis'] = {
-                    'avg_interval_seconds': round(avg_interval, 2),
-                    'std_deviation': round(std_dev, 2),
-                    'variance': round(variance, 2),
-                    'sample_size': len(intervals)
-                }
+        intervals = intervals_all[start:end - 1]
+        if len(intervals):
+            avg_interval = int(times[end - 1] - times[start]) / len(intervals)
+            variance = sum(((intervals - avg_interval) ** 2).tolist()) / len(intervals)
+            std_dev = variance ** 0.5
+
+            evidence['timing_analysis'] = {
+                'avg_interval_seconds': round(avg_interval, 2),
+                'std_deviation': round(std_dev, 2),
+                'variance': round(variance, 2),
+                'sample_size': len(intervals)
+            }
 
-                # Very low variance in timing = highly suspicious
-                if variance < 100 and avg_interval < 300:
-                    score_add = 30
-                    bot_score += score_add
-                    evidence['analysis_notes'].append(
-                        f"SUSPICIOUS: Timing variance of {variance:.1f} is unusually consistent "
-                        f"(avg interval: {avg_interval:.1f}s) - suggests automated execution"
-                    )
-                elif variance < 500 and avg_interval < 600:
-                    score_add = 15
-                    bot_score += score_add
-                    evidence['analysis_notes'].append(
-                        f"NOTABLE: Somewhat consistent timing patterns detected "
-                        f"(variance: {variance:.1f}, avg: {avg_interval:.1f}s)"
-                    )
+            # Very low variance in timing = highly suspicious
+            if variance < 100 and avg_interval < 300:
+                score_add = 30
+                bot_score += score_add
+                evidence['analysis_notes'].append(
+                    f"SUSPICIOUS: Timing variance of {variance:.1f} is unusually consistent "
+                    f"(avg interval: {avg_interval:.1f}s) - suggests automated execution"
+                )
+            elif variance < 500 and avg_interval < 600:
+                score_add = 15
+                bot_score += score_add
+                evidence['analysis_notes'].append(
+                    f"NOTABLE: Somewhat consistent timing patterns detected "
+                    f"(variance: {variance:.1f}, avg: {avg_interval:.1f}s)"
+                )
 
         # =====================================================================
         # TEST 2: Rapid Reaction Analysis
         # Look for suspiciously fast buy-then-sell or sell-then-buy sequences
         # =====================================================================
         rapid_reactions = []
-        for i in range(1, len(sorted_txs)):
-            prev_tx = sorted_txs[i-1]
-            curr_tx = sorted_txs[i]
-            reaction_time = curr_tx['block_time'] - prev_tx['block_time']
-
-            # Different trade types in rapid succession
-            if prev_tx['trade_type'] != curr_tx['trade_type'] and reaction_time <= RAPID_TRADE_THRESHOLD:
-                rapid_reactions.append({
-                    'from': prev_tx['trade_type'],
-                    'to': curr_tx['trade_type'],
-                    'reaction_seconds': reaction_time,
-                    'timestamp': curr_tx['block_time_utc']
-                })
+        lo, hi = np.searchsorted(flips, start), np.searchsorted(flips, end - 1)
+        for k in flips[lo:hi].tolist():
+            prev_tx = swaps[by_time[k]]
+            curr_tx = swaps[by_time[k + 1]]
+            rapid_reactions.append({
+                'from': prev_tx['trade_type'],
+                'to': curr_tx['trade_type'],
+                'reaction_seconds': int(intervals_all[k]),
+                'timestamp': curr_tx['block_time_utc']
+            })
 
         if rapid_reactions:
             score_add = min(len(rapid_reactions) * 15, 40)
@@ -1382,19 +1405,20 @@ def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
         # TEST 3: Trade Size Consistency
         # Bots often use identical or formula-based trade sizes
         # =====================================================================
-        amounts = [tx['amount'] for tx in txs if tx['amount'] > 0]
+        amounts = amounts_all[start:end]
+        amounts = amounts[amounts > 0]
         if len(amounts) >= 3:
-            avg_amount = sum(amounts) / len(amounts)
+            avg_amount = sum(amounts.tolist()) / len(amounts)
             if avg_amount > 0:
-                amount_variance = sum((a - avg_amount) ** 2 for a in amounts) / len(amounts)
+                amount_variance = sum(((amounts - avg_amount) ** 2).tolist()) / len(amounts)
                 normalized_variance = amount_variance / (avg_amount ** 2)
 
                 evidence['amount_analysis'] = {
                     'avg_trade_size': round(avg_amount, 4),
                     'normalized_variance': round(normalized_variance, 4),
                     'sample_size': len(amounts),
-                    'min_amount': round(min(amounts), 4),
-                    'max_amount': round(max(amounts), 4)
+                    'min_amount': round(float(amounts.min()), 4),
+                    'max_amount': round(float(amounts.max()), 4)
                 }
 
                 if normalized_variance < 0.05:
@@ -1418,7 +1442,7 @@ def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
         tx_rate = profile.trades_per_hour()
         evidence['frequency_analysis'] = {
             'trades_per_hour': round(tx_rate, 2),
-            'total_trades': len(txs),
+            'total_trades': n_txs,
             'activity_hours': round(profile.activity_duration_hours(), 2)
         }
 
@@ -1470,7 +1494,7 @@ def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
                 'wallet': wallet,
                 'bot_score': bot_score,
                 'severity': severity,
-                'total_trades': len(txs),
+                'total_trades': n_txs,
                 'buys': profile.total_buys,
                 'sells': profile.total_sells,
                 'buy_volume': round(profile.buy_volume, 4),
@@ -1516,7 +1540,8 @@ def detect_bot_signatures(profiles: Dict[str, WalletProfile], swaps: List[Dict],
 
 
 def detect_wash_trading(swaps: List[Dict], profiles: Dict[str, WalletProfile],
-                        commentator: ForensicCommentator) -> List[Dict]:
+                        commentator: ForensicCommentator,
+                        cols: Optional[SwapColumns] = None) -> List[Dict]:
     """
     Identify wash trading - fake volume created by trading between related wallets.
 
@@ -1533,85 +1558,93 @@ def detect_wash_trading(swaps: List[Dict], profiles: Dict[str, WalletProfile],
     commentator.narrate("Scanning for circular and bidirectional trading patterns...")
 
     wash_pairs = []
+    cols = cols if cols is not None else SwapColumns.from_swaps(swaps)
+
+    # Sells between two distinct, known wallets
+    rows = np.flatnonzero(cols.is_sell & (cols.trader >= 0) & (cols.counterparty >= 0)
+                          & (cols.trader != cols.counterparty))
+
+    # Normalize pair key (alphabetically sorted) as one packed int64
+    trader_rank = cols.rank[cols.trader[rows]]
+    counter_rank = cols.rank[cols.counterparty[rows]]
+    low = np.minimum(trader_rank, counter_rank)
+    keys = low * len(cols.wallets) + np.maximum(trader_rank, counter_rank)
+    is_a_to_b = trader_rank == low
+
+    pair_keys, first_row, pair_of = np.unique(keys, return_index=True, return_inverse=True)
+    pair_of = pair_of.ravel()
+    n_pairs = len(pair_keys)
+    amounts = cols.amount[rows]
+    a_to_b_sells = np.bincount(pair_of[is_a_to_b], minlength=n_pairs)
+    b_to_a_sells = np.bincount(pair_of[~is_a_to_b], minlength=n_pairs)
+    # bincount adds weights in row order: same float sums as the old += loop
+    a_to_b_volume = np.bincount(pair_of[is_a_to_b], weights=amounts[is_a_to_b], minlength=n_pairs)
+    b_to_a_volume = np.bincount(pair_of[~is_a_to_b], weights=amounts[~is_a_to_b], minlength=n_pairs)
+
+    # Rows of each pair, in swap order (sample transactions)
+    pair_rows = np.argsort(pair_of, kind='stable')
+    pair_start = np.concatenate(([0], np.cumsum(a_to_b_sells + b_to_a_sells)))
+    sorted_wallets = [cols.wallets[c] for c in np.argsort(cols.rank).tolist()]
+
+    # Identify suspicious pairs, in order of first trade
+    flagged = np.flatnonzero((a_to_b_sells >= WASH_TRADE_MIN_ROUNDS) & (b_to_a_sells >= WASH_TRADE_MIN_ROUNDS))
+    for p in flagged[np.argsort(first_row[flagged], kind='stable')].tolist():
+        wallet_a = sorted_wallets[int(pair_keys[p]) // len(cols.wallets)]
+        wallet_b = sorted_wallets[int(pair_keys[p]) % len(cols.wallets)]
+        data = {
+            'a_to_b_sells': int(a_to_b_sells[p]),
+            'b_to_a_sells': int(b_to_a_sells[p]),
+            'a_to_b_volume': float(a_to_b_volume[p]),
+            'b_to_a_volume': float(b_to_a_volume[p]),
+            'transactions': [
+                {
+                    'direction': 'A→B' if is_a_to_b[k] else 'B→A',
+                    'amount': swaps[rows[k]]['amount'],
+                    'time': swaps[rows[k]]['block_time_utc'],
+                    'signature': swaps[rows[k]]['signature']
+                }
+                for k in pair_rows[pair_start[p]:pair_start[p] + 10].tolist()
+            ]
+        }
 
-    # Build a matrix of trades between wallet pairs
-    pair_trades = defaultdict(lambda: {
-        'a_to_b_sells': 0,
-        'b_to_a_sells': 0,
-        'a_to_b_volume': 0.0,
-        'b_to_a_volume': 0.0,
-        'transactions': []
-    })
-
-    for swap in swaps:
-        trader = swap['trader']
-        counterparty = swap['counterparty']
-
-        if not trader or not counterparty or trader == counterparty:
-            continue
-
-        # Normalize pair key (alphabetically sorted)
-        pair_key = tuple(sorted([trader, counterparty]))
-        is_a_to_b = trader == pair_key[0]
-
-        if swap['trade_type'] == 'SELL':
-            if is_a_to_b:
-                pair_trades[pair_key]['a_to_b_sells'] += 1
-                pair_trades[pair_key]['a_to_b_volume'] += swap['amount']
-            else:
-                pair_trades[pair_key]['b_to_a_sells'] += 1
-                pair_trades[pair_key]['b_to_a_volume'] += swap['amount']
-
-            pair_trades[pair_key]['transactions'].append({
-                'direction': 'A→B' if is_a_to_b else 'B→A',
-                'amount': swap['amount'],
-                'time': swap['block_time_utc'],
-                'signature': swap['signature']
-            })
-
-    # Identify suspicious pairs
-    for (wallet_a, wallet_b), data in pair_trades.items():
-        # Both directions must have meaningful activity
-        if data['a_to_b_sells'] >= WASH_TRADE_MIN_ROUNDS and data['b_to_a_sells'] >= WASH_TRADE_MIN_ROUNDS:
+        total_trades = data['a_to_b_sells'] + data['b_to_a_sells']
+        total_volume = data['a_to_b_volume'] + data['b_to_a_volume']
 
-            total_trades = data['a_to_b_sells'] + data['b_to_a_sells']
-            total_volume = data['a_to_b_volume'] + data['b_to_a_volume']
+        # Calculate wash score based on symmetry and volume
+        symmetry = min(data['a_to_b_sells'], data['b_to_a_sells']) / max(data['a_to_b_sells'], data['b_to_a_sells'])
+        wash_score = (
+            min(data['a_to_b_sells'], data['b_to_a_sells']) * 15 +  # Reward bidirectionality
+            symmetry * 20 +  # Reward symmetry
+            min(total_volume / 1000, 20)  # Volume factor
+        )
 
-            # Calculate wash score based on symmetry and volume
-            symmetry = min(data['a_to_b_sells'], data['b_to_a_sells']) / max(data['a_to_b_sells'], data['b_to_a_sells'])
-            wash_score = (
-                min(data['a_to_b_sells'], data['b_to_a_sells']) * 15 +  # Reward bidirectionality
-                symmetry * 20 +  # Reward symmetry
-                min(total_volume / 1000, 20)  # Volume factor
+        # Determine severity
+        if wash_score >= 50:
+            severity = 'high'
+        elif wash_score >= 30:
+            severity = 'medium'
+        else:
+            severity = 'low'
+
+        wash_pairs.append({
+            'wallet_a': wallet_a,
+            'wallet_b': wallet_b,
+            'a_to_b_trades': data['a_to_b_sells'],
+            'b_to_a_trades': data['b_to_a_sells'],
+            'a_to_b_volume': round(data['a_to_b_volume'], 4),
+            'b_to_a_volume': round(data['b_to_a_volume'], 4),
+            'total_trades': total_trades,
+            'total_volume': round(total_volume, 4),
+            'symmetry_score': round(symmetry, 2),
+            'wash_score': round(wash_score, 1),
+            'severity': severity,
+            'sample_transactions': data['transactions'][:10],  # First 10 for evidence
+            'narrative': (
+                f"Wallet `{wallet_a}` and `{wallet_b}` engaged in {total_trades} "
+                f"bidirectional trades totaling {total_volume:,.2f} tokens. "
+                f"The symmetry score of {symmetry:.2f} suggests coordinated wash trading."
             )
-
-            # Determine severity
-            if wash_score >= 50:
-                severity = 'high'
-            elif wash_score >= 30:
-                severity = 'medium'
-            else:
-                severity = 'low'
-
-            wash_pairs.append({
-                'wallet_a': wallet_a,
-                'wallet_b': wallet_b,
-                'a_to_b_trades': data['a_to_b_sells'],
-                'b_to_a_trades': data['b_to_a_sells'],
-                'a_to_b_volume': round(data['a_to_b_volume'], 4),
-                'b_to_a_volume': round(data['b_to_a_volume'], 4),
-                'total_trades': total_trades,
-                'total_volume': round(total_volume, 4),
-                'symmetry_score': round(symmetry, 2),
-                'wash_score': round(wash_score, 1),
-                'severity': severity,
-                'sample_transactions': data['transactions'][:10],  # First 10 for evidence
-                'narrative': (
-                    f"Wallet `{wallet_a}` and `{wallet_b}` engaged in {total_trades} "
-                    f"bidirectional trades totaling {total_volume:,.2f} tokens. "
-                    f"The symmetry score of {symmetry:.2f} suggests coordinated wash trading."
-                )
-            })
+        })
 
     wash_pairs.sort(key=lambda x: x['wash_score'], reverse=True)
 
@@ -1639,7 +1672,8 @@ def detect_wash_trading(swaps: List[Dict], profiles: Dict[str, WalletProfile],
 
 
 def detect_coordinated_dump(swaps: List[Dict], window_seconds: int,
-                            commentator: ForensicCommentator) -> List[Dict]:
+                            commentator: ForensicCommentator,
+                            cols: Optional[SwapColumns] = None) -> List[Dict]:
     """
     Detect coordinated sell events - multiple wallets dumping simultaneously.
 
@@ -1656,10 +1690,11 @@ def detect_coordinated_dump(swaps: List[Dict], window_seconds: int,
     commentator.narrate(f"Analyzing for synchronized sell events (window: {window_seconds}s)...")
 
     dump_events = []
+    cols = cols if cols is not None else SwapColumns.from_swaps(swaps)
 
     # Get all sells sorted chronologically
-    sells = [s for s in swaps if s['trade_type'] == 'SELL']
-    sells.sort(key=lambda x: x['block_time'])
+    sells = np.flatnonzero(cols.is_sell)
+    sells = sells[np.argsort(cols.block_time[sells], kind='stable')]
 
     if len(sells) < 3:
         commentator.finding("Insufficient sell data for coordinated dump analysis")
@@ -1667,25 +1702,40 @@ def detect_coordinated_dump(swaps: List[Dict], window_seconds: int,
 
     commentator.narrate(f"Processing {len(sells):,} sell transactions...")
 
-    # Sliding window analysis
+    # Window [i, window_ends[i]) holds every sell up to block_time + window
+    sell_times = cols.block_time[sells]
+    window_ends = np.searchsorted(sell_times, sell_times + window_seconds, side='right').tolist()
+    sellers = cols.trader[sells].tolist()
+
+    # Sliding window analysis: both window edges only move forward, so a
+    # per-wallet count and a distinct-seller counter are updated incrementally
+    seller_counts = [0] * len(cols.wallets)
+    distinct = 0
+    left = right = 0
     i = 0
     event_id = 0
     while i < len(sells):
-        window_start = sells[i]['block_time']
-        window_end = window_start + window_seconds
-
-        # Collect all sells within this window
-        window_sells = []
-        j = i
-        while j < len(sells) and sells[j]['block_time'] <= window_end:
-            window_sells.append(sells[j])
-            j += 1
-
-        # Count unique sellers
-        unique_sellers = list(set(s['trader'] for s in window_sells if s['trader']))
+        j = window_ends[i]
+        while right < j:
+            w = sellers[right]
+            if w >= 0:
+                if seller_counts[w] == 0:
+                    distinct += 1
+                seller_counts[w] += 1
+            right += 1
+        while left < i:
+            w = sellers[left]
+            if w >= 0:
+                seller_counts[w] -= 1
+                if seller_counts[w] == 0:
+                    distinct -= 1
+            left += 1
 
         # Flag if multiple wallets selling in tight window
-        if len(unique_sellers) >= 3:
+        if distinct >= 3:
+            window_start = int(sell_times[i])
+            window_sells = [swaps[k] for k in sells[i:j].tolist()]
+            unique_sellers = list(set(s['trader'] for s in window_sells if s['trader']))
             event_id += 1
             total_volume = sum(s['amount'] for s in window_sells)
             actual_duration = window_sells[-1]['block_time'] - window_start if len(window_sells) > 1 else 0
@@ -2201,7 +2251,7 @@ def generate_executive_summary(
 
 def build_full_report(
     token_info: Dict,
-    activities: List[Dict],
+    activities: EdgeFrame,
     swaps: List[Dict],
     profiles: Dict[str, WalletProfile],
     bot_suspects: List[Dict],
@@ -2733,7 +2783,7 @@ def generate_markdown_report(report: Dict) -> str:
 
 def generate_gexf_graph(
     token_info: Dict,
-    activities: List[Dict],
+    activities: EdgeFrame,
     swaps: List[Dict],
     profiles: Dict[str, WalletProfile],
     bot_suspects: List[Dict],
@@ -2897,9 +2947,8 @@ def generate_gexf_graph(
 
     # Add edges from activities (transfers between wallets)
     transfer_edges = 0
-    for act in activities:
-        if act['edge_type'] not in ['spl_transfer', 'sol_transfer']:
-            continue
+    transfers = np.flatnonzero(activities.type_mask('spl_transfer', 'sol_transfer'))
+    for act in activities.records(transfers):
 
         from_addr = act.get('from_address')
         to_addr = act.get('to_address')
@@ -3096,13 +3145,14 @@ Examples:
     profiles = build_wallet_profiles(activities, commentator)
 
     # Run detection algorithms
-    bot_suspects = detect_bot_signatures(profiles, swaps, commentator)
+    swap_cols = SwapColumns.from_swaps(swaps)
+    bot_suspects = detect_bot_signatures(profiles, swaps, commentator, swap_cols)
 
     # THE JOE BUCK SPECIAL: Deep dive into funding wallets behind detected bots
     funding_investigations = deep_dive_bot_funders(bot_suspects, cursor, commentator)
 
-    wash_pairs = detect_wash_trading(swaps, profiles, commentator)
-    dump_events = detect_coordinated_dump(swaps, args.dump_window, commentator)
+    wash_pairs = detect_wash_trading(swaps, profiles, commentator, swap_cols)
+    dump_events = detect_coordinated_dump(swaps, args.dump_window, commentator, swap_cols)
     sybil_clusters = detect_sybil_clusters(profiles, cursor, commentator)
     timeline = analyze_timeline(swaps, commentator)
 
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Guide Clip Events - Buy -> other-wallet sells window search for the clipper scripts
+
+Shared by guide-clipper.py and guide-hound-clipper.py. A clip event is a BUY
+followed, within window_seconds, by SELLs from other wallets. The scripts
+used to test every (buy, sell) pair; here sells are sorted by block_time once
+and each buy reads only its window via two bisects, so the cost is
+O((buys + sells) log sells + matched sells) instead of O(buys x sells).
+
+Results are identical to the pairwise scan, order included: within a window
+sells are visited in the same (deduped, first-seen) order, and the final
+stable sort by clip_score sees events in buy order.
+
+workers > 1 splits the buys into chunks scored in a process pool (each worker
+receives the sorted sells once).
+
+Usage:
+    from guide_clip_events import find_clip_events
+
+    clip_events = find_clip_events(trades, window_seconds=60, min_amount=0, workers=4)
+"""
+
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+CHUNKS_PER_WORKER = 4   # buy chunks queued per pool process (load balancing)
+
+# Worker-process state (set once per process by _init_worker)
+_sells: List[Dict] = []
+_sell_times: List[int] = []
+_sell_order: List[int] = []
+
+
+def dedupe_trades(trades: list, min_amount: float = 0) -> Tuple[List[Dict], List[Dict]]:
+    """
+    (buys, sells) with valid trader and amount >= min_amount, deduped by
+    (trader, block_time) keeping the highest amount - one pass over trades.
+    """
+    buy_map: Dict[tuple, Dict] = {}
+    sell_map: Dict[tuple, Dict] = {}
+    for t in trades:
+        if t['trade_type'] == 'BUY':
+            key_map = buy_map
+        elif t['trade_type'] == 'SELL':
+            key_map = sell_map
+        else:
+            continue
+        if not (t['amount'] >= min_amount and t['trader']):
+            continue
+        key = (t['trader'], t['block_time'])
+        kept = key_map.get(key)
+        if kept is None or t['amount'] > kept['amount']:
+            key_map[key] = t
+    return list(buy_map.values()), list(sell_map.values())
+
+
+def find_clip_events(trades: list, window_seconds: int, min_amount: float = 0,
+                     workers: int = 1) -> list:
+    """
+    Find clip events: buys followed by sells from OTHER wallets within the window
+
+    Returns events sorted by clip_score (desc), each:
+        {'buy', 'sells' (copies with time_diff), 'clip_score',
+         'total_sell_amount', 'sell_count', 'avg_time_diff'}
+    """
+    buys, sells = dedupe_trades(trades, min_amount)
+    print(f"Found {len(buys)} unique BUYs and {len(sells)} unique SELLs")
+
+    # Sells by time; ties (and everything else) keep their list position
+    order = sorted(range(len(sells)), key=lambda k: sells[k]['block_time'])
+    sell_times = [sells[k]['block_time'] for k in order]
+
+    if workers > 1 and len(buys) > 1:
+        size = max(1, -(-len(buys) // (workers * CHUNKS_PER_WORKER)))
+        chunks = [buys[i:i + size] for i in range(0, len(buys), size)]
+        clip_events = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(sells, sell_times, order)) as pool:
+            for events in pool.map(_score_chunk, chunks, [window_seconds] * len(chunks)):
+                clip_events.extend(events)
+    else:
+        clip_events = _score_buys(buys, window_seconds, sells, sell_times, order)
+
+    # Sort by clip score descending
+    clip_events.sort(key=lambda x: x['clip_score'], reverse=True)
+    return clip_events
+
+
+def _init_worker(sells, sell_times, order):
+    global _sells, _sell_times, _sell_order
+    _sells, _sell_times, _sell_order = sells, sell_times, order
+
+
+def _score_chunk(buys: List[Dict], window_seconds: int) -> list:
+    return _score_buys(buys, window_seconds, _sells, _sell_times, _sell_order)
+
+
+def _score_buys(buys: List[Dict], window_seconds: int, sells: List[Dict],
+                sell_times: List[int], order: List[int]) -> list:
+    clip_events = []
+    # Trades usually arrive in time order, making the window already list-ordered
+    in_list_order = all(a < b for a, b in zip(order, order[1:]))
+
+    for buy in buys:
+        buy_time = buy['block_time']
+        buy_wallet = buy['trader']
+
+        # Must be AFTER the buy and within window: 0 < time_diff <= window
+        lo = bisect_right(sell_times, buy_time)
+        hi = bisect_right(sell_times, buy_time + window_seconds, lo)
+        if lo >= hi:
+            continue
+
+        # Visit the window in sells-list order (as the pairwise scan did)
+        window = order[lo:hi] if in_list_order else sorted(order[lo:hi])
+
+        window_sells = []
+        seen_sellers = set()  # Only count each seller once per clip event
+        for k in window:
+            sell = sells[k]
+            if sell['trader'] == buy_wallet or sell['trader'] in seen_sellers:
+                continue
+            seen_sellers.add(sell['trader'])
+
+            # Create a copy to avoid mutating original
+            sell_copy = sell.copy()
+            sell_copy['time_diff'] = sell['block_time'] - buy_time
+            window_sells.append(sell_copy)
+
+        if window_sells:
+            # Calculate clip score based on timing and amounts
+            total_sell_amount = sum(s['amount'] for s in window_sells)
+            avg_time_diff = sum(s['time_diff'] for s in window_sells) / len(window_sells)
+
+            # Score: higher for more unique sellers, faster timing, larger amounts
+            clip_score = (
+                len(window_sells) * 10 +
+                (total_sell_amount / buy['amount'] if buy['amount'] > 0 else 0) * 50 +
+                (window_seconds - avg_time_diff) / window_seconds * 40
+            )
+
+            clip_events.append({
+                'buy': buy,
+                'sells': window_sells,
+                'clip_score': clip_score,
+                'total_sell_amount': total_sell_amount,
+                'sell_count': len(window_sells),
+                'avg_time_diff': avg_time_diff
+            })
+
+    return clip_events
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Guide Edge Loader - Columnar tx_guide edges for the analysis scripts
+
+guide-analytics, guide-token-forensic and guide-clipper used to fetchall()
+every tx_guide row of a token with its addresses, signature and symbol joined
+in as strings, then build one dict per row (strftime included) before any
+detection ran. load_edges() streams the same rows in chunks into typed NumPy
+columns instead:
+
+    edge_id, tx_id  int64
+    block_time      int64     (NULL -> 0)
+    edge_type       uint8     (tx_guide_type.id; codes in frame.type_codes)
+    from_idx/to_idx int32     (index into frame.addresses, interned once)
+    token_idx       int32     (index into frame.tokens, -1 for native SOL)
+    amount          float64   (amount / 10^decimals, 0 when either is NULL)
+    amount_raw      uint64
+    tx_idx          int32     (index into frame.signatures, only if requested)
+
+Address, token and signature strings are looked up once per distinct id after
+the edge stream is consumed. Nothing is formatted up front: record() builds
+the familiar row dict (block_time_utc included) only for the rows a report
+actually prints or exports.
+
+Usage:
+    from guide_edge_loader import load_edges, utc
+
+    frame = load_edges(cursor, "mint.address = %s", [mint],
+                       edge_types=('swap_in', 'swap_out'))
+    buys = frame.type_mask('swap_out')
+    for rec in frame.records(np.flatnonzero(buys)[:10]):
+        print(rec['block_time_utc'], rec['to_address'], rec['amount'])
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_CHUNK_ROWS = 50000   # rows per fetchmany() from the edge stream
+LOOKUP_BATCH = 5000          # ids per IN (...) when resolving strings
+
+_EDGE_COLUMNS = ('edge_id', 'tx_id', 'block_time', 'edge_type', 'from_idx',
+                 'to_idx', 'token_idx', 'amount', 'amount_raw', 'tx_idx')
+
+
+def utc(block_time) -> str:
+    """'%Y-%m-%d %H:%M:%S' UTC for a unix time, '' when missing/0."""
+    if not block_time:
+        return ''
+    return datetime.fromtimestamp(int(block_time), timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class EdgeFrame:
+    """tx_guide edges as parallel NumPy columns plus interned string tables."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], addresses: List[Optional[str]],
+                 address_types: List[Optional[str]], tokens: List[Tuple[Optional[str], Optional[str]]],
+                 type_codes: Dict[int, str], type_categories: Dict[int, str],
+                 signatures: Optional[List[Optional[str]]] = None):
+        for name in _EDGE_COLUMNS:
+            setattr(self, name, columns[name])
+        self.addresses = addresses
+        self.address_types = address_types
+        self.tokens = tokens
+        self.type_codes = type_codes
+        self.type_categories = type_categories
+        self.signatures = signatures
+
+    def __len__(self) -> int:
+        return len(self.edge_id)
+
+    # -------------------------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------------------------
+
+    def type_ids(self, *codes: str) -> List[int]:
+        return [tid for tid, code in self.type_codes.items() if code in codes]
+
+    def type_mask(self, *codes: str) -> np.ndarray:
+        """Boolean mask of edges whose type_code is one of codes."""
+        return np.isin(self.edge_type, np.array(self.type_ids(*codes), dtype=np.uint8))
+
+    def address_type_array(self) -> np.ndarray:
+        """address_type per interned address, as an object array (for masks)."""
+        return np.array(self.address_types, dtype=object)
+
+    def take(self, selector) -> 'EdgeFrame':
+        """Subset by boolean mask or index array; string tables are shared."""
+        return EdgeFrame({name: getattr(self, name)[selector] for name in _EDGE_COLUMNS},
+                         self.addresses, self.address_types, self.tokens,
+                         self.type_codes, self.type_categories, self.signatures)
+
+    # -------------------------------------------------------------------------
+    # Lazy row materialization (report/export rows only)
+    # -------------------------------------------------------------------------
+
+    def address(self, idx: int) -> Optional[str]:
+        return self.addresses[idx] if idx >= 0 else None
+
+    def token_symbol(self, i: int) -> Optional[str]:
+        t = int(self.token_idx[i])
+        return self.tokens[t][0] if t >= 0 else None
+
+    def token_mint(self, i: int) -> Optional[str]:
+        t = int(self.token_idx[i])
+        return self.tokens[t][1] if t >= 0 else None
+
+    def signature(self, i: int) -> Optional[str]:
+        if self.signatures is None:
+            return None
+        s = int(self.tx_idx[i])
+        return self.signatures[s] if s >= 0 else None
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Row i as the dict shape the scripts used to build per fetched row."""
+        i = int(i)
+        block_time = int(self.block_time[i])
+        type_id = int(self.edge_type[i])
+        return {
+            'id': int(self.edge_id[i]),
+            'tx_id': int(self.tx_id[i]),
+            'signature': self.signature(i),
+            'block_time': block_time,
+            'block_time_utc': utc(block_time),
+            'edge_type': self.type_codes.get(type_id),
+            'category': self.type_categories.get(type_id),
+            'from_address': self.address(int(self.from_idx[i])),
+            'to_address': self.address(int(self.to_idx[i])),
+            'amount': float(self.amount[i]),
+            'amount_raw': int(self.amount_raw[i]),
+            'token_symbol': self.token_symbol(i),
+            'token_mint': self.token_mint(i),
+        }
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        for i in (range(len(self)) if rows is None else rows):
+            yield self.record(i)
+
+
+# =============================================================================
+# Loader
+# =============================================================================
+
+def load_edges(cursor, where: str = '1=1', params: Sequence[Any] = (),
+               order_by: Optional[str] = 'g.block_time ASC, g.id ASC',
+               edge_types: Optional[Sequence[str]] = None,
+               signatures: bool = False,
+               chunk_rows: int = DEFAULT_CHUNK_ROWS) -> EdgeFrame:
+    """
+    Stream tx_guide edges into an EdgeFrame.
+
+    where/params filter the edge query; it can reference g (tx_guide),
+    tk (tx_token) and mint (tx_address of the token mint). edge_types limits
+    the rows to those tx_guide_type codes. signatures=True also resolves
+    tx.signature for every distinct tx (skip it when no output needs it).
+    The cursor must be a plain (tuple) cursor; unbuffered streams best.
+    """
+    cursor.execute("SELECT id, type_code, category FROM tx_guide_type")
+    type_codes: Dict[int, str] = {}
+    type_categories: Dict[int, str] = {}
+    for type_id, code, category in cursor.fetchall():
+        type_codes[int(type_id)] = code
+        type_categories[int(type_id)] = category
+
+    query = """
+        SELECT g.id, g.tx_id, COALESCE(g.block_time, 0), g.edge_type_id,
+               g.from_address_id, g.to_address_id, COALESCE(g.token_id, -1),
+               COALESCE(g.amount, 0), COALESCE(g.decimals, 0)
+        FROM tx_guide g
+        LEFT JOIN tx_token tk ON tk.id = g.token_id
+        LEFT JOIN tx_address mint ON mint.id = tk.mint_address_id
+        WHERE ({where})
+    """.format(where=where)
+    params = list(params)
+    if edge_types:
+        type_ids = [tid for tid, code in type_codes.items() if code in edge_types]
+        if not type_ids:
+            type_ids = [-1]
+        query += f" AND g.edge_type_id IN ({','.join(['%s'] * len(type_ids))})"
+        params.extend(type_ids)
+    if order_by:
+        query += f" ORDER BY {order_by}"
+
+    cursor.execute(query, params)
+
+    chunks: Dict[str, List[np.ndarray]] = {name: [] for name in
+                                           ('edge_id', 'tx_id', 'block_time', 'edge_type', 'from_id',
+                                            'to_id', 'token_id', 'amount_raw', 'decimals')}
+    dtypes = (np.int64, np.int64, np.int64, np.uint8, np.uint32,
+              np.uint32, np.int64, np.uint64, np.uint8)
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        n = len(rows)
+        for (name, out), dtype, col in zip(chunks.items(), dtypes, zip(*rows)):
+            out.append(np.fromiter(col, dtype=dtype, count=n))
+
+    cols = {name: (np.concatenate(parts) if parts else np.empty(0, dtype=dtype))
+            for (name, parts), dtype in zip(chunks.items(), dtypes)}
+
+    # amount / 10^decimals, 0 when either is 0/NULL (as the per-row code did)
+    decimals = cols.pop('decimals')
+    amount_raw = cols['amount_raw']
+    scale = np.power(10.0, decimals.astype(np.float64))
+    amount = np.where((amount_raw != 0) & (decimals != 0),
+                      amount_raw.astype(np.float64) / scale, 0.0)
+
+    # Intern addresses: from/to ids -> one table, int32 positions
+    from_id, to_id = cols.pop('from_id'), cols.pop('to_id')
+    address_ids, inverse = np.unique(np.concatenate((from_id, to_id)), return_inverse=True)
+    inverse = inverse.astype(np.int32)
+    from_idx, to_idx = inverse[:len(from_id)], inverse[len(from_id):]
+    addr_rows = _lookup(cursor, "SELECT id, address, address_type FROM tx_address WHERE id IN ({})",
+                        address_ids)
+    addresses = [addr_rows.get(int(a), (None, None))[0] for a in address_ids]
+    address_types = [addr_rows.get(int(a), (None, None))[1] for a in address_ids]
+
+    token_id = cols.pop('token_id')
+    token_ids, token_inv = np.unique(token_id, return_inverse=True)
+    token_inv = token_inv.astype(np.int32)
+    token_ids = token_ids.copy()
+    has_sol = len(token_ids) and token_ids[0] < 0
+    if has_sol:
+        token_inv -= 1
+        token_ids = token_ids[1:]
+    token_rows = _lookup(cursor, """
+        SELECT tk.id, tk.token_symbol, mint.address
+        FROM tx_token tk
+        LEFT JOIN tx_address mint ON mint.id = tk.mint_address_id
+        WHERE tk.id IN ({})
+    """, token_ids)
+    tokens = [token_rows.get(int(t), (None, None)) for t in token_ids]
+
+    sig_list = None
+    tx_idx = np.full(len(cols['tx_id']), -1, dtype=np.int32)
+    if signatures:
+        tx_ids, tx_inv = np.unique(cols['tx_id'], return_inverse=True)
+        tx_idx = tx_inv.astype(np.int32)
+        sig_rows = _lookup(cursor, "SELECT id, signature FROM tx WHERE id IN ({})", tx_ids)
+        sig_list = [sig_rows.get(int(t), (None,))[0] for t in tx_ids]
+
+    cols.update(amount=amount, from_idx=from_idx, to_idx=to_idx,
+                token_idx=token_inv, tx_idx=tx_idx)
+    return EdgeFrame(cols, addresses, address_types, tokens,
+                     type_codes, type_categories, sig_list)
+
+
+def _lookup(cursor, sql: str, ids: np.ndarray) -> Dict[int, Tuple]:
+    """id -> remaining columns for ids, LOOKUP_BATCH ids per query."""
+    out: Dict[int, Tuple] = {}
+    for i in range(0, len(ids), LOOKUP_BATCH):
+        batch = [int(x) for x in ids[i:i + LOOKUP_BATCH]]
+        cursor.execute(sql.format(','.join(['%s'] * len(batch))), batch)
+        for row in cursor.fetchall():
+            out[int(row[0])] = tuple(row[1:])
+    return out